@@ -4,11 +4,14 @@ This file contains celery tasks for contentstore views
 
 import asyncio
 import base64
+import hashlib
 import json
 import os
 import re
 import shutil
 import tarfile
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from importlib.metadata import entry_points
 from tempfile import NamedTemporaryFile, mkdtemp
@@ -21,6 +24,7 @@ from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import SuspiciousOperation
 from django.core.files import File
 from django.test import RequestFactory
@@ -106,6 +110,8 @@ User = get_user_model()
 LOGGER = get_task_logger(__name__)
 FILE_READ_CHUNK = 1024  # bytes
 FULL_COURSE_REINDEX_THRESHOLD = 1
+LINK_CHECK_REQUEST_TIMEOUT = 5  # seconds
+LINK_STATUS_CACHE_KEY_PREFIX = 'course_optimizer.link_status.'
 ALL_ALLOWED_XBLOCKS = frozenset(
     [entry_point.name for entry_point in entry_points(group="xblock.v1")]
 )
@@ -738,6 +744,7 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
         self.status.increment_completed_steps()
         LOGGER.info(f'{log_prefix}: Extracted file verified. Updating course started')
 
+        phase_timings = {}
         courselike_items = import_func(
             modulestore(), user.id,
             settings.GITHUB_REPO_ROOT, [dirpath],
@@ -745,12 +752,18 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
             static_content_store=contentstore(),
             target_id=courselike_key,
             verbose=True,
+            phase_timings=phase_timings,
         )
 
         new_location = courselike_items[0].location
         LOGGER.debug('new course at %s', new_location)
 
-        LOGGER.info(f'{log_prefix}: Course import successful')
+        LOGGER.info(f'{log_prefix}: Course import successful, phase timings: {phase_timings}')
+        UserTaskArtifact.objects.create(
+            status=self.status,
+            name='Timings',
+            text=json.dumps({phase: round(seconds, 3) for phase, seconds in phase_timings.items()}),
+        )
         set_custom_attribute('course_import_completed', True)
     except (CourseImportException, InvalidProctoringProvider, DuplicateCourseError) as known_exe:
         handle_course_import_exception(courselike_key, known_exe, self.status)
@@ -1247,26 +1260,11 @@ def _scan_course_for_links(course_key):
         ...
     ]
     """
-    verticals = modulestore().get_items(
-        course_key,
-        qualifiers={'category': 'vertical'},
-        revision=ModuleStoreEnum.RevisionOption.published_only
-    )
-    blocks = []
+    store = modulestore()
     urls_to_validate = []
-    course = modulestore().get_course(course_key)
-
-    for vertical in verticals:
-        blocks.extend(vertical.get_children())
+    course = store.get_course(course_key)
 
-    for block in blocks:
-        # Excluding 'drag-and-drop-v2' as it contains data of object type instead of string, causing errors,
-        # and it doesn't contain user-facing links to scan.
-        if block.category == 'drag-and-drop-v2':
-            continue
-        block_id = str(block.location)
-        block_info = get_block_info(block)
-        block_data = block_info['data']
+    for block_id, block_data in _get_published_unit_children_data(store, course_key):
         url_list = extract_content_URLs_from_course(block_data)
         urls_to_validate += [[block_id, url] for url in url_list]
 
@@ -1289,6 +1287,60 @@ def _scan_course_for_links(course_key):
     return urls_to_validate
 
 
+def _get_published_unit_children_data(store, course_key):
+    """
+    Returns the id and (static URL rewritten) data of the published children of every unit of a course.
+
+    The data is read straight from the course structure and the blocks' definitions when the modulestore
+    supports it, rather than by loading every block as an XBlock.
+
+    Returns:
+        list: block id and block data pairs
+    """
+    blocks_fields = store.get_block_content_fields(
+        course_key,
+        parent_block_type='vertical',
+        revision=ModuleStoreEnum.RevisionOption.published_only,
+    )
+    if blocks_fields is None:
+        return _get_published_unit_children_data_from_xblocks(store, course_key)
+
+    blocks_data = []
+    for usage_key, fields in blocks_fields.items():
+        # Excluding 'drag-and-drop-v2' as it contains data of object type instead of string,
+        # and it doesn't contain user-facing links to scan.
+        if usage_key.block_type == 'drag-and-drop-v2':
+            continue
+        block_data = fields.get('data', '')
+        if not isinstance(block_data, str):
+            continue
+        blocks_data.append([str(usage_key), replace_static_urls(block_data, None, course_id=course_key)])
+    return blocks_data
+
+
+def _get_published_unit_children_data_from_xblocks(store, course_key):
+    """
+    Returns the id and data of the published children of every unit of a course, loading them as XBlocks.
+    """
+    verticals = store.get_items(
+        course_key,
+        qualifiers={'category': 'vertical'},
+        revision=ModuleStoreEnum.RevisionOption.published_only
+    )
+    blocks = []
+    for vertical in verticals:
+        blocks.extend(vertical.get_children())
+
+    blocks_data = []
+    for block in blocks:
+        # Excluding 'drag-and-drop-v2' as it contains data of object type instead of string, causing errors,
+        # and it doesn't contain user-facing links to scan.
+        if block.category == 'drag-and-drop-v2':
+            continue
+        blocks_data.append([str(block.location), get_block_info(block)['data']])
+    return blocks_data
+
+
 def extract_content_URLs_from_course(content):
     """
     Finds and returns a list of URLs in the given content.
@@ -1430,30 +1482,118 @@ async def _validate_urls_access_in_batches(url_list, course_key, batch_size=100)
     """
     Returns the statuses of a list of URL requests.
 
+    Each distinct URL is requested once, however many blocks link to it, through a single
+    pooled session which keeps at most ``batch_size`` requests in flight overall, and
+    COURSE_LINK_CHECK_MAX_REQUESTS_PER_HOST per host. The statuses of external URLs are
+    cached for COURSE_LINK_CHECK_CACHE_TIMEOUT seconds, and shared between courses.
+
     Arguments:
         url_list (list): block id and URL pairs
+        batch_size (int): maximum number of requests in flight
 
     Returns:
         list: dictionary containing URL, associated block id, and request status
     """
-    responses = []
-    url_count = len(url_list)
+    # The first block linking to each URL, by URL
+    url_data_by_url = {}
+    for block_id, url in url_list:
+        url_data_by_url.setdefault(url.strip(), [block_id, url])
+
+    statuses = _get_cached_link_statuses(url_data_by_url)
+    urls_to_request = [url for url in url_data_by_url if url not in statuses]
+    LOGGER.debug(
+        f'[Link Check] {len(url_list)} links to {len(url_data_by_url)} URLs, '
+        f'{len(urls_to_request)} of which are not cached'
+    )
+
+    if urls_to_request:
+        async with LinkCheckSession(batch_size, settings.COURSE_LINK_CHECK_MAX_REQUESTS_PER_HOST) as session:
+            results = await asyncio.gather(
+                *[_validate_url_access(session, url_data_by_url[url], course_key) for url in urls_to_request]
+            )
+        requested_statuses = {result['url']: result['status'] for result in results}
+        _set_cached_link_statuses(requested_statuses)
+        statuses.update(requested_statuses)
+
+    return [
+        {'block_id': block_id, 'url': url.strip(), 'status': statuses[url.strip()]}
+        for block_id, url in url_list
+    ]
+
+
+class LinkCheckSession:
+    """
+    An aiohttp session, shared by all of the requests of a link check, which limits the
+    number of requests in flight, overall and to each host.
+
+    Requests wait for their turn before they start, so that their timeout doesn't include
+    the time spent waiting for the other requests.
+    """
 
-    for i in range(0, url_count, batch_size):
-        batch = url_list[i:i + batch_size]
-        batch_results = await _validate_batch(batch, course_key)
-        responses.extend(batch_results)
-        LOGGER.debug(f'[Link Check] request batch {i // batch_size + 1} of {url_count // batch_size + 1}')
+    def __init__(self, max_requests, max_requests_per_host):
+        self.max_requests = max_requests
+        self.max_requests_per_host = max_requests_per_host
+        self._session = None
+        self._requests = None
+        self._host_requests = None
 
-    return responses
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_requests, limit_per_host=self.max_requests_per_host)
+        )
+        self._requests = asyncio.Semaphore(self.max_requests)
+        self._host_requests = defaultdict(lambda: asyncio.Semaphore(self.max_requests_per_host))
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self._session.close()
+
+    @asynccontextmanager
+    async def get(self, url, **kwargs):
+        """
+        Makes a GET request to the URL, once there is room for it, and yields the response.
+        """
+        host = urlparse(url).netloc.lower()
+        async with self._requests, self._host_requests[host]:
+            async with self._session.get(url, **kwargs) as response:
+                yield response
 
 
-async def _validate_batch(batch, course_key):
-    """Validate a batch of URLs"""
-    async with aiohttp.ClientSession() as session:
-        tasks = [_validate_url_access(session, url_data, course_key) for url_data in batch]
-        batch_results = await asyncio.gather(*tasks)
-        return batch_results
+def _link_status_cache_key(url):
+    """
+    Returns the key of the cached status of the URL.
+    """
+    return LINK_STATUS_CACHE_KEY_PREFIX + hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+def _get_cached_link_statuses(urls):
+    """
+    Returns the cached statuses of the given URLs, as a {URL: status} dict.
+
+    Studio URLs are never cached, since their status depends on the course (e.g. locked assets).
+    """
+    cache_keys = {_link_status_cache_key(url): url for url in urls if not _is_studio_url(url)}
+    if not cache_keys:
+        return {}
+    cached_statuses = cache.get_many(list(cache_keys))
+    return {cache_keys[cache_key]: status for cache_key, status in cached_statuses.items()}
+
+
+def _set_cached_link_statuses(statuses):
+    """
+    Caches the statuses, from a {URL: status} dict, of the external URLs which got a response.
+    """
+    timeout = settings.COURSE_LINK_CHECK_CACHE_TIMEOUT
+    if not timeout:
+        return
+    cache.set_many(
+        {
+            _link_status_cache_key(url): status
+            for url, status in statuses.items()
+            if status is not None and not _is_studio_url(url)
+        },
+        timeout,
+    )
 
 
 async def _validate_url_access(session, url_data, course_key):
@@ -1488,7 +1628,7 @@ async def _validate_url_access(session, url_data, course_key):
         headers = DEFAULT_HEADERS
 
     try:
-        async with session.get(standardized_url, headers=headers, timeout=5) as response:
+        async with session.get(standardized_url, headers=headers, timeout=LINK_CHECK_REQUEST_TIMEOUT) as response:
             result.update({'status': response.status})
     except Exception as e:  # pylint: disable=broad-except
         result.update({'status': None})
@@ -1,19 +1,24 @@
 """
 Unit tests for course import and export Celery tasks
 """
+import asyncio
 import copy
 import json
 import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import mock
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import ddt
-import pytest
 from celery import Task
 from django.conf import settings
 from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.core.cache.backends.locmem import LocMemCache
 from django.db import models
+from django.test import SimpleTestCase
 from django.test.utils import override_settings
 from edx_toggles.toggles.testutils import override_waffle_flag
 from opaque_keys.edx.keys import CourseKey
@@ -386,6 +391,30 @@ class CheckBrokenLinksTaskTest(ModuleStoreTestCase):
         """_scan_course_for_links should only scan published courses"""
         mock_modulestore_instance = mock.Mock()
         mock_modulestore.return_value = mock_modulestore_instance
+        mock_modulestore_instance.get_block_content_fields.return_value = {}
+
+        mock_course_key_string = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+        mock_module_store_enum.RevisionOption.published_only = "mock_published_only"
+
+        _scan_course_for_links(mock_course_key_string)
+
+        mock_modulestore_instance.get_block_content_fields.assert_called_once_with(
+            mock_course_key_string,
+            parent_block_type='vertical',
+            revision=mock_module_store_enum.RevisionOption.published_only
+        )
+        mock_modulestore_instance.get_items.assert_not_called()
+
+    @mock.patch('cms.djangoapps.contentstore.tasks.ModuleStoreEnum', autospec=True)
+    @mock.patch('cms.djangoapps.contentstore.tasks.modulestore', autospec=True)
+    def test_course_scan_falls_back_to_xblocks(self, mock_modulestore, mock_module_store_enum):
+        """
+        _scan_course_for_links should load the published units as XBlocks if the modulestore can't read
+        their children's data straight from the course structure.
+        """
+        mock_modulestore_instance = mock.Mock()
+        mock_modulestore.return_value = mock_modulestore_instance
+        mock_modulestore_instance.get_block_content_fields.return_value = None
         mock_modulestore_instance.get_items.return_value = []
 
         mock_course_key_string = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
@@ -431,6 +460,7 @@ class CheckBrokenLinksTaskTest(ModuleStoreTestCase):
 
         mock_modulestore_instance = mock.Mock()
         mock_modulestore.return_value = mock_modulestore_instance
+        mock_modulestore_instance.get_block_content_fields.return_value = None
         mock_modulestore_instance.get_items.return_value = [vertical]
         vertical.get_children = mock.Mock(return_value=[drag_and_drop_block, text_block])
 
@@ -452,45 +482,74 @@ class CheckBrokenLinksTaskTest(ModuleStoreTestCase):
             "Text block should be included"
         )
 
-    @pytest.mark.asyncio
-    async def test_every_detected_link_is_validated(self):
-        '''
-        The call to _validate_urls_access_in_batches() should call _validate_batch() three times, once for each
-        of the three batches of length 2 in url_list. The lambda function supplied for _validate_batch will
-        simply return the set of urls fed to _validate_batch(), and _validate_urls_access_in_batches() will
-        aggregate these into a list identical to the original url_list.
+    def test_scan_course_reads_published_unit_children(self):
+        """
+        `_scan_course_for_links` should find the links in the published children of units, and the
+        static URLs in them should be rewritten, without skipping or duplicating any block.
+        """
+        vertical = BlockFactory.create(category='vertical', parent_location=self.test_course.location)
+        drag_and_drop_block = BlockFactory.create(category='drag-and-drop-v2', parent_location=vertical.location)
+        text_block = BlockFactory.create(
+            category='html',
+            parent_location=vertical.location,
+            data='<a href="http://example.com">Example.com</a> <img src="/static/image.png">',
+        )
+        modulestore().publish(vertical.location, self.user.id)
+        draft_block = BlockFactory.create(
+            category='html',
+            parent_location=vertical.location,
+            data='<a href="http://draft.example.com">Draft</a>',
+            publish_item=False,
+        )
 
-        What this shows is that each url submitted to _validate_urls_access_in_batches() is ending up as an argument
-        to one of the generated _validate_batch() calls, and that no input URL is left unprocessed.
-        '''
-        url_list = ['1', '2', '3', '4', '5']
+        urls = _scan_course_for_links(self.test_course.id)
+
+        block_ids = {block_id for block_id, _ in urls}
+        assert str(drag_and_drop_block.usage_key) not in block_ids
+        assert str(draft_block.usage_key) not in block_ids
+        asset_url, link_url = sorted(url for block_id, url in urls if block_id == str(text_block.usage_key))
+        assert asset_url.startswith('/asset-v1:')
+        assert asset_url.endswith('/image.png')
+        assert link_url == 'http://example.com'
+
+    def test_every_detected_link_is_validated_once(self):
+        """
+        _validate_urls_access_in_batches() should request each distinct URL once, however many blocks
+        link to it, and report its status for each of those blocks.
+        """
+        url_list = [['block_1', 'http://a.com'], ['block_2', ' http://a.com '], ['block_2', 'http://b.com']]
         course_key = 'course-v1:edX+DemoX+Demo_Course'
-        batch_size = 2
-        with patch("cms.djangoapps.contentstore.tasks._validate_batch", new_callable=AsyncMock) as mock_validate_batch:
-            mock_validate_batch.side_effect = lambda x, y: x
-            validated_urls = await _validate_urls_access_in_batches(url_list, course_key, batch_size)
-            mock_validate_batch.assert_called()
-            assert mock_validate_batch.call_count == 3  # two full batches and one partial batch
-            assert validated_urls == url_list, \
-                f"List of validated urls {validated_urls} is not identical to sourced urls {url_list}"
-
-    @pytest.mark.asyncio
-    async def test_all_links_are_validated_with_batch_validation(self):
+        with patch("cms.djangoapps.contentstore.tasks._validate_url_access", new_callable=AsyncMock) as mock_validate:
+            mock_validate.side_effect = lambda session, url_data, course_key: {
+                'block_id': url_data[0], 'url': url_data[1].strip(), 'status': 200,
+            }
+            validated_urls = asyncio.run(_validate_urls_access_in_batches(url_list, course_key, batch_size=2))
+
+        assert sorted(call_args.args[1][1] for call_args in mock_validate.call_args_list) == [
+            'http://a.com', 'http://b.com'
+        ]
+        assert validated_urls == [
+            {'block_id': 'block_1', 'url': 'http://a.com', 'status': 200},
+            {'block_id': 'block_2', 'url': 'http://a.com', 'status': 200},
+            {'block_id': 'block_2', 'url': 'http://b.com', 'status': 200},
+        ]
+
+    def test_all_links_are_validated_with_batch_validation(self):
         '''
         Here the focus is not on batching, but rather that when validation occurs it does so on the intended
         URL strings
         '''
         with patch("cms.djangoapps.contentstore.tasks._validate_url_access", new_callable=AsyncMock) as mock_validate:
-            mock_validate.return_value = {"status": 200}
+            mock_validate.side_effect = lambda session, url_data, course_key: {'url': url_data[1], 'status': 200}
 
-            url_list = ['1', '2', '3', '4', '5']
+            url_list = [[f'block_{i}', f'/static/{i}'] for i in range(1, 6)]
             course_key = 'course-v1:edX+DemoX+Demo_Course'
             batch_size = 2
-            await _validate_urls_access_in_batches(url_list, course_key, batch_size)
+            asyncio.run(_validate_urls_access_in_batches(url_list, course_key, batch_size))
             args_list = mock_validate.call_args_list
-            urls = [call_args.args[1] for call_args in args_list]   # The middle argument in each of the function calls
+            urls = [call_args.args[1][1] for call_args in args_list]   # The middle argument in each of the function calls
             for i in range(1, len(url_list) + 1):
-                assert str(i) in urls, f'{i} not supplied as a url for validation in batches function'
+                assert f'/static/{i}' in urls, f'{i} not supplied as a url for validation in batches function'
 
     def test_no_retries_on_403_access_denied_links(self):
         '''
@@ -679,6 +738,109 @@ class CheckBrokenLinksTaskTest(ModuleStoreTestCase):
         self.assertEqual(extract_content_URLs_from_course(content), set(expected))  # noqa: PT009
 
 
+class LinkCheckRequestHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the servers of checked links: answers with the status in the path, e.g. /404,
+    after a short delay, and records the requests it got.
+    """
+    requests = []
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Answers a GET request.
+        """
+        cls = type(self)
+        with cls.lock:
+            cls.requests.append(self.path)
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.in_flight -= 1
+        self.send_response(int(self.path.split('/')[1]))
+        self.end_headers()
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@override_settings(COURSE_LINK_CHECK_MAX_REQUESTS_PER_HOST=2, COURSE_LINK_CHECK_CACHE_TIMEOUT=60)
+class ValidateUrlsAccessTest(SimpleTestCase):
+    """
+    Tests for _validate_urls_access_in_batches, against a local HTTP server.
+    """
+
+    def setUp(self):
+        super().setUp()
+        LinkCheckRequestHandler.requests = []
+        LinkCheckRequestHandler.max_in_flight = 0
+        server = ThreadingHTTPServer(('127.0.0.1', 0), LinkCheckRequestHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        cache_patcher = patch('cms.djangoapps.contentstore.tasks.cache', LocMemCache('link-check-test', {}))
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def validate(self, url_list, course_key='course-v1:edX+DemoX+Demo_Course'):
+        return asyncio.run(_validate_urls_access_in_batches(url_list, CourseKey.from_string(course_key)))
+
+    def test_statuses_of_duplicated_links(self):
+        url_list = [
+            ['block_1', f'{self.base_url}/200/a'],
+            ['block_2', f'{self.base_url}/404/b'],
+            ['block_3', f'{self.base_url}/200/a'],
+        ]
+
+        assert self.validate(url_list) == [
+            {'block_id': 'block_1', 'url': f'{self.base_url}/200/a', 'status': 200},
+            {'block_id': 'block_2', 'url': f'{self.base_url}/404/b', 'status': 404},
+            {'block_id': 'block_3', 'url': f'{self.base_url}/200/a', 'status': 200},
+        ]
+        assert sorted(LinkCheckRequestHandler.requests) == ['/200/a', '/404/b']
+
+    def test_requests_per_host_are_limited(self):
+        url_list = [[f'block_{i}', f'{self.base_url}/200/{i}'] for i in range(8)]
+
+        results = self.validate(url_list)
+
+        assert [result['status'] for result in results] == [200] * 8
+        assert len(LinkCheckRequestHandler.requests) == 8
+        assert LinkCheckRequestHandler.max_in_flight <= 2
+
+    def test_statuses_are_cached_across_courses(self):
+        url_list = [['block_1', f'{self.base_url}/404/a']]
+        self.validate(url_list)
+
+        results = self.validate(url_list, course_key='course-v1:edX+OtherX+Other_Course')
+
+        assert results == [{'block_id': 'block_1', 'url': f'{self.base_url}/404/a', 'status': 404}]
+        assert LinkCheckRequestHandler.requests == ['/404/a']
+
+    @override_settings(COURSE_LINK_CHECK_CACHE_TIMEOUT=0)
+    def test_statuses_are_not_cached_when_disabled(self):
+        url_list = [['block_1', f'{self.base_url}/200/a']]
+        self.validate(url_list)
+        self.validate(url_list)
+
+        assert LinkCheckRequestHandler.requests == ['/200/a', '/200/a']
+
+    def test_connection_errors_are_not_cached(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), LinkCheckRequestHandler)
+        unreachable_url = f'http://127.0.0.1:{server.server_address[1]}/200/a'
+        server.server_close()
+
+        assert self.validate([['block_1', unreachable_url]])[0]['status'] is None
+        assert not LinkCheckRequestHandler.requests
+        with patch("cms.djangoapps.contentstore.tasks._validate_url_access", new_callable=AsyncMock) as mock_validate:
+            mock_validate.return_value = {'block_id': 'block_1', 'url': unreachable_url, 'status': 200}
+            assert self.validate([['block_1', unreachable_url]])[0]['status'] == 200
+
+
 @ddt.ddt
 @override_settings(CONTENTSTORE=TEST_DATA_CONTENTSTORE)
 class SyncDiscussionSettingsTaskTestCase(CourseTestCase):
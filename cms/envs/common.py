@@ -489,6 +489,24 @@ STATIC_ROOT = os.environ.get('STATIC_ROOT_CMS', ENV_ROOT / 'staticfiles' / 'stud
 COURSE_IMPORT_EXPORT_STORAGE = 'django.core.files.storage.FileSystemStorage'
 COURSE_METADATA_EXPORT_STORAGE = 'django.core.files.storage.FileSystemStorage'
 
+# .. setting_name: COURSE_IMPORT_STATIC_CONTENT_WORKERS
+# .. setting_default: 4
+# .. setting_description: Number of threads used to upload the static files of a course to the contentstore, and
+#   to generate their thumbnails, when the course is imported.
+COURSE_IMPORT_STATIC_CONTENT_WORKERS = 4
+
+# .. setting_name: COURSE_LINK_CHECK_MAX_REQUESTS_PER_HOST
+# .. setting_default: 4
+# .. setting_description: Maximum number of concurrent requests made to any one host when the course optimizer
+#   checks the links of a course.
+COURSE_LINK_CHECK_MAX_REQUESTS_PER_HOST = 4
+
+# .. setting_name: COURSE_LINK_CHECK_CACHE_TIMEOUT
+# .. setting_default: 3600
+# .. setting_description: Number of seconds for which the status of an external link checked by the course
+#   optimizer is cached, and reused by the link checks of any course. Set to 0 to disable the cache.
+COURSE_LINK_CHECK_CACHE_TIMEOUT = 60 * 60
+
 ##### custom vendor plugin variables #####
 
 ############################### PIPELINE #######################################
@@ -1284,6 +1302,28 @@ MEILISEARCH_PUBLIC_URL = "http://meilisearch.example.com"
 MEILISEARCH_INDEX_PREFIX = ""
 MEILISEARCH_API_KEY = "devkey"
 
+# .. setting_name: MEILISEARCH_INDEX_PAGE_SIZE
+# .. setting_default: 1000
+# .. setting_description: Maximum number of documents sent to Meilisearch at once when a course is (re)indexed.
+MEILISEARCH_INDEX_PAGE_SIZE = 1000
+
+# .. setting_name: MEILISEARCH_INDEX_COURSE_WORKERS
+# .. setting_default: 1
+# .. setting_description: Number of courses indexed concurrently, each in its own thread, when the Studio search
+#   index is rebuilt.
+MEILISEARCH_INDEX_COURSE_WORKERS = 1
+
+# .. toggle_name: settings.MEILISEARCH_SYNC_COURSE_INDEX_BY_STRUCTURE_DIFF
+# .. toggle_implementation: DjangoSetting
+# .. toggle_default: False
+# .. toggle_description: When enabled, changes to course blocks (and course imports and reruns) update the Studio
+#   search index by comparing the course's structure with the version that was last indexed, and only updating the
+#   documents of the blocks that changed (and deleting the ones of removed blocks), instead of reindexing the changed
+#   block with all of its descendants.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-16
+MEILISEARCH_SYNC_COURSE_INDEX_BY_STRUCTURE_DIFF = False
+
 # .. setting_name: LIBRARY_ENABLED_BLOCKS
 # .. setting_default: ['problem', 'video', 'html', 'drag-and-drop-v2']
 # .. setting_description: List of block types that are ready/enabled to be created/used
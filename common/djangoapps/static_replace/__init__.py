@@ -1,17 +1,27 @@
 # pylint: disable=missing-module-docstring
 
+import hashlib
 import logging
 import re
+from functools import lru_cache
 
 from django.conf import settings
 from django.contrib.staticfiles import finders
 from django.contrib.staticfiles.storage import staticfiles_storage
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.locator import AssetLocator
 
 from xmodule.contentstore.content import StaticContent
 
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock/'
+REQUEST_CACHE_NAMESPACE = 'static_replace.replace_urls'
+REPLACED_TEXTS_NAMESPACE = 'static_replace.replace_urls.replaced_texts'
+
+# The maximum number of rewritten texts kept in the request cache. Celery
+# tasks only clear the request cache once they are done, so the texts a long
+# task renders must not pile up.
+MAX_REPLACED_TEXTS = 64
 
 
 def _url_replace_regex(prefix):
@@ -29,6 +39,36 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)  # noqa: UP032
 
 
+@lru_cache(maxsize=256)
+def _compiled_url_replace_regex(prefix):
+    """
+    Compiled version of _url_replace_regex, so that the patterns are built once per process.
+    """
+    return re.compile(_url_replace_regex(prefix))
+
+
+def _static_url_prefix(data_dir):
+    """
+    The prefix matching static urls, except the ones already pointing into `data_dir`.
+    """
+    return '(?:{static_url}|/static/)(?!{data_dir})'.format(  # noqa: UP032
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
+def _is_xblock_resource_url(full_url):
+    """
+    Return whether a static url points to an XBlock resource (which must not be rewritten).
+    """
+    # Probably wasn't a good idea that /static works for actual static assets
+    # and for magical course asset URLs....
+    starts_with_static_url = full_url.startswith(str(settings.STATIC_URL))
+    starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
+    contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
+    return starts_with_prefix or (starts_with_static_url and contains_prefix)
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -70,7 +110,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):  # pylint: di
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _compiled_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -90,7 +130,7 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _compiled_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -108,26 +148,13 @@ def process_static_urls(text, replacement_function, data_dir=None):
         quote = match.group('quote')
         rest = match.group('rest')
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
-
-        starts_with_static_url = full_url.startswith(str(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        # Don't rewrite XBlock resource links.
+        if _is_xblock_resource_url(prefix + rest):
             return original
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex('(?:{static_url}|/static/)(?!{data_dir})'.format(  # noqa: UP032
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return _compiled_url_replace_regex(_static_url_prefix(data_dir)).sub(wrap_part_extraction, text)
 
 
 def make_static_urls_absolute(request, html):
@@ -180,63 +207,183 @@ def replace_static_urls(
         """
         Replace a single matched url.
         """
-        original_uri = "".join([prefix, rest])
-        # Don't mess with things that end in '?raw'
-        if rest.endswith('?raw'):
-            static_paths_out.append((original_uri, original_uri))
-            return original
-
-        if lookup_asset_url:
+        if lookup_asset_url and not rest.endswith('?raw'):
+            original_uri = "".join([prefix, rest])
             new_url = lookup_asset_url(xblock, rest) or original_uri
             return "".join([quote, new_url, quote])
 
-        # In debug mode, if we can find the url as is,
-        if settings.DEBUG and finders.find(rest, True):
-            static_paths_out.append((original_uri, original_uri))
-            return original
+        url = _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path)
+        static_paths_out.append(("".join([prefix, rest]), url))
+        return "".join([quote, url, quote])
+
+    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
 
-        # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:  # pylint: disable=broad-except
-                log.warning("staticfiles_storage couldn't find path {}: {}".format(  # noqa: UP032
-                    rest, str(err)))
+def _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path):
+    """
+    Return the url that the static url `prefix + rest` should be replaced with.
 
-            if exists_in_staticfiles_storage:
+    See replace_static_urls for the meaning of the other arguments.
+    """
+    original_uri = "".join([prefix, rest])
+    # Don't mess with things that end in '?raw'
+    if rest.endswith('?raw'):
+        return original_uri
+
+    # In debug mode, if we can find the url as is,
+    if settings.DEBUG and finders.find(rest, True):
+        return original_uri
+
+    # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
+    elif (not static_asset_path) and course_id:
+        # first look in the static file pipeline and see if we are trying to reference
+        # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+        exists_in_staticfiles_storage = False
+        try:
+            exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+        except Exception as err:  # pylint: disable=broad-except
+            log.warning("staticfiles_storage couldn't find path {}: {}".format(  # noqa: UP032
+                rest, str(err)))
+
+        if exists_in_staticfiles_storage:
+            url = staticfiles_storage.url(rest)
+        else:
+            # if not, then assume it's courseware specific content and then look in the
+            # Mongo-backed database
+            # Import is placed here to avoid model import at project startup.
+            from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+            base_url = AssetBaseUrlConfig.get_base_url()
+            excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
+            url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+
+            if AssetLocator.CANONICAL_NAMESPACE in url:
+                url = url.replace('block@', 'block/', 1)
+
+    # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+    else:
+        course_path = "/".join((static_asset_path or data_directory, rest))
+
+        try:
+            if staticfiles_storage.exists(rest):
                 url = staticfiles_storage.url(rest)
             else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
-
-        # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+                url = staticfiles_storage.url(course_path)
+        # And if that fails, assume that it's course content, and add manually data directory
+        except Exception as err:  # pylint: disable=broad-except
+            log.warning("staticfiles_storage couldn't find path {}: {}".format(  # noqa: UP032
+                rest, str(err)))
+            url = "".join([prefix, course_path])
+
+    return url
+
+
+def replace_urls(
+    text,
+    course_id,
+    data_directory=None,
+    static_asset_path='',
+    static_paths_out=None,
+    jump_to_id_base_url=None,
+    static_replace_only=False
+):
+    """
+    Replace the static, course and jump-to-id urls of `text` in a single pass.
+
+    This does what replace_static_urls, replace_course_urls and (if
+    jump_to_id_base_url is given) replace_jump_to_id_urls do in turn, but
+    scans the text only once. The static urls resolved along the way and
+    the last MAX_REPLACED_TEXTS results are cached for the rest of the
+    request, since the same html and assets tend to be rendered many times
+    per request. Results are keyed on a digest and the length of the text.
+
+    text: The source text to do the substitution in
+    course_id: The course identifier used to distinguish static content for this course in studio
+    data_directory: The directory in which course data is stored
+    static_asset_path: Path for static assets, which overrides data_directory and course_id, if nonempty
+    static_paths_out: (optional) pass an array to collect tuples for each static URI found (see replace_static_urls)
+    jump_to_id_base_url: (optional) Absolute path to the base of the handler that will perform the redirect
+    static_replace_only: If True, only static urls will be replaced
+    """
+    replaced_texts = RequestCache(REPLACED_TEXTS_NAMESPACE).data
+    cache_key = (
+        hashlib.sha256(text.encode('utf-8')).hexdigest(),
+        len(text),
+        str(course_id),
+        data_directory,
+        static_asset_path,
+        jump_to_id_base_url,
+        static_replace_only,
+    )
+    cached_value = replaced_texts.get(cache_key)
+    if cached_value is not None:
+        replaced_text, static_paths = cached_value
+    else:
+        static_paths = []
+        replaced_text = _replace_urls(
+            text,
+            course_id,
+            data_directory,
+            static_asset_path,
+            static_paths,
+            None if static_replace_only else jump_to_id_base_url,
+            static_replace_only,
+            RequestCache(REQUEST_CACHE_NAMESPACE),
+        )
+        if len(replaced_texts) >= MAX_REPLACED_TEXTS:
+            # Forget the text replaced first.
+            del replaced_texts[next(iter(replaced_texts))]
+        replaced_texts[cache_key] = (replaced_text, static_paths)
+
+    if static_paths_out is not None:
+        static_paths_out.extend(static_paths)
+    return replaced_text
+
+
+def _replace_urls(
+    text,
+    course_id,
+    data_directory,
+    static_asset_path,
+    static_paths_out,
+    jump_to_id_base_url,
+    static_replace_only,
+    request_cache
+):
+    """
+    Uncached implementation of replace_urls.
+    """
+    data_dir = static_asset_path or data_directory
+    prefixes = ['(?P<static>{})'.format(_static_url_prefix(data_dir))]  # noqa: UP032
+    if not static_replace_only:
+        prefixes.append('(?P<course>/course/)')
+    if jump_to_id_base_url:
+        prefixes.append('(?P<jump_to_id>/jump_to_id/)')
+    course_url_base = '/courses/{}/'.format(course_id)  # noqa: UP032
+
+    def replace_url(match):
+        """
+        Replace a single matched url, according to the kind of prefix it has.
+        """
+        quote = match.group('quote')
+        prefix = match.group('prefix')
+        rest = match.group('rest')
+
+        if match.group('static') is not None:
+            if _is_xblock_resource_url(prefix + rest):
+                return match.group(0)
+            resolved_url_key = ('resolved_url', prefix, rest, data_directory, str(course_id), static_asset_path)
+            cached_response = request_cache.get_cached_response(resolved_url_key)
+            if cached_response.is_found:
+                url = cached_response.value
+            else:
+                url = _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path)
+                request_cache.set(resolved_url_key, url)
+            static_paths_out.append(("".join([prefix, rest]), url))
+            return "".join([quote, url, quote])
+        elif match.group('course') is not None:
+            return "".join([quote, course_url_base, rest, quote])
         else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
-
-            try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
-                else:
-                    url = staticfiles_storage.url(course_path)
-            # And if that fails, assume that it's course content, and add manually data directory
-            except Exception as err:  # pylint: disable=broad-except
-                log.warning("staticfiles_storage couldn't find path {}: {}".format(  # noqa: UP032
-                    rest, str(err)))
-                url = "".join([prefix, course_path])
-
-        static_paths_out.append((original_uri, url))
-        return "".join([quote, url, quote])
+            return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    return _compiled_url_replace_regex('|'.join(prefixes)).sub(replace_url, text)
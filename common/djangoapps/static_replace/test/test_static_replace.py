@@ -8,17 +8,22 @@ from urllib.parse import parse_qsl, quote, urlencode, urlparse, urlunparse
 import ddt
 import pytest
 from django.test import override_settings
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
 from PIL import Image
 from web_fragments.fragment import Fragment
 
 from common.djangoapps.static_replace import (
+    REPLACED_TEXTS_NAMESPACE,
+    _replace_urls,
+    _resolve_static_url,
     _url_replace_regex,
     make_static_urls_absolute,
     process_static_urls,
     replace_course_urls,
     replace_jump_to_id_urls,
     replace_static_urls,
+    replace_urls,
 )
 from common.djangoapps.static_replace.services import ReplaceURLService
 from common.djangoapps.static_replace.wrapper import replace_urls_wrapper
@@ -621,11 +626,8 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
         self.mock_replace_static_urls = self.create_patch(
             'common.djangoapps.static_replace.services.replace_static_urls'
         )
-        self.mock_replace_course_urls = self.create_patch(
-            'common.djangoapps.static_replace.services.replace_course_urls'
-        )
-        self.mock_replace_jump_to_id_urls = self.create_patch(
-            'common.djangoapps.static_replace.services.replace_jump_to_id_urls'
+        self.mock_replace_urls = self.create_patch(
+            'common.djangoapps.static_replace.services.replace_urls'
         )
 
     def create_patch(self, name):
@@ -636,45 +638,124 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
 
     def test_replace_static_url_only(self):
         """
-        Test only replace_static_urls method called when static_replace_only is passed as True.
+        Test only static urls are replaced when static_replace_only is passed as True.
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text", static_replace_only=True)
-        assert self.mock_replace_static_urls.called
-        assert not self.mock_replace_course_urls.called
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_urls.call_args.kwargs['static_replace_only']
 
     def test_service_block_argument(self):
         """This service accepts either `block` or `xblock` keyword argument."""
         replace_url_service = ReplaceURLService(block=self.course)
         replace_url_service.replace_urls("text", static_replace_only=True)
-        assert self.mock_replace_static_urls.called
-        assert not self.mock_replace_course_urls.called
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_urls.call_args.args == ("text", self.course.id)
 
     def test_replace_course_urls_called(self):
         """
-        Test replace_course_urls method called static_replace_only is passed as False.
+        Test course urls are replaced when static_replace_only is passed as False.
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text")
-        assert self.mock_replace_course_urls.called
+        assert not self.mock_replace_urls.call_args.kwargs['static_replace_only']
 
     def test_replace_jump_to_id_urls_called(self):
         """
-        Test replace_jump_to_id_urls method called jump_to_id_base_url is provided.
+        Test jump-to-id urls are replaced when jump_to_id_base_url is provided.
         """
         replace_url_service = ReplaceURLService(xblock=self.course, jump_to_id_base_url="/course/course_id")
         replace_url_service.replace_urls("text")
-        assert self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_urls.call_args.kwargs['jump_to_id_base_url'] == "/course/course_id"
 
     def test_replace_jump_to_id_urls_not_called(self):
         """
-        Test replace_jump_to_id_urls method called jump_to_id_base_url is not provided.
+        Test jump-to-id urls are not replaced when jump_to_id_base_url is not provided.
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text")
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_urls.call_args.kwargs['jump_to_id_base_url'] is None
+
+    def test_lookup_asset_url(self):
+        """
+        Test only static urls are replaced, with lookup_asset_url, when it is provided.
+        """
+        lookup_asset_url = Mock()
+        replace_url_service = ReplaceURLService(xblock=self.course, lookup_asset_url=lookup_asset_url)
+        replace_url_service.replace_urls("text")
+        self.mock_replace_static_urls.assert_called_once_with(
+            "text", xblock=self.course, lookup_asset_url=lookup_asset_url
+        )
+        assert not self.mock_replace_urls.called
+
+
+class ReplaceUrlsTest(SharedModuleStoreTestCase):
+    """
+    Tests for replace_urls.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.course = CourseFactory.create(org='TestX', number='TS03', run='2015')
+
+    def test_single_pass(self):
+        """
+        Replacing all the urls at once is the same as replacing each kind of url in turn.
+        """
+        # xss-lint: disable=python-wrap-html
+        text = (
+            '<img src="/static/image.png"/><a href="/course/info">Info</a>'
+            '<a href=\'/jump_to_id/intro\'>Intro</a><a href="/static/raw.js?raw">Raw</a>'
+        )
+        static_paths = []
+        expected_static_paths = []
+        expected = replace_static_urls(text, course_id=self.course.id, static_paths_out=expected_static_paths)
+        expected = replace_course_urls(expected, self.course.id)
+        expected = replace_jump_to_id_urls(expected, self.course.id, '/base_url/')
+
+        assert replace_urls(
+            text, self.course.id, static_paths_out=static_paths, jump_to_id_base_url='/base_url/'
+        ) == expected
+        assert static_paths == expected_static_paths
+
+    def test_static_replace_only(self):
+        text = '<a href="/course/info"><img src="/static/image.png"/></a>'
+        assert replace_urls(text, self.course.id, static_replace_only=True) == replace_static_urls(
+            text, course_id=self.course.id
+        )
+
+    @patch('common.djangoapps.static_replace._resolve_static_url', wraps=_resolve_static_url)
+    def test_cached(self, mock_resolve_static_url):
+        """
+        Results and resolved static urls are cached for the rest of the request.
+        """
+        text = '<img src="/static/image.png"/>'
+        other_text = '<img src="/static/image.png"/><img src="/static/other.png"/>'
+        static_paths = []
+
+        replaced_text = replace_urls(text, self.course.id)
+        assert replace_urls(text, self.course.id, static_paths_out=static_paths) == replaced_text
+        assert static_paths == [('/static/image.png', replaced_text[len('<img src="'):-len('"/>')])]
+        assert mock_resolve_static_url.call_count == 1
+
+        replace_urls(other_text, self.course.id)
+        assert mock_resolve_static_url.call_count == 2
+
+    @patch('common.djangoapps.static_replace.MAX_REPLACED_TEXTS', 1)
+    @patch('common.djangoapps.static_replace._replace_urls', wraps=_replace_urls)
+    def test_cached_texts_bounded(self, mock_replace_urls):
+        """
+        Only the last MAX_REPLACED_TEXTS results are kept in the request cache.
+        """
+        text = '<img src="/static/image.png"/>'
+        other_text = '<img src="/static/other.png"/>'
+
+        replaced_text = replace_urls(text, self.course.id)
+        assert replace_urls(text, self.course.id) == replaced_text
+        assert mock_replace_urls.call_count == 1
+
+        replace_urls(other_text, self.course.id)
+        assert len(RequestCache(REPLACED_TEXTS_NAMESPACE).data) == 1
+        assert replace_urls(text, self.course.id) == replaced_text
+        assert mock_replace_urls.call_count == 3
 
 
 @ddt.ddt
@@ -0,0 +1,63 @@
+"""
+Recount the active enrollments of courses, and fix their stored CourseEnrollmentCounts.
+"""
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from common.djangoapps.student.models import CourseEnrollment, CourseEnrollmentCount
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Management command to reconcile the enrollment counts of courses with their enrollments.
+    """
+    help = """
+    Recount the active enrollments in each mode of the given courses (or of all
+    courses with enrollments), and fix the stored enrollment counts that differ.
+
+    Use it to backfill the counts before turning on ENABLE_COURSE_ENROLLMENT_COUNTS,
+    and to fix any drift afterwards.
+
+    Example:
+            $ ... reconcile_course_enrollment_counts course-v1:edX+DemoX+Demo_Course
+            $ ... reconcile_course_enrollment_counts --all
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'course_ids',
+            nargs='*',
+            metavar='course_id',
+            help='Courses to reconcile the enrollment counts of.')
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Reconcile the enrollment counts of all courses with enrollments.')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            course_keys = CourseEnrollment.objects.values_list('course_id', flat=True).distinct().order_by('course_id')
+        elif options['course_ids']:
+            try:
+                course_keys = [CourseKey.from_string(course_id) for course_id in options['course_ids']]
+            except InvalidKeyError as exc:
+                raise CommandError(f'Invalid course id: {exc}') from exc
+        else:
+            raise CommandError('Pass some course ids, or --all.')
+
+        fixed = 0
+        for course_key in course_keys:
+            stored_counts = dict(CourseEnrollmentCount.objects.filter(course_id=course_key).values_list('mode', 'count'))
+            counts = CourseEnrollmentCount.reconcile(course_key)
+            if {mode: count for mode, count in stored_counts.items() if count} != counts:
+                fixed += 1
+                logger.info(
+                    "Fixed the enrollment counts of %s: %s (were %s)", course_key, counts, stored_counts
+                )
+
+        logger.info("Reconciled the enrollment counts of %d courses, %d were fixed.", len(course_keys), fixed)
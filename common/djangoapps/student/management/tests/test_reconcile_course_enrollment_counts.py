@@ -0,0 +1,48 @@
+""" Test the reconcile_course_enrollment_counts management command."""
+
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from common.djangoapps.course_modes.models import CourseMode
+from common.djangoapps.student.models import CourseEnrollmentCount
+from common.djangoapps.student.tests.factories import CourseEnrollmentFactory
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
+
+
+class ReconcileCourseEnrollmentCountsTests(TestCase):
+    """ Test the reconcile_course_enrollment_counts command."""
+    def setUp(self):
+        super().setUp()
+        self.course = CourseOverviewFactory.create()
+        self.other_course = CourseOverviewFactory.create()
+        for mode in (CourseMode.AUDIT, CourseMode.AUDIT, CourseMode.VERIFIED):
+            CourseEnrollmentFactory.create(course=self.course, mode=mode)
+        CourseEnrollmentFactory.create(course=self.course, mode=CourseMode.VERIFIED, is_active=False)
+        CourseEnrollmentFactory.create(course=self.other_course, mode=CourseMode.AUDIT)
+
+    def test_reconcile_course(self):
+        call_command('reconcile_course_enrollment_counts', str(self.course.id))
+
+        assert CourseEnrollmentCount.objects.filter(course_id=self.other_course.id).count() == 0
+        assert dict(
+            CourseEnrollmentCount.objects.filter(course_id=self.course.id).values_list('mode', 'count')
+        ) == {CourseMode.AUDIT: 2, CourseMode.VERIFIED: 1}
+
+    def test_reconcile_all(self):
+        CourseEnrollmentCount.objects.create(course_id=self.course.id, mode=CourseMode.AUDIT, count=10)
+        CourseEnrollmentCount.objects.create(course_id=self.course.id, mode=CourseMode.HONOR, count=3)
+
+        call_command('reconcile_course_enrollment_counts', '--all')
+
+        assert dict(
+            CourseEnrollmentCount.objects.filter(course_id=self.course.id).values_list('mode', 'count')
+        ) == {CourseMode.AUDIT: 2, CourseMode.VERIFIED: 1, CourseMode.HONOR: 0}
+        assert dict(
+            CourseEnrollmentCount.objects.filter(course_id=self.other_course.id).values_list('mode', 'count')
+        ) == {CourseMode.AUDIT: 1}
+
+    def test_no_courses(self):
+        with pytest.raises(CommandError):
+            call_command('reconcile_course_enrollment_counts')
@@ -0,0 +1,25 @@
+# Generated by Django 5.2
+
+import opaque_keys.edx.django.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("student", "0049_manualenrollmentaudit_statetransition_typo"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseEnrollmentCount",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("course_id", opaque_keys.edx.django.models.CourseKeyField(max_length=255)),
+                ("mode", models.CharField(max_length=100)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "unique_together": {("course_id", "mode")},
+            },
+        ),
+    ]
@@ -3,6 +3,7 @@ import hashlib  # pylint: disable=wrong-import-order
 import logging  # pylint: disable=wrong-import-order
 import uuid  # pylint: disable=wrong-import-order
 from collections import defaultdict, namedtuple  # pylint: disable=wrong-import-order
+from contextlib import nullcontext  # pylint: disable=wrong-import-order
 from datetime import date, datetime, timedelta  # pylint: disable=wrong-import-order
 from urllib.parse import urljoin
 from zoneinfo import ZoneInfo
@@ -13,8 +14,8 @@ from django.contrib.auth.models import User  # pylint: disable=imported-auth-use
 from django.core.cache import cache
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.core.validators import FileExtensionValidator
-from django.db import models
-from django.db.models import Count, Index, Q
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Index, Q
 from django.dispatch import receiver
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -230,6 +231,18 @@ class CourseEnrollmentManager(models.Manager):
         admins = CourseInstructorRole(course_locator).users_with_role()
         coaches = CourseCcxCoachRole(course_locator).users_with_role()
 
+        counts = CourseEnrollmentCount.get_counts(course_id)
+        if counts is not None:
+            # Course roles change independently of enrollments, so rather than
+            # counting the enrollments of everyone else, subtract the (few)
+            # enrollments of the course team from the maintained total.
+            team_enrollments = super().get_queryset().filter(
+                Q(user__in=staff) | Q(user__in=admins) | Q(user__in=coaches),
+                course_id=course_id,
+                is_active=1,
+            ).count()
+            return sum(counts.values()) - team_enrollments
+
         return super().get_queryset().filter(
             course_id=course_id,
             is_active=1,
@@ -272,6 +285,12 @@ class CourseEnrollmentManager(models.Manager):
         Returns a dictionary that stores the total enrollment count for a course, as well as the
         enrollment count for each individual mode.
         """
+        counts = CourseEnrollmentCount.get_counts(course_id)
+        if counts is not None:
+            enroll_dict = defaultdict(int, {mode: count for mode, count in counts.items() if count})
+            enroll_dict['total'] = sum(counts.values())
+            return enroll_dict
+
         # Unfortunately, Django's "group by"-style queries look super-awkward
         query = use_read_replica_if_available(
             super().get_queryset().filter(course_id=course_id, is_active=True).values(
@@ -361,8 +380,20 @@ class CourseEnrollment(models.Model):
             "[CourseEnrollment] {}: {} ({}); active: ({})"
         ).format(self.user, self.course_id, self.created, self.is_active)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state of the enrollment, to update the enrollment
+        # counts of the course when it changes (see update_course_enrollment_counts).
+        instance._counted_state = (  # pylint: disable=protected-access
+            instance.__dict__.get('mode'), instance.__dict__.get('is_active')
+        )
+        return instance
+
     def save(self, *args, **kwargs):  # noqa: DJ012
-        super().save(*args, **kwargs)
+        # Update the enrollment counts of the course in the same transaction.
+        with transaction.atomic() if settings.ENABLE_COURSE_ENROLLMENT_COUNTS else nullcontext():
+            super().save(*args, **kwargs)
 
         # Delete the cached status hash, forcing the value to be recalculated the next time it is needed.
         cache.delete(self.enrollment_status_hash_cache_key(self.user))
@@ -1515,6 +1546,148 @@ def update_expiry_email_date(sender, instance, **kwargs):  # pylint: disable=unu
         SoftwareSecurePhotoVerification.update_expiry_email_date_for_user(instance.user, email_config)
 
 
+class CourseEnrollmentCount(models.Model):
+    """
+    The number of active enrollments in each mode of a course.
+
+    The counts are maintained from the CourseEnrollment signals when the
+    ENABLE_COURSE_ENROLLMENT_COUNTS setting is on, so that the enrollment
+    counts of large courses can be read without counting their enrollments.
+    The counts of a course are initialized from its enrollments the first time
+    one of them changes, and the reconcile_course_enrollment_counts management
+    command fixes any drift.
+
+    .. no_pii:
+    """
+    course_id = CourseKeyField(max_length=255)
+    mode = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (('course_id', 'mode'),)
+
+    def __str__(self):
+        return f"[CourseEnrollmentCount] {self.course_id} ({self.mode}): {self.count}"
+
+    @classmethod
+    def get_counts(cls, course_id):
+        """
+        Returns a dict of the number of active enrollments in each mode of the course,
+        or None if the counts are disabled or haven't been initialized for the course.
+        """
+        if not settings.ENABLE_COURSE_ENROLLMENT_COUNTS:
+            return None
+        return dict(cls.objects.filter(course_id=course_id).values_list('mode', 'count')) or None
+
+    @classmethod
+    def update_counts(cls, course_id, changes):
+        """
+        Add the changes (a dict of mode to the change in the number of active
+        enrollments in that mode) to the counts of the course.
+
+        This is expected to run after the enrollment changes have been saved, in
+        the same transaction: if the counts of the course (or mode) are missing,
+        they're initialized from the enrollments.
+        """
+        changes = [(mode, change) for mode, change in changes.items() if change]
+        for index, (mode, change) in enumerate(changes):
+            if cls.objects.filter(course_id=course_id, mode=mode).update(count=F('count') + change):
+                continue
+            try:
+                cls._store_counts(course_id, cls._count_enrollments(course_id))
+            except IntegrityError:
+                # The counts were initialized by another process at the same time, from enrollments that didn't
+                # include the changes of this transaction yet: add the changes that haven't been counted.
+                log.warning("Concurrent initialization of the enrollment counts of %s", course_id)
+                for missing_mode, missing_change in changes[index:]:
+                    cls._add_to_count(course_id, missing_mode, missing_change)
+            return
+
+    @classmethod
+    def reconcile(cls, course_id):
+        """
+        Recount the active enrollments of each mode of the course, and fix the stored counts.
+
+        Returns the dict of counts.
+        """
+        counts = cls._count_enrollments(course_id)
+        try:
+            cls._store_counts(course_id, counts)
+        except IntegrityError:
+            # The counts were initialized by another process at the same time.
+            log.warning("Concurrent initialization of the enrollment counts of %s", course_id)
+        return counts
+
+    @classmethod
+    def _count_enrollments(cls, course_id):
+        """
+        Returns a dict of the number of active enrollments in each mode of the course.
+        """
+        return dict(
+            CourseEnrollment.objects.filter(course_id=course_id, is_active=True)
+            .values('mode').order_by().annotate(Count('id')).values_list('mode', 'id__count')
+        )
+
+    @classmethod
+    def _store_counts(cls, course_id, counts):
+        """
+        Replace the stored counts of the course with the given ones.
+
+        Raises IntegrityError (with the changes rolled back) if another process
+        created some of the counts at the same time.
+        """
+        with transaction.atomic():
+            cls.objects.filter(course_id=course_id).exclude(mode__in=counts).update(count=0)
+            for mode, count in counts.items():
+                cls.objects.update_or_create(course_id=course_id, mode=mode, defaults={'count': count})
+
+    @classmethod
+    def _add_to_count(cls, course_id, mode, change):
+        """
+        Add the change to the count of the mode of the course, creating the count if it's missing.
+        """
+        if cls.objects.filter(course_id=course_id, mode=mode).update(count=F('count') + change):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(course_id=course_id, mode=mode, count=change)
+        except IntegrityError:
+            cls.objects.filter(course_id=course_id, mode=mode).update(count=F('count') + change)
+
+
+@receiver(models.signals.post_save, sender=CourseEnrollment)
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+def update_course_enrollment_counts(sender, instance, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """
+    Keep the CourseEnrollmentCount of the enrollment's course up to date.
+    """
+    if raw or not settings.ENABLE_COURSE_ENROLLMENT_COUNTS:
+        return
+
+    if kwargs.get('created'):
+        old_mode, old_is_active = None, False
+    else:
+        old_mode, old_is_active = getattr(instance, '_counted_state', (None, None))
+    if kwargs['signal'] is models.signals.post_delete:
+        new_mode, new_is_active = None, False
+    else:
+        new_mode, new_is_active = instance.mode, instance.is_active
+    instance._counted_state = (new_mode, new_is_active)  # pylint: disable=protected-access
+
+    if old_is_active is None or (old_mode is None and old_is_active):
+        # The previous state of the enrollment is unknown (e.g. it was loaded with
+        # deferred fields), so the counts can't be updated. They'll be fixed by
+        # reconciliation.
+        return
+
+    changes = defaultdict(int)
+    if old_is_active:
+        changes[old_mode] -= 1
+    if new_is_active:
+        changes[new_mode] += 1
+    CourseEnrollmentCount.update_counts(instance.course_id, changes)
+
+
 class ManualEnrollmentAudit(models.Model):  # noqa: DJ008
     """
     Table for tracking which enrollments were performed through manual enrollment.
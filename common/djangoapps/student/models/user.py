@@ -187,6 +187,27 @@ def anonymous_id_for_user(user, course_id):
     return anonymous_user_id
 
 
+def prefetch_anonymous_ids(users, course_id):
+    """
+    Reads the existing anonymous ids of the given users for the given course
+    in a single query, and caches them in the user objects, so that calling
+    anonymous_id_for_user for any of them doesn't query the database again.
+
+    Users without an anonymous id for the course are left as they are;
+    anonymous_id_for_user creates theirs as usual.
+    """
+    users_by_id = {user.id: user for user in users if not user.is_anonymous}
+    # Ordered so that the most recently created id of each user (see anonymous_id_for_user) is cached last.
+    anonymous_user_ids = AnonymousUserId.objects.filter(
+        user_id__in=list(users_by_id), course_id=course_id,
+    ).order_by('id').values_list('user_id', 'anonymous_user_id')
+    for user_id, anonymous_user_id in anonymous_user_ids:
+        user = users_by_id[user_id]
+        if not hasattr(user, '_anonymous_id'):
+            user._anonymous_id = {}  # pylint: disable=protected-access
+        user._anonymous_id[course_id] = anonymous_user_id  # pylint: disable=protected-access
+
+
 def user_by_anonymous_id(uid):
     """
     Return user by anonymous_user_id using AnonymousUserId lookup table.
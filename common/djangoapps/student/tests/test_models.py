@@ -10,7 +10,7 @@ from crum import set_current_request
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser, User  # pylint: disable=imported-auth-user
 from django.core.cache import cache
-from django.db import connection
+from django.db import IntegrityError, connection
 from django.db.models.functions import Lower
 from django.test import TestCase, override_settings
 from django.test.utils import CaptureQueriesContext
@@ -27,6 +27,7 @@ from common.djangoapps.student.models import (
     AccountRecovery,
     CourseEnrollment,
     CourseEnrollmentAllowed,
+    CourseEnrollmentCount,
     ManualEnrollmentAudit,
     PendingEmailChange,
     PendingNameChange,
@@ -36,6 +37,7 @@ from common.djangoapps.student.models import (
     UserProfile,
 )
 from common.djangoapps.student.models_api import confirm_name_change, do_name_change_request, get_name
+from common.djangoapps.student.roles import CourseStaffRole
 from common.djangoapps.student.tests.factories import AccountRecoveryFactory, CourseEnrollmentFactory, UserFactory
 from lms.djangoapps.courseware.models import DynamicUpgradeDeadlineConfiguration
 from lms.djangoapps.courseware.toggles import (
@@ -148,6 +150,81 @@ class CourseEnrollmentTests(SharedModuleStoreTestCase):  # pylint: disable=missi
         )
         self.assertListEqual([self.user, self.user_2], all_enrolled_users)  # noqa: PT009
 
+    @override_settings(ENABLE_COURSE_ENROLLMENT_COUNTS=True)
+    def test_enrollment_counts(self):
+        """
+        The enrollment counts of a course are maintained as its enrollments change.
+        """
+        def assert_counts(expected_counts):
+            assert CourseEnrollmentCount.get_counts(self.course.id) == expected_counts
+            enrollment_counts = CourseEnrollment.objects.enrollment_counts(self.course.id)
+            assert enrollment_counts == dict(
+                {mode: count for mode, count in expected_counts.items() if count},
+                total=sum(expected_counts.values()),
+            )
+
+        assert CourseEnrollmentCount.get_counts(self.course.id) is None
+        enrollment = CourseEnrollment.enroll(self.user, self.course.id, mode=CourseMode.AUDIT)
+        assert_counts({CourseMode.AUDIT: 1})
+
+        enrollment_2 = CourseEnrollmentFactory.create(user=self.user_2, course_id=self.course.id, mode=CourseMode.AUDIT)
+        assert_counts({CourseMode.AUDIT: 2})
+
+        enrollment.update_enrollment(mode=CourseMode.VERIFIED)
+        assert_counts({CourseMode.AUDIT: 1, CourseMode.VERIFIED: 1})
+
+        CourseEnrollment.unenroll(self.user, self.course.id)
+        assert_counts({CourseMode.AUDIT: 1, CourseMode.VERIFIED: 0})
+
+        # Enrollments loaded from the database are counted too.
+        CourseEnrollment.objects.get(id=enrollment.id).update_enrollment(is_active=True)
+        assert_counts({CourseMode.AUDIT: 1, CourseMode.VERIFIED: 1})
+
+        CourseEnrollment.objects.filter(id=enrollment_2.id).delete()
+        assert_counts({CourseMode.AUDIT: 0, CourseMode.VERIFIED: 1})
+
+    @override_settings(ENABLE_COURSE_ENROLLMENT_COUNTS=True)
+    def test_enrollment_counts_initialization(self):
+        """
+        The enrollment counts of a course are initialized from its enrollments when they're first changed.
+        """
+        with override_settings(ENABLE_COURSE_ENROLLMENT_COUNTS=False):
+            CourseEnrollmentFactory.create(user=self.user, course_id=self.course.id, mode=CourseMode.AUDIT)
+        assert CourseEnrollmentCount.get_counts(self.course.id) is None
+
+        CourseEnrollmentFactory.create(user=self.user_2, course_id=self.course.id, mode=CourseMode.VERIFIED)
+
+        assert CourseEnrollmentCount.get_counts(self.course.id) == {CourseMode.AUDIT: 1, CourseMode.VERIFIED: 1}
+
+    @override_settings(ENABLE_COURSE_ENROLLMENT_COUNTS=True)
+    def test_enrollment_counts_concurrent_initialization(self):
+        """
+        An enrollment is still counted when another process initializes the counts of its course at the same time.
+        """
+        with override_settings(ENABLE_COURSE_ENROLLMENT_COUNTS=False):
+            CourseEnrollmentFactory.create(user=self.user, course_id=self.course.id, mode=CourseMode.AUDIT)
+
+        def store_counts_concurrently(course_id, counts):  # pylint: disable=unused-argument
+            # The other process counted the enrollments before the new one was committed.
+            CourseEnrollmentCount.objects.create(course_id=course_id, mode=CourseMode.AUDIT, count=1)
+            raise IntegrityError
+
+        with mock.patch.object(CourseEnrollmentCount, '_store_counts', side_effect=store_counts_concurrently):
+            CourseEnrollmentFactory.create(user=self.user_2, course_id=self.course.id, mode=CourseMode.VERIFIED)
+
+        assert CourseEnrollmentCount.get_counts(self.course.id) == {CourseMode.AUDIT: 1, CourseMode.VERIFIED: 1}
+
+    @ddt.data(True, False)
+    def test_num_enrolled_in_exclude_admins(self, enable_counts):
+        staff_user = UserFactory()
+        CourseStaffRole(self.course.id).add_users(staff_user)
+        with override_settings(ENABLE_COURSE_ENROLLMENT_COUNTS=enable_counts):
+            for user in (self.user, self.user_2, staff_user):
+                CourseEnrollmentFactory.create(user=user, course_id=self.course.id)
+            CourseEnrollment.unenroll(self.user_2, self.course.id)
+
+            assert CourseEnrollment.objects.num_enrolled_in_exclude_admins(self.course.id) == 1
+
     @skip_unless_lms
     def test_upgrade_deadline(self):
         """ The property should use either the CourseMode or related Schedule to determine the deadline. """
@@ -6,7 +6,7 @@ from django.utils.translation import gettext as _
 from edx_toggles.toggles import SettingToggle
 from milestones import api as milestones_api
 from milestones.exceptions import InvalidMilestoneRelationshipTypeException, InvalidUserException
-from milestones.models import MilestoneRelationshipType
+from milestones.models import MilestoneRelationshipType, UserMilestone
 from milestones.services import MilestonesService
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
@@ -379,6 +379,39 @@ def get_course_content_milestones(course_id, content_id=None, relationship='requ
     return [m for m in request_cache_dict[user_id][relationship] if m['content_id'] == str(content_id)]
 
 
+def get_course_content_milestones_for_users(course_id, user_ids, relationship='requires'):
+    """
+    Client API operation adapter/wrapper
+    Returns what get_course_content_milestones returns for all the content blocks
+    in a course, for each of the given users, as a dict keyed by user id.
+
+    The course's content milestones are fetched once, and the milestones the
+    users have fulfilled with a single query, rather than a query per user.
+    """
+    if not ENABLE_MILESTONES_APP.is_enabled():
+        return {user_id: [] for user_id in user_ids}
+
+    course_content_milestones = milestones_api.get_course_content_milestones(course_id, None, relationship)
+    if relationship != 'requires' or not course_content_milestones:
+        return {user_id: course_content_milestones for user_id in user_ids}
+
+    # Only the milestones that the user hasn't fulfilled yet are required.
+    fulfilled_milestones = set(
+        UserMilestone.objects.filter(
+            user_id__in=[user_id for user_id in user_ids if user_id],
+            milestone_id__in={milestone['id'] for milestone in course_content_milestones},
+            active=True,
+        ).values_list('user_id', 'milestone_id')
+    )
+    return {
+        user_id: [
+            milestone for milestone in course_content_milestones
+            if (user_id, milestone['id']) not in fulfilled_milestones
+        ]
+        for user_id in user_ids
+    }
+
+
 def remove_course_content_user_milestones(course_key, content_key, user, relationship):
     """
     Removes the specified User-Milestone link from the system for the specified course content module.
@@ -154,3 +154,28 @@ class MilestonesHelpersTestCase(ModuleStoreTestCase):
         milestones_helpers.add_course_milestone(str(course.id), 'requires', milestone)
         with pytest.raises(InvalidUserException):
             milestones_helpers.get_required_content(course.id, AnonymousUser())
+
+    def test_get_course_content_milestones_for_users_returns_none_when_app_disabled(self):
+        response = milestones_helpers.get_course_content_milestones_for_users(str(self.course.id), [1, 2])
+        assert response == {1: [], 2: []}
+
+    @override_settings(MILESTONES_APP=True)
+    def test_get_course_content_milestones_for_users(self):
+        """
+        Each user gets the same milestones as from get_course_content_milestones.
+        """
+        course_id = str(self.course.id)
+        milestone = milestones_api.add_milestone({'name': 'other', 'namespace': 'other'})
+        milestones_helpers.add_course_content_milestone(course_id, 'i4x://content/1', 'requires', self.milestone)
+        milestones_helpers.add_course_content_milestone(course_id, 'i4x://content/2', 'requires', milestone)
+        milestones_helpers.add_user_milestone({'id': 1}, self.milestone)
+        milestones_helpers.add_user_milestone({'id': 2}, self.milestone)
+        milestones_helpers.add_user_milestone({'id': 2}, milestone)
+
+        response = milestones_helpers.get_course_content_milestones_for_users(course_id, [1, 2, 3])
+
+        assert response == {
+            user_id: milestones_helpers.get_course_content_milestones(course_id, user_id=user_id)
+            for user_id in [1, 2, 3]
+        }
+        assert [len(response[user_id]) for user_id in [1, 2, 3]] == [1, 0, 2]
@@ -0,0 +1,134 @@
+"""
+Performance test comparing the rendering of a CCX course outline with and without the field override index.
+
+Run with::
+
+    RUN_PERF_TESTS=1 pytest -s lms/djangoapps/ccx/perf_tests/test_outline_overrides.py
+"""
+
+
+import datetime
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+import ddt
+import pytz
+from ccx_keys.locator import CCXLocator
+from django.test.utils import override_settings
+from edx_django_utils.cache import RequestCache
+
+from common.djangoapps.student.tests.factories import AdminFactory, UserFactory
+from lms.djangoapps.ccx.models import CustomCourseForEdX
+from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx.tests.utils import iter_blocks
+from lms.djangoapps.courseware.field_overrides import OverrideFieldData
+from lms.djangoapps.courseware.tests.test_field_overrides import inject_field_overrides
+from lms.djangoapps.courseware.testutils import FieldOverrideTestMixin
+from openedx.core.lib.courses import get_course_by_id
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import BlockFactory, CourseFactory
+
+# (chapters, sequentials per chapter, verticals per sequential, components per vertical)
+COURSE_SHAPES = (
+    (4, 4, 3, 3),
+    (10, 6, 4, 4),
+)
+
+# The fields read from each block when rendering the outline.
+OUTLINE_FIELDS = ('display_name', 'start', 'due', 'format', 'graded', 'visible_to_staff_only')
+
+# How many renders to time for each course.
+ITERATIONS = 5
+
+
+@ddt.ddt
+@unittest.skipUnless(os.environ.get('RUN_PERF_TESTS'), "Performance tests are only run on request.")
+@override_settings(
+    XBLOCK_FIELD_DATA_WRAPPERS=[],
+    MODULESTORE_FIELD_OVERRIDE_PROVIDERS=[],
+    FIELD_OVERRIDE_PROVIDERS=(
+        'lms.djangoapps.ccx.overrides.CustomCoursesForEdxOverrideProvider',
+        'lms.djangoapps.courseware.student_field_overrides.IndividualStudentOverrideProvider',
+    ),
+)
+class CCXOutlineOverridesTiming(FieldOverrideTestMixin, ModuleStoreTestCase):
+    """
+    Times reading the outline fields of every block of a CCX course, as a learner,
+    with the override index and with the providers asked for every lookup.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(setattr, OverrideFieldData, 'provider_classes', None)
+
+    def _make_ccx_course(self, num_chapters, num_sequentials, num_verticals, num_components):
+        """
+        Returns the blocks of a CCX of a course of the given shape, with the CCX start dates of its
+        chapters and due dates of its sequentials overridden, bound to field data for a learner.
+        """
+        course = CourseFactory.create(enable_ccx=True)
+        with self.store.bulk_operations(course.id):
+            for __ in range(num_chapters):
+                chapter = BlockFactory.create(parent=course, category='chapter')
+                for __ in range(num_sequentials):
+                    sequential = BlockFactory.create(parent=chapter, category='sequential', graded=True)
+                    for __ in range(num_verticals):
+                        vertical = BlockFactory.create(parent=sequential, category='vertical')
+                        for __ in range(num_components):
+                            BlockFactory.create(parent=vertical, category='problem')
+
+        ccx = CustomCourseForEdX.objects.create(course_id=course.id, display_name='Test CCX', coach=AdminFactory())
+        ccx_course = get_course_by_id(CCXLocator.from_course_locator(course.id, ccx.id), depth=None)
+        ccx_start = datetime.datetime(2030, 1, 1, tzinfo=pytz.UTC)
+        for chapter in ccx_course.get_children():
+            override_field_for_ccx(ccx, chapter, 'start', ccx_start)
+            for sequential in chapter.get_children():
+                override_field_for_ccx(ccx, sequential, 'due', ccx_start + datetime.timedelta(days=7))
+
+        OverrideFieldData.provider_classes = None
+        blocks = list(iter_blocks(ccx_course))
+        inject_field_overrides(blocks, ccx_course, UserFactory())
+        return blocks
+
+    @staticmethod
+    def _render_outline(blocks):
+        """
+        Reads the outline fields of all the blocks, as a new request would.
+        """
+        RequestCache.clear_all_namespaces()
+        for block in blocks:
+            block._field_data_cache.clear()  # pylint: disable=protected-access
+        for block in blocks:
+            for name in OUTLINE_FIELDS:
+                getattr(block, name)
+
+    def _time_renders(self, blocks):
+        """
+        Returns the best wall time, in milliseconds, of rendering the outline of the given blocks.
+        """
+        timings = []
+        for __ in range(ITERATIONS):
+            start = time.perf_counter()
+            self._render_outline(blocks)
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000
+
+    @ddt.data(*COURSE_SHAPES)
+    @ddt.unpack
+    def test_outline_timings(self, num_chapters, num_sequentials, num_verticals, num_components):
+        blocks = self._make_ccx_course(num_chapters, num_sequentials, num_verticals, num_components)
+
+        with patch.object(OverrideFieldData, 'index_overrides', False):
+            without_index_ms = self._time_renders(blocks)
+        with_index_ms = self._time_renders(blocks)
+
+        print(
+            f"\n{len(blocks)} blocks:"
+            f"\n  without index: {without_index_ms:8.1f} ms"
+            f"\n  with index:    {with_index_ms:8.1f} ms"
+        )
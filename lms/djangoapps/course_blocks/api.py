@@ -12,6 +12,7 @@ from openedx.core.djangoapps.content.block_structure.api import get_block_struct
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from openedx.features.content_type_gating.block_transformers import ContentTypeGateTransformer
 
+from . import transformed_cache
 from .transformers import library_content, load_override_data, start_date, user_partitions, visibility
 from .usage_info import CourseUsageInfo
 
@@ -93,8 +94,12 @@ def get_course_blocks(
             exactly equivalent to the blocks that the given user has
             access.
     """
+    # Only the default access transformers have all the user state they depend on covered by
+    # the transformed cache's invalidation; completion changes far too often to be cached.
+    access_transformers = None
     if not transformers:
-        transformers = BlockStructureTransformers(get_course_block_access_transformers(user))
+        access_transformers = get_course_block_access_transformers(user)
+        transformers = BlockStructureTransformers(access_transformers)
     if include_completion:
         transformers += [BlockCompletionTransformer()]
     transformers.usage_info = CourseUsageInfo(
@@ -104,9 +109,23 @@ def get_course_blocks(
         include_has_scheduled_content
     )
 
-    return get_block_structure_manager(starting_block_usage_key.course_key).get_transformed(
-        transformers,
-        starting_block_usage_key,
-        collected_block_structure,
-        user,
-    )
+    def transform():
+        return get_block_structure_manager(starting_block_usage_key.course_key).get_transformed(
+            transformers,
+            starting_block_usage_key,
+            collected_block_structure,
+            user,
+        )
+
+    if (
+        access_transformers is not None and not include_completion and
+        transformed_cache.is_cacheable_for(user, starting_block_usage_key.course_key)
+    ):
+        return transformed_cache.get_or_transform(
+            user,
+            starting_block_usage_key,
+            [transformer.name() for transformer in access_transformers],
+            (allow_start_dates_in_future, include_has_scheduled_content),
+            transform,
+        )
+    return transform()
@@ -0,0 +1,22 @@
+"""
+Course Blocks Application Configuration
+
+Signal handlers are connected here.
+"""
+
+
+from django.apps import AppConfig
+
+
+class CourseBlocksConfig(AppConfig):
+    """
+    Application Configuration for Course Blocks.
+    """
+    name = 'lms.djangoapps.course_blocks'
+    verbose_name = 'Course Blocks'
+
+    def ready(self):
+        """
+        Connect signal handlers.
+        """
+        from . import signals  # pylint: disable=unused-import  # noqa: F401
@@ -0,0 +1,67 @@
+"""
+Signal handlers retiring a user's cached transformed block structures
+(see transformed_cache.py) when the user state they depend on changes.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.djangoapps.student.signals import ENROLL_STATUS_CHANGE, ENROLLMENT_TRACK_UPDATED
+from lms.djangoapps.courseware.models import StudentFieldOverride
+from lms.djangoapps.teams.models import CourseTeamMembership
+from openedx.core.djangoapps.course_groups.signals.signals import COHORT_MEMBERSHIP_UPDATED
+from openedx.core.djangoapps.schedules.models import Schedule
+
+from . import transformed_cache
+
+
+@receiver(ENROLL_STATUS_CHANGE)
+def _handle_enroll_status_change(sender, user=None, course_id=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Retires the user's transformed block structures when they enroll in or unenroll from the course.
+    """
+    if user is not None and course_id is not None and transformed_cache.get_cache_timeout():
+        transformed_cache.invalidate_user(user.id, course_id)
+
+
+@receiver(ENROLLMENT_TRACK_UPDATED)
+@receiver(COHORT_MEMBERSHIP_UPDATED)
+def _handle_user_partition_update(sender, user, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Retires the user's transformed block structures when the user partition groups they're in change.
+    """
+    if transformed_cache.get_cache_timeout():
+        transformed_cache.invalidate_user(user.id, course_key)
+
+
+@receiver(post_save, sender=StudentFieldOverride)
+@receiver(post_delete, sender=StudentFieldOverride)
+def _handle_student_field_override_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Retires the user's transformed block structures when their field overrides (e.g. due date extensions) change.
+    """
+    if transformed_cache.get_cache_timeout():
+        transformed_cache.invalidate_user(instance.student_id, instance.course_id)
+
+
+@receiver(post_save, sender=CourseTeamMembership)
+@receiver(post_delete, sender=CourseTeamMembership)
+def _handle_team_membership_change(sender, instance, created=True, **kwargs):  # pylint: disable=unused-argument
+    """
+    Retires the user's transformed block structures when they join or leave a team, which
+    team-based user partitions depend on.
+
+    Memberships are also saved whenever their last_activity_at is updated, which doesn't
+    change the user's access, so only newly created memberships are handled on save.
+    """
+    if created and transformed_cache.get_cache_timeout():
+        transformed_cache.invalidate_user(instance.user_id, instance.team.course_id)
+
+
+@receiver(post_save, sender=Schedule)
+def _handle_schedule_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Retires the user's transformed block structures when their schedule, which relative dates are based on, changes.
+    """
+    if transformed_cache.get_cache_timeout():
+        enrollment = instance.enrollment
+        transformed_cache.invalidate_user(enrollment.user_id, enrollment.course_id)
@@ -6,13 +6,18 @@ Tests for course_blocks API
 from unittest.mock import Mock, patch
 
 import ddt
+from django.conf import settings
 from django.http.request import HttpRequest
+from django.test.utils import override_settings
 
 from common.djangoapps.student.tests.factories import UserFactory
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.course_blocks.transformers.tests.helpers import CourseStructureTestCase
 from lms.djangoapps.course_blocks.transformers.tests.test_user_partitions import UserPartitionTestMixin
 from lms.djangoapps.courseware.block_render import make_track_function, prepare_runtime_for_user
+from lms.djangoapps.teams.tests.factories import CourseTeamFactory, CourseTeamMembershipFactory
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.djangoapps.content.block_structure.manager import BlockStructureManager
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
 from xmodule.modulestore.django import modulestore
@@ -147,3 +152,59 @@ class TestGetCourseBlocks(UserPartitionTestMixin, CourseStructureTestCase):
             set(block_structure.get_block_keys()),
             self.get_block_key_set(self.blocks, *expected_blocks)
         )
+
+
+@override_settings(BLOCK_STRUCTURES_SETTINGS=dict(settings.BLOCK_STRUCTURES_SETTINGS, TRANSFORMED_CACHE_TIMEOUT=300))
+class TestTransformedCache(TestGetCourseBlocks):
+    """
+    Tests `get_course_blocks` with the transformed block structure cache enabled.
+    """
+
+    def get_course_block_keys(self):
+        """
+        Returns the keys of the course blocks transformed for self.user with the default
+        transformers, and whether the transformers were applied.
+        """
+        with patch.object(
+            BlockStructureManager, 'get_transformed', autospec=True, side_effect=BlockStructureManager.get_transformed,
+        ) as mock_get_transformed:
+            block_structure = get_course_blocks(self.user, self.course.location)
+        return set(block_structure.get_block_keys()), mock_get_transformed.called
+
+    def test_cached_until_cohort_changes(self):
+        self.setup_partitions_and_course()
+        get_block_structure_manager(self.course.id).update_collected_if_needed()
+        without_a = self.get_block_key_set(self.blocks, 'course', 'B', 'O')
+
+        assert self.get_course_block_keys() == (without_a, True)
+        assert self.get_course_block_keys() == (without_a, False)
+
+        add_user_to_cohort(self.partition_cohorts[self.user_partition.id - 1][0], self.user.username)
+        assert self.get_course_block_keys() == (without_a | self.get_block_key_set(self.blocks, 'A'), True)
+
+    def test_cached_until_team_membership_changes(self):
+        self.setup_partitions_and_course()
+        get_block_structure_manager(self.course.id).update_collected_if_needed()
+        without_a = self.get_block_key_set(self.blocks, 'course', 'B', 'O')
+        team = CourseTeamFactory.create(course_id=self.course.id)
+
+        assert self.get_course_block_keys() == (without_a, True)
+
+        membership = CourseTeamMembershipFactory.create(team=team, user=self.user)
+        assert self.get_course_block_keys() == (without_a, True)
+
+        # Recording the member's activity doesn't retire their cached structures.
+        membership.save()
+        assert self.get_course_block_keys() == (without_a, False)
+
+        membership.delete()
+        assert self.get_course_block_keys() == (without_a, True)
+
+    def test_not_cached_for_staff(self):
+        self.setup_partitions_and_course()
+        get_block_structure_manager(self.course.id).update_collected_if_needed()
+        self.user.is_staff = True
+        self.user.save()
+
+        assert self.get_course_block_keys()[1]
+        assert self.get_course_block_keys()[1]
@@ -0,0 +1,161 @@
+"""
+An opt-in cache of course block structures transformed for a user.
+
+Applying the course block access transformers to the collected block structure
+yields the same result for as long as neither the course nor the user's state
+in it change, yet it is redone for every outline or blocks API call. This
+module caches the result, keyed by:
+
+    * the version of the course's collected block structure (its
+      BlockStructureModel VERSION_FIELDS), so publishing the course retires
+      the cached results once the collected data is updated,
+    * the transformers applied and the version of the registered transformers,
+    * the user and the user's generation in the course, a random token kept in
+      the cache which is deleted when the user state the access transformers
+      depend on changes (see signals.py).
+
+Users with staff access to the course, users being masqueraded as and
+anonymous users aren't cached. Start dates and other time-based rules aren't
+part of the key, so a block opening or closing can take up to the cache
+timeout to show up; set BLOCK_STRUCTURES_SETTINGS['TRANSFORMED_CACHE_TIMEOUT']
+accordingly.
+"""
+import hashlib
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from edx_django_utils.monitoring import set_custom_attribute
+
+from lms.djangoapps.courseware.access import has_access
+from openedx.core.djangoapps.content.block_structure.exceptions import BlockStructureNotFound
+from openedx.core.djangoapps.content.block_structure.models import BlockStructureModel
+from openedx.core.djangoapps.content.block_structure.serialization import deserialize, serialize
+from openedx.core.djangoapps.content.block_structure.transformer_registry import TransformerRegistry
+from xmodule.modulestore.django import modulestore
+
+# Transformed structures larger than this (serialized) aren't cached.
+MAX_ENTRY_SIZE = 1024 * 1024
+
+CACHE_KEY_PREFIX = 'course_blocks.transformed'
+
+
+def get_cache_timeout():
+    """
+    Returns the timeout, in seconds, of cached transformed block structures.
+    0 (the default) disables the cache.
+    """
+    return settings.BLOCK_STRUCTURES_SETTINGS.get('TRANSFORMED_CACHE_TIMEOUT', 0)
+
+
+def _user_generation_key(user_id, course_key):
+    return f'{CACHE_KEY_PREFIX}.user.{user_id}.{course_key}'
+
+
+def invalidate_user(user_id, course_key):
+    """
+    Retires the cached transformed block structures of the given user in the given course.
+    """
+    cache.delete(_user_generation_key(user_id, course_key))
+
+
+def _get_user_generation(user_id, course_key):
+    """
+    Returns the user's current generation in the course, starting a new one if needed.
+    """
+    key = _user_generation_key(user_id, course_key)
+    generation = cache.get(key)
+    if generation is None:
+        generation = uuid4().hex
+        if not cache.add(key, generation, None):
+            # Another process started one in the meantime.
+            generation = cache.get(key, generation)
+    return generation
+
+
+def _get_course_version(course_key):
+    """
+    Returns the version of the course's collected block structure.
+
+    Raises:
+        BlockStructureNotFound if the course's block structure hasn't been collected yet.
+    """
+    bs_model = BlockStructureModel.get(modulestore().make_course_usage_key(course_key))
+    return tuple(str(getattr(bs_model, field_name)) for field_name in BlockStructureModel.VERSION_FIELDS)
+
+
+def is_cacheable_for(user, course_key):
+    """
+    Returns whether block structures transformed for the given user can be cached.
+
+    Anonymous users, course staff and staff masquerading as someone else aren't cached.
+    """
+    if not get_cache_timeout():
+        return False
+    if not getattr(user, 'id', None):
+        return False
+    if getattr(user, 'real_user', user) != user or getattr(user, 'masquerade_settings', {}).get(course_key):
+        return False
+    # Staff see everything, and gaining or losing staff access isn't tracked.
+    return not has_access(user, 'staff', course_key)
+
+
+def get_or_transform(user, starting_block_usage_key, transformer_names, variant, transform):
+    """
+    Returns the block structure transformed for the given user, from the
+    cache if it's there, and otherwise by calling transform and caching
+    the result.
+
+    Arguments:
+        user (User) - The user the block structure is transformed for.
+
+        starting_block_usage_key (UsageKey) - The starting block of the
+            transformed block structure.
+
+        transformer_names ([str]) - The names of the transformers applied, in order.
+
+        variant (tuple) - Any other (hashable) arguments the transformation depends on.
+
+        transform (() -> BlockStructureBlockData) - Returns the transformed block structure.
+    """
+    course_key = starting_block_usage_key.course_key
+    try:
+        course_version = _get_course_version(course_key)
+    except BlockStructureNotFound:
+        # Not collected yet; transforming will collect it.
+        return transform()
+
+    key_parts = (
+        str(starting_block_usage_key),
+        course_version,
+        tuple(transformer_names),
+        TransformerRegistry.get_write_version_hash(),
+        variant,
+        user.id,
+        _get_user_generation(user.id, course_key),
+    )
+    cache_key = '{}.{}'.format(CACHE_KEY_PREFIX, hashlib.sha1(repr(key_parts).encode('utf-8')).hexdigest())
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        serialized_data, transform_time_ms = cached
+        # .. custom_attribute_name: course_blocks_transformed_cache_hit
+        # .. custom_attribute_description: Whether the course blocks transformed for the user
+        #   were found in the cache. Not set when the cache isn't used.
+        set_custom_attribute('course_blocks_transformed_cache_hit', True)
+        # .. custom_attribute_name: course_blocks_transformed_cache_saved_ms
+        # .. custom_attribute_description: How long transforming the course blocks took when
+        #   the cached result was computed, i.e. roughly the time the cache hit saved.
+        set_custom_attribute('course_blocks_transformed_cache_saved_ms', transform_time_ms)
+        return deserialize(serialized_data, starting_block_usage_key)
+
+    set_custom_attribute('course_blocks_transformed_cache_hit', False)
+    start = time.perf_counter()
+    block_structure = transform()
+    transform_time_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    serialized_data = serialize(block_structure)
+    if len(serialized_data) <= MAX_ENTRY_SIZE:
+        cache.set(cache_key, (serialized_data, transform_time_ms), get_cache_timeout())
+    return block_structure
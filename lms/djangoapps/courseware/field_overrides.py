@@ -21,7 +21,7 @@ from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
 
 from django.conf import settings
-from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, RequestCache
 from xblock.field_data import FieldData
 
 from xmodule.modulestore.inheritance import InheritanceMixin
@@ -30,6 +30,11 @@ NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = 'lms.djangoapps.courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = 'lms.djangoapps.courseware.modulestore_field_overrides.\
     enabled_providers.{course_id}'
+OVERRIDE_INDEX_NAMESPACE = 'lms.djangoapps.courseware.field_overrides.override_index'
+# How many (user, course) override indexes are kept at once.  Requests rarely
+# need more than one, but tasks running outside of a request (e.g. grade reports)
+# go through the overrides of many users without the request cache being cleared.
+MAX_OVERRIDE_INDEXES = 4
 
 
 def resolve_dotted(name):
@@ -51,15 +56,35 @@ def resolve_dotted(name):
     return target
 
 
-def _lineage(block):
+def clear_override_index():
     """
-    Returns an iterator over all ancestors of the given block, starting with
-    its immediate parent and ending at the root of the block tree.
+    Forgets the field overrides looked up so far in the current request.
+    Should be called when overrides are changed.
     """
-    parent = block.get_parent()
-    while parent:
-        yield parent
-        parent = parent.get_parent()
+    RequestCache(OVERRIDE_INDEX_NAMESPACE).clear()
+
+
+def _inheritable_fields():
+    """
+    Returns the names of the fields blocks inherit from their ancestors.
+    """
+    return InheritanceMixin.fields.keys()  # pylint: disable=no-member
+
+
+class _OverrideIndex:
+    """
+    The field overrides found for a user in a course during a request.
+
+    `overrides` maps (block location, field name) to the override of the
+    field in the block, or NOTSET.  `inherited` maps (block location, field
+    name) to the override of the field the block's children inherit, i.e.
+    the override in the block or else the one it inherits itself, or NOTSET.
+    """
+    __slots__ = ('overrides', 'inherited')
+
+    def __init__(self):
+        self.overrides = {}
+        self.inherited = {}
 
 
 class _OverridesDisabled(threading.local):
@@ -147,9 +172,16 @@ class OverrideFieldData(FieldData):
     is important for this setting.  Override providers will tried in the order
     configured in the setting.  The first provider to find an override 'wins'
     for a particular field lookup.
+
+    The overrides found for a user in a course are kept for the rest of the
+    request, along with the overrides inherited from each block's ancestors,
+    so each block and field only asks the providers once.
     """
     provider_classes = None
 
+    # Whether found overrides are kept for the rest of the request (see clear_override_index).
+    index_overrides = True
+
     @classmethod
     def wrap(cls, user, course, wrapped):
         """
@@ -200,18 +232,79 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):  # pylint: disable=super-init-not-called
         self.fallback = fallback
         self.providers = tuple(provider(user, fallback) for provider in providers)
+        self._index_key = (type(self), tuple(providers), getattr(user, 'id', user))
+
+    def _get_index(self, block):
+        """
+        Returns the overrides found so far in the request for the user in the
+        course of the given block, or None if the block isn't in a course.
+        """
+        location = getattr(block, 'location', None)
+        if location is None or not self.index_overrides:
+            return None
+        index_key = self._index_key + (location.course_key,)
+        indexes = RequestCache(OVERRIDE_INDEX_NAMESPACE).data
+        index = indexes.get(index_key)
+        if index is None:
+            if len(indexes) >= MAX_OVERRIDE_INDEXES:
+                # Forget the index created first.
+                del indexes[next(iter(indexes))]
+            index = indexes[index_key] = _OverrideIndex()
+        return index
+
+    def _get_provider_override(self, block, name):
+        """
+        Asks the providers, in order, for an override of the field identified by `name` in `block`.
+        """
+        for provider in self.providers:
+            value = provider.get(block, name, NOTSET)
+            if value is not NOTSET:
+                return value
+        return NOTSET
 
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
         """
-        if not overrides_disabled():
-            for provider in self.providers:
-                value = provider.get(block, name, NOTSET)
-                if value is not NOTSET:
-                    return value
-        return NOTSET
+        if overrides_disabled():
+            return NOTSET
+        index = self._get_index(block)
+        if index is None:
+            return self._get_provider_override(block, name)
+        key = (block.location, name)
+        try:
+            return index.overrides[key]
+        except KeyError:
+            value = index.overrides[key] = self._get_provider_override(block, name)
+            return value
+
+    def _get_inherited_override(self, block, name):
+        """
+        Returns the override of the inheritable field identified by `name` in the
+        closest ancestor of `block` that has one, or `NOTSET` if none of them do.
+
+        What each ancestor passes down is kept in the override index, so the
+        lineage of a block is only walked up to the first ancestor already seen
+        in the request.
+        """
+        parent = block.get_parent()
+        if parent is None:
+            return NOTSET
+        index = self._get_index(parent)
+        if index is None:
+            value = self.get_override(parent, name)
+            return value if value is not NOTSET else self._get_inherited_override(parent, name)
+
+        key = (parent.location, name)
+        try:
+            return index.inherited[key]
+        except KeyError:
+            value = self.get_override(parent, name)
+            if value is NOTSET:
+                value = self._get_inherited_override(parent, name)
+            index.inherited[key] = value
+            return value
 
     def get(self, block, name):
         value = self.get_override(block, name)
@@ -230,15 +323,12 @@ class OverrideFieldData(FieldData):
             return self.fallback.has(block, name)
 
         has = self.get_override(block, name)
-        if has is NOTSET:
+        if has is NOTSET and not overrides_disabled() and name in _inheritable_fields():
             # If this is an inheritable field and an override is set above,
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
-            inheritable = list(InheritanceMixin.fields.keys())  # pylint: disable=no-member
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    if self.get_override(ancestor, name) is not NOTSET:
-                        return False
+            if self._get_inherited_override(block, name) is not NOTSET:
+                return False
 
         return has is not NOTSET or self.fallback.has(block, name)
 
@@ -248,13 +338,10 @@ class OverrideFieldData(FieldData):
     def default(self, block, name):
         # The `default` method is overloaded by the field storage system to
         # also handle inheritance.
-        if self.providers and not overrides_disabled():
-            inheritable = list(InheritanceMixin.fields.keys())  # pylint: disable=no-member
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    value = self.get_override(ancestor, name)
-                    if value is not NOTSET:
-                        return value
+        if self.providers and not overrides_disabled() and name in _inheritable_fields():
+            value = self._get_inherited_override(block, name)
+            if value is not NOTSET:
+                return value
         return self.fallback.default(block, name)
 
 
@@ -262,6 +349,10 @@ class OverrideModulestoreFieldData(OverrideFieldData):
     """Apply field data overrides at the modulestore level. No student context required."""
     provider_classes = None
 
+    # These providers derive overrides from the authored content of the
+    # blocks, which can change during the request.
+    index_overrides = False
+
     @classmethod
     def wrap(cls, block, field_data):  # pylint: disable=arguments-differ
         """
@@ -966,6 +966,32 @@ class ScoresClient:
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def create_for_users(cls, course_id, user_ids, scorable_locations):
+        """
+        Create ScoresClients with pre-fetched data for the given locations,
+        for each of the given users, with a single query.
+
+        Returns a dict of {user_id: ScoresClient}.
+        """
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=list(user_ids),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        locations_to_scores = defaultdict(dict)
+        for user_id, location, correct, total, created in scores_qset.values_list(
+            'student_id', 'module_state_key', 'grade', 'max_grade', 'created'
+        ):
+            locations_to_scores[user_id][location.map_into_course(course_id)] = cls.Score(correct, total, created)
+
+        clients = {}
+        for user_id in user_ids:
+            client = clients[user_id] = cls(course_id, user_id)
+            client._locations_to_scores = locations_to_scores[user_id]  # pylint: disable=protected-access
+            client._has_fetched = True  # pylint: disable=protected-access
+        return clients
+
 
 def set_score(user_id, usage_key, score, max_score):
     """
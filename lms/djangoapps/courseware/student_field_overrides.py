@@ -9,7 +9,7 @@ import json
 from lms.djangoapps.courseware.models import StudentFieldOverride
 from openedx.core.lib.xblock_utils import is_xblock_aside
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, clear_override_index
 
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
@@ -83,6 +83,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    clear_override_index()
 
 
 def clear_override_for_user(user, block, name):
@@ -98,5 +99,6 @@ def clear_override_for_user(user, block, name):
             student_id=user.id,
             location=block.location,
             field=name).delete()
+        clear_override_index()
     except StudentFieldOverride.DoesNotExist:
         pass
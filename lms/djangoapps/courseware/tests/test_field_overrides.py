@@ -2,18 +2,23 @@
 Tests for `field_overrides` module.
 """
 import unittest
+from datetime import datetime
 
 import pytest
 from django.test.utils import override_settings
+from edx_django_utils.cache import RequestCache
 from xblock.field_data import DictFieldData
 
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import BlockFactory, CourseFactory
 
 from ..field_overrides import (
+    MAX_OVERRIDE_INDEXES,
+    OVERRIDE_INDEX_NAMESPACE,
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
+    clear_override_index,
     disable_overrides,
     resolve_dotted,
 )
@@ -44,6 +49,27 @@ class TestOverrideProvider(FieldOverrideProvider):
         return True
 
 
+OVERRIDDEN_DUE = datetime(2030, 1, 1)
+
+
+class ChapterDueOverrideProvider(FieldOverrideProvider):
+    """
+    A `FieldOverrideProvider` overriding the due date of chapters, which
+    records the (block type, field name) of the overrides asked for.
+    """
+    calls = []
+
+    def get(self, block, name, default):
+        self.calls.append((block.location.block_type, name))
+        if name == 'due' and block.location.block_type == 'chapter':
+            return OVERRIDDEN_DUE
+        return default
+
+    @classmethod
+    def enabled_for(cls, course):  # pylint: disable=arguments-differ
+        return True
+
+
 class OverrideFieldBase(SharedModuleStoreTestCase):
     """
     Base class for field data override tests.  Using override_settings and
@@ -130,6 +156,66 @@ class OverrideFieldDataTests(OverrideFieldBase):
         assert isinstance(data, DictFieldData)
 
 
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'lms.djangoapps.courseware.tests.test_field_overrides.ChapterDueOverrideProvider',))
+class OverrideIndexTests(OverrideFieldBase):
+    """
+    Tests for the overrides `OverrideFieldData` keeps for the rest of the request.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        chapter = BlockFactory.create(parent=cls.course, category='chapter')
+        cls.sequential_location = BlockFactory.create(parent=chapter, category='sequential').location
+        cls.vertical_location = BlockFactory.create(
+            parent_location=cls.sequential_location, category='vertical',
+        ).location
+
+    def setUp(self):
+        super().setUp()
+        OverrideFieldData.provider_classes = None
+        ChapterDueOverrideProvider.calls = []
+
+    def tearDown(self):
+        super().tearDown()
+        OverrideFieldData.provider_classes = None
+
+    def make_one(self):
+        return OverrideFieldData.wrap(TESTUSER, self.course, DictFieldData({}))
+
+    def test_inherited_override(self):
+        vertical = self.store.get_item(self.vertical_location)
+        data = self.make_one()
+        assert data.default(vertical, 'due') == OVERRIDDEN_DUE
+        assert not data.has(vertical, 'due')
+
+    def test_providers_asked_once_per_request(self):
+        sequential = self.store.get_item(self.sequential_location)
+        vertical = self.store.get_item(self.vertical_location)
+        for _ in range(2):
+            # Blocks are bound to their own field data.
+            assert self.make_one().default(vertical, 'due') == OVERRIDDEN_DUE
+            assert self.make_one().default(sequential, 'due') == OVERRIDDEN_DUE
+        assert ChapterDueOverrideProvider.calls == [('sequential', 'due'), ('chapter', 'due')]
+
+        clear_override_index()
+        assert self.make_one().default(sequential, 'due') == OVERRIDDEN_DUE
+        assert ChapterDueOverrideProvider.calls[2:] == [('chapter', 'due')]
+
+    def test_indexes_bounded(self):
+        sequential = self.store.get_item(self.sequential_location)
+        for user_id in range(MAX_OVERRIDE_INDEXES + 1):
+            data = OverrideFieldData.wrap(user_id, self.course, DictFieldData({}))
+            assert data.default(sequential, 'due') == OVERRIDDEN_DUE
+        assert len(RequestCache(OVERRIDE_INDEX_NAMESPACE).data) == MAX_OVERRIDE_INDEXES
+
+        # The index of the first user was dropped, so the providers are asked again.
+        del ChapterDueOverrideProvider.calls[:]
+        assert OverrideFieldData.wrap(0, self.course, DictFieldData({})).default(sequential, 'due') == OVERRIDDEN_DUE
+        assert ChapterDueOverrideProvider.calls == [('chapter', 'due')]
+
+
 @override_settings(
     MODULESTORE_FIELD_OVERRIDE_PROVIDERS=['lms.djangoapps.courseware.tests.test_field_overrides.TestOverrideProvider']
 )
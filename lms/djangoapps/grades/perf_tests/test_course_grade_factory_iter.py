@@ -0,0 +1,92 @@
+"""
+Performance test comparing per-user and chunked grading with CourseGradeFactory.iter.
+
+Run with::
+
+    RUN_PERF_TESTS=1 pytest -s lms/djangoapps/grades/perf_tests/test_course_grade_factory_iter.py
+
+The number of learners defaults to 10,000, and can be set with PERF_TEST_LEARNERS.
+"""
+
+
+import os
+import time
+import unittest
+
+import ddt
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from lms.djangoapps.courseware.models import StudentModule
+
+from ..course_grade_factory import CourseGradeFactory
+from ..tests.base import GradeTestBase
+
+User = get_user_model()
+
+NUM_LEARNERS = int(os.environ.get('PERF_TEST_LEARNERS', 10000))
+
+# The chunk size that grade reports and compute_grades_for_course use.
+CHUNK_SIZE = 100
+
+
+@ddt.ddt
+@unittest.skipUnless(os.environ.get('RUN_PERF_TESTS'), "Performance tests are only run on request.")
+class CourseGradeFactoryIterTiming(GradeTestBase):
+    """
+    Times grading a synthetic course's learners one at a time and in chunks, and counts the queries each makes.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    @classmethod
+    def setUpTestData(cls):  # pylint: disable=missing-function-docstring
+        super().setUpTestData()
+        User.objects.bulk_create(
+            User(username=f'perf_learner_{index}', email=f'perf_learner_{index}@example.com')
+            for index in range(NUM_LEARNERS)
+        )
+        cls.learners = list(User.objects.filter(username__startswith='perf_learner_').order_by('id'))
+        # Every other learner has answered the first problem, so that there are scores to read.
+        StudentModule.objects.bulk_create(
+            StudentModule(
+                student=learner,
+                course_id=cls.course.id,
+                module_state_key=cls.problem.location,
+                module_type='problem',
+                state='{}',
+                grade=index % 2,
+                max_grade=1,
+            )
+            for index, learner in enumerate(cls.learners[::2])
+        )
+
+    def _grade(self, force_update, chunk_size):
+        """
+        Grades all the learners, and returns (wall time in seconds, number of queries).
+        """
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for result in CourseGradeFactory().iter(
+                users=self.learners, course=self.course, force_update=force_update, chunk_size=chunk_size,
+            ):
+                assert result.error is None
+            elapsed = time.perf_counter() - start
+        return elapsed, len(queries)
+
+    @ddt.data(True, False)
+    def test_iter_timings(self, force_update):
+        if not force_update:
+            # Persist the grades to be read.
+            self._grade(force_update=True, chunk_size=CHUNK_SIZE)
+
+        per_user_seconds, per_user_queries = self._grade(force_update, chunk_size=None)
+        chunked_seconds, chunked_queries = self._grade(force_update, chunk_size=CHUNK_SIZE)
+
+        print(
+            f"\n{len(self.learners)} learners, {'update' if force_update else 'read'} mode:"
+            f"\n  per user:        {per_user_seconds:8.1f} s  {per_user_queries:>8} queries"
+            f"\n  chunks of {CHUNK_SIZE:<4}: {chunked_seconds:8.1f} s  {chunked_queries:>8} queries"
+        )
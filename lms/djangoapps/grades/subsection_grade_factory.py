@@ -3,18 +3,21 @@ SubsectionGrade Factory Class
 """
 
 
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from logging import getLogger
 
 from django.conf import settings
 from lazy import lazy
 from submissions import api as submissions_api
+from submissions.models import ScoreSummary
+from submissions.serializers import UnannotatedScoreSerializer
 
-from common.djangoapps.student.models import anonymous_id_for_user
+from common.djangoapps.student.models import anonymous_id_for_user, prefetch_anonymous_ids
 from lms.djangoapps.courseware.model_data import ScoresClient
 from lms.djangoapps.grades.models import PersistentSubsectionGrade
 from lms.djangoapps.grades.scores import possibly_scored
 from openedx.core.djangoapps.signals.signals import COURSE_ASSESSMENT_GRADE_CHANGED
+from openedx.core.lib.cache_utils import get_cache
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
 
 from .course_data import CourseData
@@ -27,6 +30,8 @@ class SubsectionGradeFactory:
     """
     Factory for Subsection Grades.
     """
+    _SCORES_CACHE_NAMESPACE = 'grades.subsection_grade_factory.SubsectionGradeFactory.scores'
+
     def __init__(self, student, course=None, course_structure=None, course_data=None):
         self.student = student
         self.course_data = course_data or CourseData(student, course=course, structure=course_structure)
@@ -115,12 +120,65 @@ class SubsectionGradeFactory:
 
         return calculated_grade
 
+    @classmethod
+    def prefetch_scores(cls, course_data, users):
+        """
+        Prefetches the CSM and Submissions API scores of the given users
+        in the course, with a query for each rather than for each user.
+
+        The scores are read for every possibly scored block of the
+        course's collected structure, so they hold for any user's
+        transformed structure of the course.
+        """
+        course_key = course_data.course_key
+        scorable_locations = [
+            block_key for block_key in course_data.collected_structure if possibly_scored(block_key)
+        ]
+        csm_scores = ScoresClient.create_for_users(course_key, [user.id for user in users], scorable_locations)
+
+        prefetch_anonymous_ids(users, course_key)
+        anonymous_user_ids = {user.id: anonymous_id_for_user(user, course_key) for user in users}
+        submissions_scores = defaultdict(dict)
+        score_summaries = ScoreSummary.objects.filter(
+            student_item__course_id=str(course_key),
+            student_item__student_id__in=list(anonymous_user_ids.values()),
+        ).select_related('latest', 'latest__submission', 'student_item')
+        # The same as submissions_api.get_scores, for all the users at once.
+        for summary in score_summaries:
+            if not summary.latest.is_hidden():
+                submissions_scores[summary.student_item.student_id][summary.student_item.item_id] = (
+                    UnannotatedScoreSerializer(summary.latest).data
+                )
+
+        get_cache(cls._SCORES_CACHE_NAMESPACE)[str(course_key)] = {
+            user.id: (csm_scores[user.id], submissions_scores[anonymous_user_ids[user.id]])
+            for user in users
+        }
+
+    @classmethod
+    def clear_prefetched_scores(cls, course_key):
+        """
+        Clears prefetched scores for this course from the RequestCache.
+        """
+        get_cache(cls._SCORES_CACHE_NAMESPACE).pop(str(course_key), None)
+
+    def _get_prefetched_scores(self):
+        """
+        Returns the student's prefetched (CSM, Submissions API) scores,
+        or None if they weren't prefetched.
+        """
+        prefetched_scores = get_cache(self._SCORES_CACHE_NAMESPACE).get(str(self.course_data.course_key), {})
+        return prefetched_scores.get(self.student.id)
+
     @lazy
     def _csm_scores(self):
         """
         Lazily queries and returns all the scores stored in the user
         state (in CSM) for the course, while caching the result.
         """
+        prefetched_scores = self._get_prefetched_scores()
+        if prefetched_scores is not None:
+            return prefetched_scores[0]
         scorable_locations = [block_key for block_key in self.course_data.structure if possibly_scored(block_key)]
         return ScoresClient.create_for_locations(self.course_data.course_key, self.student.id, scorable_locations)
 
@@ -130,6 +188,9 @@ class SubsectionGradeFactory:
         Lazily queries and returns the scores stored by the
         Submissions API for the course, while caching the result.
         """
+        prefetched_scores = self._get_prefetched_scores()
+        if prefetched_scores is not None:
+            return prefetched_scores[1]
         anonymous_user_id = anonymous_id_for_user(self.student, self.course_data.course_key)
         return submissions_api.get_scores(str(self.course_data.course_key), anonymous_user_id)
 
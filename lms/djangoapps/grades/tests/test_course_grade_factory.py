@@ -7,6 +7,7 @@ import ddt
 
 from common.djangoapps.student.tests.factories import UserFactory
 from lms.djangoapps.courseware.access import has_access
+from lms.djangoapps.courseware.model_data import ScoresClient, set_score
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
 from xmodule.modulestore.tests.django_utils import (
     SharedModuleStoreTestCase,  # pylint: disable=wrong-import-order
@@ -160,6 +161,37 @@ class TestCourseGradeFactory(GradeTestBase):
             ))
         assert mock_update.called == force_update
 
+    @ddt.data((True, 1), (True, 2), (False, 2))
+    @ddt.unpack
+    def test_iter_chunked(self, force_update, chunk_size):
+        users = [self.request.user, UserFactory()]
+        set_score(users[0].id, self.problem.location, 1, 1)
+        expected_percents = [
+            result.course_grade.percent
+            for result in CourseGradeFactory().iter(users=users, course=self.course, force_update=True)
+        ]
+        assert expected_percents[0] > 0
+
+        with patch(
+            'lms.djangoapps.grades.subsection_grade_factory.submissions_api.get_scores'
+        ) as mock_get_scores, patch.object(
+            ScoresClient, 'create_for_locations'
+        ) as mock_create_for_locations, patch.object(
+            ScoresClient, 'create_for_users', wraps=ScoresClient.create_for_users
+        ) as mock_create_for_users:
+            results = list(CourseGradeFactory().iter(
+                users=users, course=self.course, force_update=force_update, chunk_size=chunk_size,
+            ))
+            for result in results:
+                assert result.course_grade.problem_scores
+
+        assert [result.error for result in results] == [None, None]
+        assert [result.course_grade.percent for result in results] == expected_percents
+        # Scores are read once per chunk, not per user.
+        assert mock_create_for_users.call_count == len(users) // chunk_size
+        mock_create_for_locations.assert_not_called()
+        mock_get_scores.assert_not_called()
+
     def test_course_grade_summary(self):
         with mock_get_score(1, 2):
             self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
@@ -28,6 +28,30 @@ USE_ON_DISK_GRADE_REPORTING = CourseWaffleFlag(
     f'{WAFFLE_NAMESPACE}.use_on_disk_grade_reporting', __name__
 )
 
+# .. toggle_name: instructor_task.use_sharded_grade_reporting
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating course and problem grade reports, split the learners into shards
+#   (see GRADE_REPORT_LEARNERS_PER_SHARD) graded by parallel subtasks, and merge their results into the
+#   report once all of them are done. Shards that fail can be re-run with the resume_grade_report
+#   management command instead of regenerating the whole report.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-16
+USE_SHARDED_GRADE_REPORTING = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.use_sharded_grade_reporting', __name__
+)
+
+# .. toggle_name: instructor_task.columnar_grade_reports
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating course and problem grade reports, also upload a Parquet version
+#   of the report, with typed numeric columns, for analytics pipelines.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-16
+COLUMNAR_GRADE_REPORTS = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.columnar_grade_reports', __name__
+)
+
 
 def problem_grade_report_verified_only(course_id):
     """
@@ -54,3 +78,19 @@ def use_on_disk_grade_reporting(course_id):
     False otherwise.
     """
     return USE_ON_DISK_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_sharded_grade_reporting(course_id):
+    """
+    Returns True if grade reports should be generated
+    by parallel subtasks, False otherwise.
+    """
+    return USE_SHARDED_GRADE_REPORTING.is_enabled(course_id)
+
+
+def columnar_grade_reports(course_id):
+    """
+    Returns True if grade reports should also be uploaded
+    in a columnar format, False otherwise.
+    """
+    return COLUMNAR_GRADE_REPORTS.is_enabled(course_id)
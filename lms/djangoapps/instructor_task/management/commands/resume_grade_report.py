@@ -0,0 +1,53 @@
+"""
+Command to resume a sharded grade report
+"""
+
+
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
+from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.tasks import calculate_grades_csv, calculate_problem_grade_report
+
+
+class Command(BaseCommand):
+    """
+    Command to queue again the shards of a course or problem grade report that
+    didn't succeed, and merge them into the report once they're done. Shards that
+    succeeded are not graded again.
+
+    Only applies to reports generated while the
+    instructor_task.use_sharded_grade_reporting flag was enabled.
+
+    Example:
+    ./manage.py lms resume_grade_report 1234
+    """
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'entry_id',
+            type=int,
+            help='id of the InstructorTask of the grade report',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            entry = InstructorTask.objects.get(pk=options['entry_id'])
+        except InstructorTask.DoesNotExist as exc:
+            raise CommandError(f"No InstructorTask with id {options['entry_id']}") from exc
+
+        if entry.task_type == InstructorTaskTypes.GRADE_COURSE:
+            task_class = calculate_grades_csv
+        elif entry.task_type == InstructorTaskTypes.GRADE_PROBLEMS:
+            task_class = calculate_problem_grade_report
+        else:
+            raise CommandError(f'InstructorTask {entry.id} is not a grade report')
+
+        if not entry.subtasks:
+            raise CommandError(f'Grade report {entry.id} was not sharded, it cannot be resumed')
+
+        task_class.apply_async([entry.id, {'task_id': entry.task_id}], task_id=entry.task_id)
+        self.stdout.write(f'Resuming grade report {entry.id} ({entry.task_id})')
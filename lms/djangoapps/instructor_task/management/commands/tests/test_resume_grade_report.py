@@ -0,0 +1,45 @@
+"""
+Tests for resuming sharded grade reports
+"""
+
+
+import json
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
+from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskTestCase
+
+
+class TestResumeGradeReportCommand(InstructorTaskTestCase):
+    """
+    Tests for the `resume_grade_report` management command
+    """
+
+    def test_resume(self):
+        entry = InstructorTaskFactory.create(
+            task_type=InstructorTaskTypes.GRADE_PROBLEMS,
+            task_id='grade-report-task',
+            subtasks=json.dumps({'total': 1, 'succeeded': 0, 'failed': 1, 'status': {}}),
+        )
+        with patch(
+            'lms.djangoapps.instructor_task.management.commands.resume_grade_report.calculate_problem_grade_report'
+        ) as mock_task:
+            call_command('resume_grade_report', entry.id)
+        mock_task.apply_async.assert_called_once_with(
+            [entry.id, {'task_id': 'grade-report-task'}], task_id='grade-report-task',
+        )
+
+    def test_not_sharded(self):
+        entry = InstructorTaskFactory.create(task_type=InstructorTaskTypes.GRADE_COURSE, task_id='grade-report-task')
+        with pytest.raises(CommandError):
+            call_command('resume_grade_report', entry.id)
+
+    def test_not_a_grade_report(self):
+        entry = InstructorTaskFactory.create(task_id='rescore-task')
+        with pytest.raises(CommandError):
+            call_command('resume_grade_report', entry.id)
@@ -208,7 +208,7 @@ class SubtaskStatus:
         return str(repr(self))
 
 
-def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
+def initialize_subtask_info(entry, action_name, total_num, subtask_id_list, defer_success=False):
     """
     Store initial subtask information to InstructorTask object.
 
@@ -237,6 +237,10 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
     Monitoring code should assume that if an InstructorTask has subtask information, that it should
     rely on the status stored in the InstructorTask object, rather than status stored in the
     corresponding AsyncResult.
+
+    If `defer_success` is True, a 'defer_success' key is stored too, and the InstructorTask stays
+    in PROGRESS once all the subtasks are done, for whatever completes the task afterwards (e.g.
+    merging the subtasks' results) to mark it as succeeded.
     """
     task_progress = {
         'action_name': action_name,
@@ -262,6 +266,8 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
         'failed': 0,
         'status': subtask_status
     }
+    if defer_success:
+        subtask_dict['defer_success'] = True
     entry.subtasks = json.dumps(subtask_dict)
 
     # and save the entry immediately, before any subtasks actually start work:
@@ -278,6 +284,7 @@ def queue_subtasks_for_query(
     item_fields,
     items_per_task,
     total_num_items,
+    defer_success=False,
 ):
     """
     Generates and queues subtasks to each execute a chunk of "items" generated by a queryset.
@@ -293,6 +300,8 @@ def queue_subtasks_for_query(
             These are in addition to the 'pk' field.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
         `total_num_items` : total amount of items that will be put into subtasks
+        `defer_success` : whether the InstructorTask should stay in PROGRESS once the subtasks are done
+            (see initialize_subtask_info).
 
     Returns:  the task progress as stored in the InstructorTask object.
 
@@ -313,7 +322,9 @@ def queue_subtasks_for_query(
     )
     # Make sure this is committed to database before handing off subtasks to celery.
     with outer_atomic():
-        progress = initialize_subtask_info(entry, action_name, total_num_items, subtask_id_list)
+        progress = initialize_subtask_info(
+            entry, action_name, total_num_items, subtask_id_list, defer_success=defer_success,
+        )
 
     # Construct a generator that will return the recipients to use for each subtask.
     # Pass in the desired fields to fetch for each recipient.
@@ -563,8 +574,9 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         # If we're done with the last task, update the parent status to indicate that.
         # At present, we mark the task as having succeeded.  In future, we should see
         # if there was a catastrophic failure that occurred, and figure out how to
-        # report that here.
-        if num_remaining <= 0:
+        # report that here.  Tasks that defer their success are marked as succeeded by whatever
+        # completes them once their subtasks are done.
+        if num_remaining <= 0 and not subtask_dict.get('defer_success'):
             entry.task_state = SUCCESS
         entry.subtasks = json.dumps(subtask_dict)
         entry.task_output = InstructorTask.create_output_for_success(task_progress)
@@ -576,3 +588,45 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     except Exception:
         TASK_LOG.exception("Unexpected error while updating InstructorTask.")
         raise
+
+
+@transaction.atomic
+def reset_unfinished_subtasks(entry_id):
+    """
+    Prepares the subtasks of an InstructorTask that did not succeed to be queued again.
+
+    Subtasks that failed are counted out of the parent task's progress and set back to QUEUING,
+    as are subtasks that never completed and aren't being executed (e.g. because the worker running
+    them died).  Subtasks that are still being executed are left alone.  If any subtask is reset,
+    the InstructorTask's state goes back to PROGRESS.
+
+    Returns the list of the ids of the subtasks that were reset, in the order they were created.
+    """
+    entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
+    subtask_dict = json.loads(entry.subtasks)
+    task_progress = json.loads(entry.task_output)
+
+    reset_subtask_ids = []
+    for subtask_id, status in subtask_dict['status'].items():
+        subtask_status = SubtaskStatus.from_dict(status)
+        if subtask_status.state == SUCCESS:
+            continue
+        if subtask_status.state in READY_STATES:
+            for statname in ['attempted', 'succeeded', 'failed', 'skipped']:
+                task_progress[statname] -= getattr(subtask_status, statname)
+            subtask_dict['failed'] -= 1
+        elif cache.get(f"subtask-{subtask_id}") is not None:
+            # Still being executed by another worker.
+            continue
+        subtask_dict['status'][subtask_id] = SubtaskStatus.create(subtask_id).to_dict()
+        reset_subtask_ids.append(subtask_id)
+
+    if reset_subtask_ids:
+        TASK_LOG.info("Resetting %d unfinished subtasks of instructor task %d", len(reset_subtask_ids), entry_id)
+        # Drop any failure message recorded once the subtasks were done.
+        task_progress.pop('message', None)
+        entry.subtasks = json.dumps(subtask_dict)
+        entry.task_output = InstructorTask.create_output_for_success(task_progress)
+        entry.task_state = PROGRESS
+        entry.save()
+    return reset_subtask_ids
@@ -36,7 +36,12 @@ from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
     upload_may_enroll_csv,
     upload_students_csv,
 )
-from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport, ProblemGradeReport, ProblemResponses
+from lms.djangoapps.instructor_task.tasks_helper.grades import (
+    CourseGradeReport,
+    ProblemGradeReport,
+    ProblemResponses,
+    run_grade_report_shard,
+)
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     generate_anonymous_ids,
@@ -219,6 +224,20 @@ def calculate_problem_grade_report(entry_id, xblock_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@shared_task
+@set_code_owner_attribute
+def generate_grade_report_shard(entry_id, xblock_instance_args, action_name, id_range, subtask_status_dict):
+    """
+    Grade the learners of one shard of a course or problem grade report.
+
+    Queued by calculate_grades_csv and calculate_problem_grade_report when the
+    instructor_task.use_sharded_grade_reporting flag is enabled, with the
+    (min, max) `id_range` of the shard's learners.  The last shard to finish
+    merges the shards into the report.
+    """
+    return run_grade_report_shard(entry_id, xblock_instance_args, action_name, id_range, subtask_status_dict)
+
+
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
 def calculate_students_features_csv(entry_id, xblock_instance_args):
@@ -0,0 +1,90 @@
+"""
+Columnar (Parquet) versions of grade reports.
+"""
+import logging
+
+import pyarrow
+import pyarrow.parquet
+
+TASK_LOG = logging.getLogger('edx.celery.task')
+
+# Number of rows buffered before they are written out as a row group.
+ROW_GROUP_SIZE = 10000
+
+
+class ParquetReportWriter:
+    """
+    Writes the rows of a report to a Parquet file, streaming them out in row groups.
+
+    Values of integer and float columns that aren't numbers (e.g. 'Not Attempted')
+    are written as nulls. Other columns are written as dictionary-encoded strings.
+    """
+
+    def __init__(self, output_file, headers, integer_headers=(), float_headers=()):
+        self.headers = headers
+        integer_headers = set(integer_headers)
+        float_headers = set(float_headers)
+        self._converters = []
+        fields = []
+        for header in headers:
+            if header in integer_headers:
+                fields.append(pyarrow.field(header, pyarrow.int64()))
+                self._converters.append(_to_int)
+            elif header in float_headers:
+                fields.append(pyarrow.field(header, pyarrow.float64()))
+                self._converters.append(_to_float)
+            else:
+                fields.append(pyarrow.field(header, pyarrow.dictionary(pyarrow.int32(), pyarrow.string())))
+                self._converters.append(_to_str)
+        self.schema = pyarrow.schema(fields)
+        self._writer = pyarrow.parquet.ParquetWriter(output_file, self.schema, compression='snappy')
+        self._buffered_rows = []
+
+    def write_rows(self, rows):
+        """
+        Adds the given rows, in the order of the headers, to the file.
+        """
+        self._buffered_rows.extend(rows)
+        if len(self._buffered_rows) >= ROW_GROUP_SIZE:
+            self._flush()
+
+    def append_file(self, input_file):
+        """
+        Adds the rows of the given Parquet file, written with the same headers, to the file.
+        """
+        self._flush()
+        self._writer.write_table(pyarrow.parquet.read_table(input_file).cast(self.schema))
+
+    def close(self):
+        """
+        Writes out the remaining rows and the file's footer.
+        """
+        self._flush()
+        self._writer.close()
+
+    def _flush(self):
+        if not self._buffered_rows:
+            return
+        columns = [
+            [convert(row[index]) for row in self._buffered_rows]
+            for index, convert in enumerate(self._converters)
+        ]
+        arrays = [
+            pyarrow.array(column, type=field.type.value_type).dictionary_encode()
+            if pyarrow.types.is_dictionary(field.type) else pyarrow.array(column, type=field.type)
+            for column, field in zip(columns, self.schema)  # noqa: B905
+        ]
+        self._writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+        self._buffered_rows = []
+
+
+def _to_int(value):
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def _to_float(value):
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _to_str(value):
+    return None if value is None else str(value)
@@ -3,16 +3,23 @@ Functionality for generating grade reports.
 """
 
 import csv
+import json
 import logging
+import os
 import re
+import shutil
 from collections import OrderedDict, defaultdict
 from datetime import datetime
+from io import StringIO
 from itertools import chain
 from tempfile import TemporaryFile
 from time import time
 
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
 from lazy import lazy
 from opaque_keys.edx.keys import UsageKey
 from pytz import UTC
@@ -31,9 +38,20 @@ from lms.djangoapps.grades.api import context as grades_context
 from lms.djangoapps.instructor_analytics.basic import list_problem_responses
 from lms.djangoapps.instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.instructor_task.config.waffle import (
+    columnar_grade_reports,
     course_grade_report_verified_only,
     problem_grade_report_verified_only,
     use_on_disk_grade_reporting,
+    use_sharded_grade_reporting,
+)
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    reset_unfinished_subtasks,
+    update_subtask_status,
 )
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
@@ -48,8 +66,13 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.partitions.partitions_service import PartitionService  # pylint: disable=wrong-import-order
 from xmodule.split_test_block import get_split_user_partitions  # pylint: disable=wrong-import-order
 
+from . import columnar
 from .runner import TaskProgress
-from .utils import upload_csv_file_to_report_store, upload_csv_to_report_store
+from .utils import (
+    upload_csv_file_to_report_store,
+    upload_csv_to_report_store,
+    upload_parquet_file_to_report_store,
+)
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -57,6 +80,12 @@ ENROLLED_IN_COURSE = 'enrolled'
 
 NOT_ENROLLED_IN_COURSE = 'unenrolled'
 
+# Directory of the report store, under the course's, where the shards of sharded grade reports are kept.
+GRADE_REPORT_SHARDS_DIR = 'grade_report_shards'
+
+# Lock expiration should be long enough to allow the shards of a grade report to be merged.
+SHARD_MERGE_LOCK_EXPIRE = 60 * 60
+
 
 def _user_enrollment_status(user, course_id):
     """
@@ -73,6 +102,15 @@ def _flatten(iterable):
     return list(chain.from_iterable(iterable))
 
 
+def _write_csv_row(binary_file, row):
+    """
+    Writes the given row to the given binary file in csv format.
+    """
+    buff = StringIO()
+    csv.writer(buff).writerow(row)
+    binary_file.write(buff.getvalue().encode('utf-8'))
+
+
 class _CourseGradeReportContext:
     """
     Internal class that provides a common context to use for a single grade
@@ -93,6 +131,9 @@ class _CourseGradeReportContext:
             course_id=course_id,
             task_input=_task_input,
         )
+        self.task_id = _xblock_instance_args.get('task_id') if _xblock_instance_args is not None else None
+        self.entry_id = _entry_id
+        self.task_input = _task_input
         self.action_name = action_name
         self.course_id = course_id
         self.task_progress = TaskProgress(self.action_name, total=None, start_time=time())
@@ -321,6 +362,20 @@ class InMemoryReportMixin:
                 parent_dir=self.context.upload_parent_dir
             )
 
+        with TemporaryFile('w+b') as columnar_file:
+            columnar_writer = self._columnar_writer(columnar_file)
+            if columnar_writer is not None:
+                columnar_writer.write_rows(success_rows)
+                columnar_writer.close()
+                columnar_file.seek(0)
+                upload_parquet_file_to_report_store(
+                    columnar_file,
+                    self.context.upload_filename,
+                    self.context.course_id,
+                    date,
+                    parent_dir=self.context.upload_parent_dir
+                )
+
     def _compile(self, batched_rows):
         """
         Compiles and returns the complete list of (success_rows, error_rows) for
@@ -351,31 +406,45 @@ class TemporaryFileReportMixin:
         self.context.update_status('TemporaryFileReportMixin - 1: Starting grade report')
         batched_rows = self._batched_rows()
 
-        with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+        with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file, \
+                TemporaryFile('w+b') as columnar_file:
             self.context.update_status('TemporaryFileReportMixin - 2: Compiling grades into temp files')
-            has_errors = self.iter_and_write_batched_rows(batched_rows, success_file, error_file)
+            columnar_writer = self._columnar_writer(columnar_file)
+            has_errors = self.iter_and_write_batched_rows(
+                batched_rows, success_file, error_file, columnar_writer=columnar_writer,
+            )
+            if columnar_writer is not None:
+                columnar_writer.close()
 
             self.context.update_status('TemporaryFileReportMixin - 3: Uploading files')
-            self.upload_temp_files(success_file, error_file, has_errors)
+            self.upload_temp_files(
+                success_file, error_file, has_errors, columnar_file=columnar_file if columnar_writer else None,
+            )
 
         return self.context.update_status('TemporaryFileReportMixin - 4: Completed grades')
 
-    def iter_and_write_batched_rows(self, batched_rows, success_file, error_file):
+    def iter_and_write_batched_rows(
+        self, batched_rows, success_file, error_file, write_headers=True, columnar_writer=None,
+    ):
         """
         Iterate through batched rows, writing returned chunks to disk as we go.
         This should hopefully help us avoid out of memory errors.
+
+        Success rows are also written to `columnar_writer`, if given.
         """
         success_writer = csv.writer(success_file)
         error_writer = csv.writer(error_file)
 
-        # Write headers
-        success_writer.writerow(self._success_headers())
-        error_writer.writerow(self._error_headers())
+        if write_headers:
+            success_writer.writerow(self._success_headers())
+            error_writer.writerow(self._error_headers())
 
         succeeded, failed = 0, 0
         # Iterate through batched rows, writing to temp file
         for success_rows, error_rows in batched_rows:
             success_writer.writerows(success_rows)
+            if columnar_writer is not None:
+                columnar_writer.write_rows(success_rows)
             if len(error_rows) > 0:
                 error_writer.writerows(error_rows)
             succeeded += len(success_rows)
@@ -388,9 +457,10 @@ class TemporaryFileReportMixin:
 
         return self.context.task_progress.failed > 0
 
-    def upload_temp_files(self, success_file, error_file, has_errors):
+    def upload_temp_files(self, success_file, error_file, has_errors, columnar_file=None):
         """
-        Uploads success and error csv files to report store
+        Uploads success and error csv files to report store, along with
+        the columnar version of the report if there is one.
         """
         date = datetime.now(UTC)
 
@@ -413,6 +483,309 @@ class TemporaryFileReportMixin:
                 parent_dir=self.context.upload_parent_dir
             )
 
+        if columnar_file is not None:
+            columnar_file.seek(0)
+            upload_parquet_file_to_report_store(
+                columnar_file,
+                self.context.upload_filename,
+                self.context.course_id,
+                date,
+                parent_dir=self.context.upload_parent_dir
+            )
+
+
+class ShardedReportMixin(TemporaryFileReportMixin):
+    """
+    Mixin for a file report whose learners are split into shards graded by parallel subtasks.
+
+    Each shard writes its rows to temp files which are then kept in the report store, as a
+    checkpoint of the shard.  Once all the shards have succeeded, the last one to finish merges
+    them, in order, into the report.  Running the report's task again for the same InstructorTask
+    (see the resume_grade_report management command) only queues the shards that didn't succeed.
+    """
+    # The class of the context of the report, set by the report classes.
+    context_class = None
+
+    def _generate(self):
+        """
+        Queues the shards of the report, or the ones that didn't succeed if they were already queued.
+        """
+        entry = InstructorTask.objects.get(pk=self.context.entry_id)
+        if entry.subtasks:
+            return self._resume(entry)
+
+        learners = get_user_model().objects.filter(**self._enrolled_learner_filter()).order_by('id')
+        total_num_learners = learners.count()
+        if total_num_learners == 0:
+            return super()._generate()
+
+        self.context.update_status('ShardedReportMixin - 1: Queueing shards')
+        id_ranges = {}
+
+        def _create_shard_subtask(item_list, initial_subtask_status):
+            """Creates a subtask to grade the learners of a shard."""
+            id_range = [item_list[0]['pk'], item_list[-1]['pk']]
+            id_ranges[initial_subtask_status.task_id] = id_range
+            return self._shard_subtask(id_range, initial_subtask_status)
+
+        progress = queue_subtasks_for_query(
+            entry,
+            self.context.action_name,
+            _create_shard_subtask,
+            [learners],
+            [],
+            settings.GRADE_REPORT_LEARNERS_PER_SHARD,
+            total_num_learners,
+            # The report is only done once its shards are merged (see _mark_merged).
+            defer_success=True,
+        )
+
+        # The id ranges of the shards are needed to queue them again.
+        self._store_shard_file('manifest.json', StringIO(json.dumps(id_ranges)))
+        if json.loads(InstructorTask.objects.get(pk=entry.id).subtasks).get('merged'):
+            # The shards were all done before the manifest was stored.
+            self._delete_shard_file('manifest.json')
+        return progress
+
+    def _resume(self, entry):
+        """
+        Queues again the shards of the report that didn't succeed.
+        """
+        if json.loads(entry.subtasks).get('merged'):
+            TASK_LOG.info('%s, Report already generated, nothing to resume', self.context.task_info_string)
+            self._mark_merged()
+            return json.loads(entry.task_output)
+
+        id_ranges = self._read_manifest()
+        if id_ranges is None:
+            raise ValueError(f'{self.context.task_info_string}, Unable to resume grade report: no shard manifest found')
+
+        subtask_ids = reset_unfinished_subtasks(entry.id)
+        self.context.update_status(f'ShardedReportMixin - 1: Queueing {len(subtask_ids)} shards again')
+        for subtask_id in subtask_ids:
+            self._shard_subtask(id_ranges[subtask_id], SubtaskStatus.create(subtask_id)).apply_async()
+        if not subtask_ids:
+            # Either the remaining shards are still running, or they are all done and only the merge is left.
+            self._finish_if_last_shard()
+        return json.loads(InstructorTask.objects.get(pk=entry.id).task_output)
+
+    def _shard_subtask(self, id_range, subtask_status):
+        """
+        Returns the subtask grading the learners in the given id range.
+        """
+        # Imported here, as tasks.py imports the report classes.
+        from lms.djangoapps.instructor_task.tasks import generate_grade_report_shard  # pylint: disable=cyclic-import
+        return generate_grade_report_shard.subtask(
+            (
+                self.context.entry_id,
+                {'task_id': self.context.task_id},
+                self.context.action_name,
+                id_range,
+                subtask_status.to_dict(),
+            ),
+            task_id=subtask_status.task_id,
+        )
+
+    @classmethod
+    def generate_shard(cls, entry, xblock_instance_args, action_name, id_range, subtask_status_dict):
+        """
+        Grades the learners of a shard of the report and stores the resulting rows.
+
+        Returns the status of the shard's subtask, as a dict.
+        """
+        subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+        current_task_id = subtask_status.task_id
+        check_subtask_is_valid(entry.id, current_task_id, subtask_status)
+
+        with modulestore().bulk_operations(entry.course_id):
+            context = cls.context_class(
+                xblock_instance_args, entry.id, entry.course_id, json.loads(entry.task_input), action_name,
+            )
+            report = cls(context)
+            try:
+                report._write_shard(current_task_id, id_range)  # pylint: disable=protected-access
+            except Exception:
+                TASK_LOG.exception('%s, Grade report shard %s failed', context.task_info_string, current_task_id)
+                subtask_status.increment(state=FAILURE)
+                update_subtask_status(entry.id, current_task_id, subtask_status)
+                report._finish_if_last_shard()  # pylint: disable=protected-access
+                raise
+
+            progress = context.task_progress
+            subtask_status.increment(succeeded=progress.succeeded, failed=progress.failed, state=SUCCESS)
+            update_subtask_status(entry.id, current_task_id, subtask_status)
+            report._finish_if_last_shard()  # pylint: disable=protected-access
+        return subtask_status.to_dict()
+
+    def _write_shard(self, subtask_id, id_range):
+        """
+        Writes the rows of the learners in the given id range to the shard's files.
+        """
+        with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file, \
+                TemporaryFile('w+b') as columnar_file:
+            columnar_writer = self._columnar_writer(columnar_file)
+            has_errors = self.iter_and_write_batched_rows(
+                self._batched_rows(id_range), success_file, error_file, write_headers=False,
+                columnar_writer=columnar_writer,
+            )
+            self._store_shard_file(f'{subtask_id}.csv', success_file)
+            if columnar_writer is not None:
+                columnar_writer.close()
+                self._store_shard_file(f'{subtask_id}.parquet', columnar_file)
+            if has_errors:
+                self._store_shard_file(f'{subtask_id}_err.csv', error_file)
+            else:
+                # Left by a previous attempt at the shard, if any.
+                self._delete_shard_file(f'{subtask_id}_err.csv')
+
+    def _finish_if_last_shard(self):
+        """
+        Merges the shards into the report once they have all succeeded, or records
+        the failure of the report if some of them didn't.
+        """
+        subtask_dict = json.loads(InstructorTask.objects.get(pk=self.context.entry_id).subtasks)
+        if subtask_dict.get('merged') or subtask_dict['succeeded'] + subtask_dict['failed'] < subtask_dict['total']:
+            return
+
+        if subtask_dict['failed']:
+            self._record_failure(
+                '{failed} of {total} shards of the report failed; resume the report to retry them.'.format(
+                    failed=subtask_dict['failed'], total=subtask_dict['total'],
+                )
+            )
+            return
+
+        lock_key = f'grade-report-merge-{self.context.entry_id}'
+        if not cache.add(lock_key, 'true', SHARD_MERGE_LOCK_EXPIRE):
+            return
+        subtask_ids = list(subtask_dict['status'])
+        try:
+            self.context.update_status('ShardedReportMixin - 2: Merging shards')
+            self._merge_shards(subtask_ids)
+            self._mark_merged()
+        except Exception:
+            self._record_failure('Merging the shards of the report failed; resume the report to retry.')
+            raise
+        finally:
+            cache.delete(lock_key)
+
+        for subtask_id in subtask_ids:
+            self._delete_shard_file(f'{subtask_id}.csv')
+            self._delete_shard_file(f'{subtask_id}_err.csv')
+            self._delete_shard_file(f'{subtask_id}.parquet')
+        self._delete_shard_file('manifest.json')
+        self.context.update_status('ShardedReportMixin - 3: Completed grades')
+
+    def _merge_shards(self, subtask_ids):
+        """
+        Uploads the report made of the files of the given shards, in order.
+        """
+        with TemporaryFile('w+b') as success_file, TemporaryFile('w+b') as error_file, \
+                TemporaryFile('w+b') as columnar_file:
+            _write_csv_row(success_file, self._success_headers())
+            _write_csv_row(error_file, self._error_headers())
+            has_errors = False
+            for subtask_id in subtask_ids:
+                self._copy_shard_file(f'{subtask_id}.csv', success_file)
+                has_errors |= self._copy_shard_file(f'{subtask_id}_err.csv', error_file)
+
+            columnar_writer = self._columnar_writer(columnar_file)
+            if columnar_writer is not None:
+                shard_paths = [self._shard_path(f'{subtask_id}.parquet') for subtask_id in subtask_ids]
+                if all(self._report_store.storage.exists(path) for path in shard_paths):
+                    for path in shard_paths:
+                        with self._report_store.storage.open(path, 'rb') as shard_file:
+                            columnar_writer.append_file(shard_file)
+                    columnar_writer.close()
+                else:
+                    # Columnar reports were enabled while the shards were running.
+                    columnar_writer = None
+
+            self.upload_temp_files(
+                success_file, error_file, has_errors, columnar_file=columnar_file if columnar_writer else None,
+            )
+
+    @transaction.atomic
+    def _mark_merged(self):
+        """
+        Records that the report was generated from its shards.
+        """
+        entry = InstructorTask.objects.select_for_update().get(pk=self.context.entry_id)
+        subtask_dict = json.loads(entry.subtasks)
+        subtask_dict['merged'] = True
+        task_progress = json.loads(entry.task_output)
+        task_progress.pop('message', None)
+        entry.subtasks = json.dumps(subtask_dict)
+        entry.task_output = InstructorTask.create_output_for_success(task_progress)
+        entry.task_state = SUCCESS
+        entry.save()
+
+    @transaction.atomic
+    def _record_failure(self, message):
+        """
+        Marks the report as failed with the given message, keeping the progress of its shards.
+        """
+        TASK_LOG.error('%s, %s', self.context.task_info_string, message)
+        entry = InstructorTask.objects.select_for_update().get(pk=self.context.entry_id)
+        task_progress = json.loads(entry.task_output)
+        task_progress['message'] = message
+        entry.task_output = InstructorTask.create_output_for_success(task_progress)
+        entry.task_state = FAILURE
+        entry.save()
+
+    @lazy
+    def _report_store(self):
+        return ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    def _shard_path(self, filename):
+        """
+        Returns the path of the given file of the report's shards in the report store.
+        """
+        return os.path.join(self._shards_dir, filename)
+
+    @lazy
+    def _shards_dir(self):
+        return os.path.join(
+            self._report_store.path_to(self.context.course_id), GRADE_REPORT_SHARDS_DIR, str(self.context.entry_id),
+        )
+
+    def _store_shard_file(self, filename, buff):
+        """
+        Stores the contents of the given file-like object as the given file of the report's shards.
+        """
+        # Storages don't overwrite existing files, so remove the one left by a previous attempt.
+        self._delete_shard_file(filename)
+        buff.seek(0)
+        self._report_store.store(self.context.course_id, filename, buff, parent_dir=self._shards_dir)
+
+    def _delete_shard_file(self, filename):
+        path = self._shard_path(filename)
+        if self._report_store.storage.exists(path):
+            self._report_store.storage.delete(path)
+
+    def _copy_shard_file(self, filename, output_file):
+        """
+        Appends the given file of the report's shards to the given binary file.
+        Returns whether the file exists.
+        """
+        path = self._shard_path(filename)
+        if not self._report_store.storage.exists(path):
+            return False
+        with self._report_store.storage.open(path, 'rb') as shard_file:
+            shutil.copyfileobj(shard_file, output_file)
+        return True
+
+    def _read_manifest(self):
+        """
+        Returns the id ranges of the learners of the report's shards, keyed by subtask id,
+        or None if they weren't stored.
+        """
+        path = self._shard_path('manifest.json')
+        if not self._report_store.storage.exists(path):
+            return None
+        with self._report_store.storage.open(path, 'rb') as manifest_file:
+            return json.loads(manifest_file.read().decode('utf-8'))
+
 
 class GradeReportBase:
     """
@@ -447,27 +820,35 @@ class GradeReportBase:
         TASK_LOG.info('%s, Task type: %s, %s, %s', task_info_string, self.context.action_name,
                       message, self.context.task_progress.state)
 
-    def _batch_users(self):
+    def _enrolled_learner_filter(self):
+        """
+        Returns the User filter kwargs matching the learners included in this report.
+        """
+        filter_kwargs = {
+            'courseenrollment__course_id': self.context.course_id,
+        }
+        if self.context.report_for_verified_only:
+            filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+        return filter_kwargs
+
+    def _batch_users(self, id_range=None):
         """
-        Returns a generator of batches of users.
+        Returns a generator of batches of users, limited to the given (min, max)
+        range of user ids if there is one.
         """
         def grouper(iterable, chunk_size=100, fillvalue=None):
             args = [iter(iterable)] * chunk_size
             return zip_longest(*args, fillvalue=fillvalue)
 
-        def get_enrolled_learners_for_course(course_id, verified_only=False):
+        def get_enrolled_learners_for_course(filter_kwargs):
             """
             Get all the enrolled users in a course chunk by chunk.
             This generator method fetches & loads the enrolled user objects on demand which in chunk
             size defined. This method is a workaround to avoid out-of-memory errors.
             """
-            filter_kwargs = {
-                'courseenrollment__course_id': course_id,
-            }
-            if verified_only:
-                filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
-
             user_ids_list = get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
+            if id_range is not None:
+                user_ids_list = user_ids_list.filter(id__gte=id_range[0], id__lte=id_range[1])
             user_chunks = grouper(user_ids_list)
             for user_ids in user_chunks:
                 user_ids = [user_id for user_id in user_ids if user_id is not None]
@@ -481,9 +862,27 @@ class GradeReportBase:
 
                 yield users
 
-        return get_enrolled_learners_for_course(
-            course_id=self.context.course_id,
-            verified_only=self.context.report_for_verified_only
+        return get_enrolled_learners_for_course(self._enrolled_learner_filter())
+
+    def _numeric_headers(self):
+        """
+        Returns the headers of the columns of grades, whose values are numbers
+        in the columnar version of the report.
+        """
+        raise NotImplementedError
+
+    def _columnar_writer(self, output_file):
+        """
+        Returns a writer of the columnar version of the report to the given binary file,
+        or None if the report isn't uploaded in a columnar format.
+        """
+        if not columnar_grade_reports(self.context.course_id):
+            return None
+        return columnar.ParquetReportWriter(
+            output_file,
+            self._success_headers(),
+            integer_headers=['Student ID'],
+            float_headers=self._numeric_headers(),
         )
 
     def log_additional_info_for_testing(self, message):
@@ -500,11 +899,11 @@ class GradeReportBase:
         been processed
         """
 
-    def _batched_rows(self):
+    def _batched_rows(self, id_range=None):
         """
         A generator of batches of (success_rows, error_rows) for this report.
         """
-        for users in self._batch_users():
+        for users in self._batch_users(id_range):
             yield self._rows_for_users(users)
             self._clear_caches()
 
@@ -516,6 +915,8 @@ class CourseGradeReport(GradeReportBase):
     # Batch size for chunking the list of enrollees in the course.
     USER_BATCH_SIZE = 100
 
+    context_class = _CourseGradeReportContext
+
     @classmethod
     def generate(cls, _xblock_instance_args, _entry_id, course_id, _task_input, action_name):
         """
@@ -523,7 +924,9 @@ class CourseGradeReport(GradeReportBase):
         """
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
-            if use_on_disk_grade_reporting(course_id):  # AU-926
+            if use_sharded_grade_reporting(course_id):
+                return ShardedCourseGradeReport(context)._generate()  # pylint: disable=protected-access
+            elif use_on_disk_grade_reporting(course_id):  # AU-926
                 return TempFileCourseGradeReport(context)._generate()  # pylint: disable=protected-access
             else:
                 return InMemoryCourseGradeReport(context)._generate()  # pylint: disable=protected-access
@@ -549,6 +952,9 @@ class CourseGradeReport(GradeReportBase):
         """
         return ["Student ID", "Username", "Error"]
 
+    def _numeric_headers(self):
+        return self._grades_header()
+
     def _grades_header(self):
         """
         Returns the applicable grades-related headers for this report.
@@ -710,10 +1116,18 @@ class TempFileCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
     """ Course Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+class ShardedCourseGradeReport(CourseGradeReport, ShardedReportMixin):
+    """ Course Grade Report whose learners are graded in parallel shards that are then merged """
+
+
 class ProblemGradeReport(GradeReportBase):
     """
     Class to encapsulate functionality related to generating user/row had header data for Problem Grade Reports.
     """
+    # Number of enrollees whose scores are read in bulk.
+    USER_BATCH_SIZE = 100
+
+    context_class = _ProblemGradeReportContext
 
     @classmethod
     def generate(cls, _xblock_instance_args, _entry_id, course_id, _task_input, action_name):
@@ -722,7 +1136,9 @@ class ProblemGradeReport(GradeReportBase):
         """
         with modulestore().bulk_operations(course_id):
             context = _ProblemGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
-            if use_on_disk_grade_reporting(course_id):  # AU-926
+            if use_sharded_grade_reporting(course_id):
+                return ShardedProblemGradeReport(context)._generate()  # pylint: disable=protected-access
+            elif use_on_disk_grade_reporting(course_id):  # AU-926
                 return TempFileProblemGradeReport(context)._generate()  # pylint: disable=protected-access
             else:
                 return InMemoryProblemGradeReport(context)._generate()  # pylint: disable=protected-access
@@ -745,6 +1161,9 @@ class ProblemGradeReport(GradeReportBase):
         """
         return list(self._problem_grades_header().values()) + ['error_msg']
 
+    def _numeric_headers(self):
+        return ['Grade'] + _flatten(list(self.context.graded_scorable_blocks_header.values()))
+
     def _problem_grades_header(self):
         """Problem Grade report header."""
         return OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
@@ -759,6 +1178,7 @@ class ProblemGradeReport(GradeReportBase):
             course=self.context.course,
             collected_block_structure=self.context.course_structure,
             course_key=self.context.course_id,
+            chunk_size=self.USER_BATCH_SIZE,
         ):
             if not course_grade:
                 err_msg = str(error)
@@ -805,6 +1225,22 @@ class TempFileProblemGradeReport(ProblemGradeReport, TemporaryFileReportMixin):
     """ Program Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+class ShardedProblemGradeReport(ProblemGradeReport, ShardedReportMixin):
+    """ Problem Grade Report whose learners are graded in parallel shards that are then merged """
+
+
+def run_grade_report_shard(entry_id, xblock_instance_args, action_name, id_range, subtask_status_dict):
+    """
+    Grades the learners in the given id range for the sharded grade report of the given InstructorTask.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    if entry.task_type == InstructorTaskTypes.GRADE_PROBLEMS:
+        report_class = ShardedProblemGradeReport
+    else:
+        report_class = ShardedCourseGradeReport
+    return report_class.generate_shard(entry, xblock_instance_args, action_name, id_range, subtask_status_dict)
+
+
 class ProblemResponses:
     """
     Class to encapsulate functionality related to generating Problem Responses Reports.
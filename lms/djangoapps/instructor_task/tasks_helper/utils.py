@@ -74,6 +74,31 @@ def upload_csv_file_to_report_store(file, csv_name, course_id, timestamp, config
     return report_name
 
 
+def upload_parquet_file_to_report_store(file, report_name, course_id, timestamp, config_name='GRADES_DOWNLOAD',
+                                       parent_dir=''):
+    """
+    Upload a Parquet file using ReportStore.
+
+    Arguments:
+        file: Parquet data in a binary file-like object
+        report_name: Name of the resulting report
+        course_id: ID of the course
+        parent_dir: Name of the directory where the file will be stored
+
+    Returns:
+        report_name: string - Name of the generated report
+    """
+    report_store = ReportStore.from_config(config_name)
+    filename = "{course_prefix}_{report_name}_{timestamp_str}.parquet".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        report_name=report_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
+    report_store.store(course_id, filename, file, parent_dir)
+    return filename
+
+
 def upload_zip_to_report_store(file, zip_name, course_id, timestamp, config_name='GRADES_DOWNLOAD'):
     """
     Upload given file buffer as a zip file using ReportStore.
@@ -7,6 +7,7 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 
 
+import json
 import os
 import shutil
 import tempfile
@@ -16,8 +17,10 @@ from datetime import datetime, timedelta
 from unittest.mock import ANY, MagicMock, Mock, patch
 
 import ddt
+import pyarrow.parquet
 import pytest
 import unicodecsv
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
@@ -42,6 +45,7 @@ from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsec
 from lms.djangoapps.grades.subsection_grade import CreateSubsectionGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
 from lms.djangoapps.instructor_analytics.basic import UNAVAILABLE, list_problem_responses
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
@@ -50,6 +54,7 @@ from lms.djangoapps.instructor_task.tasks_helper.grades import (
     CourseGradeReport,
     ProblemGradeReport,
     ProblemResponses,
+    ShardedCourseGradeReport,
 )
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
@@ -58,6 +63,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_ora2_submission_files,
     upload_ora2_summary,
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -86,7 +92,7 @@ from xmodule.partitions.partitions import Group, UserPartition  # pylint: disabl
 # noinspection PyUnresolvedReferences
 from xmodule.tests.helpers import override_descriptor_system  # pylint: disable=unused-import  # noqa: F401
 
-from ..models import ReportStore
+from ..models import PROGRESS, InstructorTask, ReportStore
 from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED
 
 _TEAMS_CONFIG = TeamsConfig({
@@ -94,6 +100,8 @@ _TEAMS_CONFIG = TeamsConfig({
     'topics': [{'id': 'topic', 'name': 'Topic', 'description': 'A Topic'}],
 })
 USE_ON_DISK_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_on_disk_grade_reporting'
+USE_SHARDED_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_sharded_grade_reporting'
+COLUMNAR_GRADE_REPORTS = 'lms.djangoapps.instructor_task.tasks_helper.grades.columnar_grade_reports'
 
 QUERY_COUNT_TABLE_IGNORELIST = AUTHZ_TABLES
 
@@ -451,6 +459,133 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         )
 
 
+@ddt.ddt
+@patch(COLUMNAR_GRADE_REPORTS, Mock(return_value=True))
+@patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task', Mock())
+class TestColumnarGradeReport(InstructorGradeReportTestCase):
+    """
+    Tests that grade reports are also uploaded in a columnar format when enabled.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.students = [self.create_student(f'student{i}') for i in range(2)]
+
+    def _report_filenames(self):
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        return [filename for filename, _ in report_store.links_for(self.course.id)]
+
+    @ddt.data(True, False)
+    def test_columnar_report(self, use_tempfile):
+        with patch(USE_ON_DISK_GRADE_REPORT, return_value=use_tempfile):
+            CourseGradeReport.generate(None, None, self.course.id, {}, 'graded')
+
+        filenames = self._report_filenames()
+        assert len(filenames) == 2
+        columnar_filename = next(filename for filename in filenames if filename.endswith('.parquet'))
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        with report_store.storage.open(report_store.path_to(self.course.id, columnar_filename), 'rb') as report_file:
+            table = pyarrow.parquet.read_table(report_file)
+        assert str(table.schema.field('Student ID').type) == 'int64'
+        assert str(table.schema.field('Grade').type) == 'double'
+        assert table.column('Username').to_pylist() == [student.username for student in self.students]
+        assert table.column('Grade').to_pylist() == [0.0, 0.0]
+
+    @ddt.data(True, False)
+    def test_columnar_report_disabled(self, use_tempfile):
+        with patch(COLUMNAR_GRADE_REPORTS, return_value=False):
+            with patch(USE_ON_DISK_GRADE_REPORT, return_value=use_tempfile):
+                CourseGradeReport.generate(None, None, self.course.id, {}, 'graded')
+
+        filenames = self._report_filenames()
+        assert len(filenames) == 1
+        assert filenames[0].endswith('.csv')
+
+
+@override_settings(GRADE_REPORT_LEARNERS_PER_SHARD=2)
+@patch(USE_SHARDED_GRADE_REPORT, Mock(return_value=True))
+@patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task', Mock())
+class TestShardedGradeReport(InstructorGradeReportTestCase):
+    """
+    Tests that grade reports generated in shards are merged, and can be resumed.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.students = [self.create_student(f'student{i}') for i in range(3)]
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type=InstructorTaskTypes.GRADE_COURSE,
+            task_id='grade-report-task',
+            task_key='',
+        )
+
+    def _generate(self):
+        return CourseGradeReport.generate({'task_id': self.entry.task_id}, self.entry.id, self.course.id, {}, 'graded')
+
+    def _report_usernames(self):
+        """
+        Returns the usernames in the report, in order.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        assert len(links) == 1
+        with report_store.storage.open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            return [row['Username'] for row in unicodecsv.DictReader(csv_file)]
+
+    def test_shards_merged(self):
+        self._generate()
+
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        assert entry.task_state == SUCCESS
+        assert json.loads(entry.subtasks)['total'] == 2
+        assert_dict_contains_subset(self, {'attempted': 3, 'succeeded': 3, 'failed': 0}, json.loads(entry.task_output))
+        assert self._report_usernames() == [student.username for student in self.students]
+
+    def test_in_progress_until_merged(self):
+        states = []
+
+        def record_state(report, subtask_ids):  # pylint: disable=unused-argument
+            states.append(InstructorTask.objects.get(pk=self.entry.id).task_state)
+
+        with patch.object(ShardedCourseGradeReport, '_merge_shards', autospec=True, side_effect=record_state):
+            self._generate()
+
+        # All the shards were done when merging, but the report wasn't.
+        assert states == [PROGRESS]
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        assert entry.task_state == SUCCESS
+        assert json.loads(entry.subtasks)['merged']
+
+    def test_resume_failed_shard(self):
+        write_shard = ShardedCourseGradeReport._write_shard  # pylint: disable=protected-access
+        shards_written = []
+
+        def fail_first_shard(report, subtask_id, id_range):
+            shards_written.append(subtask_id)
+            if len(shards_written) == 1:
+                raise ValueError('Worker lost')
+            return write_shard(report, subtask_id, id_range)
+
+        with patch.object(ShardedCourseGradeReport, '_write_shard', autospec=True, side_effect=fail_first_shard):
+            self._generate()
+            entry = InstructorTask.objects.get(pk=self.entry.id)
+            assert entry.task_state == FAILURE
+            assert not ReportStore.from_config(config_name='GRADES_DOWNLOAD').links_for(self.course.id)
+
+            self._generate()
+
+        # Only the failed shard was graded again.
+        assert len(shards_written) == 3
+        assert shards_written[2] == shards_written[0]
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        assert entry.task_state == SUCCESS
+        assert_dict_contains_subset(self, {'attempted': 3, 'succeeded': 3, 'failed': 0}, json.loads(entry.task_output))
+        assert self._report_usernames() == [student.username for student in self.students]
+
+
 @ddt.ddt
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
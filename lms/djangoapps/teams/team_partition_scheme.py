@@ -96,6 +96,50 @@ class TeamPartitionScheme:
 
         return Group(user_team.team.id, str(user_team.team.name))
 
+    @classmethod
+    def get_groups_for_users(cls, course_key, users, user_partition):
+        """Get the (Content) Groups from the specified user partition for many users.
+
+        This gives the same result as calling get_group_for_user for each user, but
+        the team memberships of all the users are fetched with a single query.
+
+        Args:
+            course_key (CourseKey): The course key.
+            users (list of User): The users.
+            user_partition (UserPartition): The user partition.
+
+        Returns:
+            dict: Mapping from user ID to the Group of the user in the specified user
+            partition. Users who don't belong to any group are left out.
+        """
+        if not CONTENT_GROUPS_FOR_TEAMS.is_enabled(course_key):
+            return {}
+
+        groups = {}
+        users_to_fetch = []
+        for user in users:
+            # Masquerading users need the special handling of get_group_for_user.
+            if get_course_masquerade(user, course_key):
+                group = cls.get_group_for_user(course_key, user, user_partition)
+                if group is not None:
+                    groups[user.id] = group
+            else:
+                users_to_fetch.append(user)
+
+        if not users_to_fetch:
+            return groups
+
+        teams = get_teams_in_teamset(str(course_key), user_partition.parameters["team_set_id"])
+        team_ids = [team.team_id for team in teams]
+        memberships = CourseTeamMembership.get_memberships(
+            course_ids=[str(course_key)], team_ids=team_ids,
+        ).filter(user__in=users_to_fetch).select_related('team').order_by('id')
+        for membership in memberships:
+            # A user cannot belong to more than one team in a team-set by definition.
+            groups.setdefault(membership.user_id, Group(membership.team.id, str(membership.team.name)))
+
+        return groups
+
     @classmethod
     def create_user_partition(cls, id, name, description, groups=None, parameters=None, active=True):    # pylint: disable=redefined-builtin, invalid-name, unused-argument
         """Create a custom UserPartition to support dynamic groups based on teams.
@@ -157,6 +157,38 @@ class TestTeamPartitionScheme(ModuleStoreTestCase):
             self.course_key, self.student, team_partition_scheme
         ) == team_partition_scheme.groups[0]
 
+    @patch("lms.djangoapps.teams.team_partition_scheme.TeamsConfigurationService")
+    def test_get_groups_for_users(self, mock_teams_configuration_service):
+        """
+        Test that the TeamPartitionScheme returns the same groups for many users
+        as it does for each of them.
+
+        Expected result:
+        - The students in a team get the group of their team, the others none.
+        """
+        mock_teams_configuration_service().get_teams_configuration.return_value.teamsets = self.team_sets
+        team = CourseTeamFactory.create(
+            name="Team in 1st TeamSet",
+            course_id=self.course_key,
+            topic_id=self.team_sets[0].teamset_id,
+        )
+        team.add_user(self.student)
+        other_student = UserFactory.create()
+        other_student.courseenrollment_set.create(course_id=self.course_key, is_active=True)
+        team_partition_scheme = TeamPartitionScheme.create_user_partition(
+            id=self.team_sets[0].user_partition_id,
+            name=f"Team Group: {self.team_sets[0].name}",
+            description="Partition for segmenting users by team-set",
+            parameters={
+                "course_id": str(self.course_key),
+                "team_set_id": self.team_sets[0].teamset_id,
+            }
+        )
+
+        assert TeamPartitionScheme.get_groups_for_users(
+            self.course_key, [self.student, other_student], team_partition_scheme
+        ) == {self.student.id: team_partition_scheme.groups[0]}
+
     def test_get_group_for_user_no_team(self):
         """
         Test that the TeamPartitionScheme returns None for a student not in a team.
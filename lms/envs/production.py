@@ -451,6 +451,8 @@ EXPLICIT_QUEUES = {
         'queue': GRADES_DOWNLOAD_ROUTING_KEY},  # noqa: F405
     'lms.djangoapps.instructor_task.tasks.calculate_problem_grade_report': {
         'queue': GRADES_DOWNLOAD_ROUTING_KEY},  # noqa: F405
+    'lms.djangoapps.instructor_task.tasks.generate_grade_report_shard': {
+        'queue': GRADES_DOWNLOAD_ROUTING_KEY},  # noqa: F405
     'lms.djangoapps.instructor_task.tasks.generate_certificates': {
         'queue': GRADES_DOWNLOAD_ROUTING_KEY},  # noqa: F405
     'lms.djangoapps.verify_student.tasks.send_verification_status_email': {
@@ -6,10 +6,13 @@ Module with family of classes for block structures.
 
 The following internal data structures are implemented:
     _BlockRelations - Data structure for a single block's relations.
+    _BlockRelationsMap - Map of usage keys to their _BlockRelations.
     _BlockData - Data structure for a single block's data.
 """
 
 
+import itertools
+from array import array
 from copy import deepcopy
 from functools import partial
 from logging import getLogger
@@ -31,6 +34,8 @@ class _BlockRelations:
     Data structure to encapsulate relationships for a single block,
     including its children and parents.
     """
+    __slots__ = ('parents', 'children')
+
     def __init__(self):
 
         # List of usage keys of this block's parents.
@@ -41,6 +46,80 @@ class _BlockRelations:
         # list [UsageKey]
         self.children = []
 
+    def __getstate__(self):
+        return {'parents': self.parents, 'children': self.children}
+
+    def __setstate__(self, state):
+        # Also accepts the __dict__ of instances pickled before __slots__ were used.
+        self.parents = state['parents']
+        self.children = state['children']
+
+
+def _pack_relations(relations_lists, key_indices):
+    """
+    Returns the given lists of usage keys as a CSR-style pair of
+    arrays: the indices of all the keys, and the offset at which each
+    list starts (plus the end offset of the last one).
+    """
+    offsets = array('I', [0])
+    indices = array('I')
+    for relations in relations_lists:
+        indices.extend(key_indices[usage_key] for usage_key in relations)
+        offsets.append(len(indices))
+    return offsets, indices
+
+
+def _unpack_block_relations(keys, num_blocks, child_offsets, child_indices, parent_offsets, parent_indices):
+    """
+    Rebuilds the _BlockRelationsMap pickled by _BlockRelationsMap.__reduce__.
+    """
+    block_relations = _BlockRelationsMap()
+    for index in range(num_blocks):
+        relations = _BlockRelations.__new__(_BlockRelations)
+        relations.children = [keys[i] for i in child_indices[child_offsets[index]:child_offsets[index + 1]]]
+        relations.parents = [keys[i] for i in parent_indices[parent_offsets[index]:parent_offsets[index + 1]]]
+        block_relations[keys[index]] = relations
+    return block_relations
+
+
+class _BlockRelationsMap(dict):
+    """
+    Map of a block's usage key to its _BlockRelations.
+
+    Pickles compactly: each usage key is written once, and the parents
+    and children of all the blocks are written as CSR-style arrays of
+    integer indices into those keys, rather than as per-block objects
+    holding lists of keys.
+
+    The index arrays are only the stored form. Once loaded, relations are
+    per-block lists again, since transformers edit them block by block
+    (remove_block, pruning) and get_children/get_parents hand the lists
+    out directly; rebuilding the arrays on every edit would cost more
+    than it saves. See perf_tests/test_block_relations.py for how the
+    two forms compare.
+    """
+    def __reduce__(self):
+        keys = list(self)
+        key_indices = {usage_key: index for index, usage_key in enumerate(keys)}
+        num_blocks = len(keys)
+        # Relations should only refer to blocks in the map, but don't lose any that don't.
+        for relations in self.values():
+            for usage_key in itertools.chain(relations.children, relations.parents):
+                if usage_key not in key_indices:
+                    key_indices[usage_key] = len(keys)
+                    keys.append(usage_key)
+
+        child_offsets, child_indices = _pack_relations(
+            (relations.children for relations in self.values()), key_indices
+        )
+        parent_offsets, parent_indices = _pack_relations(
+            (relations.parents for relations in self.values()), key_indices
+        )
+        return (
+            _unpack_block_relations,
+            (keys, num_blocks, child_offsets, child_indices, parent_offsets, parent_indices),
+        )
+
 
 class BlockStructure:
     """
@@ -61,8 +140,8 @@ class BlockStructure:
         # Map of a block's usage key to its block relations. The
         # existence of a block in the structure is determined by its
         # presence in this map.
-        # dict {UsageKey: _BlockRelations}
-        self._block_relations = {}
+        # _BlockRelationsMap {UsageKey: _BlockRelations}
+        self._block_relations = _BlockRelationsMap()
 
         # Add the root block.
         self._add_block(self._block_relations, root_block_usage_key)
@@ -210,7 +289,7 @@ class BlockStructure:
 
         # Create a new block relations map to store only those blocks
         # that are still linked
-        pruned_block_relations = {}
+        pruned_block_relations = _BlockRelationsMap()
         old_block_relations = self._block_relations
 
         # Build the structure from the leaves up by doing a post-order
@@ -282,7 +361,13 @@ class BlockStructure:
 class FieldData:
     """
     Data structure to encapsulate collected fields.
+
+    Instances use __slots__ rather than a per-instance __dict__, since a
+    block structure holds one for every block and every transformer's
+    data for it.
     """
+    __slots__ = ('fields',)
+
     def class_field_names(self):
         """
         Returns list of names of fields that are defined directly
@@ -316,6 +401,14 @@ class FieldData:
         else:
             del self.fields[field_name]
 
+    def __getstate__(self):
+        return {field_name: getattr(self, field_name) for field_name in self.class_field_names()}
+
+    def __setstate__(self, state):
+        # Also accepts the __dict__ of instances pickled before __slots__ were used.
+        for field_name, field_value in state.items():
+            object.__setattr__(self, field_name, field_value)
+
     def _is_own_field(self, field_name):
         """
         Returns whether the given field_name is the name of an
@@ -328,6 +421,7 @@ class TransformerData(FieldData):
     """
     Data structure to encapsulate collected data for a transformer.
     """
+    __slots__ = ()
 
 
 class TransformerDataMap(dict):
@@ -380,6 +474,8 @@ class BlockData(FieldData):
     """
     Data structure to encapsulate collected data for a single block.
     """
+    __slots__ = ('location', 'transformer_data')
+
     def class_field_names(self):
         return super().class_field_names() + ['location', 'transformer_data']
 
@@ -406,7 +502,7 @@ class BlockStructureBlockData(BlockStructure):
     # update this value whenever the data structure changes. Dependent storage
     # layers can then use this value when serializing/deserializing block
     # structures, and invalidating any previously cached/stored data.
-    VERSION = 2
+    VERSION = 4
 
     def __init__(self, root_block_usage_key):
         super().__init__(root_block_usage_key)
@@ -4,6 +4,7 @@ BlockStructures.
 """
 
 
+import logging
 from contextlib import contextmanager
 
 from xmodule.modulestore import ModuleStoreEnum
@@ -13,6 +14,8 @@ from .factory import BlockStructureFactory
 from .store import BlockStructureStore
 from .transformers import BlockStructureTransformers
 
+logger = logging.getLogger(__name__)
+
 
 class BlockStructureManager:
     """
@@ -66,8 +69,22 @@ class BlockStructureManager:
             BlockStructureBlockData - A transformed block structure,
                 starting at starting_block_usage_key.
         """
-        block_structure = collected_block_structure.copy() if collected_block_structure else self.get_collected(user)
-
+        try:
+            block_structure = (
+                collected_block_structure.copy() if collected_block_structure else self.get_collected(user)
+            )
+            return self._transform(block_structure, transformers, starting_block_usage_key)
+        except BlockStructureNotFound:
+            # Some of the stored data, which is decoded as the transformers use it, turned
+            # out to be unreadable. Throw it away, and transform freshly collected data.
+            logger.exception("BlockStructure: Failed to decode the stored data of %s", self.root_block_usage_key)
+            self.clear()
+            return self._transform(self.get_collected(user), transformers, starting_block_usage_key)
+
+    def _transform(self, block_structure, transformers, starting_block_usage_key):
+        """
+        Transforms the given block structure, starting at starting_block_usage_key (see get_transformed).
+        """
         if starting_block_usage_key:
             # Override the root_block_usage_key so traversals start at the
             # requested location.  The rest of the structure will be pruned
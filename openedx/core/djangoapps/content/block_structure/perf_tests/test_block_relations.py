@@ -0,0 +1,108 @@
+"""
+Performance test comparing the per-block and index-packed pickles of block structure relations.
+
+Run with::
+
+    RUN_PERF_TESTS=1 pytest -s openedx/core/djangoapps/content/block_structure/perf_tests/test_block_relations.py
+"""
+
+
+import gc
+import os
+import pickle
+import time
+import tracemalloc
+import unittest
+
+import ddt
+from opaque_keys.edx.keys import CourseKey
+
+from ..block_structure import BlockStructureModulestoreData
+
+# (chapters, sequentials per chapter, verticals per sequential, components per vertical),
+# which generate structures of roughly 2k and 20k blocks.
+STRUCTURE_SHAPES = (
+    (10, 10, 4, 4),
+    (20, 20, 10, 4),
+)
+
+# How many loads to time for each structure.
+ITERATIONS = 5
+
+
+def _make_block_structure(num_chapters, num_sequentials, num_verticals, num_components):
+    """
+    Return a BlockStructureModulestoreData with the given shape, and a few blocks with several parents.
+    """
+    course_key = CourseKey.from_string('course-v1:edX+Perf+Test')
+    root = course_key.make_usage_key('course', 'course')
+    block_structure = BlockStructureModulestoreData(root)
+    for chapter_index in range(num_chapters):
+        chapter = course_key.make_usage_key('chapter', f'chapter_{chapter_index}')
+        block_structure._add_relation(root, chapter)  # pylint: disable=protected-access
+        for sequential_index in range(num_sequentials):
+            sequential = course_key.make_usage_key('sequential', f'sequential_{chapter_index}_{sequential_index}')
+            block_structure._add_relation(chapter, sequential)  # pylint: disable=protected-access
+            for vertical_index in range(num_verticals):
+                vertical_id = f'{chapter_index}_{sequential_index}_{vertical_index}'
+                vertical = course_key.make_usage_key('vertical', f'vertical_{vertical_id}')
+                block_structure._add_relation(sequential, vertical)  # pylint: disable=protected-access
+                for component_index in range(num_components):
+                    component = course_key.make_usage_key('problem', f'problem_{vertical_id}_{component_index}')
+                    block_structure._add_relation(vertical, component)  # pylint: disable=protected-access
+    return block_structure
+
+
+def _measure(load):
+    """
+    Return (best wall time in ms, memory retained by the result in KB, peak traced memory in KB) for ``load``.
+    """
+    timings = []
+    for __ in range(ITERATIONS):
+        gc.collect()
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = load()  # pylint: disable=unused-variable  # noqa: F841
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(timings) * 1000, retained / 1024, peak / 1024
+
+
+@ddt.ddt
+@unittest.skipUnless(os.environ.get('RUN_PERF_TESTS'), "Performance tests are only run on request.")
+class BlockRelationsPickleTiming(unittest.TestCase):
+    """
+    Times unpickling the relations of a block structure, and measures the memory they take once loaded.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    @ddt.data(*STRUCTURE_SHAPES)
+    @ddt.unpack
+    def test_unpickle_timings(self, num_chapters, num_sequentials, num_verticals, num_components):
+        block_structure = _make_block_structure(num_chapters, num_sequentials, num_verticals, num_components)
+        block_relations = block_structure._block_relations  # pylint: disable=protected-access
+        # A plain dict pickles one _BlockRelations with lists of usage keys per block, as before.
+        per_block = pickle.dumps(dict(block_relations), 4)
+        packed = pickle.dumps(block_relations, 4)
+        root = block_structure.root_block_usage_key
+        assert pickle.loads(packed)[root].children == pickle.loads(per_block)[root].children
+
+        per_block_ms, per_block_kb, per_block_peak_kb = _measure(lambda: pickle.loads(per_block))
+        packed_ms, packed_kb, packed_peak_kb = _measure(lambda: pickle.loads(packed))
+
+        print(
+            f"\n{len(block_structure)} blocks:"
+            f"\n  per block: {len(per_block):>10} bytes  {per_block_ms:8.1f} ms"
+            f"  {per_block_kb:10.0f} KB retained  {per_block_peak_kb:10.0f} KB peak"
+            f"\n  packed:    {len(packed):>10} bytes  {packed_ms:8.1f} ms"
+            f"  {packed_kb:10.0f} KB retained  {packed_peak_kb:10.0f} KB peak"
+        )
@@ -0,0 +1,304 @@
+"""
+Sectioned serialization of block structures for the BlockStructureStore.
+
+The serialized data is split into independently compressed sections, listed
+in a table of contents at the start of the data:
+
+    * 'structure' - the block relations, the structure-wide transformer data
+      (which holds each transformer's version, as checked by
+      BlockStructureTransformers.verify_versions) and each block's collected
+      xBlock fields.
+    * 'transformer:<name>' - one section per transformer, holding the data
+      that transformer collected for each block.
+
+Deserializing only decodes the 'structure' section. A transformer's section is
+decoded the first time any block's data for that transformer is accessed, so
+a request only pays for the transformers it actually uses.
+
+The table of contents records the CRC-32 of every section, and all of them are
+checked when the data is deserialized, so that corrupt data is rejected up
+front (and the block structure rebuilt) rather than when a transformer first
+uses its section. A section that still fails to decode later on (e.g. because
+it was pickled with classes that changed since) raises BlockStructureNotFound.
+
+Layout:
+
+    MAGIC (8 bytes) | table of contents length (4 bytes, little-endian) |
+    table of contents (pickle) | sections (each a zlib-compressed pickle)
+
+The table of contents is a dict holding the format version, and a list of
+(name, offset, length, crc32) entries for the sections.
+
+Data serialized before this format existed is a zlib-compressed pickle of the
+(block relations, transformer data, block data map) tuple, and can still be
+loaded with :func:`deserialize`.
+"""
+import pickle
+import struct
+import zlib
+
+from openedx.core.lib.cache_utils import zunpickle
+
+from .block_structure import BlockData, TransformerDataMap
+from .exceptions import BlockStructureNotFound
+from .factory import BlockStructureFactory
+
+MAGIC = b'BSSECTS\x00'
+FORMAT_VERSION = 2
+
+_TOC_LENGTH = struct.Struct('<I')
+
+STRUCTURE_SECTION = 'structure'
+TRANSFORMER_SECTION_PREFIX = 'transformer:'
+
+
+class _TransformerSections:
+    """
+    The not yet decoded transformer sections of a deserialized block structure.
+    """
+    def __init__(self, data, sections, block_data_list, root_block_usage_key):
+        self._data = data
+        self._root_block_usage_key = root_block_usage_key
+        # {transformer name: (offset, length)}
+        self._sections = sections
+        # BlockData objects, in the order their data is stored in each section.
+        self._block_data_list = block_data_list
+        self.pending = set(sections)
+
+    def load(self, transformer_name):
+        """
+        Decodes the section of the given transformer, if it's pending, into
+        the transformer data maps of the blocks.
+
+        Raises:
+            BlockStructureNotFound if the section can't be decoded.
+        """
+        if transformer_name not in self.pending:
+            return
+        offset, length = self._sections[transformer_name]
+        try:
+            block_transformer_data = pickle.loads(zlib.decompress(self._data[offset:offset + length]))
+        except Exception as exc:
+            raise BlockStructureNotFound(self._root_block_usage_key) from exc
+        self.pending.discard(transformer_name)
+        for index, transformer_data in block_transformer_data.items():
+            dict.__setitem__(self._block_data_list[index].transformer_data, transformer_name, transformer_data)
+        if not self.pending:
+            self._data = None
+
+    def load_all(self):
+        """
+        Decodes all the pending sections.
+        """
+        for transformer_name in list(self.pending):
+            self.load(transformer_name)
+
+
+class _LazyTransformerDataMap(TransformerDataMap):
+    """
+    A block's TransformerDataMap whose entries are decoded from their
+    sections on first access.
+
+    Lookups by transformer only decode that transformer's section; anything
+    that needs the whole map (iteration, pickling, copying) decodes them all.
+    """
+    __slots__ = ('_transformer_sections',)
+
+    def __init__(self, transformer_sections):
+        super().__init__()
+        self._transformer_sections = transformer_sections
+
+    def _load(self, key):
+        """
+        Makes sure the section of the transformer identified by key is loaded.
+        """
+        if self._transformer_sections.pending:
+            self._transformer_sections.load(self._translate_key(key))
+
+    def _load_all(self):
+        """
+        Makes sure all the sections are loaded.
+        """
+        if self._transformer_sections.pending:
+            self._transformer_sections.load_all()
+
+    def __getitem__(self, key):
+        self._load(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        self._load(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._load(key)
+        super().__delitem__(key)
+
+    def __contains__(self, key):
+        self._load(key)
+        return dict.__contains__(self, self._translate_key(key))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __iter__(self):
+        self._load_all()
+        return super().__iter__()
+
+    def __len__(self):
+        self._load_all()
+        return super().__len__()
+
+    def __eq__(self, other):
+        self._load_all()
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def keys(self):
+        self._load_all()
+        return super().keys()
+
+    def values(self):
+        self._load_all()
+        return super().values()
+
+    def items(self):
+        self._load_all()
+        return super().items()
+
+    def __reduce__(self):
+        # Copies and pickles are plain TransformerDataMaps with everything loaded.
+        self._load_all()
+        return (TransformerDataMap, (), None, None, iter(dict(self).items()))
+
+
+def is_sectioned(serialized_data):
+    """
+    Returns whether the given data was serialized by :func:`serialize`.
+    """
+    return serialized_data[:len(MAGIC)] == MAGIC
+
+
+def _section(value):
+    """
+    Returns the serialized form of a section's value.
+    """
+    return zlib.compress(pickle.dumps(value, 4))
+
+
+def serialize(block_structure):
+    """
+    Returns the sectioned serialization of the given block structure.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            whose collected data is to be serialized.
+    """
+    block_data_map = block_structure._block_data_map  # pylint: disable=protected-access
+    block_keys = list(block_data_map)
+
+    # {transformer name: {block index: TransformerData}}
+    transformer_block_data = {}
+    for index, block_data in enumerate(block_data_map.values()):
+        for transformer_name, transformer_data in block_data.transformer_data.items():
+            transformer_block_data.setdefault(transformer_name, {})[index] = transformer_data
+
+    sections = [(
+        STRUCTURE_SECTION,
+        _section((
+            block_structure._block_relations,  # pylint: disable=protected-access
+            block_structure.transformer_data,
+            block_keys,
+            [block_data.fields for block_data in block_data_map.values()],
+        )),
+    )]
+    sections.extend(
+        (TRANSFORMER_SECTION_PREFIX + transformer_name, _section(data))
+        for transformer_name, data in transformer_block_data.items()
+    )
+
+    table_of_contents = []
+    offset = 0
+    for name, section in sections:
+        table_of_contents.append((name, offset, len(section), zlib.crc32(section)))
+        offset += len(section)
+    toc_data = pickle.dumps({'version': FORMAT_VERSION, 'sections': table_of_contents}, 4)
+
+    return b''.join(
+        [MAGIC, _TOC_LENGTH.pack(len(toc_data)), toc_data] + [section for __, section in sections]
+    )
+
+
+def _deserialize_sectioned(serialized_data, root_block_usage_key):
+    """
+    Returns the block structure serialized by :func:`serialize`, with
+    its transformer sections left to be decoded on demand.
+    """
+    data = memoryview(serialized_data)
+    toc_start = len(MAGIC) + _TOC_LENGTH.size
+    toc_length, = _TOC_LENGTH.unpack_from(data, len(MAGIC))
+    table_of_contents = pickle.loads(data[toc_start:toc_start + toc_length])
+    if table_of_contents['version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported block structure format version {table_of_contents['version']}")
+
+    sections_start = toc_start + toc_length
+    sections = {}
+    for name, offset, length, checksum in table_of_contents['sections']:
+        section_start = sections_start + offset
+        if section_start + length > len(data) or zlib.crc32(data[section_start:section_start + length]) != checksum:
+            raise ValueError(f"Corrupt block structure section {name}")
+        sections[name] = (section_start, length)
+
+    offset, length = sections.pop(STRUCTURE_SECTION)
+    block_relations, transformer_data, block_keys, block_fields = pickle.loads(
+        zlib.decompress(data[offset:offset + length])
+    )
+
+    block_data_list = []
+    transformer_sections = _TransformerSections(
+        data,
+        {
+            name[len(TRANSFORMER_SECTION_PREFIX):]: location
+            for name, location in sections.items()
+            if name.startswith(TRANSFORMER_SECTION_PREFIX)
+        },
+        block_data_list,
+        root_block_usage_key,
+    )
+    block_data_map = {}
+    for usage_key, fields in zip(block_keys, block_fields, strict=True):
+        block_data = BlockData.__new__(BlockData)
+        object.__setattr__(block_data, 'location', usage_key)
+        object.__setattr__(block_data, 'fields', fields)
+        object.__setattr__(block_data, 'transformer_data', _LazyTransformerDataMap(transformer_sections))
+        block_data_list.append(block_data)
+        block_data_map[usage_key] = block_data
+
+    return BlockStructureFactory.create_new(root_block_usage_key, block_relations, transformer_data, block_data_map)
+
+
+def deserialize(serialized_data, root_block_usage_key):
+    """
+    Returns the block structure for the given serialized data, in either
+    the sectioned or the original pickled format.
+
+    Arguments:
+        serialized_data (bytes) - Data returned by :func:`serialize`, or
+            a zpickled (block relations, transformer data, block data map)
+            tuple.
+
+        root_block_usage_key (UsageKey) - The usage_key for the root of
+            the block structure.
+
+    Returns:
+        BlockStructureBlockData - The deserialized block structure.
+    """
+    if is_sectioned(serialized_data):
+        return _deserialize_sectioned(serialized_data, root_block_usage_key)
+
+    block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+    return BlockStructureFactory.create_new(root_block_usage_key, block_relations, transformer_data, block_data_map)
@@ -8,13 +8,11 @@ from logging import getLogger
 
 from edx_django_utils import monitoring
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
-
 from . import config
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
-from .factory import BlockStructureFactory
 from .models import BlockStructureModel
+from .serialization import deserialize, serialize
 from .transformer_registry import TransformerRegistry
 
 logger = getLogger(__name__)  # pylint: disable=C0103
@@ -174,13 +172,11 @@ class BlockStructureStore:
     def _serialize(self, block_structure):
         """
         Serializes the data for the given block_structure.
+
+        Each transformer's data is stored in its own section, so that
+        only the sections that are used get deserialized.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        return zpickle(data_to_cache)
+        return serialize(block_structure)
 
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
@@ -188,20 +184,13 @@ class BlockStructureStore:
         """
 
         try:
-            block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+            return deserialize(serialized_data, root_block_usage_key)
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
             bs_model = self._get_model(root_block_usage_key)
             logger.exception("BlockStructure: Failed to load data from cache for %s", bs_model)
             raise BlockStructureNotFound(bs_model.data_usage_key)  # pylint: disable=raise-missing-from  # noqa: B904
 
-        return BlockStructureFactory.create_new(
-            root_block_usage_key,
-            block_relations,
-            transformer_data,
-            block_data_map,
-        )
-
     @staticmethod
     def _encode_root_cache_key(bs_model):
         """
@@ -4,6 +4,7 @@ Tests for block_structure.py
 
 
 import itertools
+import pickle
 
 # pylint: disable=protected-access
 from collections import namedtuple
@@ -15,7 +16,7 @@ import ddt
 
 from openedx.core.lib.graph_traversals import traverse_post_order
 
-from ..block_structure import BlockStructure, BlockStructureModulestoreData
+from ..block_structure import BlockData, BlockStructure, BlockStructureModulestoreData
 from ..exceptions import TransformerException
 from .helpers import ChildrenMapTestMixin, MockTransformer, MockXBlock
 
@@ -293,3 +294,28 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         assert _get_value(block_structure) == 'edit1'
         assert _get_value(new_copy) == 'edit2'
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_pickle(self, children_map):
+        block_structure = self.create_block_structure(children_map)
+        block_structure.override_xblock_field(1, 'display_name', 'Block 1')
+        block_structure.set_transformer_block_field(1, 'transformer', 'test_key', 'test_value')
+
+        block_relations, block_data_map = pickle.loads(
+            pickle.dumps((block_structure._block_relations, block_structure._block_data_map), 4)
+        )
+        for block in block_structure:
+            assert block_relations[block].parents == block_structure.get_parents(block)
+            assert block_relations[block].children == block_structure.get_children(block)
+        assert block_data_map[1].display_name == 'Block 1'
+        assert block_data_map[1].transformer_data['transformer'].test_key == 'test_value'
+
+    def test_unpickle_instance_dict(self):
+        # Block data pickled before the classes used __slots__ holds an instance __dict__.
+        block_data = BlockData.__new__(BlockData)
+        block_data.__setstate__({'fields': {'display_name': 'Block 1'}, 'location': 1, 'transformer_data': {}})
+        assert block_data.usage_key == 1
+        assert block_data.display_name == 'Block 1'
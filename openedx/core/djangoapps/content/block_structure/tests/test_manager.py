@@ -2,7 +2,8 @@
 Tests for manager.py
 """
 
-from unittest.mock import MagicMock
+import zlib
+from unittest.mock import MagicMock, patch
 
 import ddt
 import pytest
@@ -169,6 +170,35 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
             )
             self.assert_block_structure(block_structure, expected_structure, missing_blocks=expected_missing_blocks)
 
+    def test_get_transformed_with_undecodable_data(self):
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.get_collected()
+            self.modulestore.get_items_call_count = 0
+
+            decompress = zlib.decompress
+            decompressed = []
+
+            def decompress_structure_only(data):
+                """
+                Decompress the structure section, but none of the transformer sections.
+                """
+                decompressed.append(data)
+                if len(decompressed) > 1:
+                    raise zlib.error
+                return decompress(data)
+
+            with patch(
+                'openedx.core.djangoapps.content.block_structure.serialization.zlib.decompress',
+                side_effect=decompress_structure_only,
+            ):
+                block_structure = self.bs_manager.get_transformed(self.transformers)
+
+        # The data was collected again, and transformed.
+        assert self.modulestore.get_items_call_count > 0
+        assert TestTransformer1.collect_call_count == 2
+        self.assert_block_structure(block_structure, self.children_map)
+        TestTransformer1.assert_transformed(block_structure)
+
     def test_get_transformed_with_nonexistent_starting_block(self):
         with mock_registered_transformers(self.registered_transformers):
             with pytest.raises(UsageKeyNotInBlockStructure):
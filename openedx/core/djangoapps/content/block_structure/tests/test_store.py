@@ -1,11 +1,14 @@
 """
 Tests for block_structure/cache.py
 """
+import zlib
+from unittest.mock import patch
 
 import ddt
 import pytest
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from openedx.core.lib.cache_utils import zpickle
 
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
@@ -76,3 +79,48 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         assert self.mock_cache.timeout_from_last_call == 0
         self.store.add(self.block_structure)
         assert self.mock_cache.timeout_from_last_call == timeout
+
+    def test_transformer_data_loaded_on_demand(self):
+        self.store.add(self.block_structure)
+        stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        root_block_key = self.block_key_factory(0)
+
+        # Only the structure-wide data, which holds the transformers' versions, is loaded up front.
+        version = stored_value._get_transformer_data_version(MockTransformer)  # pylint: disable=protected-access
+        assert version == MockTransformer.WRITE_VERSION
+        assert not dict.__contains__(stored_value[root_block_key].transformer_data, MockTransformer.name())
+
+        value = stored_value.get_transformer_block_field(root_block_key, MockTransformer, 'test')
+        assert value == 'MockTransformer val'
+        assert dict.__contains__(stored_value[root_block_key].transformer_data, MockTransformer.name())
+
+    def test_get_pickled_data(self):
+        # Data stored before the sectioned format is a zpickled tuple.
+        self.store.add(self.block_structure)
+        self.mock_cache.map[next(iter(self.mock_cache.map))] = zpickle((
+            self.block_structure._block_relations,  # pylint: disable=protected-access
+            self.block_structure.transformer_data,
+            self.block_structure._block_data_map,  # pylint: disable=protected-access
+        ))
+        stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(stored_value, self.children_map)
+        assert stored_value.get_transformer_block_field(
+            self.block_key_factory(0), MockTransformer, 'test'
+        ) == 'MockTransformer val'
+
+    def test_get_corrupt_data(self):
+        self.store.add(self.block_structure)
+        cache_key = next(iter(self.mock_cache.map))
+        serialized_data = self.mock_cache.map[cache_key]
+        # Flip a bit of the last section, which holds transformer data that's only decoded on demand.
+        self.mock_cache.map[cache_key] = serialized_data[:-1] + bytes([serialized_data[-1] ^ 1])
+        with pytest.raises(BlockStructureNotFound):
+            self.store.get(self.block_structure.root_block_usage_key)
+
+    def test_undecodable_transformer_data(self):
+        self.store.add(self.block_structure)
+        stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        with patch('openedx.core.djangoapps.content.block_structure.serialization.zlib.decompress') as decompress:
+            decompress.side_effect = zlib.error
+            with pytest.raises(BlockStructureNotFound):
+                stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test')
@@ -5,6 +5,7 @@ from .outlines import (
     get_course_outline,  # noqa: F401
     get_user_course_outline,  # noqa: F401
     get_user_course_outline_details,  # noqa: F401
+    get_user_course_outlines,  # noqa: F401
     key_supports_outlines,  # noqa: F401
     replace_course_outline,  # noqa: F401
 )
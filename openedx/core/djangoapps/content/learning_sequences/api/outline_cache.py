@@ -0,0 +1,250 @@
+"""
+Caching for CourseOutlineData.
+
+Outlines are cached in two tiers, both keyed on the course's published_version:
+
+* A small, process-local LRU cache of CourseOutlineData objects, so that the
+  busy courses of a process don't need any reconstruction at all.
+* The shared Django cache, where outlines are stored in a compact serialized
+  form: nested tuples of primitives, pickled and compressed. It's much smaller
+  than a pickled CourseOutlineData (which repeats the opaque key and attrs
+  class information for every section and sequence) and faster to load.
+
+Every entry also records the time its LearningContext was last modified, so
+that an outline that was replaced without a new published_version (e.g. when
+re-running the outline generation of a course) is never served stale. Callers
+pass in the current modification time when reading from the cache.
+
+Do not import from this module outside of the learning_sequences api package.
+"""
+import pickle
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional  # noqa: UP035
+
+from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey
+
+from ..data import (
+    CourseLearningSequenceData,
+    CourseOutlineData,
+    CourseSectionData,
+    CourseVisibility,
+    ExamData,
+    VisibilityData,
+)
+
+# How long outlines stay in the shared cache (in seconds).
+SHARED_CACHE_TIMEOUT = 300
+
+# How many outlines each process keeps in memory.
+PROCESS_CACHE_MAX_SIZE = 64
+
+# Bump this whenever the serialized format changes.
+_SERIALIZATION_VERSION = 1
+
+_process_cache = OrderedDict()
+_process_cache_lock = threading.Lock()
+
+
+def get_course_outline(course_key: CourseKey,
+                       published_version: str,
+                       modified: datetime) -> Optional[CourseOutlineData]:  # noqa: UP045
+    """
+    Get the cached outline for a version of a course, or None if it's not cached.
+
+    `modified` is the time the course's LearningContext was last modified.
+    """
+    cache_key = _cache_key(course_key, published_version)
+    with _process_cache_lock:
+        entry = _process_cache.get(cache_key)
+        if entry is not None:
+            _process_cache.move_to_end(cache_key)
+    if entry is not None and entry[0] == modified:
+        return entry[1]
+
+    serialized_outline = cache.get(cache_key)
+    if serialized_outline is None:
+        return None
+    outline_modified, outline = _deserialize_course_outline(serialized_outline)
+    if outline_modified != modified:
+        return None
+
+    _set_in_process_cache(cache_key, modified, outline)
+    return outline
+
+
+def set_course_outline(course_outline: CourseOutlineData, modified: datetime):
+    """
+    Cache the outline of a course, built from a LearningContext last modified at `modified`.
+    """
+    cache_key = _cache_key(course_outline.course_key, course_outline.published_version)
+    _set_in_process_cache(cache_key, modified, course_outline)
+    cache.set(cache_key, _serialize_course_outline(course_outline, modified), SHARED_CACHE_TIMEOUT)
+
+
+def delete_course_outline(course_key: CourseKey, published_version: str):
+    """
+    Remove the outline of a course from the cache of this process and the shared cache.
+
+    The outlines of other versions of the course are also dropped from this
+    process, since they're not going to be used anymore.
+    """
+    course_key_prefix = _cache_key(course_key, "")
+    with _process_cache_lock:
+        for cache_key in [key for key in _process_cache if key.startswith(course_key_prefix)]:
+            del _process_cache[cache_key]
+    cache.delete(_cache_key(course_key, published_version))
+
+
+def clear_process_cache():
+    """
+    Empty the cache of this process (for tests).
+    """
+    with _process_cache_lock:
+        _process_cache.clear()
+
+
+def _cache_key(course_key, published_version):
+    return f"learning_sequences.api.get_course_outline.v3.{course_key}.{published_version}"
+
+
+def _set_in_process_cache(cache_key, modified, course_outline):
+    """
+    Add an outline to the cache of this process, evicting the least recently used ones.
+    """
+    with _process_cache_lock:
+        _process_cache[cache_key] = (modified, course_outline)
+        _process_cache.move_to_end(cache_key)
+        while len(_process_cache) > PROCESS_CACHE_MAX_SIZE:
+            _process_cache.popitem(last=False)
+
+
+def _serialize_user_partition_groups(user_partition_groups):
+    return tuple(
+        (partition_id, tuple(sorted(group_ids)))
+        for partition_id, group_ids in user_partition_groups.items()
+    )
+
+
+def _deserialize_user_partition_groups(serialized_user_partition_groups):
+    return {
+        partition_id: frozenset(group_ids)
+        for partition_id, group_ids in serialized_user_partition_groups
+    }
+
+
+def _serialize_course_outline(course_outline: CourseOutlineData, modified: datetime) -> bytes:
+    """
+    Serialize an outline into compressed nested tuples of primitives.
+
+    Usage keys are stored as (block_type, block_id) pairs, since they all
+    belong to the course.
+    """
+    data = (
+        _SERIALIZATION_VERSION,
+        modified,
+        str(course_outline.course_key),
+        course_outline.title,
+        course_outline.published_at,
+        course_outline.published_version,
+        course_outline.days_early_for_beta,
+        course_outline.self_paced,
+        course_outline.course_visibility.value,
+        course_outline.entrance_exam_id,
+        tuple(
+            (
+                section.usage_key.block_type,
+                section.usage_key.block_id,
+                section.title,
+                (section.visibility.hide_from_toc, section.visibility.visible_to_staff_only),
+                _serialize_user_partition_groups(section.user_partition_groups),
+                tuple(
+                    (
+                        sequence.usage_key.block_type,
+                        sequence.usage_key.block_id,
+                        sequence.title,
+                        (sequence.visibility.hide_from_toc, sequence.visibility.visible_to_staff_only),
+                        (
+                            sequence.exam.is_practice_exam,
+                            sequence.exam.is_proctored_enabled,
+                            sequence.exam.is_time_limited,
+                        ),
+                        sequence.inaccessible_after_due,
+                        _serialize_user_partition_groups(sequence.user_partition_groups),
+                    )
+                    for sequence in section.sequences
+                ),
+            )
+            for section in course_outline.sections
+        ),
+    )
+    return zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _deserialize_course_outline(serialized_outline: bytes):
+    """
+    Inverse of _serialize_course_outline.
+
+    Returns a (modified, CourseOutlineData) tuple, or (None, None) if the
+    data was serialized in another format.
+    """
+    data = pickle.loads(zlib.decompress(serialized_outline))
+    if data[0] != _SERIALIZATION_VERSION:
+        return None, None
+
+    (
+        _version,
+        modified,
+        course_key_str,
+        title,
+        published_at,
+        published_version,
+        days_early_for_beta,
+        self_paced,
+        course_visibility,
+        entrance_exam_id,
+        sections,
+    ) = data
+    course_key = CourseKey.from_string(course_key_str)
+    sections_data = [
+        CourseSectionData(
+            usage_key=course_key.make_usage_key(block_type, block_id),
+            title=section_title,
+            visibility=VisibilityData(*visibility),
+            user_partition_groups=_deserialize_user_partition_groups(user_partition_groups),
+            sequences=[
+                CourseLearningSequenceData(
+                    usage_key=course_key.make_usage_key(seq_block_type, seq_block_id),
+                    title=sequence_title,
+                    visibility=VisibilityData(*sequence_visibility),
+                    exam=ExamData(*exam),
+                    inaccessible_after_due=inaccessible_after_due,
+                    user_partition_groups=_deserialize_user_partition_groups(sequence_user_partition_groups),
+                )
+                for (
+                    seq_block_type,
+                    seq_block_id,
+                    sequence_title,
+                    sequence_visibility,
+                    exam,
+                    inaccessible_after_due,
+                    sequence_user_partition_groups,
+                ) in sequences
+            ],
+        )
+        for block_type, block_id, section_title, visibility, user_partition_groups, sequences in sections
+    ]
+    return modified, CourseOutlineData(
+        course_key=course_key,
+        title=title,
+        published_at=published_at,
+        published_version=published_version,
+        days_early_for_beta=days_early_for_beta,
+        entrance_exam_id=entrance_exam_id,
+        sections=sections_data,
+        self_paced=self_paced,
+        course_visibility=CourseVisibility(course_visibility),
+    )
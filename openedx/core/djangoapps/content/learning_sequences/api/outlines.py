@@ -10,12 +10,13 @@ from typing import Dict, FrozenSet, List, Optional, Union  # noqa: UP035
 
 from django.db import transaction
 from django.db.models.query import QuerySet
-from edx_django_utils.cache import TieredCache
 from edx_django_utils.monitoring import function_trace, set_custom_attribute
 from opaque_keys import OpaqueKey
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import LibraryLocator
 
+from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.roles import BulkRoleCache
 from openedx.core import types
 from openedx.core.djangoapps.content.learning_sequences.api.processors.team_partition_groups import (
     TeamPartitionGroupsOutlineProcessor,
@@ -43,6 +44,7 @@ from ..models import (
     PublishReport,
     UserPartitionGroup,
 )
+from . import outline_cache
 from .permissions import can_see_all_content
 from .processors.cohort_partition_groups import CohortPartitionGroupsOutlineProcessor
 from .processors.content_gating import ContentGatingOutlineProcessor
@@ -55,6 +57,22 @@ from .processors.visibility import VisibilityOutlineProcessor
 
 log = logging.getLogger(__name__)
 
+# These are processors that alter which sequences are visible to students.
+# For instance, certain sequences that are intentionally hidden or not yet
+# released. These do not need to be run for staff users. This is where we
+# would add in pluggability for OutlineProcessors down the road.
+_OUTLINE_PROCESSOR_CLASSES = [
+    ('content_gating', ContentGatingOutlineProcessor),
+    ('milestones', MilestonesOutlineProcessor),
+    ('schedule', ScheduleOutlineProcessor),
+    ('special_exams', SpecialExamsOutlineProcessor),
+    ('visibility', VisibilityOutlineProcessor),
+    ('enrollment', EnrollmentOutlineProcessor),
+    ('enrollment_track_partitions', EnrollmentTrackPartitionGroupsOutlineProcessor),
+    ('cohorts_partitions', CohortPartitionGroupsOutlineProcessor),
+    ('teams_partitions', TeamPartitionGroupsOutlineProcessor),
+]
+
 # Public API...
 __all__ = [
     'get_content_errors',
@@ -62,6 +80,7 @@ __all__ = [
     'get_course_outline',
     'get_user_course_outline',
     'get_user_course_outline_details',
+    'get_user_course_outlines',
     'key_supports_outlines',
     'replace_course_outline',
 ]
@@ -115,14 +134,14 @@ def get_course_outline(course_key: CourseKey) -> CourseOutlineData:
     # like management commands, where it may iterate through many courses.
     set_custom_attribute('learning_sequences.api.course_id', str(course_key))
     course_context = _get_course_context_for_outline(course_key)
+    learning_context = course_context.learning_context
 
     # Check to see if it's in the cache.
-    cache_key = "learning_sequences.api.get_course_outline.v2.{}.{}".format(  # noqa: UP032
-        course_context.learning_context.context_key, course_context.learning_context.published_version
+    cached_outline = outline_cache.get_course_outline(
+        learning_context.context_key, learning_context.published_version, learning_context.modified
     )
-    outline_cache_result = TieredCache.get_cached_response(cache_key)
-    if outline_cache_result.is_found:
-        return outline_cache_result.value
+    if cached_outline is not None:
+        return cached_outline
 
     # Fetch model data, and remember that empty Sections should still be
     # represented (so query CourseSection explicitly instead of relying only on
@@ -194,7 +213,7 @@ def get_course_outline(course_key: CourseKey) -> CourseOutlineData:
         self_paced=course_context.self_paced,
         course_visibility=CourseVisibility(course_context.course_visibility),
     )
-    TieredCache.set_all_tiers(cache_key, outline_data, 300)
+    outline_cache.set_course_outline(outline_data, learning_context.modified)
 
     return outline_data
 
@@ -302,6 +321,47 @@ def get_user_course_outline_details(course_key: CourseKey,
     )
 
 
+@function_trace('learning_sequences.api.get_user_course_outlines')
+def get_user_course_outlines(course_key: CourseKey,
+                             users: List[types.User],  # noqa: UP006
+                             at_time: datetime) -> Dict[int, UserCourseOutlineData]:  # noqa: UP006
+    """
+    Get outlines customized for many users of the same course at a particular time.
+
+    This returns the same outlines as calling get_user_course_outline for each
+    user, and is meant for jobs that need the outlines of many learners of a
+    course at once. The course outline is only loaded once, the users'
+    enrollments and roles are fetched in bulk, and each OutlineProcessor loads
+    the data for all the users together (see
+    OutlineProcessor.load_data_for_users).
+
+    `users` is a list of Django User objects (the AnonymousUser is not
+    supported), and the outlines are returned in a dict keyed by user id.
+    """
+    users = list(users)
+    set_custom_attribute('learning_sequences.api.num_users', len(users))
+    full_course_outline = get_course_outline(course_key)
+
+    # Prime the request caches used by the permission checks and processors.
+    CourseEnrollment.bulk_fetch_enrollment_states(users, course_key)
+    BulkRoleCache.prefetch(users)
+
+    processors_by_user_id = {user.id: {} for user in users}
+    for name, processor_cls in _OUTLINE_PROCESSOR_CLASSES:
+        processors = [processor_cls(course_key, user, at_time) for user in users]
+        with function_trace(f'learning_sequences.api.outline_processors.{name}.load_data_for_users'):
+            processor_cls.load_data_for_users(processors, full_course_outline)
+        for user, processor in zip(users, processors, strict=True):
+            processors_by_user_id[user.id][name] = processor
+
+    return {
+        user.id: _get_user_course_outline_from_processors(
+            full_course_outline, user, at_time, processors_by_user_id[user.id]
+        )
+        for user in users
+    }
+
+
 def _get_user_course_outline_and_processors(course_key: CourseKey,  # pylint: disable=missing-function-docstring
                                             user: types.User,
                                             at_time: datetime):
@@ -319,36 +379,35 @@ def _get_user_course_outline_and_processors(course_key: CourseKey,  # pylint: di
     set_custom_attribute('learning_sequences.api.user_id', user.id)
 
     full_course_outline = get_course_outline(course_key)
-    user_can_see_all_content = can_see_all_content(user, course_key)
-
-    # These are processors that alter which sequences are visible to students.
-    # For instance, certain sequences that are intentionally hidden or not yet
-    # released. These do not need to be run for staff users. This is where we
-    # would add in pluggability for OutlineProcessors down the road.
-    processor_classes = [
-        ('content_gating', ContentGatingOutlineProcessor),
-        ('milestones', MilestonesOutlineProcessor),
-        ('schedule', ScheduleOutlineProcessor),
-        ('special_exams', SpecialExamsOutlineProcessor),
-        ('visibility', VisibilityOutlineProcessor),
-        ('enrollment', EnrollmentOutlineProcessor),
-        ('enrollment_track_partitions', EnrollmentTrackPartitionGroupsOutlineProcessor),
-        ('cohorts_partitions', CohortPartitionGroupsOutlineProcessor),
-        ('teams_partitions', TeamPartitionGroupsOutlineProcessor),
-    ]
 
-    # Run each OutlineProcessor in order to figure out what items we have to
-    # remove from the CourseOutline.
     processors = {}
-    usage_keys_to_remove = set()
-    inaccessible_sequences = set()
-    for name, processor_cls in processor_classes:
+    for name, processor_cls in _OUTLINE_PROCESSOR_CLASSES:
         # Future optimization: This should be parallelizable (don't rely on a
         # particular ordering).
         processor = processor_cls(course_key, user, at_time)
         processors[name] = processor
         processor.load_data(full_course_outline)
-        if not user_can_see_all_content:
+
+    user_course_outline = _get_user_course_outline_from_processors(
+        full_course_outline, user, at_time, processors
+    )
+    return user_course_outline, processors
+
+
+def _get_user_course_outline_from_processors(full_course_outline: CourseOutlineData,
+                                             user: types.User,
+                                             at_time: datetime,
+                                             processors) -> UserCourseOutlineData:
+    """
+    Helper function that builds a UserCourseOutlineData from the outline
+    processors of a user, once they have loaded their data.
+    """
+    # Run each OutlineProcessor to figure out what items we have to remove
+    # from the CourseOutline.
+    usage_keys_to_remove = set()
+    inaccessible_sequences = set()
+    if not can_see_all_content(user, full_course_outline.course_key):
+        for name, processor in processors.items():
             # function_trace lets us see how expensive each processor is being.
             with function_trace(f'learning_sequences.api.outline_processors.{name}'):
                 processor_usage_keys_removed = processor.usage_keys_to_remove(full_course_outline)
@@ -360,7 +419,7 @@ def _get_user_course_outline_and_processors(course_key: CourseKey,  # pylint: di
     trimmed_course_outline = full_course_outline.remove(usage_keys_to_remove)
     accessible_sequences = frozenset(set(trimmed_course_outline.sequences) - inaccessible_sequences)
 
-    user_course_outline = UserCourseOutlineData(
+    return UserCourseOutlineData(
         base_outline=full_course_outline,
         user=user,
         at_time=at_time,
@@ -381,8 +440,6 @@ def _get_user_course_outline_and_processors(course_key: CourseKey,  # pylint: di
         }
     )
 
-    return user_course_outline, processors
-
 
 @function_trace('learning_sequences.api.replace_course_outline')
 def replace_course_outline(course_outline: CourseOutlineData,
@@ -414,6 +471,8 @@ def replace_course_outline(course_outline: CourseOutlineData,
         _update_course_section_sequences(course_outline, course_context)
         _update_publish_report(course_outline, content_errors, course_context)
 
+    outline_cache.delete_course_outline(course_outline.course_key, course_outline.published_version)
+
 
 def _update_course_context(course_outline: CourseOutlineData):
     """
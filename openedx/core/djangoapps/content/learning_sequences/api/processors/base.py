@@ -27,6 +27,10 @@ class OutlineProcessor:
         * load_data
         * inaccessible_sequences, usage_keys_to_remove (no ordering guarantee)
 
+    When outlines are requested for many users of the same course at once (see
+    get_user_course_outlines), load_data is replaced by a single call to the
+    load_data_for_users classmethod for all the users' processors.
+
     Also note that you should not assume any ordering relative to any other
     OutlineProcessor. Once async support works its way fully into Django, we'll
     likely even want to run these in parallel.
@@ -62,6 +66,20 @@ class OutlineProcessor:
         """
         pass  # pylint: disable=unnecessary-pass
 
+    @classmethod
+    def load_data_for_users(cls, processors, full_course_outline: CourseOutlineData):
+        """
+        Fetch the data for a list of processors of this class.
+
+        The processors are all for the same course and time, one per user. By
+        default this just calls load_data on each of them. Override it when the
+        data can be fetched for all the users with a few set-based queries
+        instead of a few queries per user. The result must be the same as
+        calling load_data on each processor.
+        """
+        for processor in processors:
+            processor.load_data(full_course_outline)
+
     def inaccessible_sequences(self, full_course_outline: CourseOutlineData):  # pylint: disable=unused-argument
         """
         Return a set/frozenset of Sequence UsageKeys that are not accessible.
@@ -10,7 +10,9 @@ from openedx.core.djangoapps.course_groups.cohorts import (
     get_cohort,
     get_cohorted_user_partition_id,
     get_group_info_for_cohort,
+    is_course_cohorted,
 )
+from openedx.core.djangoapps.course_groups.models import CohortMembership
 
 from .base import OutlineProcessor
 
@@ -43,6 +45,45 @@ class CohortPartitionGroupsOutlineProcessor(OutlineProcessor):
             if user_cohort:
                 self.user_cohort_group_id, _ = get_group_info_for_cohort(user_cohort)
 
+    @classmethod
+    def load_data_for_users(cls, processors, full_course_outline) -> None:
+        """
+        Load the cohorted partition id once, and the users' group ids with a
+        single query for their cohort memberships.
+
+        Users who aren't in a cohort yet go through get_cohort, which assigns
+        them one, as load_data would.
+        """
+        if not processors:
+            return
+
+        course_key = processors[0].course_key
+        cohorted_partition_id = get_cohorted_user_partition_id(course_key)
+        for processor in processors:
+            processor.cohorted_partition_id = cohorted_partition_id
+
+        if not cohorted_partition_id or not is_course_cohorted(course_key):
+            return
+
+        users = [processor.user for processor in processors if processor.user.is_authenticated]
+        cohorts_by_user_id = {
+            membership.user_id: membership.course_user_group
+            for membership in CohortMembership.objects.filter(
+                course_id=course_key, user__in=users,
+            ).select_related('course_user_group')
+        }
+        group_ids_by_cohort_id = {}
+        for processor in processors:
+            if processor.user.id in cohorts_by_user_id:
+                user_cohort = cohorts_by_user_id[processor.user.id]
+            else:
+                user_cohort = get_cohort(processor.user, course_key)
+
+            if user_cohort:
+                if user_cohort.id not in group_ids_by_cohort_id:
+                    group_ids_by_cohort_id[user_cohort.id], _ = get_group_info_for_cohort(user_cohort)
+                processor.user_cohort_group_id = group_ids_by_cohort_id[user_cohort.id]
+
     def _is_user_excluded_by_partition_group(self, user_partition_groups) -> bool:
         """
         Is the user part of the group to which the block is restricting content?
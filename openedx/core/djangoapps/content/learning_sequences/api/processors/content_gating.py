@@ -7,6 +7,7 @@ from opaque_keys.edx.keys import CourseKey
 from common.djangoapps.student.models import EntranceExamConfiguration
 from common.djangoapps.util import milestones_helpers
 from openedx.core import types
+from openedx.core.toggles import ENTRANCE_EXAMS
 
 from .base import OutlineProcessor
 
@@ -39,6 +40,32 @@ class ContentGatingOutlineProcessor(OutlineProcessor):
                 self.user, self.course_key
             )
 
+    @classmethod
+    def load_data_for_users(cls, processors, full_course_outline):
+        """
+        Get the required content for the course for each user, and find which
+        users can skip the entrance exam with a single query.
+        """
+        if not processors:
+            return
+
+        course_key = processors[0].course_key
+        users_who_can_skip_entrance_exam = set()
+        if ENTRANCE_EXAMS.is_enabled():
+            users_who_can_skip_entrance_exam = set(
+                EntranceExamConfiguration.objects.filter(
+                    course_id=course_key,
+                    user__in=[processor.user for processor in processors if processor.user.is_authenticated],
+                    skip_entrance_exam=True,
+                ).values_list('user_id', flat=True)
+            )
+
+        for processor in processors:
+            processor.required_content = milestones_helpers.get_required_content(course_key, processor.user)
+            processor.can_skip_entrance_exam = (
+                processor.user.is_authenticated and processor.user.id in users_who_can_skip_entrance_exam
+            )
+
     def inaccessible_sequences(self, full_course_outline):
         """
         Mark any section that is gated by required content as inaccessible
@@ -40,6 +40,28 @@ class EnrollmentTrackPartitionGroupsOutlineProcessor(OutlineProcessor):
         Pull track groups for this course and which group the user is in.
         """
         user_partition = create_enrollment_track_partition_with_course_id(self.course_key)
+        self._load_user_group(user_partition)
+
+    @classmethod
+    def load_data_for_users(cls, processors, full_course_outline) -> None:
+        """
+        Build the track partition once for all the users.
+
+        Finding each user's group then only needs their enrollment mode, which
+        is in the request cache when the enrollments were bulk fetched (as
+        get_user_course_outlines does).
+        """
+        if not processors:
+            return
+
+        user_partition = create_enrollment_track_partition_with_course_id(processors[0].course_key)
+        for processor in processors:
+            processor._load_user_group(user_partition)  # pylint: disable=protected-access
+
+    def _load_user_group(self, user_partition):
+        """
+        Find which group of the track partition the user is in.
+        """
         self.enrollment_track_groups = get_user_partition_groups(
             self.course_key,
             [user_partition],
@@ -2,6 +2,7 @@
 Outline processors for applying team user partition groups.
 """
 import logging
+from collections import defaultdict
 from datetime import datetime
 from typing import Dict  # noqa: UP035
 
@@ -48,6 +49,29 @@ class TeamPartitionGroupsOutlineProcessor(OutlineProcessor):
             partition_dict_key="id",
         )
 
+    @classmethod
+    def load_data_for_users(cls, processors, full_course_outline) -> None:
+        """
+        Pull team groups for this course once, and which group each user is in
+        with one query per team-set.
+        """
+        if not processors:
+            return
+
+        course_key = processors[0].course_key
+        if not CONTENT_GROUPS_FOR_TEAMS.is_enabled(course_key):
+            return
+
+        users = [processor.user for processor in processors]
+        groups_by_user_id = defaultdict(dict)
+        for user_partition in create_team_set_partitions_with_course_id(course_key) or []:
+            groups = user_partition.scheme.get_groups_for_users(course_key, users, user_partition)
+            for user_id, group in groups.items():
+                groups_by_user_id[user_id][user_partition.id] = group
+
+        for processor in processors:
+            processor.current_user_groups = groups_by_user_id[processor.user.id]
+
     def _is_user_excluded_by_partition_group(self, user_partition_groups):
         """
         Is the user part of the group to which the block is restricting content?
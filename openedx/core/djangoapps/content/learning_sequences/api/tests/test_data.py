@@ -82,6 +82,8 @@ class TestCourseOutlineData(TestCase):
         assert len(new_outline.sections[0].sequences) == len(self.course_outline.sections[0].sequences) - 1
         for seq in new_outline.sections[0].sequences:
             assert seq != seq_to_remove
+        # The unchanged Section is shared with the original outline.
+        assert new_outline.sections[1] is self.course_outline.sections[1]
 
     def test_remove_section(self):
         """
@@ -101,7 +103,7 @@ class TestCourseOutlineData(TestCase):
         """Removing something that's not already there is a no-op."""
         seq_key_to_remove = self.course_key.make_usage_key('sequential', 'not_here')
         new_outline = self.course_outline.remove({seq_key_to_remove})
-        assert new_outline == self.course_outline
+        assert new_outline is self.course_outline
 
     def test_days_early_for_beta(self):
         """
@@ -0,0 +1,56 @@
+"""
+Tests for the CourseOutlineData cache.
+"""
+from datetime import datetime, timezone
+from unittest import TestCase
+
+import attr
+from opaque_keys.edx.keys import CourseKey
+
+from ...data import CourseOutlineData, CourseVisibility, ExamData, VisibilityData
+from ..outline_cache import _deserialize_course_outline, _serialize_course_outline
+from .test_data import generate_sections
+
+
+class CourseOutlineSerializationTestCase(TestCase):
+    """
+    Tests for the compact serialization of outlines in the shared cache.
+    """
+
+    def test_roundtrip(self):
+        course_key = CourseKey.from_string("course-v1:OpenEdX+Learn+Cache")
+        sections = generate_sections(course_key, [2, 0, 1])
+        sections[0] = attr.evolve(
+            sections[0],
+            visibility=VisibilityData(hide_from_toc=True, visible_to_staff_only=False),
+            user_partition_groups={50: frozenset([1, 2]), 51: frozenset([3])},
+            sequences=[
+                attr.evolve(
+                    sections[0].sequences[0],
+                    exam=ExamData(is_time_limited=True),
+                    inaccessible_after_due=True,
+                    user_partition_groups={50: frozenset([2])},
+                ),
+                attr.evolve(
+                    sections[0].sequences[1],
+                    visibility=VisibilityData(hide_from_toc=False, visible_to_staff_only=True),
+                ),
+            ],
+        )
+        course_outline = CourseOutlineData(
+            course_key=course_key,
+            title="Cached Test Course!",
+            published_at=datetime(2020, 5, 20, tzinfo=timezone.utc),  # noqa: UP017
+            published_version="5ebece4b69dd593d82fe2016",
+            entrance_exam_id=str(sections[2].usage_key),
+            days_early_for_beta=3,
+            sections=sections,
+            self_paced=True,
+            course_visibility=CourseVisibility.PUBLIC_OUTLINE,
+        )
+        modified = datetime(2020, 5, 21, tzinfo=timezone.utc)  # noqa: UP017
+
+        serialized_outline = _serialize_course_outline(course_outline, modified)
+
+        assert isinstance(serialized_outline, bytes)
+        assert _deserialize_course_outline(serialized_outline) == (modified, course_outline)
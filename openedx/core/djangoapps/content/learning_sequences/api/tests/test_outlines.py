@@ -11,7 +11,10 @@ import ddt
 import pytest
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
 from django.db.models import signals
+from django.test.utils import CaptureQueriesContext
+from edx_django_utils.cache import RequestCache
 from edx_proctoring.exceptions import ProctoredExamNotFoundException
 from edx_toggles.toggles.testutils import override_waffle_flag
 from edx_when.api import set_dates_for_course
@@ -50,6 +53,7 @@ from ..outlines import (
     get_course_outline,
     get_user_course_outline,
     get_user_course_outline_details,
+    get_user_course_outlines,
     key_supports_outlines,
     replace_course_outline,
 )
@@ -156,6 +160,17 @@ class CourseOutlineTestCase(CacheIsolationTestCase):
             uncached_new_version_outline = get_course_outline(self.course_key)  # pylint: disable=unused-variable  # noqa: F841
             assert new_version_outline == new_version_outline  # pylint: disable=comparison-with-itself
 
+    def test_replace_same_version(self):
+        """
+        Replacing an outline without changing its version doesn't leave the old one in the cache.
+        """
+        replace_course_outline(self.course_outline)
+        assert get_course_outline(self.course_key) == self.course_outline
+
+        new_outline = attr.evolve(self.course_outline, sections=generate_sections(self.course_key, [1]))
+        replace_course_outline(new_outline)
+        assert get_course_outline(self.course_key) == new_outline
+
 
 class UserCourseOutlineTestCase(CacheIsolationTestCase):
     """
@@ -515,6 +530,28 @@ class MilestonesTestCase(OutlineProcessorTestCase):
         assert self.open_seq_key in student_details.outline.accessible_sequences
         assert self.milestone_required_seq_key not in student_details.outline.accessible_sequences
 
+    @patch('openedx.core.djangoapps.content.learning_sequences.api.processors.milestones.milestones_helpers.get_course_content_milestones_for_users')  # pylint: disable=line-too-long
+    def test_pending_milestones_for_users(self, get_course_content_milestones_for_users_mock):
+        """
+        Getting the outlines of many users uses their pending milestones, fetched for all of them at once.
+        """
+        get_course_content_milestones_for_users_mock.return_value = {
+            self.global_staff.id: [],
+            self.student.id: [{'content_id': str(self.milestone_required_seq_key)}],
+        }
+
+        outlines = get_user_course_outlines(
+            self.course_key,
+            [self.global_staff, self.student],
+            datetime(2020, 5, 25, tzinfo=timezone.utc),  # noqa: UP017
+        )
+
+        get_course_content_milestones_for_users_mock.assert_called_once_with(
+            str(self.course_key), [self.global_staff.id, self.student.id], 'requires'
+        )
+        assert len(outlines[self.global_staff.id].accessible_sequences) == 2
+        assert outlines[self.student.id].accessible_sequences == {self.open_seq_key}
+
 
 class ScheduleTestCase(OutlineProcessorTestCase):
     """
@@ -1906,6 +1943,104 @@ class CohortPartitionGroupsTestCase(OutlineProcessorTestCase):
             assert len(learner_details.outline.accessible_sequences) == expected_values_dict[learner_to_verify.username]
 
 
+class UserCourseOutlinesTestCase(OutlineProcessorTestCase):
+    """Tests for getting the outlines of many users at once."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        CourseCohortsSettings.objects.create(course_id=cls.course_key, is_cohorted=True)
+        cls.learners = []
+        for index in range(6):
+            learner = UserFactory.create(username=f'learner{index}', email=f'learner{index}@example.com')
+            learner.courseenrollment_set.create(course_id=cls.course_key, is_active=True, mode=CourseMode.AUDIT)
+            cls.learners.append(learner)
+        cls.unenrolled_learner = UserFactory.create(username='unenrolled', email='unenrolled@example.com')
+
+        for cohort_index, group_id in enumerate([1001, 1002]):
+            cohort = CohortFactory(
+                course_id=cls.course_key,
+                name=f'Test Cohort {cohort_index}',
+                users=cls.learners[cohort_index::2],
+            )
+            CourseUserGroupPartitionGroup(
+                course_user_group=cohort,
+                partition_id=1000,
+                group_id=group_id,
+            ).save()
+
+        course_start_date = datetime(2021, 3, 26, tzinfo=timezone.utc)  # noqa: UP017
+        set_dates_for_course(
+            cls.course_key,
+            [(cls.course_key.make_usage_key('course', 'course'), {'start': course_start_date})]
+        )
+        visibility = VisibilityData(hide_from_toc=False, visible_to_staff_only=False)
+        replace_course_outline(
+            CourseOutlineData(
+                course_key=cls.course_key,
+                title="User Course Outlines Test Course",
+                published_at=course_start_date,
+                published_version="8ebece4b69dd593d82fe2024",
+                sections=[
+                    CourseSectionData(
+                        usage_key=cls.course_key.make_usage_key('chapter', str(section_index)),
+                        title=f"Section {section_index}",
+                        user_partition_groups={1000: frozenset([group_id])},
+                        sequences=[
+                            CourseLearningSequenceData(
+                                usage_key=cls.course_key.make_usage_key('subsection', str(section_index)),
+                                title=f"Subsection {section_index}",
+                                visibility=visibility,
+                            ),
+                        ]
+                    )
+                    for section_index, group_id in enumerate([1001, 1002])
+                ],
+                self_paced=False,
+                days_early_for_beta=None,
+                entrance_exam_id=None,
+                course_visibility=CourseVisibility.PRIVATE,
+            )
+        )
+        cls.check_date = datetime(2021, 3, 27, tzinfo=timezone.utc)  # noqa: UP017
+
+    def get_users(self):
+        return self.learners + [self.unenrolled_learner, self.global_staff, self.beta_tester]
+
+    def test_same_outlines_as_single_user(self):
+        users = self.get_users()
+        outlines = get_user_course_outlines(self.course_key, users, self.check_date)
+
+        assert outlines == {
+            user.id: get_user_course_outline(self.course_key, user, self.check_date)
+            for user in users
+        }
+        # Each learner only sees the section of their cohort.
+        assert [len(outlines[learner.id].sections) for learner in self.learners] == [1] * len(self.learners)
+        assert outlines[self.learners[0].id].sections != outlines[self.learners[1].id].sections
+        assert not outlines[self.unenrolled_learner.id].sections
+        assert len(outlines[self.global_staff.id].sections) == 2
+
+    def test_fewer_queries_than_single_user(self):
+        """
+        Getting the outlines in bulk should take fewer queries than getting them one user at a time.
+        """
+        users = self.get_users()
+        # Make sure the course outline is cached, so that only the per user queries are counted.
+        get_course_outline(self.course_key)
+
+        RequestCache.clear_all_namespaces()
+        with CaptureQueriesContext(connection) as bulk_queries:
+            get_user_course_outlines(self.course_key, users, self.check_date)
+
+        RequestCache.clear_all_namespaces()
+        with CaptureQueriesContext(connection) as single_user_queries:
+            for user in users:
+                get_user_course_outline(self.course_key, user, self.check_date)
+
+        assert len(bulk_queries) < len(single_user_queries)
+
+
 class ContentErrorTestCase(CacheIsolationTestCase):
     """Test error collection and reporting."""
 
@@ -248,6 +248,9 @@ class CourseOutlineData:
         The UsageKeys can be for Sequences or Sections/Chapters. Removing a
         Section will remove all Sequences in that Section. It is not an error to
         pass in UsageKeys that do not exist in the outline.
+
+        Sections and Sequences are shared with this outline rather than copied,
+        and if nothing is removed, this outline itself is returned.
         """
         keys_to_remove = set(usage_keys)
 
@@ -262,6 +265,15 @@ class CourseOutlineData:
             elif section_sequences_keys.issubset(keys_to_remove):
                 keys_to_remove.add(section.usage_key)
 
+        # Outlines are trimmed for every user, and usually not by much, so
+        # share whatever is unchanged with this outline instead of copying it.
+        if not any(
+            section.usage_key in keys_to_remove
+            or any(seq.usage_key in keys_to_remove for seq in section.sequences)
+            for section in self.sections
+        ):
+            return self
+
         return attr.evolve(
             self,
             sections=[
@@ -273,6 +285,8 @@ class CourseOutlineData:
                         if seq.usage_key not in keys_to_remove
                     ]
                 )
+                if any(seq.usage_key in keys_to_remove for seq in section.sequences)
+                else section
                 for section in self.sections
                 if section.usage_key not in keys_to_remove
             ]
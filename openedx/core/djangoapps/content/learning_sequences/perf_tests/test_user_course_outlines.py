@@ -0,0 +1,167 @@
+"""
+Performance test comparing get_user_course_outlines with calling get_user_course_outline for each user.
+
+Run with::
+
+    RUN_PERF_TESTS=1 pytest -s openedx/core/djangoapps/content/learning_sequences/perf_tests/test_user_course_outlines.py
+
+The number of learners defaults to 1,000, and can be set with PERF_TEST_LEARNERS.
+"""
+
+
+import os
+import time
+import unittest
+from datetime import datetime, timezone
+
+import attr
+import ddt
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from edx_django_utils.cache import RequestCache
+from edx_when.api import set_dates_for_course
+from milestones import api as milestones_api
+from milestones.models import MilestoneRelationshipType, UserMilestone
+from opaque_keys.edx.keys import CourseKey
+
+from common.djangoapps.course_modes.models import CourseMode
+from common.djangoapps.student.models import CourseEnrollment
+from openedx.core.djangoapps.course_groups.models import (
+    CohortMembership,
+    CourseCohortsSettings,
+    CourseUserGroupPartitionGroup,
+)
+from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+
+from ..api import get_course_outline, get_user_course_outline, get_user_course_outlines, replace_course_outline
+from ..api.tests.test_data import generate_sections
+from ..data import CourseOutlineData, CourseVisibility
+
+User = get_user_model()
+
+NUM_LEARNERS = int(os.environ.get('PERF_TEST_LEARNERS', 1000))
+
+# Sections of the synthetic course, each with this many sequences.
+NUM_SEQUENCES = [10] * 10
+
+COHORT_PARTITION_ID = 1000
+COHORT_GROUP_IDS = [1001, 1002]
+
+
+@ddt.ddt
+@unittest.skipUnless(os.environ.get('RUN_PERF_TESTS'), "Performance tests are only run on request.")
+class UserCourseOutlinesTiming(CacheIsolationTestCase):
+    """
+    Times getting the outlines of a cohorted course's learners one at a time and all at once, and counts the
+    queries each makes.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    @classmethod
+    def setUpTestData(cls):  # pylint: disable=missing-function-docstring, super-method-not-called
+        cls.course_key = CourseKey.from_string("course-v1:OpenEdX+OutlinePerf+T1")
+        course_start_date = datetime(2021, 3, 26, tzinfo=timezone.utc)  # noqa: UP017
+        set_dates_for_course(
+            cls.course_key,
+            [(cls.course_key.make_usage_key('course', 'course'), {'start': course_start_date})]
+        )
+        sections = generate_sections(cls.course_key, NUM_SEQUENCES)
+        # Each cohort only sees every other section.
+        sections = [
+            attr.evolve(
+                section,
+                user_partition_groups={COHORT_PARTITION_ID: frozenset([COHORT_GROUP_IDS[index % 2]])},
+            )
+            for index, section in enumerate(sections)
+        ]
+        replace_course_outline(
+            CourseOutlineData(
+                course_key=cls.course_key,
+                title="Outline Performance Test Course",
+                published_at=course_start_date,
+                published_version="8ebece4b69dd593d82fe2024",
+                sections=sections,
+                self_paced=False,
+                days_early_for_beta=None,
+                entrance_exam_id=None,
+                course_visibility=CourseVisibility.PRIVATE,
+            )
+        )
+        cls.check_date = datetime(2021, 3, 27, tzinfo=timezone.utc)  # noqa: UP017
+
+        User.objects.bulk_create(
+            User(username=f'perf_learner_{index}', email=f'perf_learner_{index}@example.com')
+            for index in range(NUM_LEARNERS)
+        )
+        cls.learners = list(User.objects.filter(username__startswith='perf_learner_').order_by('id'))
+        CourseEnrollment.objects.bulk_create(
+            CourseEnrollment(user=learner, course_id=cls.course_key, is_active=True, mode=CourseMode.AUDIT)
+            for learner in cls.learners
+        )
+
+        CourseCohortsSettings.objects.create(course_id=cls.course_key, is_cohorted=True)
+        for index, group_id in enumerate(COHORT_GROUP_IDS):
+            cohort = CohortFactory(course_id=cls.course_key, name=f'Perf Cohort {index}')
+            cohort_learners = cls.learners[index::len(COHORT_GROUP_IDS)]
+            cohort.users.add(*cohort_learners)
+            CohortMembership.objects.bulk_create(
+                CohortMembership(course_user_group=cohort, user=learner, course_id=cls.course_key)
+                for learner in cohort_learners
+            )
+            CourseUserGroupPartitionGroup.objects.create(
+                course_user_group=cohort,
+                partition_id=COHORT_PARTITION_ID,
+                group_id=group_id,
+            )
+
+        # The first sequence of each section requires a milestone, which every other learner has collected.
+        MilestoneRelationshipType.objects.get_or_create(name='requires')
+        MilestoneRelationshipType.objects.get_or_create(name='fulfills')
+        milestone = milestones_api.add_milestone({'name': 'Perf Milestone', 'namespace': 'perf'})
+        for section in sections:
+            milestones_api.add_course_content_milestone(
+                str(cls.course_key), str(section.sequences[0].usage_key), 'requires', milestone
+            )
+        UserMilestone.objects.bulk_create(
+            UserMilestone(user_id=learner.id, milestone_id=milestone['id']) for learner in cls.learners[::2]
+        )
+
+    def _get_outlines(self, get_outlines):
+        """
+        Gets the learners' outlines with get_outlines, and returns (outlines, wall time in seconds, number of
+        queries).
+        """
+        RequestCache.clear_all_namespaces()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            outlines = get_outlines()
+            elapsed = time.perf_counter() - start
+        return outlines, elapsed, len(queries)
+
+    @ddt.data(False, True)
+    def test_outline_timings(self, milestones_enabled):
+        # Make sure the course outline is cached, so that only the per user work is timed.
+        get_course_outline(self.course_key)
+
+        with self.settings(MILESTONES_APP=milestones_enabled):
+            per_user_outlines, per_user_seconds, per_user_queries = self._get_outlines(
+                lambda: {
+                    learner.id: get_user_course_outline(self.course_key, learner, self.check_date)
+                    for learner in self.learners
+                }
+            )
+            bulk_outlines, bulk_seconds, bulk_queries = self._get_outlines(
+                lambda: get_user_course_outlines(self.course_key, self.learners, self.check_date)
+            )
+        assert bulk_outlines == per_user_outlines
+
+        print(
+            f"\n{len(self.learners)} learners, {sum(NUM_SEQUENCES)} sequences, "
+            f"milestones {'enabled' if milestones_enabled else 'disabled'}:"
+            f"\n  per user: {per_user_seconds:8.1f} s  {per_user_queries:>8} queries"
+            f"\n  bulk:     {bulk_seconds:8.1f} s  {bulk_queries:>8} queries"
+        )
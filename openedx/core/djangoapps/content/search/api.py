@@ -6,10 +6,12 @@ from __future__ import annotations
 
 import logging
 import time
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta, timezone
 from functools import wraps
+from itertools import islice
 from typing import Callable, Generator, cast  # noqa: UP035
 
 from attrs import define
@@ -17,6 +19,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.db import connections
 from meilisearch import Client as MeilisearchClient
 from meilisearch.errors import MeilisearchApiError, MeilisearchError
 from meilisearch.models.task import TaskInfo
@@ -38,13 +41,18 @@ from openedx.core.djangoapps.content.search.index_config import (
     INDEX_SEARCHABLE_ATTRIBUTES,
     INDEX_SORTABLE_ATTRIBUTES,
 )
-from openedx.core.djangoapps.content.search.models import IncrementalIndexCompleted, get_access_ids_for_request
+from openedx.core.djangoapps.content.search.models import (
+    IncrementalIndexCompleted,
+    IndexedCourseVersion,
+    get_access_ids_for_request,
+)
 from openedx.core.djangoapps.content_libraries import api as lib_api
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
 from .documents import (
     Fields,
+    get_content_tags,
     meili_id_from_opaque_key,
     searchable_doc_collections,
     searchable_doc_containers,
@@ -366,6 +374,8 @@ def reset_index(status_cb: Callable[[str], None] | None = None) -> None:
     with _using_temp_index(status_cb) as temp_index_name:
         _apply_index_settings(temp_index_name, wait=False)
         status_cb("Index recreated!")
+    # The courses have to be indexed in full again, not just synced with their last indexed version:
+    IndexedCourseVersion.objects.all().delete()
     status_cb("Index reset complete.")
 
 
@@ -493,6 +503,7 @@ def reconcile_index(
 
     # CASE: Index empty
     if drift.is_empty:
+        IndexedCourseVersion.objects.all().delete()
         if drift.is_settings_drifted:
             status_cb("Empty index has drifted settings. Reconfiguring...")
             _apply_index_settings(STUDIO_INDEX_NAME, wait=True, status_cb=status_cb)
@@ -543,39 +554,152 @@ def index_course(
     course_key: CourseKey,
     index_name: str | None = None,
     status_cb: Callable[[str], None] | None = None,
-) -> list[dict]:
+) -> int:
     """
     Rebuilds the index for a given course.
+
+    The course's blocks are loaded with all of their definitions up front, the tags of all its blocks are
+    fetched in three queries, and the documents are sent to Meilisearch in pages of MEILISEARCH_INDEX_PAGE_SIZE
+    as they are built, rather than all at once.
+
+    The version of the course's structure that was indexed is recorded for sync_course_index.
+
+    Returns the number of documents indexed.
     """
     store = modulestore()
-    client = _get_meilisearch_client()
-    docs = []
     if index_name is None:
         index_name = STUDIO_INDEX_NAME
     if status_cb is None:
         status_cb = log.info
 
-    # Pre-fetch the course with all of its children:
-    course = store.get_course(course_key, depth=None)
+    # Pre-fetch the course with all of its children, and their definitions:
+    course = store.get_course(course_key, depth=None, prefetch_definitions=True)
 
     if course is None:
         status_cb(f"Error: course {course_key} does not seem to exist! It may have been incompletely deleted.")
-        return []
+        return 0
+
+    content_tags = get_content_tags(course_key)
+
+    def course_docs():
+        """Generate the documents of all the course's blocks/components"""
+        for block in _iter_descendants(course):
+            doc = searchable_doc_for_course_block(block)
+            doc.update(searchable_doc_tags(block.usage_key, content_tags))
+            yield doc
+
+    num_docs = _add_documents_in_pages(index_name, course_docs())
+    course_version = getattr(course, "course_version", None)
+    if course_version is not None:
+        IndexedCourseVersion.objects.update_or_create(
+            context_key=course_key,
+            defaults={"structure_version": str(course_version)},
+        )
+    return num_docs
+
+
+def sync_course_index(course_key: CourseKey, status_cb: Callable[[str], None] | None = None) -> None:
+    """
+    Brings the index documents of a course up to date, by comparing its structure with the version that was
+    last indexed: only the documents of the blocks that changed since then are updated, and the documents of
+    the blocks that were removed are deleted.
+
+    Falls back to indexing the whole course if it was never indexed, or its structure versions can't be compared.
+    """
+    store = modulestore()
+    if status_cb is None:
+        status_cb = log.info
+
+    indexed_version = IndexedCourseVersion.objects.filter(
+        context_key=course_key,
+    ).values_list("structure_version", flat=True).first()
+    changes = None
+    if indexed_version is not None:
+        changes = store.get_block_changes(course_key, indexed_version)
+    if changes is None:
+        status_cb(f"Indexing all the blocks of course {course_key}...")
+        index_course(course_key, status_cb=status_cb)
+        return
+
+    current_version, changed_keys, removed_keys = changes
+    if str(current_version) == indexed_version:
+        return
+
+    docs = []
+    with store.bulk_operations(course_key):
+        for usage_key in changed_keys:
+            if usage_key.block_type in EXCLUDED_XBLOCK_TYPES:
+                continue
+            try:
+                block = store.get_item(usage_key)
+            except ItemNotFoundError as err:
+                log.exception(err)
+                status_cb(f"Unable to load block {usage_key}")
+                continue
+            docs.append(searchable_doc_for_course_block(block))
+
+    page_size = getattr(settings, "MEILISEARCH_INDEX_PAGE_SIZE", 1000)
+    for start in range(0, len(docs), page_size):
+        _update_index_docs(docs[start:start + page_size])
+    _delete_index_docs([meili_id_from_opaque_key(usage_key) for usage_key in removed_keys])
+
+    IndexedCourseVersion.objects.update_or_create(
+        context_key=course_key,
+        defaults={"structure_version": str(current_version)},
+    )
+    status_cb(f"Synced course {course_key}: {len(docs)} documents updated, {len(removed_keys)} deleted.")
+
+
+def _iter_descendants(block, status_cb: Callable[[str], None] | None = None) -> Iterator:
+    """
+    Yields the descendants of an XBlock, depth first, skipping the ones that can't be loaded like
+    _recurse_children does.
+    """
+    children = []
+    _recurse_children(block, children.append, status_cb)
+    for child in children:
+        yield child
+        yield from _iter_descendants(child, status_cb)
 
-    def add_with_children(block):
-        """Recursively index the given XBlock/component"""
-        doc = searchable_doc_for_course_block(block)
-        doc.update(searchable_doc_tags(block.usage_key))
-        docs.append(doc)  # pylint: disable=cell-var-from-loop
-        _recurse_children(block, add_with_children)  # pylint: disable=cell-var-from-loop
 
-    # Index course children
-    _recurse_children(course, add_with_children)
+def _add_documents_in_pages(index_name: str, docs: Iterable[dict]) -> int:
+    """
+    Adds the documents to the index, in pages of (at most) MEILISEARCH_INDEX_PAGE_SIZE documents sent as soon
+    as they are generated, and waits for Meilisearch to process them.
+
+    Returns the number of documents added.
+    """
+    client = _get_meilisearch_client()
+    page_size = getattr(settings, "MEILISEARCH_INDEX_PAGE_SIZE", 1000)
+    tasks = []
+    num_docs = 0
+    docs = iter(docs)
+    while page := list(islice(docs, page_size)):
+        tasks.append(client.index(index_name).add_documents(page))
+        num_docs += len(page)
+    for task in tasks:
+        _wait_for_meili_task(task)
+    return num_docs
+
+
+def _map_concurrently(fn: Callable, items: Iterable, max_workers: int) -> Iterator:
+    """
+    Like map(), but calls fn for up to max_workers items at once, in threads, if max_workers > 1.
+
+    Each thread closes its database connections once it's done with an item.
+    """
+    if max_workers <= 1:
+        yield from map(fn, items)
+        return
+
+    def call_and_close_connections(item):
+        try:
+            return fn(item)
+        finally:
+            connections.close_all()
 
-    if docs:
-        # Add all the docs in this course at once (usually faster than adding one at a time):
-        _wait_for_meili_task(client.index(index_name).add_documents(docs))
-    return docs
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(call_and_close_connections, items)
 
 
 def rebuild_index(  # pylint: disable=too-many-statements
@@ -628,12 +752,13 @@ def rebuild_index(  # pylint: disable=too-many-statements
 
         def index_library(lib_key: LibraryLocatorV2) -> list:
             docs = []
+            content_tags = get_content_tags(lib_key)
             for component in lib_api.get_library_components(lib_key):
                 try:
                     metadata = lib_api.LibraryXBlockMetadata.from_component(lib_key, component)
                     doc = {}
                     doc.update(searchable_doc_for_library_block(metadata))
-                    doc.update(searchable_doc_tags(metadata.usage_key))
+                    doc.update(searchable_doc_tags(metadata.usage_key, content_tags))
                     doc.update(searchable_doc_collections(metadata.usage_key))
                     doc.update(searchable_doc_containers(metadata.usage_key, "units"))
                     docs.append(doc)
@@ -743,22 +868,39 @@ def rebuild_index(  # pylint: disable=too-many-statements
 
         ############## Courses ##############
         status_cb("Indexing courses...")
-        # To reduce memory usage on large instances, split up the CourseOverviews into pages of 1,000 courses:
+        # Several courses can be indexed at once, each in its own thread:
+        course_workers = getattr(settings, "MEILISEARCH_INDEX_COURSE_WORKERS", 1)
+        courses_started_at = time.monotonic()
+        num_course_blocks_done = 0
+
+        def index_course_from_overview(course) -> int:
+            status_cb(f"Now indexing course {course.display_name} ({course.id})")
+            num_docs = index_course(course.id, index_name, status_cb)
+            if incremental:
+                IncrementalIndexCompleted.objects.get_or_create(context_key=course.id)
+            return num_docs
 
+        # To reduce memory usage on large instances, split up the CourseOverviews into pages of 1,000 courses:
         paginator = Paginator(CourseOverview.objects.only("id", "display_name").order_by("-created", "id"), 1000)
         for p in paginator.page_range:
+            courses = []
             for course in paginator.page(p).object_list:
-                status_cb(
-                    f"{num_contexts_done + 1}/{num_contexts}. Now indexing course {course.display_name} ({course.id})"
-                )
                 if course.id in keys_indexed:
                     num_contexts_done += 1
-                    continue
-                course_docs = index_course(course.id, index_name, status_cb)
-                if incremental:
-                    IncrementalIndexCompleted.objects.get_or_create(context_key=course.id)
+                    status_cb(f"{num_contexts_done}/{num_contexts}. Course {course.id} was already indexed.")
+                else:
+                    courses.append(course)
+            for course, num_docs in zip(  # noqa: B905
+                courses, _map_concurrently(index_course_from_overview, courses, course_workers)
+            ):
                 num_contexts_done += 1
-                num_blocks_done += len(course_docs)
+                num_blocks_done += num_docs
+                num_course_blocks_done += num_docs
+                elapsed = time.monotonic() - courses_started_at
+                status_cb(
+                    f"{num_contexts_done}/{num_contexts}. Indexed {num_docs} blocks in course {course.id} "
+                    f"({num_course_blocks_done / elapsed if elapsed else 0:.1f} course blocks/s so far)"
+                )
 
     IncrementalIndexCompleted.objects.all().delete()
     status_cb(f"Done! {num_blocks_done} blocks indexed across {num_contexts_done} courses, collections and libraries.")
@@ -811,6 +953,7 @@ def delete_docs_with_context_key(key: OpaqueKey) -> None:
     Delete all docs for given context key
     """
     _delete_documents(f'{Fields.context_key} = "{key}"')
+    IndexedCourseVersion.objects.filter(context_key=key).delete()
 
 
 def _delete_documents(filter_query: str) -> None:
@@ -851,6 +994,25 @@ def _delete_index_doc(doc_id) -> None:
     _wait_for_meili_task(client.index(STUDIO_INDEX_NAME).delete_document(doc_id))
 
 
+def _delete_index_docs(doc_ids: list[str]) -> None:
+    """
+    Helper function that deletes the documents with the given IDs from the search index
+
+    If there is a rebuild in progress, the documents will also be removed from the new index.
+    """
+    if not doc_ids:
+        return
+
+    client = _get_meilisearch_client()
+    current_rebuild_index_name = _get_running_rebuild_index_name()
+
+    if current_rebuild_index_name:
+        # If there is a rebuild in progress, the documents will also be removed from the new index.
+        client.index(current_rebuild_index_name).delete_documents(ids=doc_ids)
+
+    _wait_for_meili_task(client.index(STUDIO_INDEX_NAME).delete_documents(ids=doc_ids))
+
+
 def upsert_library_block_index_doc(usage_key: UsageKey) -> None:
     """
     Creates or updates the document for the given Library Block in the search index
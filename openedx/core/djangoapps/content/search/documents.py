@@ -352,10 +352,52 @@ def searchable_doc_for_course_block(block) -> dict:
     return doc
 
 
-def searchable_doc_tags(object_id: OpaqueKey) -> dict:
+def get_content_tags(context_key: LearningContextKey) -> dict[str, list[tuple[str, list[str]]]]:
+    """
+    Get the tags of the given course/library and of all its components, for searchable_doc_tags(), in three
+    queries.
+
+    Returns a dictionary of (taxonomy name, tag lineage) pairs keyed by object id.
+    """
+    object_tags, taxonomies = tagging_api.get_all_object_tags(context_key)
+    tag_values: dict[int, set[str]] = {}
+    for taxonomy_tags in object_tags.values():
+        for taxonomy_id, values in taxonomy_tags.items():
+            if taxonomies[taxonomy_id].enabled:
+                tag_values.setdefault(taxonomy_id, set()).update(values)
+    lineages = tagging_api.get_tag_lineages(tag_values)
+
+    content_tags: dict[str, list[tuple[str, list[str]]]] = {}
+    for object_id, taxonomy_tags in object_tags.items():
+        content_tags[object_id] = [
+            (taxonomies[taxonomy_id].name, lineages.get((taxonomy_id, value), [value]))
+            for taxonomy_id, values in taxonomy_tags.items()
+            if taxonomies[taxonomy_id].enabled
+            for value in values
+        ]
+
+    # Free-text tags have no Tag, so they aren't in get_all_object_tags(); their lineage is just their value.
+    free_text_object_tags, free_text_taxonomies = tagging_api.get_all_free_text_object_tags(context_key)
+    for object_id, taxonomy_tags in free_text_object_tags.items():
+        content_tags.setdefault(object_id, []).extend(
+            (free_text_taxonomies[taxonomy_id].name, [value])
+            for taxonomy_id, values in taxonomy_tags.items()
+            for value in values
+        )
+
+    return {object_id: sorted(tags) for object_id, tags in content_tags.items()}
+
+
+def searchable_doc_tags(
+    object_id: OpaqueKey,
+    content_tags: dict[str, list[tuple[str, list[str]]]] | None = None,
+) -> dict:
     """
     Given an XBlock, course, library, etc., get the tag data for its index doc.
 
+    When indexing many objects from the same course/library, pass the tags of all its objects (see
+    get_content_tags) as content_tags, to skip querying the tags of each one.
+
     See the comments above on "Field.tags" for an explanation of the format.
 
     e.g. for something tagged "Difficulty: Hard" and "Location: Vancouver" this
@@ -376,10 +418,13 @@ def searchable_doc_tags(object_id: OpaqueKey) -> dict:
     strings in a particular format that the frontend knows how to render to
     support hierarchical refinement by tag.
     """
-    # Note that we could improve performance for indexing many components from the same library/course,
-    # if we used get_all_object_tags() to load all the tags for the library in a single query rather than loading the
-    # tags for each component separately.
-    all_tags = tagging_api.get_object_tags(str(object_id)).all()
+    if content_tags is not None:
+        all_tags = content_tags.get(str(object_id), [])
+    else:
+        all_tags = [
+            (obj_tag.taxonomy.name, obj_tag.get_lineage())
+            for obj_tag in tagging_api.get_object_tags(str(object_id)).all()
+        ]
     result = {
         Fields.tags_taxonomy: [],
         Fields.tags_level0: [],
@@ -397,12 +442,12 @@ def searchable_doc_tags(object_id: OpaqueKey) -> dict:
         # and go back to just setting {Fields.tags: {}}` when there are no tags.
         return {Fields.tags: result}
 
-    for obj_tag in all_tags:
+    for taxonomy_name, lineage in all_tags:
         # Add the taxonomy name:
-        if obj_tag.taxonomy.name not in result[Fields.tags_taxonomy]:
-            result[Fields.tags_taxonomy].append(obj_tag.taxonomy.name)
+        if taxonomy_name not in result[Fields.tags_taxonomy]:
+            result[Fields.tags_taxonomy].append(taxonomy_name)
         # Taxonomy name plus each level of tags, in a list: # e.g. ["Location", "North America", "Canada", "Vancouver"]
-        parts = [obj_tag.taxonomy.name] + obj_tag.get_lineage()
+        parts = [taxonomy_name] + lineage
         parts = [part.replace(" > ", " _ ") for part in parts]  # Escape our separator.
         # Now we build each level (tags.level0, tags.level1, etc.) as applicable.
         # We have a hard-coded limit of 4 levels of tags for now (see Fields.tags above).
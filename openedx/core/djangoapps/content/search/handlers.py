@@ -4,6 +4,7 @@ Signal/event handlers for content search
 
 import logging
 
+from django.conf import settings
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
 from opaque_keys import InvalidKeyError
@@ -59,6 +60,7 @@ from .tasks import (
     delete_library_block_index_doc,
     delete_library_container_index_doc,
     delete_xblock_index_doc,
+    sync_course_index_docs,
     update_content_library_index_docs,
     update_library_collection_index_doc,
     update_library_container_index_doc,
@@ -70,6 +72,13 @@ from .tasks import (
 log = logging.getLogger(__name__)
 
 
+def _sync_by_structure_diff(context_key) -> bool:
+    """
+    Should changes to the given course update its index documents with sync_course_index_docs?
+    """
+    return context_key.is_course and getattr(settings, "MEILISEARCH_SYNC_COURSE_INDEX_BY_STRUCTURE_DIFF", False)
+
+
 def handle_post_migrate(sender, **kwargs):
     """
     Reconcile Meilisearch index state after Django migrations run.
@@ -125,6 +134,10 @@ def xblock_created_handler(**kwargs) -> None:
         log.error("Received null or incorrect data for event")
         return
 
+    if _sync_by_structure_diff(xblock_info.usage_key.context_key):
+        sync_course_index_docs.delay(str(xblock_info.usage_key.context_key))
+        return
+
     upsert_xblock_index_doc.delay(
         str(xblock_info.usage_key),
         recursive=False,
@@ -142,6 +155,10 @@ def xblock_updated_handler(**kwargs) -> None:
         log.error("Received null or incorrect data for event")
         return
 
+    if _sync_by_structure_diff(xblock_info.usage_key.context_key):
+        sync_course_index_docs.delay(str(xblock_info.usage_key.context_key))
+        return
+
     upsert_xblock_index_doc.delay(
         str(xblock_info.usage_key),
         recursive=True,  # Update all children because the breadcrumb may have changed
@@ -159,6 +176,10 @@ def xblock_deleted_handler(**kwargs) -> None:
         log.error("Received null or incorrect data for event")
         return
 
+    if _sync_by_structure_diff(xblock_info.usage_key.context_key):
+        sync_course_index_docs.delay(str(xblock_info.usage_key.context_key))
+        return
+
     delete_xblock_index_doc.delay(str(xblock_info.usage_key))
 
 
@@ -398,6 +419,10 @@ def handle_reindex_on_signal(**kwargs):
         log.error("Received null or incorrect data for event")
         return
 
+    if _sync_by_structure_diff(course_data.course_key):
+        sync_course_index_docs.delay(str(course_data.course_key))
+        return
+
     upsert_course_blocks_docs.delay(str(course_data.course_key))
 
 
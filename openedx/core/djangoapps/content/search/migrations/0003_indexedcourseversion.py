@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 12:00
+
+import opaque_keys.edx.django.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_incrementalindexcompleted'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexedCourseVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('context_key', opaque_keys.edx.django.models.LearningContextKeyField(max_length=255, unique=True)),
+                ('structure_version', models.CharField(max_length=255)),
+            ],
+        ),
+    ]
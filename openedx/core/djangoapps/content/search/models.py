@@ -77,3 +77,17 @@ class IncrementalIndexCompleted(models.Model):  # noqa: DJ008
         unique=True,
         null=False,
     )
+
+
+class IndexedCourseVersion(models.Model):  # noqa: DJ008
+    """
+    Stores the version of each course's structure that the search index was last synced with, so that
+    the next sync only has to update the documents of the blocks changed since then.
+    """
+
+    context_key = LearningContextKeyField(
+        max_length=255,
+        unique=True,
+        null=False,
+    )
+    structure_version = models.CharField(max_length=255)
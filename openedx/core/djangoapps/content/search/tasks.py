@@ -49,6 +49,19 @@ def upsert_course_blocks_docs(course_key_str: str) -> None:
     api.index_course(course_key)
 
 
+@shared_task(base=LoggedTask, autoretry_for=(MeilisearchError, ConnectionError))
+@set_code_owner_attribute
+def sync_course_index_docs(course_key_str: str) -> None:
+    """
+    Celery task to update the content index documents of the XBlocks in a course that changed since it was last indexed.
+    """
+    course_key = CourseKey.from_string(course_key_str)
+
+    log.info("Syncing content index documents for XBlocks in course with id: %s", course_key)
+
+    api.sync_course_index(course_key)
+
+
 @shared_task(base=LoggedTask, autoretry_for=(MeilisearchError, ConnectionError))
 @set_code_owner_attribute
 def delete_xblock_index_doc(usage_key_str: str) -> None:
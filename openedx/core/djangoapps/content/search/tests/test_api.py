@@ -28,7 +28,7 @@ from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE,
 try:
     # This import errors in the lms because content.search is not an installed app there.
     from .. import api
-    from ..models import IncrementalIndexCompleted, SearchAccess
+    from ..models import IncrementalIndexCompleted, IndexedCourseVersion, SearchAccess
 except RuntimeError:
     SearchAccess = {}
 
@@ -445,6 +445,117 @@ class TestSearchApi(ModuleStoreTestCase):
         # one missing course indexed
         assert mock_meilisearch.return_value.index.return_value.add_documents.call_count == 8
 
+    @override_settings(MEILISEARCH_ENABLED=True)
+    def test_index_course_free_text_tags(self, mock_meilisearch) -> None:
+        """
+        Test that free-text tags are indexed along with the other tags when a course is indexed.
+        """
+        free_text_taxonomy = tagging_api.create_taxonomy(name="Free", export_id="Free", allow_free_text=True)
+        tagging_api.set_taxonomy_orgs(free_text_taxonomy, all_orgs=True)
+        tagging_api.tag_object(str(self.sequential.usage_key), free_text_taxonomy, ["anything"])
+        tagging_api.tag_object(str(self.sequential.usage_key), self.taxonomyA, ["one"])
+        mock_meilisearch.return_value.index.return_value.add_documents.reset_mock()
+
+        assert api.index_course(self.course.id) == 2
+
+        docs = [
+            doc
+            for add_documents_call in mock_meilisearch.return_value.index.return_value.add_documents.mock_calls
+            for doc in add_documents_call.args[0]
+        ]
+        doc_sequential = next(doc for doc in docs if doc["id"] == self.doc_sequential["id"])
+        assert doc_sequential["tags"] == {
+            "taxonomy": ["A", "Free"],
+            "level0": ["A > one", "Free > anything"],
+            "level1": [],
+            "level2": [],
+            "level3": [],
+        }
+
+    @override_settings(MEILISEARCH_ENABLED=True, MEILISEARCH_INDEX_PAGE_SIZE=1)
+    def test_index_course_in_pages(self, mock_meilisearch) -> None:
+        """
+        Test that a course's documents are added in pages, and that the tags of its blocks are still indexed
+        without loading the tags of each block.
+        """
+        tagging_api.tag_object(str(self.sequential.usage_key), self.taxonomyA, ["one"])
+        doc_sequential = copy.deepcopy(self.doc_sequential)
+        doc_sequential["tags"] = {
+            "taxonomy": ["A"],
+            "level0": ["A > one"],
+            "level1": [],
+            "level2": [],
+            "level3": [],
+        }
+        doc_vertical = copy.deepcopy(self.doc_vertical)
+        doc_vertical["tags"] = copy.deepcopy(EMPTY_TAGS)
+        mock_meilisearch.return_value.index.return_value.add_documents.reset_mock()
+
+        with patch.object(tagging_api, "get_object_tags", wraps=tagging_api.get_object_tags) as mock_get_object_tags:
+            assert api.index_course(self.course.id) == 2
+
+        mock_get_object_tags.assert_not_called()
+        assert mock_meilisearch.return_value.index.return_value.add_documents.mock_calls == [
+            call([doc_sequential]),
+            call([doc_vertical]),
+        ]
+
+    @override_settings(MEILISEARCH_ENABLED=True)
+    def test_sync_course_index(self, mock_meilisearch) -> None:
+        """
+        Test that syncing a course's index only updates the documents of the blocks changed since the course was
+        last indexed, and deletes the documents of the removed blocks.
+        """
+        index = mock_meilisearch.return_value.index.return_value
+
+        # The course was never indexed, so all of it is:
+        api.sync_course_index(self.course.id)
+        assert index.add_documents.call_count == 1
+        indexed_version = IndexedCourseVersion.objects.get(context_key=self.course.id).structure_version
+        assert indexed_version == str(self.store.get_course(self.course.id).course_version)
+
+        # Nothing changed since:
+        api.sync_course_index(self.course.id)
+        index.update_documents.assert_not_called()
+        index.delete_documents.assert_not_called()
+
+        # Renaming the sequential changes the breadcrumbs of the vertical too:
+        sequential = self.store.get_item(self.sequential.location)
+        sequential.display_name = "Renamed"
+        with freeze_time(datetime(2024, 5, 6, 7, 8, 9, tzinfo=UTC)):
+            self.store.update_item(sequential, self.user_id)
+        doc_sequential = copy.deepcopy(self.doc_sequential)
+        doc_sequential["display_name"] = "Renamed"
+        doc_vertical = copy.deepcopy(self.doc_vertical)
+        doc_vertical["breadcrumbs"][1]["display_name"] = "Renamed"
+
+        api.sync_course_index(self.course.id)
+        index.update_documents.assert_called_once()
+        assert sorted(index.update_documents.call_args[0][0], key=lambda doc: doc["id"]) == [
+            doc_sequential,
+            doc_vertical,
+        ]
+        index.delete_documents.assert_not_called()
+
+        # Deleting the vertical deletes its document:
+        index.update_documents.reset_mock()
+        self.store.delete_item(UsageKey.from_string(self.doc_vertical["usage_key"]), self.user_id)
+        api.sync_course_index(self.course.id)
+        index.delete_documents.assert_called_once_with(ids=[self.doc_vertical["id"]])
+        assert [doc["id"] for doc in index.update_documents.call_args[0][0]] == [self.doc_sequential["id"]]
+        assert index.add_documents.call_count == 1
+
+        # If the indexed version can't be found, the course is indexed again in full:
+        IndexedCourseVersion.objects.filter(context_key=self.course.id).update(structure_version="0" * 24)
+        api.sync_course_index(self.course.id)
+        assert index.add_documents.call_count == 2
+
+    @ddt.data(1, 3)
+    def test_map_concurrently(self, max_workers, mock_meilisearch) -> None:  # pylint: disable=unused-argument
+        assert list(api._map_concurrently(lambda x: x * 2, range(10), max_workers)) == [  # pylint: disable=protected-access
+            x * 2 for x in range(10)
+        ]
+
     @override_settings(MEILISEARCH_ENABLED=True)
     def test_reset_meilisearch_index(self, mock_meilisearch) -> None:
         api.reset_index()
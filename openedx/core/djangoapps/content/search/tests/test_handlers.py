@@ -139,6 +139,35 @@ class TestUpdateIndexHandlers(ModuleStoreTestCase, LiveServerTestCase):
             "block-v1orgatest_coursetest_runtypeverticalblocktest_vertical-011f143b"
         )
 
+    @override_settings(MEILISEARCH_SYNC_COURSE_INDEX_BY_STRUCTURE_DIFF=True)
+    @patch("openedx.core.djangoapps.content.search.handlers.upsert_xblock_index_doc")
+    @patch("openedx.core.djangoapps.content.search.handlers.sync_course_index_docs")
+    def test_sync_course_index_on_xblock_changes(
+        self,
+        mock_sync_course_index_docs,
+        mock_upsert_xblock_index_doc,
+        meilisearch_client,  # pylint: disable=unused-argument
+    ):
+        course = self.store.create_course(
+            self.orgA.short_name,
+            "test_course",
+            "test_run",
+            self.user_id,
+            fields={"display_name": "Test Course"},
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sequential = self.store.create_child(self.user_id, course.location, "sequential", "test_sequential")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.store.update_item(sequential, self.user_id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.store.delete_item(sequential.location, self.user_id)
+
+        # Each change syncs the course's documents, instead of updating the ones of the changed block:
+        assert mock_sync_course_index_docs.delay.call_count == 3
+        mock_sync_course_index_docs.delay.assert_called_with(str(course.id))
+        mock_upsert_xblock_index_doc.delay.assert_not_called()
+
     def test_library_creation_creates_search_access(self, meilisearch_client):
         """
         Test that creating a library automatically creates a SearchAccess record.
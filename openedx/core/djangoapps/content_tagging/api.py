@@ -15,7 +15,7 @@ from opaque_keys.edx.keys import CollectionKey, ContainerKey, CourseKey, UsageKe
 from opaque_keys.edx.locator import LibraryLocatorV2
 from openedx_events.content_authoring.data import ContentObjectChangedData, ContentObjectData
 from openedx_events.content_authoring.signals import CONTENT_OBJECT_ASSOCIATIONS_CHANGED, CONTENT_OBJECT_TAGS_CHANGED
-from openedx_tagging.models import ObjectTag, Taxonomy
+from openedx_tagging.models import ObjectTag, Tag, Taxonomy
 from openedx_tagging.models.utils import TAGS_CSV_SEPARATOR
 from organizations.models import Organization
 
@@ -139,18 +139,9 @@ def get_unassigned_taxonomies(enabled=True) -> QuerySet:
     )
 
 
-def get_all_object_tags(
-    content_key: ContentKey,
-    prefetch_orgs: bool = False,
-) -> tuple[TagValuesByObjectIdDict, TaxonomyDict]:
+def _object_id_clause_for_content(content_key: ContentKey) -> Q:
     """
-    Get all the object tags applied to components in the given course/library.
-
-    Includes any tags applied to the course/library as a whole.
-    Returns a tuple with a dictionary of grouped object tag values for all blocks and a dictionary of taxonomies.
-
-    If `prefetch_orgs` is set, then the returned ObjectTag taxonomies will have their TaxonomyOrgs prefetched,
-    which makes checking permissions faster.
+    Returns a filter matching the object tags of the given course/library and of its components.
     """
     context_key_str = str(content_key)
     # We use a block_id_prefix (i.e. the modified course id) to get the tags for the children of the Content
@@ -168,10 +159,25 @@ def get_all_object_tags(
     object_id_clause = Q(object_id=content_key)
     if block_id_prefix:
         object_id_clause |= Q(object_id__startswith=block_id_prefix)
+    return object_id_clause
 
+
+def get_all_object_tags(
+    content_key: ContentKey,
+    prefetch_orgs: bool = False,
+) -> tuple[TagValuesByObjectIdDict, TaxonomyDict]:
+    """
+    Get all the object tags applied to components in the given course/library.
+
+    Includes any tags applied to the course/library as a whole.
+    Returns a tuple with a dictionary of grouped object tag values for all blocks and a dictionary of taxonomies.
+
+    If `prefetch_orgs` is set, then the returned ObjectTag taxonomies will have their TaxonomyOrgs prefetched,
+    which makes checking permissions faster.
+    """
     all_object_tags = ObjectTag.objects.filter(
         Q(tag__isnull=False, tag__taxonomy__isnull=False),
-        object_id_clause,
+        _object_id_clause_for_content(content_key),
     ).select_related("tag__taxonomy").order_by("object_id")
 
     if prefetch_orgs:
@@ -197,6 +203,50 @@ def get_all_object_tags(
     return grouped_object_tags, dict(sorted(taxonomies.items()))
 
 
+def get_all_free_text_object_tags(content_key: ContentKey) -> tuple[TagValuesByObjectIdDict, TaxonomyDict]:
+    """
+    Get all the free-text object tags applied to the given course/library and its components, in a single query.
+
+    These are the tags that get_all_object_tags() leaves out, since they have no Tag. Tags of deleted or
+    disabled taxonomies are excluded, as in get_object_tags(). Returns the same tuple as get_all_object_tags().
+    """
+    free_text_object_tags = ObjectTag.objects.filter(
+        _object_id_clause_for_content(content_key),
+        tag__isnull=True,
+        taxonomy__isnull=False,
+        taxonomy__enabled=True,
+        taxonomy__allow_free_text=True,
+    ).select_related("taxonomy").order_by("object_id", "taxonomy_id", "id")
+
+    grouped_object_tags: TagValuesByObjectIdDict = {}
+    taxonomies: TaxonomyDict = {}
+    for object_tag in free_text_object_tags:
+        grouped_object_tags.setdefault(object_tag.object_id, {}).setdefault(object_tag.taxonomy_id, []).append(
+            object_tag.value
+        )
+        taxonomies.setdefault(object_tag.taxonomy_id, object_tag.taxonomy)
+
+    return grouped_object_tags, dict(sorted(taxonomies.items()))
+
+
+def get_tag_lineages(tag_values: dict[int, set[str]]) -> dict[tuple[int, str], list[str]]:
+    """
+    Get the lineage of the given tags, as a dictionary of lineages keyed by (taxonomy id, tag value), in a single
+    query.
+
+    `tag_values` holds the values of the tags to look up for each taxonomy id, e.g. as returned by
+    get_all_object_tags().  Tags without a parent aren't included; their lineage is just their value.
+    """
+    tags_clause = Q()
+    for taxonomy_id, values in tag_values.items():
+        tags_clause |= Q(taxonomy_id=taxonomy_id, value__in=values)
+    if not tags_clause:
+        return {}
+    # Join the parents down to the fourth level of tags, the deepest one the search index uses.
+    tags = Tag.objects.filter(tags_clause, parent__isnull=False).select_related("parent__parent__parent")
+    return {(tag.taxonomy_id, tag.value): tag.get_lineage() for tag in tags}
+
+
 def set_all_object_tags(
     content_key: ContentKey,
     object_tags: TagValuesByTaxonomyIdDict,
@@ -314,6 +314,49 @@ class TestAPIObjectTags(TestGetAllObjectTagsMixin, TestCase):
             self.taxonomy_2.id: self.taxonomy_2,
         }
 
+    def test_get_all_free_text_object_tags(self):
+        """
+        Test the get_all_free_text_object_tags function using a course
+        """
+        free_text_taxonomy = api.create_taxonomy(name="Free text", allow_free_text=True)
+        api.set_taxonomy_orgs(free_text_taxonomy, all_orgs=True)
+        disabled_taxonomy = api.create_taxonomy(name="Disabled", allow_free_text=True)
+        api.set_taxonomy_orgs(disabled_taxonomy, all_orgs=True)
+        block_id = "block-v1:orgA+test_course+test_run+type@sequential+block@test_sequential"
+        api.tag_object(object_id=block_id, taxonomy=free_text_taxonomy, tags=["Free 1", "Free 2"])
+        api.tag_object(object_id=block_id, taxonomy=disabled_taxonomy, tags=["Hidden"])
+        api.tag_object(object_id="course-v1:orgB+other_course+test_run", taxonomy=free_text_taxonomy, tags=["Other"])
+        disabled_taxonomy.enabled = False
+        disabled_taxonomy.save()
+
+        with self.assertNumQueries(1):
+            object_tags, taxonomies = api.get_all_free_text_object_tags(
+                CourseKey.from_string("course-v1:orgA+test_course+test_run")
+            )
+
+        assert object_tags == {block_id: {free_text_taxonomy.id: ["Free 1", "Free 2"]}}
+        assert taxonomies == {free_text_taxonomy.id: free_text_taxonomy}
+
+    def test_get_tag_lineages(self):
+        """
+        Test the get_tag_lineages function with tags at the root and below it
+        """
+        api.add_tag_to_taxonomy(taxonomy=self.taxonomy_1, tag="Tag 1.1.1", parent_tag_value="Tag 1.1")
+        api.add_tag_to_taxonomy(taxonomy=self.taxonomy_1, tag="Tag 1.1.1.1", parent_tag_value="Tag 1.1.1")
+
+        with self.assertNumQueries(1):
+            lineages = api.get_tag_lineages({
+                self.taxonomy_1.id: {"Tag 1.1", "Tag 1.1.1", "Tag 1.1.1.1"},
+                self.taxonomy_2.id: {"Tag 2.1"},
+            })
+
+        assert lineages == {
+            (self.taxonomy_1.id, "Tag 1.1.1"): ["Tag 1.1", "Tag 1.1.1"],
+            (self.taxonomy_1.id, "Tag 1.1.1.1"): ["Tag 1.1", "Tag 1.1.1", "Tag 1.1.1.1"],
+        }
+        with self.assertNumQueries(0):
+            assert not api.get_tag_lineages({})
+
     def test_get_library_object_tags(self):
         """
         Test the get_all_object_tags function using a library
@@ -1,6 +1,13 @@
 """
 Helper functions for caching course assets.
+
+Assets are cached in three tiers, all keyed by the asset's location:
+  - the whole content of small assets,
+  - the metadata (digest, lock, length, content type, last modification...) of any asset,
+    which is enough to answer conditional and unauthorized requests without loading its data,
+  - for a short time, the locations of assets which weren't found.
 """
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
@@ -14,37 +21,90 @@ try:
 except InvalidCacheBackendError:
     pass
 
+METADATA_KEY_PREFIX = 'metadata:'
+NOT_FOUND_KEY_PREFIX = 'not_found:'
+
+# Attributes of the content kept as its metadata.
+METADATA_FIELDS = (
+    'name', 'content_type', 'length', 'last_modified_at', 'thumbnail_location', 'import_path', 'locked',
+    'content_digest',
+)
+
+
+def _cache_key(location, prefix=''):
+    """
+    Returns the cache key of the given location, for the tier with the given prefix.
+    """
+    return (prefix + str(location)).encode("utf-8")
+
 
 def set_cached_content(content):
     """
     Stores the given piece of content in the cache, using its location as the key.
     """
-    CONTENT_CACHE.set(str(content.location).encode("utf-8"), content, version=STATIC_CONTENT_VERSION)
+    CONTENT_CACHE.set(_cache_key(content.location), content, version=STATIC_CONTENT_VERSION)
 
 
 def get_cached_content(location):
     """
     Retrieves the given piece of content by its location if cached.
     """
-    return CONTENT_CACHE.get(str(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
+    return CONTENT_CACHE.get(_cache_key(location), version=STATIC_CONTENT_VERSION)
+
+
+def set_cached_metadata(content):
+    """
+    Stores the metadata of the given piece of content in the cache, using its location as the key.
+    """
+    metadata = {field: getattr(content, field, None) for field in METADATA_FIELDS}
+    CONTENT_CACHE.set(_cache_key(content.location, METADATA_KEY_PREFIX), metadata, version=STATIC_CONTENT_VERSION)
+
+
+def get_cached_metadata(location):
+    """
+    Retrieves the metadata of the given piece of content by its location, as a dict, if cached.
+    """
+    return CONTENT_CACHE.get(_cache_key(location, METADATA_KEY_PREFIX), version=STATIC_CONTENT_VERSION)
+
+
+def set_cached_not_found(location):
+    """
+    Records in the cache, for COURSE_ASSETS_NOT_FOUND_CACHE_TTL seconds, that there is no content at the location.
+    """
+    timeout = getattr(settings, 'COURSE_ASSETS_NOT_FOUND_CACHE_TTL', 0)
+    if timeout > 0:
+        CONTENT_CACHE.set(
+            _cache_key(location, NOT_FOUND_KEY_PREFIX), True, timeout=timeout, version=STATIC_CONTENT_VERSION
+        )
+
+
+def is_cached_not_found(location):
+    """
+    Returns whether the cache records that there is no content at the location.
+    """
+    return CONTENT_CACHE.get(_cache_key(location, NOT_FOUND_KEY_PREFIX), False, version=STATIC_CONTENT_VERSION)
 
 
 def del_cached_content(location):
     """
-    Delete content for the given location, as well versions of the content without a run.
+    Delete content, its metadata and any record of it not being found for the given location, as well
+    as for the location without a run.
 
     It's possible that the content could have been cached without knowing the course_key,
     and so without having the run.
     """
-    def location_str(loc):
-        """Force the location to a Unicode string."""
-        return str(loc).encode("utf-8")
-
-    locations = [location_str(location)]
+    locations = [location]
     try:
-        locations.append(location_str(location.replace(run=None)))
+        locations.append(location.replace(run=None))
     except InvalidKeyError:
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
-    CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    CONTENT_CACHE.delete_many(
+        [
+            _cache_key(loc, prefix)
+            for loc in locations
+            for prefix in ('', METADATA_KEY_PREFIX, NOT_FOUND_KEY_PREFIX)
+        ],
+        version=STATIC_CONTENT_VERSION,
+    )
@@ -0,0 +1,118 @@
+"""
+Performance test of the contentserver under range-heavy seeking through a large asset, comparing streamed
+responses with responses buffered in memory, as all responses were before they were streamed.
+
+Run with::
+
+    RUN_PERF_TESTS=1 pytest -s openedx/core/djangoapps/contentserver/perf_tests/test_range_seeking.py
+"""
+
+
+import copy
+import os
+import random
+import time
+import unittest
+from unittest.mock import patch
+from uuid import uuid4
+
+import ddt
+from django.conf import settings
+from django.http import HttpResponse
+from django.test.client import Client
+from django.test.utils import override_settings
+from gridfs.grid_file import GridOut
+
+from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+TEST_DATA_CONTENTSTORE = copy.deepcopy(settings.CONTENTSTORE)
+TEST_DATA_CONTENTSTORE['DOC_STORE_CONFIG']['db'] = 'test_xcontent_%s' % uuid4().hex  # noqa: UP031
+
+# The size of the asset sought through, e.g. a lecture video.
+ASSET_LENGTH = 64 * 1024 * 1024
+
+# How many seeks a session makes, and how much of the asset the player reads after each one
+# before seeking again.
+SEEKS = 20
+BYTES_READ_PER_SEEK = 512 * 1024
+
+
+@ddt.ddt
+@unittest.skipUnless(os.environ.get('RUN_PERF_TESTS'), "Performance tests are only run on request.")
+@override_settings(CONTENTSTORE=TEST_DATA_CONTENTSTORE)
+class RangeSeekingTiming(SharedModuleStoreTestCase):
+    """
+    Replays a video player seeking through a large asset, and reports the bytes read from the
+    contentstore (origin bandwidth) and the time the worker spends on the requests (occupancy).
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        course_key = CourseFactory.create().id
+        cls.asset_key = course_key.make_asset_key('asset', 'lecture.mp4')
+        cls.url = '/' + str(cls.asset_key)
+        contentstore().save(StaticContent(cls.asset_key, 'lecture.mp4', 'video/mp4', os.urandom(ASSET_LENGTH)))
+
+    def _seek_session(self, range_headers):
+        """
+        Requests each of the given ranges and reads the start of its data, as a player seeking would.
+
+        Returns (bytes read from the contentstore, seconds spent serving the requests).
+        """
+        bytes_read = []
+        readchunk = GridOut.readchunk
+
+        def counting_readchunk(grid_out):
+            chunk = readchunk(grid_out)
+            bytes_read.append(len(chunk))
+            return chunk
+
+        client = Client()
+        elapsed = 0
+        with patch.object(GridOut, 'readchunk', autospec=True, side_effect=counting_readchunk):
+            for range_header in range_headers:
+                start = time.perf_counter()
+                response = client.get(self.url, HTTP_RANGE=range_header)
+                assert response.status_code == 206
+                received = 0
+                for data in (response.streaming_content if response.streaming else [response.content]):
+                    received += len(data)
+                    if received >= BYTES_READ_PER_SEEK:
+                        break
+                # The player drops the connection when it seeks again.
+                response.close()
+                elapsed += time.perf_counter() - start
+        return sum(bytes_read), elapsed
+
+    @ddt.data('open-ended', 'bounded')
+    def test_seek_timings(self, range_kind):
+        seek_positions = random.Random(0).sample(range(0, ASSET_LENGTH - BYTES_READ_PER_SEEK, 4096), SEEKS)
+        if range_kind == 'open-ended':
+            # What HTML5 video players send.
+            range_headers = [f'bytes={first}-' for first in seek_positions]
+        else:
+            range_headers = [f'bytes={first}-{first + 2 * BYTES_READ_PER_SEEK - 1}' for first in seek_positions]
+
+        with patch(
+            'openedx.core.djangoapps.contentserver.views.make_content_response',
+            side_effect=lambda content, data: HttpResponse(data),
+        ):
+            buffered_bytes, buffered_seconds = self._seek_session(range_headers)
+        streamed_bytes, streamed_seconds = self._seek_session(range_headers)
+
+        delivered = SEEKS * BYTES_READ_PER_SEEK
+        print(
+            f"\n{SEEKS} {range_kind} seeks reading {BYTES_READ_PER_SEEK // 1024} KB each"
+            f" ({delivered / 2 ** 20:.1f} MB used by the player):"
+            f"\n  buffered: {buffered_bytes / 2 ** 20:8.1f} MB read from the contentstore"
+            f"  {buffered_seconds * 1000:8.1f} ms serving"
+            f"\n  streamed: {streamed_bytes / 2 ** 20:8.1f} MB read from the contentstore"
+            f"  {streamed_seconds * 1000:8.1f} ms serving"
+        )
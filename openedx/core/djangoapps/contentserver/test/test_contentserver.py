@@ -7,27 +7,32 @@ import copy
 import datetime
 import logging
 import unittest
+from io import BytesIO
 from unittest.mock import patch
 from uuid import uuid4
 
 import ddt
+import pytest
 from django.conf import settings
-from django.test import RequestFactory
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import RequestFactory, SimpleTestCase
 from django.test.client import Client
 from django.test.utils import override_settings
 from opaque_keys import InvalidKeyError
+from opaque_keys.edx.locator import CourseLocator
 
 from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.student.tests.factories import AdminFactory, UserFactory
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import VERSIONED_ASSETS_PREFIX, StaticContent
+from xmodule.contentstore.content import VERSIONED_ASSETS_PREFIX, StaticContent, StaticContentStream
 from xmodule.contentstore.django import contentstore
+from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE, SharedModuleStoreTestCase
 from xmodule.modulestore.xml_importer import import_course_from_xml
 
-from .. import views
+from .. import caching, views
 
 log = logging.getLogger(__name__)
 
@@ -324,15 +329,83 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request output a multipart/byteranges response with a part for each range.
         """
-        first_byte = self.length_unlocked / 4
-        last_byte = self.length_unlocked / 2
+        data = self.contentstore.find(self.unlocked_asset).data
+        first_byte = self.length_unlocked // 4
+        last_byte = self.length_unlocked // 2
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(  # noqa: UP032
             first=first_byte, last=last_byte))
 
-        assert resp.status_code == 200
+        assert resp.status_code == 206
         assert 'Content-Range' not in resp
+        content_type, boundary = resp['Content-Type'].split('; boundary=')
+        assert content_type == 'multipart/byteranges'
+        body = resp.content
+        assert resp['Content-Length'] == str(len(body))
+        parts = body.split(f'--{boundary}'.encode())
+        # The body starts with an empty preamble and ends with the closing boundary.
+        assert len(parts) == 4
+        assert parts[-1] == b'--\r\n'
+        expected_ranges = [(first_byte, last_byte), (self.length_unlocked - 100, self.length_unlocked - 1)]
+        for part, (first, last) in zip(parts[1:3], expected_ranges):  # noqa: B905
+            headers, part_data = part.split(b'\r\n\r\n', 1)
+            assert f'Content-Range: bytes {first}-{last}/{self.length_unlocked}'.encode() in headers
+            assert part_data == data[first:last + 1] + b'\r\n'
+
+    def test_range_request_overlapping_ranges(self):
+        """
+        Test that overlapping and adjacent ranges are coalesced into a single range.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=10-20, 0-9, 15-30')
+
+        assert resp.status_code == 206
+        assert resp['Content-Range'] == f'bytes 0-30/{self.length_unlocked}'
+        assert resp['Content-Length'] == '31'
+
+    def test_range_requests_seeking(self):
+        """
+        Test a sequence of range requests as sent by a video player seeking through an asset: each response
+        holds just the requested bytes.
+        """
+        data = self.contentstore.find(self.unlocked_asset).data
+        chunk_length = max(self.length_unlocked // 10, 1)
+        for first in (0, 5 * chunk_length, 2 * chunk_length, 9 * chunk_length, chunk_length):
+            last = min(first + chunk_length - 1, self.length_unlocked - 1)
+            resp = self.client.get(self.url_unlocked, HTTP_RANGE=f'bytes={first}-{last}')
+            assert resp.status_code == 206
+            assert resp['Content-Range'] == f'bytes {first}-{last}/{self.length_unlocked}'
+            assert b''.join(resp) == data[first:last + 1]
+
+    def test_etag(self):
+        """
+        Test that the ETag is the asset's digest, and that a request matching it gets a 304 Not Modified.
+        """
+        content_digest = self.contentstore.find(self.unlocked_asset).content_digest
+        resp = self.client.get(self.url_unlocked)
+        assert resp.status_code == 200
+        assert resp['ETag'] == f'"{content_digest}"'
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=f'"other", W/"{content_digest}"')
+        assert resp.status_code == 304
+        assert resp['ETag'] == f'"{content_digest}"'
+
+        # If-None-Match takes precedence over If-Modified-Since.
+        resp = self.client.get(
+            self.url_unlocked, HTTP_IF_NONE_MATCH='"other"', HTTP_IF_MODIFIED_SINCE=resp['Last-Modified'],
+        )
+        assert resp.status_code == 200
+
+    def test_if_range(self):
+        """
+        Test that a Range is only served if the If-Range matches the current version of the asset.
+        """
+        content_digest = self.contentstore.find(self.unlocked_asset).content_digest
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=f'"{content_digest}"')
+        assert resp.status_code == 206
+
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"other"')
+        assert resp.status_code == 200
         assert resp['Content-Length'] == str(self.length_unlocked)
 
     @ddt.data(
@@ -485,6 +558,63 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         assert is_from_cdn is True
 
 
+@override_settings(COURSE_ASSETS_NOT_FOUND_CACHE_TTL=60)
+class LoadAssetFromLocationTestCase(SimpleTestCase):
+    """
+    Tests for the cache tiers of load_asset_from_location.
+    """
+    def setUp(self):
+        super().setUp()
+        self.location = CourseLocator('edX', 'toy', '2012_Fall').make_asset_key('asset', 'video.mp4')
+        cache_patcher = patch.object(caching, 'CONTENT_CACHE', LocMemCache('contentserver-test', {}))
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        find_patcher = patch.object(views.AssetManager, 'find')
+        self.mock_find = find_patcher.start()
+        self.addCleanup(find_patcher.stop)
+
+    def stream_content(self, data):
+        """
+        Returns the content of the asset with the given data, as loaded from the contentstore.
+        """
+        return StaticContentStream(
+            self.location, 'video.mp4', 'video/mp4', BytesIO(data),
+            last_modified_at=datetime.datetime(2024, 1, 1), length=len(data), content_digest='abc',
+        )
+
+    def test_small_content_cached(self):
+        self.mock_find.side_effect = lambda *args, **kwargs: self.stream_content(b'data')
+        views.load_asset_from_location(self.location)
+        content = views.load_asset_from_location(self.location)
+
+        assert self.mock_find.call_count == 1
+        assert content.data == b'data'
+
+    def test_large_content_metadata_cached(self):
+        data = b'd' * 1048576
+        self.mock_find.side_effect = lambda *args, **kwargs: self.stream_content(data)
+        views.load_asset_from_location(self.location)
+        content = views.load_asset_from_location(self.location)
+
+        # The metadata of the content is available without loading it.
+        assert self.mock_find.call_count == 1
+        assert (content.length, content.content_type, content.content_digest) == (len(data), 'video/mp4', 'abc')
+        assert b''.join(content.stream_data_in_range(10, 19)) == data[10:20]
+        assert self.mock_find.call_count == 2
+
+    def test_not_found_cached(self):
+        self.mock_find.side_effect = NotFoundError()
+        for __ in range(2):
+            with pytest.raises(NotFoundError):
+                views.load_asset_from_location(self.location)
+        assert self.mock_find.call_count == 1
+
+        # Saving or deleting the asset clears the cache.
+        caching.del_cached_content(self.location)
+        self.mock_find.side_effect = lambda *args, **kwargs: self.stream_content(b'data')
+        assert views.load_asset_from_location(self.location).data == b'data'
+
+
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
     """
@@ -7,6 +7,7 @@ have 3 views as entry points.
 """
 import datetime
 import logging
+from uuid import uuid4
 
 from django.http import (
     HttpResponse,
@@ -15,7 +16,9 @@ from django.http import (
     HttpResponseNotFound,
     HttpResponseNotModified,
     HttpResponsePermanentRedirect,
+    StreamingHttpResponse,
 )
+from django.utils.http import parse_etags, quote_etag
 from django.views.decorators.http import require_safe
 from edx_django_utils.monitoring import set_custom_attribute
 from opaque_keys import InvalidKeyError
@@ -26,13 +29,20 @@ from common.djangoapps.student.models import CourseEnrollment
 from openedx.core.djangoapps.header_control import force_header_for_response
 from openedx.core.djangoapps.waffle_utils import CourseWaffleFlag
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent
+from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent, StaticContentStream
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore import InvalidLocationError
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.util.sandboxing import course_code_library_asset_name
 
-from .caching import get_cached_content, set_cached_content
+from .caching import (
+    get_cached_content,
+    get_cached_metadata,
+    is_cached_not_found,
+    set_cached_content,
+    set_cached_metadata,
+    set_cached_not_found,
+)
 from .models import CdnUserAgentsConfig, CourseAssetCacheTtlConfig
 
 
@@ -51,6 +61,10 @@ log = logging.getLogger(__name__)
 
 HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# Maximum number of (coalesced) ranges served as a multipart/byteranges response.
+# Requests for more ranges get the full content.
+MAX_BYTE_RANGES = 20
+
 
 def is_asset_request(request):
     """Determines whether the given request is an asset request"""
@@ -124,25 +138,33 @@ def process_request(request):
             return HttpResponseForbidden('Unauthorized')
 
         # Figure out if the client sent us a conditional request, and let them know
-        # if this asset has changed since then.
+        # if this asset has changed since then. If-None-Match takes precedence over If-Modified-Since.
+        # https://www.rfc-editor.org/rfc/rfc9110#section-13.2.2
+        etag = get_etag(content)
         last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-        if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            if etag is not None and etag_matches(request.META['HTTP_IF_NONE_MATCH'], etag, weak=True):
+                response = HttpResponseNotModified()
+                set_caching_headers(content, loc, response)
+                return response
+        elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
             if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
             if if_modified_since == last_modified_at_str:
-                return HttpResponseNotModified()
+                response = HttpResponseNotModified()
+                set_caching_headers(content, loc, response)
+                return response
 
-        # *** File streaming within a byte range ***
+        # *** File streaming within byte ranges ***
         # If a Range is provided, parse Range attribute of the request
         # Add Content-Range in the response if Range is structurally correct
-        # Request -> Range attribute structure: "Range: bytes=first-[last]"
-        # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
-        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
+        # Request -> Range attribute structure: "Range: bytes=first-[last][, first-[last]...]"
+        # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength", in the
+        # response headers for a single range, and in the header of each part of a multipart/byteranges response
+        # for multiple ranges.
+        # https://www.rfc-editor.org/rfc/rfc9110#section-14
+        # The Range is ignored if an If-Range precondition shows the client holds another version of the asset.
         response = None
-        if request.META.get('HTTP_RANGE'):
-            # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-            if isinstance(content, StaticContent):
-                content = AssetManager.find(loc, as_stream=True)
-
+        if request.META.get('HTTP_RANGE') and if_range_matches(request, etag, last_modified_at_str):
             header_value = request.META['HTTP_RANGE']
             try:
                 unit, ranges = parse_range_header(header_value, content.length)
@@ -153,47 +175,52 @@ def process_request(request):
                     str(exception), header_value, str(loc)
                 )
             else:
+                satisfiable_ranges = coalesce_ranges(ranges, content.length)
                 if unit != 'bytes':
                     # Only accept ranges in bytes
                     log.warning("Unknown unit in Range header: %s for content: %s", header_value, str(loc))
-                elif len(ranges) > 1:
-                    # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                    # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                    # But we send back the full content.
+                elif not satisfiable_ranges:
                     log.warning(
-                        "More than 1 ranges in Range header: %s for content: %s", header_value, str(loc)
+                        "Cannot satisfy ranges in Range header: %s for content: %s",
+                        header_value, str(loc)
                     )
+                    response = HttpResponse(status=416)  # Requested Range Not Satisfiable
+                    response['Content-Range'] = f'bytes */{content.length}'
+                    return response
+                elif len(satisfiable_ranges) > MAX_BYTE_RANGES:
+                    log.warning(
+                        "Too many ranges in Range header: %s for content: %s", header_value, str(loc)
+                    )
+                elif len(satisfiable_ranges) == 1:
+                    first, last = satisfiable_ranges[0]
+                    response = make_content_response(content, content.stream_data_in_range(first, last))
+                    response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(  # noqa: UP032
+                        first=first, last=last, length=content.length
+                    )
+                    response['Content-Length'] = str(last - first + 1)
+                    response['Content-Type'] = content.content_type
+                    response.status_code = 206  # Partial Content
+
+                    set_custom_attribute('contentserver.ranged', True)
                 else:
-                    first, last = ranges[0]
-
-                    if 0 <= first <= last < content.length:
-                        # If the byte range is satisfiable
-                        response = HttpResponse(content.stream_data_in_range(first, last))
-                        response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(  # noqa: UP032
-                            first=first, last=last, length=content.length
-                        )
-                        response['Content-Length'] = str(last - first + 1)
-                        response.status_code = 206  # Partial Content
-
-                        set_custom_attribute('contentserver.ranged', True)
-                    else:
-                        log.warning(
-                            "Cannot satisfy ranges in Range header: %s for content: %s",
-                            header_value, str(loc)
-                        )
-                        return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                    response = make_byteranges_response(content, satisfiable_ranges)
+                    response.status_code = 206  # Partial Content
+
+                    set_custom_attribute('contentserver.ranged', True)
+                    set_custom_attribute('contentserver.range_count', len(satisfiable_ranges))
 
         # If Range header is absent or syntactically invalid return a full content response.
         if response is None:
-            response = HttpResponse(content.stream_data())
+            response = make_content_response(content, content.stream_data())
             response['Content-Length'] = content.length
+            response['Content-Type'] = content.content_type
 
         set_custom_attribute('contentserver.content_len', content.length)
         set_custom_attribute('contentserver.content_type', content.content_type)
+        set_custom_attribute('contentserver.streamed', response.streaming)
 
         # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
         response['Accept-Ranges'] = 'bytes'
-        response['Content-Type'] = content.content_type
         response['X-Frame-Options'] = 'ALLOW'
 
         # Set any caching headers, and do any response cleanup needed.  Based on how much
@@ -233,6 +260,9 @@ def set_caching_headers(content, location, response):
         response['Cache-Control'] = "private, no-cache, no-store"
 
     response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+    etag = get_etag(content)
+    if etag is not None:
+        response['ETag'] = etag
 
     # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
     # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
@@ -324,28 +354,174 @@ def is_user_authorized(request, content, location):
     return True
 
 
+class CachedMetadataContent(StaticContentStream):
+    """
+    Content built from its cached metadata, whose data is only loaded from the contentstore once it's read.
+    """
+    def __init__(self, location, metadata):
+        super().__init__(location, stream=None, **metadata)
+        self._content = None
+
+    def _load(self):
+        if self._content is None:
+            self._content = AssetManager.find(self.location, as_stream=True)
+        return self._content
+
+    def stream_data(self):
+        return self._load().stream_data()
+
+    def stream_data_in_range(self, first_byte, last_byte):
+        return self._load().stream_data_in_range(first_byte, last_byte)
+
+    def close(self):
+        if self._content is not None:
+            self._content.close()
+
+    def copy_to_in_mem(self):
+        return self._load().copy_to_in_mem()
+
+
 def load_asset_from_location(location):
     """
     Loads an asset based on its location, either retrieving it from a cache
     or loading it directly from the contentstore.
+
+    Raises NotFoundError if there's no asset at the location.
     """
 
-    # See if we can load this item from cache.
+    # See if we can load this item, or at least its metadata, from cache.
     content = get_cached_content(location)
-    if content is None:
-        # Not in cache, so just try and load it from the asset manager.
+    if content is not None:
+        # .. custom_attribute_name: contentserver.cache_tier
+        # .. custom_attribute_description: The cache tier which answered the lookup of the requested asset:
+        #   'content', 'metadata' or 'not_found', or 'miss' if the asset was loaded from the contentstore.
+        set_custom_attribute('contentserver.cache_tier', 'content')
+        return content
+
+    if is_cached_not_found(location):
+        set_custom_attribute('contentserver.cache_tier', 'not_found')
+        raise NotFoundError(location)
+
+    metadata = get_cached_metadata(location)
+    if metadata is not None:
+        set_custom_attribute('contentserver.cache_tier', 'metadata')
+        return CachedMetadataContent(location, metadata)
+
+    # Not in cache, so just try and load it from the asset manager.
+    set_custom_attribute('contentserver.cache_tier', 'miss')
+    try:
         content = AssetManager.find(location, as_stream=True)
-
-        # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
-        # because it's the default for memcached and also we don't want to do too much
-        # buffering in memory when we're serving an actual request.
-        if content.length is not None and content.length < 1048576:
-            content = content.copy_to_in_mem()
-            set_cached_content(content)
+    except (ItemNotFoundError, NotFoundError):
+        set_cached_not_found(location)
+        raise
+
+    # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
+    # because it's the default for memcached and also we don't want to do too much
+    # buffering in memory when we're serving an actual request.
+    if content.length is not None and content.length < 1048576:
+        content = content.copy_to_in_mem()
+        set_cached_content(content)
+    else:
+        set_cached_metadata(content)
 
     return content
 
 
+def make_content_response(content, data):
+    """
+    Returns a response with the given data of the content.
+
+    The data of content which isn't in memory is streamed to the client as it is read, one
+    GridFS chunk at a time, rather than being buffered in the response.
+    """
+    if isinstance(content, StaticContentStream):
+        return StreamingHttpResponse(data)
+    return HttpResponse(data)
+
+
+def make_byteranges_response(content, ranges):
+    """
+    Returns a multipart/byteranges response with the given (first, last) byte ranges of the content.
+    """
+    boundary = uuid4().hex
+    part_headers = []
+    for first, last in ranges:
+        part_header = f'\r\n--{boundary}\r\n'
+        if content.content_type:
+            part_header += f'Content-Type: {content.content_type}\r\n'
+        part_header += f'Content-Range: bytes {first}-{last}/{content.length}\r\n\r\n'
+        part_headers.append(part_header.encode('ascii'))
+    closing_boundary = f'\r\n--{boundary}--\r\n'.encode('ascii')
+
+    def stream_parts():
+        for (first, last), part_header in zip(ranges, part_headers):  # noqa: B905
+            yield part_header
+            yield from content.stream_data_in_range(first, last)
+        yield closing_boundary
+
+    response = make_content_response(content, stream_parts())
+    response['Content-Type'] = f'multipart/byteranges; boundary={boundary}'
+    response['Content-Length'] = str(
+        sum(len(part_header) for part_header in part_headers)
+        + sum(last - first + 1 for first, last in ranges)
+        + len(closing_boundary)
+    )
+    return response
+
+
+def get_etag(content):
+    """
+    Returns the strong entity tag of the content, based on the digest of its data, if it has one.
+    """
+    content_digest = getattr(content, 'content_digest', None)
+    if not content_digest:
+        return None
+    return quote_etag(content_digest)
+
+
+def etag_matches(header_value, etag, weak=False):
+    """
+    Returns whether the entity tags of an If-None-Match or If-Range header match the given (strong) etag.
+
+    Weak comparison, as used for If-None-Match, ignores the weakness of the header's entity tags.
+    """
+    etags = parse_etags(header_value)
+    if etags == ['*']:
+        return True
+    if weak:
+        etags = [tag.removeprefix('W/') for tag in etags]
+    return etag in etags
+
+
+def if_range_matches(request, etag, last_modified_at_str):
+    """
+    Returns whether the request's Range should be served, i.e. whether it has no If-Range header,
+    or one matching the current version of the asset.
+    """
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return etag is not None and etag_matches(if_range, etag)
+    return if_range == last_modified_at_str
+
+
+def coalesce_ranges(ranges, content_length):
+    """
+    Returns the satisfiable (first, last) byte ranges among the given ones, sorted,
+    with overlapping and adjacent ranges merged.
+    """
+    coalesced = []
+    for first, last in sorted(ranges):
+        if not 0 <= first <= last < content_length:
+            continue
+        if coalesced and first <= coalesced[-1][1] + 1:
+            coalesced[-1] = (coalesced[-1][0], max(last, coalesced[-1][1]))
+        else:
+            coalesced.append((first, last))
+    return coalesced
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
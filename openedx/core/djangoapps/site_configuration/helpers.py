@@ -208,10 +208,7 @@ def get_value_for_org(org, val_name, default=None):
     """
     # Import is placed here to avoid model import at project startup.
     from openedx.core.djangoapps.site_configuration.models import SiteConfiguration
-    if SiteConfiguration.has_org(org):
-        return SiteConfiguration.get_value_for_org(org, val_name, default)
-    else:
-        return default
+    return SiteConfiguration.get_value_for_org(org, val_name, default)
 
 
 def get_current_site_orgs():
@@ -4,17 +4,91 @@ Django models for site configurations.
 
 
 import collections
+import copy
 from logging import getLogger
+from uuid import uuid4
 
 from django.contrib.sites.models import Site
-from django.db import models
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from jsonfield.fields import JSONField
 from model_utils.models import TimeStampedModel
 
 logger = getLogger(__name__)  # pylint: disable=invalid-name
 
+ORG_INDEX_VERSION_CACHE_KEY = 'site_configuration.org_index.version'
+
+
+class OrgIndex:
+    """
+    Process-wide index of the enabled site configurations, by the orgs in their ``course_org_filter``.
+
+    The index is built with a single query the first time it's used, and stamped with the version found in
+    the shared cache at that time. Saving or deleting a SiteConfiguration stores a new version there (see
+    ``invalidate``), so every process rebuilds its index the next time it's used. If the shared cache
+    doesn't keep the version (e.g. a DummyCache), the index is rebuilt every time.
+    """
+
+    def __init__(self):
+        # (version, {org: (configuration id, site values)}), replaced as a whole so that threads
+        # never see a version with the index of another.
+        self._state = None
+
+    @staticmethod
+    def _current_version():
+        """
+        Return the version of the site configurations in the shared cache, storing a new one if there's none.
+        """
+        version = cache.get(ORG_INDEX_VERSION_CACHE_KEY)
+        if version is None:
+            version = uuid4().hex
+            if not cache.add(ORG_INDEX_VERSION_CACHE_KEY, version, None):
+                version = cache.get(ORG_INDEX_VERSION_CACHE_KEY, version)
+        return version
+
+    @staticmethod
+    def _build():
+        """
+        Return {org: (configuration id, site values)} for the enabled site configurations. If several of
+        them have the same org in their ``course_org_filter``, the first one created is used.
+        """
+        configurations_by_org = {}
+        for configuration in SiteConfiguration.objects.filter(enabled=True).order_by('id'):
+            course_org_filter = configuration.get_value('course_org_filter', [])
+            # The value of 'course_org_filter' can be configured as a string representing
+            # a single organization or a list of strings representing multiple organizations.
+            if not isinstance(course_org_filter, list):
+                course_org_filter = [course_org_filter]
+            for org in course_org_filter:
+                configurations_by_org.setdefault(org, (configuration.id, configuration.site_values))
+        return configurations_by_org
+
+    def get(self):
+        """
+        Return {org: (configuration id, site values)}, rebuilding it if the site configurations changed.
+        """
+        version = self._current_version()
+        state = self._state
+        if state is None or state[0] != version:
+            state = self._state = (version, self._build())
+        return state[1]
+
+    def invalidate(self):
+        """
+        Make every process rebuild its index the next time it's used, once the current transaction is committed.
+        """
+        self._state = None
+        transaction.on_commit(self._store_new_version)
+
+    def _store_new_version(self):
+        self._state = None
+        cache.set(ORG_INDEX_VERSION_CACHE_KEY, uuid4().hex, None)
+
+
+org_index = OrgIndex()
+
 
 class SiteConfiguration(models.Model):
     """
@@ -78,18 +152,13 @@ class SiteConfiguration(models.Model):
             org (str): Org to use to filter SiteConfigurations
             select_related (list or None): A list of values to pass as arguments to select_related
         """
-        query = cls.objects.filter(site_values__contains=org, enabled=True).all()
+        indexed = org_index.get().get(org)
+        if indexed is None:
+            return None
+        query = cls.objects.filter(id=indexed[0], enabled=True)
         if select_related is not None:
             query = query.select_related(*select_related)
-        for configuration in query:
-            course_org_filter = configuration.get_value('course_org_filter', [])
-            # The value of 'course_org_filter' can be configured as a string representing
-            # a single organization or a list of strings representing multiple organizations.
-            if not isinstance(course_org_filter, list):
-                course_org_filter = [course_org_filter]
-            if org in course_org_filter:
-                return configuration
-        return None
+        return query.first()
 
     @classmethod
     def get_value_for_org(cls, org, name, default=None):
@@ -105,11 +174,11 @@ class SiteConfiguration(models.Model):
         Returns:
             Configuration value for the given key.
         """
-        configuration = cls.get_configuration_for_org(org)
-        if configuration is None:
+        indexed = org_index.get().get(org)
+        if indexed is None or name not in indexed[1]:
             return default
-        else:
-            return configuration.get_value(name, default)
+        # The site values are shared by the whole process, so callers get a copy they can modify.
+        return copy.deepcopy(indexed[1][name])
 
     @classmethod
     def get_all_orgs(cls):
@@ -120,14 +189,7 @@ class SiteConfiguration(models.Model):
         Returns:
             A set of all organizations present in site configuration.
         """
-        org_filter_set = set()
-
-        for configuration in cls.objects.filter(site_values__contains='course_org_filter', enabled=True).all():
-            course_org_filter = configuration.get_value('course_org_filter', [])
-            if not isinstance(course_org_filter, list):
-                course_org_filter = [course_org_filter]
-            org_filter_set.update(course_org_filter)
-        return org_filter_set
+        return set(org_index.get())
 
     @classmethod
     def has_org(cls, org):
@@ -137,7 +199,7 @@ class SiteConfiguration(models.Model):
         Returns:
             True if given organization is present in site configurations otherwise False.
         """
-        return org in cls.get_all_orgs()
+        return org in org_index.get()
 
 
 def save_siteconfig_without_historical_record(siteconfig, *args, **kwargs):
@@ -215,3 +277,12 @@ def update_site_configuration_history(sender, instance, created, **kwargs):  # p
             site_values=instance.site_values,
             enabled=instance.enabled,
         )
+
+
+@receiver(post_save, sender=SiteConfiguration)
+@receiver(post_delete, sender=SiteConfiguration)
+def invalidate_org_index(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Rebuild the index of site configurations by org, in every process, after a site configuration changes.
+    """
+    org_index.invalidate()
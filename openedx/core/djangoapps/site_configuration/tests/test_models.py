@@ -5,10 +5,12 @@ from unittest.mock import patch
 
 import pytest
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.db import IntegrityError, transaction
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from openedx.core.djangoapps.site_configuration.models import (
+    ORG_INDEX_VERSION_CACHE_KEY,
     SiteConfiguration,
     SiteConfigurationHistory,
     save_siteconfig_without_historical_record,
@@ -321,3 +323,63 @@ class SiteConfigurationTests(TestCase):
 
         # Test that the default value is returned if the value for the given key is not found in the configuration
         self.assertCountEqual(SiteConfiguration.get_all_orgs(), expected_orgs)  # noqa: PT009
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'site_configuration_org_index',
+        },
+    })
+    def test_org_index(self):
+        """
+        Test that the orgs of the site configurations are looked up without any query, until
+        a site configuration changes in this process or another one.
+        """
+        cache.clear()
+        config1 = SiteConfigurationFactory.create(site=self.site, site_values=self.test_config1)
+        org1 = self.test_config1['course_org_filter']
+        org2 = self.test_config2['course_org_filter']
+
+        with self.assertNumQueries(1):
+            assert SiteConfiguration.has_org(org1)
+        with self.assertNumQueries(0):
+            assert not SiteConfiguration.has_org(org2)
+            assert SiteConfiguration.get_all_orgs() == {org1}
+            assert SiteConfiguration.get_value_for_org(org1, 'university') == self.test_config1['university']
+            assert SiteConfiguration.get_value_for_org(org1, 'non-existent', 'default') == 'default'
+
+        # Saving a site configuration rebuilds the index, in this process and (once committed) in the others:
+        with self.captureOnCommitCallbacks(execute=True):
+            SiteConfigurationFactory.create(site=self.site2, site_values=self.test_config2)
+        version = cache.get(ORG_INDEX_VERSION_CACHE_KEY)
+        with self.assertNumQueries(1):
+            assert SiteConfiguration.get_all_orgs() == {org1, org2}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            config1.delete()
+        assert cache.get(ORG_INDEX_VERSION_CACHE_KEY) != version
+        assert SiteConfiguration.get_all_orgs() == {org2}
+
+        # Another process changed the site configurations:
+        SiteConfiguration.objects.filter(site=self.site2).update(enabled=False)
+        assert SiteConfiguration.has_org(org2)
+        cache.set(ORG_INDEX_VERSION_CACHE_KEY, 'changed')
+        assert not SiteConfiguration.has_org(org2)
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'site_configuration_org_index',
+        },
+    })
+    def test_get_value_for_org_returns_copy(self):
+        """
+        Test that the values returned by get_value_for_org can be modified without changing the org index.
+        """
+        cache.clear()
+        site_values = dict(self.test_config1, MKTG_URLS={'ROOT': 'https://example.com'})
+        SiteConfigurationFactory.create(site=self.site, site_values=site_values)
+        org = self.test_config1['course_org_filter']
+
+        SiteConfiguration.get_value_for_org(org, 'MKTG_URLS')['ROOT'] = 'https://changed.example.com'
+        assert SiteConfiguration.get_value_for_org(org, 'MKTG_URLS') == {'ROOT': 'https://example.com'}
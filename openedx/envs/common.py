@@ -1354,6 +1354,19 @@ MARK_LIBRARY_CONTENT_BLOCK_COMPLETE_ON_VIEW = False
 # .. toggle_tickets: 'https://github.com/open-craft/edx-platform/pull/429'
 DISABLE_UNENROLLMENT = False
 
+# .. toggle_name: ENABLE_COURSE_ENROLLMENT_COUNTS
+# .. toggle_implementation: DjangoSetting
+# .. toggle_default: False
+# .. toggle_description: Set to True to maintain the number of active enrollments in each mode of every course in
+#   the CourseEnrollmentCount table as enrollments change, and to read enrollment counts (e.g. to check whether a
+#   course is full, or for the instructor dashboard) from it instead of counting enrollments.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-16
+# .. toggle_warning: Keep the value in sync between the LMS and CMS, since both change enrollments. After turning it
+#   on, the counts of an existing course are initialized from its enrollments when one of them first changes. Run
+#   the reconcile_course_enrollment_counts management command to backfill them ahead of time or to fix any drift.
+ENABLE_COURSE_ENROLLMENT_COUNTS = False
+
 # .. toggle_name: BADGES_ENABLED
 # .. toggle_implementation: DjangoSetting
 # .. toggle_default: False
@@ -1533,6 +1546,15 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     #   For more information, check https://github.com/openedx/edx-platform/pull/13388 and
     #   https://github.com/openedx/edx-platform/pull/14571.
     TASK_MAX_RETRIES=5,
+
+    # .. setting_name: BLOCK_STRUCTURES_SETTINGS['TRANSFORMED_CACHE_TIMEOUT']
+    # .. setting_default: 0
+    # .. setting_description: Timeout, in seconds, of the cache of course block structures transformed
+    #   for a learner (see lms/djangoapps/course_blocks/transformed_cache.py). 0 disables the cache.
+    #   Cached results are retired when the course is republished or when the learner's enrollment,
+    #   cohort, enrollment track, field overrides or schedule change, but time-based rules (such as
+    #   a block's start date passing) are only picked up once the entry times out.
+    TRANSFORMED_CACHE_TIMEOUT=0,
 )
 
 ################################ Bulk Email ################################
@@ -1637,6 +1659,12 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': None,
 }
 
+# .. setting_name: GRADE_REPORT_LEARNERS_PER_SHARD
+# .. setting_default: 5000
+# .. setting_description: Number of learners graded by each subtask of a course or problem grade
+#   report when the instructor_task.use_sharded_grade_reporting waffle flag is enabled for the course.
+GRADE_REPORT_LEARNERS_PER_SHARD = 5000
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': None,
@@ -1829,6 +1857,13 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# .. setting_name: COURSE_ASSETS_NOT_FOUND_CACHE_TTL
+# .. setting_default: 60
+# .. setting_description: Number of seconds for which the contentserver caches that a requested course asset
+#   doesn't exist, so that repeated requests for missing assets (e.g. broken links, crawlers) don't all query the
+#   contentstore. Saving or deleting an asset clears this cache for it. Set to 0 to disable this cache.
+COURSE_ASSETS_NOT_FOUND_CACHE_TTL = 60
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -1864,6 +1899,18 @@ MODULESTORE = {
 # require student context.
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ()
 
+# .. setting_name: COURSE_STRUCTURE_PROCESS_CACHE
+# .. setting_default: {'MAX_BYTES': 0, 'MAX_ENTRIES': 128}
+# .. setting_description: Limits for the in-process LRU tier that sits in front of the
+#   'course_structure_cache' for split modulestore structures. Structures are immutable per version
+#   GUID, so each worker process keeps recently used ones as encoded buffers and serves them without
+#   going to memcached. MAX_BYTES is the total size of the buffers kept per process, MAX_ENTRIES the
+#   maximum number of structures. Setting MAX_BYTES to 0 disables the tier.
+COURSE_STRUCTURE_PROCESS_CACHE = {
+    'MAX_BYTES': 0,
+    'MAX_ENTRIES': 128,
+}
+
 ############################# Micro-frontends ##############################
 
 # .. setting_name: ACCOUNT_MICROFRONTEND_URL
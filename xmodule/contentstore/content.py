@@ -294,6 +294,12 @@ class StaticContent:  # pylint: disable=missing-class-docstring
     def stream_data(self):
         yield self._data
 
+    def stream_data_in_range(self, first_byte, last_byte):
+        """
+        Stream the data between first_byte and last_byte (included)
+        """
+        yield self._data[first_byte:last_byte + 1]
+
     @staticmethod
     def serialize_asset_key_with_slash(asset_key):
         """
@@ -316,7 +322,7 @@ class StaticContentStream(StaticContent):  # pylint: disable=missing-class-docst
 
     def stream_data(self):
         while True:
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
+            chunk = self._read_chunk(STREAM_DATA_CHUNK_SIZE)
             if len(chunk) == 0:
                 break
             yield chunk
@@ -326,16 +332,24 @@ class StaticContentStream(StaticContent):  # pylint: disable=missing-class-docst
         Stream the data between first_byte and last_byte (included)
         """
         self._stream.seek(first_byte)
-        position = first_byte
-        while True:
-            if last_byte < position + STREAM_DATA_CHUNK_SIZE - 1:
-                chunk = self._stream.read(last_byte - position + 1)
-                yield chunk
+        remaining = last_byte - first_byte + 1
+        while remaining > 0:
+            chunk = self._read_chunk(min(remaining, STREAM_DATA_CHUNK_SIZE))
+            if len(chunk) == 0:
                 break
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
-            position += STREAM_DATA_CHUNK_SIZE
+            # A whole GridFS chunk may extend past the end of the range.
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
             yield chunk
 
+    def _read_chunk(self, size):
+        """
+        Read the next chunk of the stream, as stored if it's a GridFS file, of `size` bytes otherwise.
+        """
+        if hasattr(self._stream, 'readchunk'):
+            return self._stream.readchunk()
+        return self._stream.read(size)
+
     def close(self):
         self._stream.close()
 
@@ -419,7 +433,7 @@ class ContentStore:
                 if tempfile_path is None:
                     thumbnail_file = BytesIO(content.data)
                 else:
-                    with open(tempfile_path) as f:
+                    with open(tempfile_path, 'rb') as f:
                         thumbnail_file = BytesIO(f.read())
                 thumbnail_content = StaticContent(thumbnail_file_location, thumbnail_name,
                                                   'image/svg+xml', thumbnail_file)
@@ -5,15 +5,22 @@ MongoDB/GridFS-level code for the contentstore.
 
 import hashlib
 import json
+import logging
 import os
+from datetime import datetime, timezone
+from tempfile import SpooledTemporaryFile
 
 import gridfs
 import pymongo
+from bson.objectid import ObjectId
 from bson.son import SON
 from fs.osfs import OSFS
 from gridfs.errors import FileExists, NoFile
+from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import AssetKey
+from opaque_keys.edx.locator import CourseLocator
 
+from openedx.core.djangoapps.contentserver.caching import del_cached_content
 from xmodule.contentstore.content import XASSET_LOCATION_TAG
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import ASSET_IGNORE_REGEX
@@ -22,21 +29,35 @@ from xmodule.util.misc import escape_invalid_characters, get_library_or_course_a
 
 from .content import ContentStore, StaticContent, StaticContentStream
 
+log = logging.getLogger(__name__)
+
+# Size up to which the data of an asset is kept in memory, rather than in a temporary file,
+# while it is hashed to find its blob.
+BLOB_SPOOL_MAX_SIZE = 10 * 1024 * 1024
+
 
 class MongoContentStore(ContentStore):
     """
     MongoDB-backed ContentStore.
+
+    Each asset is a GridFS file in `bucket`. When `deduplicate_assets` is enabled, the data of
+    new assets is instead stored once per distinct content, in reference counted GridFS files of
+    the `<bucket>_blobs` bucket looked up by the SHA-256 of the data, and the asset's file only holds
+    its attributes and the `blob_id` of its data. Copying such assets to another course doesn't
+    copy their data. Assets stored either way can be read whether or not the option is enabled.
     """
     # pylint: disable=unused-argument
 
     def __init__(
         self, host, db,
-        port=27017, tz_aware=True, user=None, password=None, bucket='fs', collection=None, **kwargs
+        port=27017, tz_aware=True, user=None, password=None, bucket='fs', collection=None,
+        deduplicate_assets=False, **kwargs
     ):
         """
         Establish the connection with the mongo backend and connect to the collections
 
         :param collection: ignores but provided for consistency w/ other doc_store_config patterns
+        :param deduplicate_assets: whether to store the data of new assets in shared blobs
         """
         # GridFS will throw an exception if the Database is wrapped in a MongoProxy. So don't wrap it.
         self.connection_params = {
@@ -49,6 +70,7 @@ class MongoContentStore(ContentStore):
             **kwargs
         }
         self.bucket = bucket
+        self.deduplicate_assets = deduplicate_assets
         self.do_connection()
 
     def do_connection(self):
@@ -62,6 +84,11 @@ class MongoContentStore(ContentStore):
         self.fs_files = mongo_db[self.bucket + ".files"]  # the underlying collection GridFS uses
         self.chunks = mongo_db[self.bucket + ".chunks"]
 
+        blob_bucket = self.bucket + "_blobs"
+        self.blob_fs = gridfs.GridFS(mongo_db, blob_bucket)
+        self.blobs = mongo_db[blob_bucket + ".files"]
+        self.blob_chunks = mongo_db[blob_bucket + ".chunks"]
+
     def close_connections(self):
         """
         Closes any open connections to the underlying databases
@@ -104,11 +131,11 @@ class MongoContentStore(ContentStore):
         if database:
             connection.drop_database(self.fs_files.database.name)
         elif collections:
-            self.fs_files.drop()
-            self.chunks.drop()
+            for collection in (self.fs_files, self.chunks, self.blobs, self.blob_chunks):
+                collection.drop()
         else:
-            self.fs_files.remove({})
-            self.chunks.remove({})
+            for collection in (self.fs_files, self.chunks, self.blobs, self.blob_chunks):
+                collection.remove({})
 
         if connections:
             self.close_connections()
@@ -116,50 +143,185 @@ class MongoContentStore(ContentStore):
     def save(self, content):
         content_id, content_son = self.asset_db_key(content.location)
 
-        # The way to version files in gridFS is to not use the file id as the _id but just as the filename.
-        # Then you can upload as many versions as you like and access by date or version. Because we use
-        # the location as the _id, we must delete before adding (there's no replace method in gridFS)
-        self.delete(content_id)  # delete is a noop if the entry doesn't exist; so, don't waste time checking
-
         thumbnail_location = content.thumbnail_location.to_deprecated_list_repr() if content.thumbnail_location else None  # pylint: disable=line-too-long
-        with self.fs.new_file(_id=content_id, filename=str(content.location), content_type=content.content_type,  # pylint: disable=line-too-long
-                              displayname=content.name, content_son=content_son,
-                              thumbnail_location=thumbnail_location,
-                              import_path=content.import_path,
-                              # getattr b/c caching may mean some pickled instances don't have attr
-                              locked=getattr(content, 'locked', False)) as fp:
-
-            # It seems that this code thought that only some specific object would have the `__iter__` attribute
-            # but many more objects have this in python3 and shouldn't be using the chunking logic. For string and
-            # byte streams we write them directly to gridfs and convert them to byetarrys if necessary.
-            if hasattr(content.data, '__iter__') and not isinstance(content.data, (bytes, (str,))):
+        attrs = {
+            'filename': str(content.location),
+            'displayname': content.name,
+            'content_son': content_son,
+            'thumbnail_location': thumbnail_location,
+            'import_path': content.import_path,
+            # getattr b/c caching may mean some pickled instances don't have attr
+            'locked': getattr(content, 'locked', False),
+        }
+        if self.deduplicate_assets:
+            # Replaces the asset once the blob of the new data is referenced.
+            self._save_in_blob(content_id, content.content_type, attrs, _data_chunks(content.data))
+        else:
+            # The way to version files in gridFS is to not use the file id as the _id but just as the filename.
+            # Then you can upload as many versions as you like and access by date or version. Because we use
+            # the location as the _id, we must delete before adding (there's no replace method in gridFS)
+            self.delete(content_id)  # delete is a noop if the entry doesn't exist; so, don't waste time checking
+            with self.fs.new_file(_id=content_id, content_type=content.content_type, **attrs) as fp:
                 custom_md5 = hashlib.md5()
-                for chunk in content.data:
+                for chunk in _data_chunks(content.data):
                     fp.write(chunk)
                     custom_md5.update(chunk)
                 fp.custom_md5 = custom_md5.hexdigest()
-            else:
-                # Ideally we could just ensure that we don't get strings in here and only byte streams
-                # but being confident of that wolud be a lot more work than we have time for so we just
-                # handle both cases here.
-                if isinstance(content.data, str):
-                    encoded_data = content.data.encode('utf-8')
-                    fp.write(encoded_data)
-                    fp.custom_md5 = hashlib.md5(encoded_data).hexdigest()
-                else:
-                    fp.write(content.data)
-                    fp.custom_md5 = hashlib.md5(content.data).hexdigest()
 
+        del_cached_content(content.location)
         return content
 
+    def _save_in_blob(self, content_id, content_type, attrs, data_chunks):
+        """
+        Save an asset whose data is stored in the blob of its content, creating the blob if there is none yet.
+
+        An existing asset with the same id is replaced, and the blob of its data is only released once the
+        new data's blob is referenced, so saving an asset again with the same data doesn't upload it again.
+        """
+        replaced_asset = self.fs_files.find_one({'_id': content_id}, {'blob_id': True})
+        with SpooledTemporaryFile(max_size=BLOB_SPOOL_MAX_SIZE) as data_file:
+            sha256 = hashlib.sha256()
+            custom_md5 = hashlib.md5()
+            for chunk in data_chunks:
+                data_file.write(chunk)
+                sha256.update(chunk)
+                custom_md5.update(chunk)
+            length = data_file.tell()
+
+            blob_id = self._reference_blob_for_hash(sha256.hexdigest())
+            if blob_id is None:
+                blob_id = self._put_blob(data_file, sha256.hexdigest())
+
+            self.fs.delete(content_id)
+            if blob_id is not None:
+                self._insert_blob_asset(content_id, content_type, attrs, blob_id, length, custom_md5.hexdigest())
+            else:
+                data_file.seek(0)
+                with self.fs.new_file(_id=content_id, content_type=content_type, **attrs) as fp:
+                    fp.write(data_file)
+                    fp.custom_md5 = custom_md5.hexdigest()
+
+        if replaced_asset is not None and replaced_asset.get('blob_id') is not None:
+            self._release_blob(replaced_asset['blob_id'])
+
+    def _put_blob(self, data_file, sha256):
+        """
+        Store the data of the given file in a new blob with the given hash, referenced once.
+
+        Returns the id of the blob, or None if a blob with the same hash was stored concurrently
+        and deleted again before it could be referenced.
+        """
+        blob_id = ObjectId()
+        data_file.seek(0)
+        try:
+            self.blob_fs.put(data_file, _id=blob_id, sha256=sha256, refcount=1)
+        except FileExists:
+            # A blob with the same hash was stored concurrently (see the unique index in ensure_indexes).
+            # The chunks written so far belong to this call's own blob id, so nothing else uses them.
+            self.blob_chunks.delete_many({'files_id': blob_id})
+            return self._reference_blob_for_hash(sha256)
+        return blob_id
+
+    def _insert_blob_asset(self, content_id, content_type, attrs, blob_id, length, custom_md5):
+        """
+        Insert the GridFS file of an asset whose data is stored in the given (already referenced) blob.
+
+        The file has no chunks of its own, but has the same attributes as one holding the data.
+        """
+        self.fs_files.insert_one({
+            '_id': content_id,
+            'contentType': content_type,
+            'length': length,
+            'chunkSize': gridfs.DEFAULT_CHUNK_SIZE,
+            'uploadDate': datetime.now(timezone.utc),  # noqa: UP017
+            'custom_md5': custom_md5,
+            'blob_id': blob_id,
+            **attrs,
+        })
+
+    def _reference_blob(self, blob_id):
+        """
+        Add a reference to the blob with the given id.
+
+        Returns whether the blob exists.
+        """
+        return self.blobs.update_one({'_id': blob_id}, {'$inc': {'refcount': 1}}).matched_count > 0
+
+    def _reference_blob_for_hash(self, sha256):
+        """
+        Add a reference to the blob of the data with the given SHA-256.
+
+        Returns the id of the blob, or None if there is none.
+        """
+        blob = self.blobs.find_one_and_update({'sha256': sha256}, {'$inc': {'refcount': 1}}, {'_id': True})
+        return blob['_id'] if blob is not None else None
+
+    def _release_blob(self, blob_id):
+        """
+        Remove a reference to the blob with the given id, deleting the blob once nothing references it.
+
+        Every blob is stored with an id of its own rather than its hash, so the chunks deleted with
+        it can't be those of a blob of the same data being stored concurrently.
+        """
+        self.blobs.update_one({'_id': blob_id}, {'$inc': {'refcount': -1}})
+        # The condition keeps a blob which got referenced again in the meantime.
+        if self.blobs.delete_one({'_id': blob_id, 'refcount': {'$lte': 0}}).deleted_count:
+            self.blob_chunks.delete_many({'files_id': blob_id})
+
+    def _delete_asset(self, asset_id, blob_id=None):
+        """
+        Delete the GridFS file of an asset, releasing the blob of its data if it has one.
+        """
+        self.fs.delete(asset_id)
+        if blob_id is not None:
+            self._release_blob(blob_id)
+        self._del_cached_asset(asset_id)
+
+    def _del_cached_asset(self, asset_id):
+        """
+        Clear the contentserver's cache of the asset with the given database id.
+        """
+        if isinstance(asset_id, str):
+            try:
+                asset_key = AssetKey.from_string(asset_id)
+            except InvalidKeyError:
+                return
+        else:
+            course_key = CourseLocator(
+                asset_id['org'], asset_id['course'], asset_id.get('run'), deprecated='run' not in asset_id
+            )
+            asset_key = course_key.make_asset_key(asset_id['category'], asset_id['name'])
+        del_cached_content(asset_key)
+
+    def get_deduplication_stats(self):
+        """
+        Returns the number of blobs, the bytes they use and the bytes saved by sharing them between assets.
+        """
+        stats = list(self.blobs.aggregate([
+            {'$group': {
+                '_id': None,
+                'blobs': {'$sum': 1},
+                'stored_bytes': {'$sum': '$length'},
+                'referenced_bytes': {'$sum': {'$multiply': ['$length', '$refcount']}},
+            }},
+        ]))
+        if not stats:
+            return {'blobs': 0, 'stored_bytes': 0, 'saved_bytes': 0}
+        return {
+            'blobs': stats[0]['blobs'],
+            'stored_bytes': stats[0]['stored_bytes'],
+            'saved_bytes': stats[0]['referenced_bytes'] - stats[0]['stored_bytes'],
+        }
+
     def delete(self, location_or_id):
         """
         Delete an asset.
         """
         if isinstance(location_or_id, AssetKey):
             location_or_id, _ = self.asset_db_key(location_or_id)
+        asset = self.fs_files.find_one({'_id': location_or_id}, {'blob_id': True})
         # Deletes of non-existent files are considered successful
-        self.fs.delete(location_or_id)
+        self._delete_asset(location_or_id, asset.get('blob_id') if asset else None)
 
     def find(self, location, throw_on_not_found=True, as_stream=False):  # pylint: disable=arguments-differ
         content_id, __ = self.asset_db_key(location)
@@ -179,7 +341,7 @@ class MongoContentStore(ContentStore):
                     )
 
                 return StaticContentStream(
-                    location, fp.displayname, fp.content_type, fp, last_modified_at=fp.uploadDate,
+                    location, fp.displayname, fp.content_type, self._data_file(fp), last_modified_at=fp.uploadDate,
                     thumbnail_location=thumbnail_location,
                     import_path=getattr(fp, 'import_path', None),
                     length=fp.length, locked=getattr(fp, 'locked', False),
@@ -199,7 +361,8 @@ class MongoContentStore(ContentStore):
                         )
 
                     return StaticContent(
-                        location, fp.displayname, fp.content_type, fp.read(), last_modified_at=fp.uploadDate,
+                        location, fp.displayname, fp.content_type, self._data_file(fp).read(),
+                        last_modified_at=fp.uploadDate,
                         thumbnail_location=thumbnail_location,
                         import_path=getattr(fp, 'import_path', None),
                         length=fp.length, locked=getattr(fp, 'locked', False),
@@ -211,6 +374,15 @@ class MongoContentStore(ContentStore):
             else:
                 return None
 
+    def _data_file(self, fp):
+        """
+        Returns the GridFS file holding the data of the asset with the given GridFS file.
+        """
+        blob_id = getattr(fp, 'blob_id', None)
+        if blob_id is None:
+            return fp
+        return self.blob_fs.get(blob_id)
+
     def export(self, location, output_directory):  # pylint: disable=missing-function-docstring
         content = self.find(location)
 
@@ -254,7 +426,7 @@ class MongoContentStore(ContentStore):
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
             for attr, value in asset.items():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
+                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key', 'blob_id']:
                     policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
 
         with open(assets_policy_file, 'w') as f:
@@ -282,7 +454,7 @@ class MongoContentStore(ContentStore):
             ])
             items = self.fs_files.find(query)
             for asset in items:
-                self.fs.delete(asset[prefix])
+                self._delete_asset(asset[prefix], asset.get('blob_id'))
                 assets_to_delete += 1
 
             self.fs_files.remove(query)
@@ -391,13 +563,14 @@ class MongoContentStore(ContentStore):
         :param location:  a c4x asset location
         """
         for attr in attr_dict.keys():
-            if attr in ['_id', 'md5', 'uploadDate', 'length']:
+            if attr in ['_id', 'md5', 'uploadDate', 'length', 'blob_id']:
                 raise AttributeError(f"{attr} is a protected attribute.")
         asset_db_key, __ = self.asset_db_key(location)
         # catch upsert error and raise NotFoundError if asset doesn't exist
         result = self.fs_files.update_one({'_id': asset_db_key}, {"$set": attr_dict}, upsert=False)
         if result.matched_count == 0:
             raise NotFoundError(asset_db_key)
+        del_cached_content(location)
 
     def get_attrs(self, location):
         """
@@ -419,9 +592,11 @@ class MongoContentStore(ContentStore):
         """
         See :meth:`.ContentStore.copy_all_course_assets`
 
-        This implementation fairly expensively copies all of the data
+        This implementation fairly expensively copies all of the data, except for assets stored in blobs
+        which are copied by referencing the same blob.
         """
         source_query = query_for_course(source_course_key)
+        shared_bytes = 0
         # it'd be great to figure out how to do all of this on the db server and not pull the bits over
         for asset in self.fs_files.find(source_query):
             asset_key = self.make_id_son(asset)
@@ -445,11 +620,23 @@ class MongoContentStore(ContentStore):
                 asset_id = str(
                     dest_course_key.make_asset_key(asset_key['category'], asset_key['name']).for_branch(None)
                 )
-            try:
-                self.create_asset(source_content, asset_id, asset, asset_key)
-            except FileExists:
-                self.fs.delete(file_id=asset_id)
-                self.create_asset(source_content, asset_id, asset, asset_key)
+            self.delete(asset_id)
+            blob_id = asset.get('blob_id')
+            if blob_id is not None and self._reference_blob(blob_id):
+                self._insert_blob_asset(
+                    asset_id, asset['contentType'], self._copied_asset_attrs(asset, asset_key),
+                    blob_id, asset['length'], asset.get('custom_md5'),
+                )
+                shared_bytes += asset['length']
+            else:
+                self.create_asset(self._data_file(source_content), asset_id, asset, asset_key)
+            self._del_cached_asset(asset_id)
+
+        if shared_bytes:
+            log.info(
+                'Copied the assets of %s to %s sharing %d bytes of their data.',
+                source_course_key, dest_course_key, shared_bytes
+            )
 
     def create_asset(self, source_content, asset_id, asset, asset_key):
         """
@@ -460,17 +647,28 @@ class MongoContentStore(ContentStore):
         :param asset_key:
         :return:
         """
-        self.fs.put(
-            source_content.read(),
-            _id=asset_id, filename=asset['filename'], content_type=asset['contentType'],
-            displayname=asset['displayname'], content_son=asset_key,
+        attrs = self._copied_asset_attrs(asset, asset_key)
+        if self.deduplicate_assets:
+            self._save_in_blob(asset_id, asset['contentType'], attrs, _data_chunks(source_content))
+            return
+
+        self.fs.put(source_content.read(), _id=asset_id, content_type=asset['contentType'], **attrs)
+
+    def _copied_asset_attrs(self, asset, asset_key):
+        """
+        Returns the attributes of the copy of the given asset with the given key.
+        """
+        return {
+            'filename': asset['filename'],
+            'displayname': asset['displayname'],
+            'content_son': asset_key,
             # thumbnail is not technically correct but will be functionally correct as the code
             # only looks at the name which is not course relative.
-            thumbnail_location=asset['thumbnail_location'],
-            import_path=asset['import_path'],
+            'thumbnail_location': asset['thumbnail_location'],
+            'import_path': asset['import_path'],
             # getattr b/c caching may mean some pickled instances don't have attr
-            locked=asset.get('locked', False)
-        )
+            'locked': asset.get('locked', False),
+        }
 
     def delete_all_course_assets(self, course_key):
         """
@@ -482,7 +680,7 @@ class MongoContentStore(ContentStore):
         matching_assets = self.fs_files.find(course_query)
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
-            self.fs.delete(asset_key)
+            self._delete_asset(asset_key, asset.get('blob_id'))
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
@@ -615,6 +813,13 @@ class MongoContentStore(ContentStore):
             sparse=True,
             background=True
         )
+        # Blobs are looked up by the hash of their data, and only one is stored per hash.
+        create_collection_index(
+            self.blobs,
+            [('sha256', pymongo.ASCENDING)],
+            unique=True,
+            background=True
+        )
 
 
 def query_for_course(course_key, category=None):
@@ -638,3 +843,23 @@ def query_for_course(course_key, category=None):
     else:
         dbkey[f'{prefix}.run'] = course_key.run
     return dbkey
+
+
+def _data_chunks(data):
+    """
+    Yield the data of an asset, given as bytes, a string, or an iterable or file of bytes chunks, as bytes chunks.
+    """
+    # It seems that this code thought that only some specific object would have the `__iter__` attribute
+    # but many more objects have this in python3 and shouldn't be using the chunking logic. For string and
+    # byte streams we write them directly to gridfs and convert them to byetarrys if necessary.
+    if hasattr(data, 'read'):
+        yield from iter(lambda: data.read(gridfs.DEFAULT_CHUNK_SIZE), b'')
+    elif hasattr(data, '__iter__') and not isinstance(data, (bytes, str)):
+        yield from data
+    # Ideally we could just ensure that we don't get strings in here and only byte streams
+    # but being confident of that wolud be a lot more work than we have time for so we just
+    # handle both cases here.
+    elif isinstance(data, str):
+        yield data.encode('utf-8')
+    else:
+        yield data
@@ -506,6 +506,12 @@ class BlockData:
             self.asides = {}   # pylint: disable=attribute-defined-outside-init
         return self.asides
 
+    def get_attributes(self):
+        """
+        Return the attributes of this block data (fields, block_type, definition, etc.) as a dict.
+        """
+        return self.__dict__
+
     def __repr__(self):
         return ("{classname}(fields={self.fields}, "  # noqa: UP032
                 "block_type={self.block_type}, "
@@ -876,7 +882,7 @@ class ModuleStoreRead(ModuleStoreAssetBase, metaclass=ABCMeta):
             xblock, fields = (block, block.fields)
         elif isinstance(block, BlockData):
             # BlockData is an object - compare its attributes in dict form.
-            xblock, fields = (None, block.__dict__)
+            xblock, fields = (None, block.get_attributes())
         else:
             xblock, fields = (None, block)
 
@@ -353,14 +353,19 @@ class InheritingFieldData(KvsFieldData):
     InheritanceKeyValueStore.
     """
 
-    def __init__(self, inheritable_names, **kwargs):
+    def __init__(self, inheritable_names, inherited_settings=None, **kwargs):
         """
         `inheritable_names` is a list of names that can be inherited from
         parents.
 
+        `inherited_settings` optionally holds the precomputed json values the
+        block inherits, keyed by field name. When given, they are used instead of
+        walking up the block's ancestors, unless the block is bound to a user
+        (whose field data may override the ancestors' values).
         """
         super().__init__(**kwargs)
         self.inheritable_names = set(inheritable_names)
+        self.inherited_settings = inherited_settings
 
     def has_default_value(self, name):
         """
@@ -377,6 +382,11 @@ class InheritingFieldData(KvsFieldData):
         The default for an inheritable name is found on a parent.
         """
         if name in self.inheritable_names:
+            if self.inherited_settings is not None and not hasattr(block, '_bound_field_data'):
+                if name in self.inherited_settings:
+                    return self.inherited_settings[name]
+                return super().default(block, name)
+
             # Walk up the content tree to find the first ancestor
             # that this field is set on. Use the field from the current
             # block so that if it has a different default than the root
@@ -400,10 +410,11 @@ class InheritingFieldData(KvsFieldData):
         return super().default(block, name)
 
 
-def inheriting_field_data(kvs):
+def inheriting_field_data(kvs, inherited_settings=None):
     """Create an InheritanceFieldData that inherits the names in InheritanceMixin."""
     return InheritingFieldData(
         inheritable_names=InheritanceMixin.fields.keys(),  # pylint: disable=no-member
+        inherited_settings=inherited_settings,
         kvs=kvs,
     )
 
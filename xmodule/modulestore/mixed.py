@@ -288,6 +288,50 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(course_key)
         return store.get_items(course_key, **kwargs)
 
+    def get_block_content_fields(self, course_key, **kwargs):
+        """
+        Returns the content scoped fields of the blocks in a course, as a {UsageKey: {field name: value}}
+        dict, without instantiating any XBlock; or None if the course's modulestore can't read them.
+
+        Args:
+            course_key (CourseKey): the course identifier
+            kwargs:
+                parent_block_type (str): if given, only the children of the blocks of this type are returned
+                revision: the revision of the course to read, as for get_items
+        """
+        store = self._get_modulestore_for_courselike(course_key)
+        if not hasattr(store, 'get_block_content_fields'):
+            return None
+        return {
+            usage_key.version_agnostic().for_branch(None): fields
+            for usage_key, fields in store.get_block_content_fields(course_key, **kwargs).items()
+        }
+
+    def get_block_changes(self, course_key, previous_version, **kwargs):
+        """
+        Returns the blocks of a course which changed since a previous version of its structure, as a
+        (current structure version, [changed UsageKey], [removed UsageKey]) tuple; or None if the course's
+        modulestore can't compare structure versions, or the previous version can't be found.
+
+        Args:
+            course_key (CourseKey): the course identifier
+            previous_version: the version of the course's structure to compare to
+            kwargs:
+                revision: the revision of the course to read, as for get_items
+        """
+        store = self._get_modulestore_for_courselike(course_key)
+        if not hasattr(store, 'get_block_changes'):
+            return None
+        changes = store.get_block_changes(course_key, previous_version, **kwargs)
+        if changes is None:
+            return None
+        current_version, changed, removed = changes
+        return (
+            current_version,
+            [usage_key.version_agnostic().for_branch(None) for usage_key in changed],
+            [usage_key.version_agnostic().for_branch(None) for usage_key in removed],
+        )
+
     @strip_key
     def get_course_summaries(self, **kwargs):
         """
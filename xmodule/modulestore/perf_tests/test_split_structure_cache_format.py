@@ -0,0 +1,87 @@
+"""
+Performance test comparing the pickled and columnar CourseStructureCache encodings.
+
+Run with::
+
+    RUN_PERF_TESTS=1 pytest -s xmodule/modulestore/perf_tests/test_split_structure_cache_format.py
+"""
+
+
+import gc
+import os
+import pickle
+import time
+import tracemalloc
+import unittest
+import zlib
+
+import ddt
+
+from xmodule.modulestore.split_mongo.columnar_structure import ColumnarStructure, encode_structure
+from xmodule.modulestore.tests.test_split_columnar_structure import make_structure
+
+# (chapters, sequentials per chapter, verticals per sequential); every vertical holds one html block,
+# so these generate structures of roughly 1k, 10k and 50k blocks.
+STRUCTURE_SHAPES = (
+    (10, 10, 5),
+    (25, 20, 10),
+    (50, 50, 10),
+)
+
+# How many loads to time for each structure.
+ITERATIONS = 5
+
+
+def _measure(load):
+    """
+    Return (best wall time in ms, peak traced memory in KB) for calling ``load``.
+    """
+    timings = []
+    for __ in range(ITERATIONS):
+        gc.collect()
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = load()  # pylint: disable=unused-variable  # noqa: F841
+        __, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(timings) * 1000, peak / 1024
+
+
+@ddt.ddt
+@unittest.skipUnless(os.environ.get('RUN_PERF_TESTS'), "Performance tests are only run on request.")
+class StructureCacheFormatTiming(unittest.TestCase):
+    """
+    Times loading a cached structure with the pickle and columnar encodings.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    @ddt.data(*STRUCTURE_SHAPES)
+    @ddt.unpack
+    def test_load_timings(self, num_chapters, num_sequentials, num_verticals):
+        structure = make_structure(num_chapters, num_sequentials, num_verticals)
+        pickled = zlib.compress(pickle.dumps(structure, 4), 1)
+        columnar = zlib.compress(encode_structure(structure), 1)
+
+        pickle_ms, pickle_kb = _measure(lambda: pickle.loads(zlib.decompress(pickled)))
+        columnar_ms, columnar_kb = _measure(lambda: ColumnarStructure(zlib.decompress(columnar)).to_structure())
+        # What a request that touches every block pays.
+        full_ms, full_kb = _measure(
+            lambda: [block.fields for block in ColumnarStructure(zlib.decompress(columnar)).to_structure()[
+                'blocks'
+            ].values()]
+        )
+
+        print(
+            f"\n{len(structure['blocks'])} blocks:"
+            f"\n  pickle:            {len(pickled):>10} bytes  {pickle_ms:8.1f} ms  {pickle_kb:10.0f} KB peak"
+            f"\n  columnar (open):   {len(columnar):>10} bytes  {columnar_ms:8.1f} ms  {columnar_kb:10.0f} KB peak"
+            f"\n  columnar (all):    {'':>10}        {full_ms:8.1f} ms  {full_kb:10.0f} KB peak"
+        )
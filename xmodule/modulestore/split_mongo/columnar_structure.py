@@ -0,0 +1,392 @@
+"""
+A versioned, columnar binary encoding for split modulestore structures.
+
+The classic course structure cache pickles the whole structure dict, which means
+every cache hit has to rebuild every ``BlockKey`` and ``BlockData`` (including all
+of their field dicts) before the structure can be used. This module lays the
+structure out as a set of flat sections instead:
+
+* an interned table of block types,
+* parallel arrays of block type indices and block ids for every block key,
+* CSR-style ``children`` offsets/indices arrays that refer to block key indices,
+* one pickled field blob per block, which is only decoded on first access.
+
+All arrays are stored little-endian and 8-byte aligned, so a
+:class:`ColumnarStructure` can be opened over any buffer (``bytes``, ``mmap``,
+...) without copying it. Opening a structure only parses the header; block
+fields are decoded lazily by :class:`LazyBlockData`.
+
+Layout (all integers little-endian)::
+
+    header:   MAGIC (8s) | FORMAT_VERSION (H) | flags (H) | num_blocks (I) | num_keys (I) | num_types (I)
+    sections: NUM_SECTIONS * (offset (Q), length (Q))
+    payload:  the sections themselves, each aligned to 8 bytes
+"""
+import pickle
+import struct
+import sys
+from array import array
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+
+MAGIC = b'SPLITCOL'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<8sHHIII')
+_SECTION = struct.Struct('<QQ')
+_ALIGNMENT = 8
+
+# Section identifiers, in the order they are written.
+(
+    SECTION_META,           # pickled structure dict, minus 'blocks'
+    SECTION_TYPES,          # NUL-separated, utf-8 encoded block types
+    SECTION_KEY_TYPES,      # uint32 per block key: index into the type table
+    SECTION_ID_OFFSETS,     # uint32 * (num_keys + 1): offsets into SECTION_ID_BLOB
+    SECTION_ID_BLOB,        # utf-8 encoded block ids, back to back
+    SECTION_CHILD_OFFSETS,  # uint32 * (num_blocks + 1): offsets into SECTION_CHILDREN
+    SECTION_CHILDREN,       # uint32 per child: index of the child's block key
+    SECTION_BLOCK_FLAGS,    # uint8 per block: FLAG_* bits
+    SECTION_FIELD_OFFSETS,  # uint64 * (num_blocks + 1): offsets into SECTION_FIELD_BLOB
+    SECTION_FIELD_BLOB,     # pickled storable block data (without children), back to back
+) = range(10)
+NUM_SECTIONS = 10
+
+# The block stores a 'children' field (possibly empty).
+FLAG_HAS_CHILDREN = 0x01
+
+PICKLE_PROTOCOL = 4
+
+
+class StructureFormatError(ValueError):
+    """
+    Raised when a buffer does not contain a columnar structure this code can read.
+    """
+
+
+def is_columnar_structure(data):
+    """
+    Return True if ``data`` starts with the columnar structure magic number.
+    """
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def _align(buf):
+    """
+    Pad ``buf`` with NUL bytes up to the next section alignment boundary.
+    """
+    remainder = len(buf) % _ALIGNMENT
+    if remainder:
+        buf.extend(b'\x00' * (_ALIGNMENT - remainder))
+
+
+def _little_endian(arr):
+    """
+    Return the raw bytes of ``arr`` in little-endian order.
+    """
+    if sys.byteorder != 'little':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def encode_structure(structure):
+    """
+    Encode a structure (as returned by ``structure_from_mongo``) into the columnar format.
+
+    Arguments:
+        structure (dict): The structure, with 'blocks' as a map of {BlockKey: BlockData}.
+
+    Returns:
+        bytes
+    """
+    blocks = structure['blocks']
+    meta = {key: value for key, value in structure.items() if key != 'blocks'}
+    if 'root' in meta and meta['root'] is not None:
+        meta['root'] = tuple(meta['root'])
+
+    # Every block in the structure gets a key index first, in structure order; children
+    # that point outside of the structure (which can happen with corrupt data) are
+    # appended after them so that they still round-trip.
+    key_index = {}
+    key_list = []
+    for block_key in blocks:
+        key_index[block_key] = len(key_list)
+        key_list.append(block_key)
+
+    type_index = {}
+    key_types = array('I')
+    child_offsets = array('I', [0])
+    children = array('I')
+    flags = bytearray()
+    field_offsets = array('Q', [0])
+    field_blob = bytearray()
+
+    for block in blocks.values():
+        storable = block.to_storable()
+        fields = dict(storable['fields'])
+        block_flags = 0
+        if 'children' in fields:
+            block_flags |= FLAG_HAS_CHILDREN
+            for child in fields.pop('children'):
+                child = BlockKey(*child)
+                if child not in key_index:
+                    key_index[child] = len(key_list)
+                    key_list.append(child)
+                children.append(key_index[child])
+        child_offsets.append(len(children))
+        flags.append(block_flags)
+
+        storable['fields'] = fields
+        field_blob.extend(pickle.dumps(storable, PICKLE_PROTOCOL))
+        field_offsets.append(len(field_blob))
+
+    id_offsets = array('I', [0])
+    id_blob = bytearray()
+    for block_key in key_list:
+        if block_key.type not in type_index:
+            type_index[block_key.type] = len(type_index)
+        key_types.append(type_index[block_key.type])
+        id_blob.extend(block_key.id.encode('utf-8'))
+        id_offsets.append(len(id_blob))
+
+    sections = [None] * NUM_SECTIONS
+    sections[SECTION_META] = pickle.dumps(meta, PICKLE_PROTOCOL)
+    sections[SECTION_TYPES] = '\x00'.join(type_index).encode('utf-8')
+    sections[SECTION_KEY_TYPES] = _little_endian(key_types)
+    sections[SECTION_ID_OFFSETS] = _little_endian(id_offsets)
+    sections[SECTION_ID_BLOB] = bytes(id_blob)
+    sections[SECTION_CHILD_OFFSETS] = _little_endian(child_offsets)
+    sections[SECTION_CHILDREN] = _little_endian(children)
+    sections[SECTION_BLOCK_FLAGS] = bytes(flags)
+    sections[SECTION_FIELD_OFFSETS] = _little_endian(field_offsets)
+    sections[SECTION_FIELD_BLOB] = bytes(field_blob)
+
+    out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(blocks), len(key_list), len(type_index)))
+    table_position = len(out)
+    out.extend(b'\x00' * (_SECTION.size * NUM_SECTIONS))
+    _align(out)
+
+    table = []
+    for section in sections:
+        table.append((len(out), len(section)))
+        out.extend(section)
+        _align(out)
+
+    for number, (offset, length) in enumerate(table):
+        _SECTION.pack_into(out, table_position + number * _SECTION.size, offset, length)
+
+    return bytes(out)
+
+
+class ColumnarStructure:
+    """
+    Read-only view over an encoded structure.
+
+    Construction only validates the header and creates (zero-copy) views over the
+    sections, so it costs the same no matter how big the structure is. Block keys,
+    children and block fields are decoded on demand.
+    """
+
+    def __init__(self, data):
+        self._buffer = memoryview(data).cast('B')
+        if len(self._buffer) < _HEADER.size:
+            raise StructureFormatError("Buffer too small to hold a columnar structure")
+
+        magic, version, _flags, num_blocks, num_keys, num_types = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise StructureFormatError("Buffer does not contain a columnar structure")
+        if version != FORMAT_VERSION:
+            raise StructureFormatError(f"Unsupported columnar structure format version {version}")
+
+        self.num_blocks = num_blocks
+        self.num_keys = num_keys
+        self._num_types = num_types
+
+        self._sections = []
+        for number in range(NUM_SECTIONS):
+            offset, length = _SECTION.unpack_from(self._buffer, _HEADER.size + number * _SECTION.size)
+            if offset + length > len(self._buffer):
+                raise StructureFormatError("Columnar structure section is out of bounds")
+            self._sections.append(self._buffer[offset:offset + length])
+
+        self._key_types = self._array(SECTION_KEY_TYPES, 'I', num_keys)
+        self._id_offsets = self._array(SECTION_ID_OFFSETS, 'I', num_keys + 1)
+        self._child_offsets = self._array(SECTION_CHILD_OFFSETS, 'I', num_blocks + 1)
+        self._children = self._array(SECTION_CHILDREN, 'I', self._child_offsets[num_blocks])
+        self._field_offsets = self._array(SECTION_FIELD_OFFSETS, 'Q', num_blocks + 1)
+        self._flags = self._sections[SECTION_BLOCK_FLAGS]
+        if len(self._flags) != num_blocks:
+            raise StructureFormatError("Columnar structure block flags are truncated")
+
+        self._types = None
+        self._keys = None
+        self._key_index = None
+        self._meta = None
+
+    def _array(self, section, typecode, count):
+        """
+        Return a sequence of ``count`` integers of type ``typecode`` stored in ``section``.
+
+        On little-endian hosts this is a zero-copy memoryview over the buffer.
+        """
+        view = self._sections[section]
+        itemsize = array(typecode).itemsize
+        if len(view) != count * itemsize:
+            raise StructureFormatError("Columnar structure array section has an unexpected size")
+        if sys.byteorder == 'little':
+            return view.cast(typecode)
+        values = array(typecode, view.tobytes())
+        values.byteswap()
+        return values
+
+    @property
+    def meta(self):
+        """
+        The top-level structure fields (everything but 'blocks').
+        """
+        if self._meta is None:
+            self._meta = pickle.loads(self._sections[SECTION_META])
+        return self._meta
+
+    @property
+    def root(self):
+        """
+        The BlockKey of the structure's root block.
+        """
+        root = self.meta.get('root')
+        return BlockKey(*root) if root is not None else None
+
+    @property
+    def block_types(self):
+        """
+        The interned list of block types in this structure.
+        """
+        if self._types is None:
+            raw = self._sections[SECTION_TYPES].tobytes().decode('utf-8')
+            self._types = raw.split('\x00') if self._num_types else []
+        return self._types
+
+    def block_key(self, index):
+        """
+        Return the BlockKey stored at key ``index``.
+        """
+        if self._keys is not None:
+            return self._keys[index]
+        id_blob = self._sections[SECTION_ID_BLOB]
+        block_id = id_blob[self._id_offsets[index]:self._id_offsets[index + 1]].tobytes().decode('utf-8')
+        return BlockKey(self.block_types[self._key_types[index]], block_id)
+
+    @property
+    def block_keys(self):
+        """
+        All block keys (structure blocks first, then dangling child references).
+        """
+        if self._keys is None:
+            types = self.block_types
+            key_types = self._key_types
+            id_offsets = self._id_offsets
+            ids = self._sections[SECTION_ID_BLOB].tobytes()
+            self._keys = [
+                BlockKey(types[key_types[index]], ids[id_offsets[index]:id_offsets[index + 1]].decode('utf-8'))
+                for index in range(self.num_keys)
+            ]
+        return self._keys
+
+    def index_of(self, block_key):
+        """
+        Return the key index of ``block_key``, or None if it isn't in this structure.
+        """
+        if self._key_index is None:
+            self._key_index = {key: index for index, key in enumerate(self.block_keys)}
+        index = self._key_index.get(block_key)
+        if index is None or index >= self.num_blocks:
+            return None
+        return index
+
+    def has_children(self, index):
+        """
+        Return True if the block at ``index`` stores a 'children' field.
+        """
+        return bool(self._flags[index] & FLAG_HAS_CHILDREN)
+
+    def child_indices(self, index):
+        """
+        Return the key indices of the children of the block at ``index``.
+        """
+        return self._children[self._child_offsets[index]:self._child_offsets[index + 1]]
+
+    def children(self, index):
+        """
+        Return the children of the block at ``index`` as a list of BlockKeys.
+        """
+        keys = self.block_keys
+        return [keys[child] for child in self.child_indices(index)]
+
+    def block_storable(self, index):
+        """
+        Decode the storable dict of the block at ``index``, with its children restored.
+        """
+        blob = self._sections[SECTION_FIELD_BLOB]
+        storable = pickle.loads(blob[self._field_offsets[index]:self._field_offsets[index + 1]])
+        if self.has_children(index):
+            storable['fields']['children'] = self.children(index)
+        return storable
+
+    def to_structure(self):
+        """
+        Return a structure dict equivalent to the encoded one.
+
+        Block fields are not decoded here: each value in 'blocks' is a
+        :class:`LazyBlockData` that decodes itself the first time it is used.
+        """
+        structure = dict(self.meta)
+        if structure.get('root') is not None:
+            structure['root'] = BlockKey(*structure['root'])
+        keys = self.block_keys
+        structure['blocks'] = {keys[index]: LazyBlockData(self, index) for index in range(self.num_blocks)}
+        return structure
+
+
+class LazyBlockData(BlockData):
+    """
+    A BlockData whose fields are decoded from a :class:`ColumnarStructure` on first access.
+
+    Once decoded (or when copied/pickled, which forces decoding) it behaves exactly
+    like a regular BlockData.
+    """
+    _LAZY_ATTRS = ('fields', 'block_type', 'definition', 'defaults', 'asides', 'edit_info')
+
+    def __init__(self, source, index):  # pylint: disable=super-init-not-called
+        self.definition_loaded = False
+        self._lazy_source = source
+        self._lazy_index = index
+
+    def _materialize(self):
+        """
+        Decode this block's data from the source structure, if that hasn't happened yet.
+        """
+        source = self.__dict__.pop('_lazy_source', None)
+        if source is None:
+            return
+        decoded = BlockData(**source.block_storable(self.__dict__.pop('_lazy_index')))
+        # Don't clobber anything that was assigned before the block got decoded.
+        for attr in self._LAZY_ATTRS:
+            if attr not in self.__dict__:
+                setattr(self, attr, getattr(decoded, attr))
+
+    def __getattr__(self, name):
+        # Only called for attributes that haven't been set yet, i.e. the
+        # ones populated by from_storable.
+        if name.startswith('__') or self.__dict__.get('_lazy_source') is None:
+            raise AttributeError(name)
+        self._materialize()
+        return getattr(self, name)
+
+    def get_attributes(self):
+        self._materialize()
+        return super().get_attributes()
+
+    def __getstate__(self):
+        self._materialize()
+        return dict(self.__dict__)
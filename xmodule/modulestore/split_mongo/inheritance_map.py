@@ -0,0 +1,253 @@
+"""
+Iterative computation of inherited settings for split modulestore structures.
+
+An inheritance map is a dict of {BlockKey: {field_name: json_value}} holding, for
+every block reachable from the root, the value each inheritable field would
+inherit from the nearest ancestor that sets it. Blocks that don't set any
+inheritable field pass their own inherited dict down to their children as-is,
+so most blocks share a handful of dict objects: the maps must be treated as
+read-only.
+
+Because structures are immutable per version, a map only needs to be computed
+once per version. :func:`derive_inheritance_map` builds the map of a new version
+(e.g. after a publish) from the previous version's map, recomputing only the
+subtrees under blocks whose inheritable settings or children changed.
+"""
+from xmodule.modulestore.split_mongo import BlockKey
+
+_EMPTY = {}
+
+
+class InheritanceCycleError(Exception):
+    """
+    Raised when a structure's children form a loop.
+    """
+
+
+class InheritanceMap:
+    """
+    The inherited settings of one structure version.
+
+    Attributes:
+        version: the structure ``_id`` this map was computed for.
+        root (BlockKey): the structure's root block.
+        settings (dict): {BlockKey: {field_name: value}}; dicts are shared between blocks.
+        signatures (dict): {BlockKey: (local inheritable settings, children)}, used to
+            find what changed between two versions.
+    """
+    __slots__ = ('version', 'root', 'settings', 'signatures')
+
+    def __init__(self, version, root, settings, signatures):
+        self.version = version
+        self.root = root
+        self.settings = settings
+        self.signatures = signatures
+
+    def __getitem__(self, block_key):
+        return self.settings[block_key]
+
+    def __contains__(self, block_key):
+        return block_key in self.settings
+
+    def __len__(self):
+        return len(self.settings)
+
+    def get(self, block_key, default=None):
+        return self.settings.get(block_key, default)
+
+
+def _local_settings(block_data, field_names):
+    """
+    Return the inheritable settings set directly on ``block_data`` as a tuple of (name, value).
+    """
+    fields = block_data.fields
+    return tuple((name, fields[name]) for name in field_names if name in fields)
+
+
+def _signature(block_data, field_names):
+    """
+    Return what, about this block, determines the inheritance of its descendants.
+    """
+    return (
+        _local_settings(block_data, field_names),
+        tuple(BlockKey(*child) for child in block_data.fields.get('children', ())),
+    )
+
+
+def _pass_down(inherited, local_settings):
+    """
+    Return the settings a block passes to its children, reusing ``inherited`` when possible.
+    """
+    if not local_settings:
+        return inherited
+    passed = dict(inherited)
+    passed.update(local_settings)
+    return passed
+
+
+def propagate(block_map, start_key, inherited_settings_map, field_names, inheriting_settings=None):
+    """
+    Fill ``inherited_settings_map`` for ``start_key`` and all of its descendants.
+
+    This walks the tree with an explicit stack, so it neither recurses nor copies
+    the path to each block. When a block is reached from more than one parent, the
+    settings passed down by the later parent take precedence, as they always have.
+
+    Arguments:
+        block_map (dict): {BlockKey: BlockData} for the structure.
+        start_key (BlockKey): where to start.
+        inherited_settings_map (dict): the map to fill, {BlockKey: settings dict}.
+        field_names (iterable): the names of the inheritable fields.
+        inheriting_settings (dict): the settings ``start_key`` inherits from its ancestors.
+
+    Raises:
+        InheritanceCycleError: if a block is its own ancestor.
+    """
+    field_names = tuple(field_names)
+    if inheriting_settings is None:
+        inheriting_settings = _EMPTY
+
+    on_path = set()
+    # Entries are (block_key, inherited settings) to enter a block, or (block_key, None) to leave it.
+    stack = [(start_key, inheriting_settings)]
+    while stack:
+        block_key, incoming = stack.pop()
+        if incoming is None:
+            on_path.discard(block_key)
+            continue
+
+        block_data = block_map.get(block_key)
+        if block_data is None:
+            # here's where we need logic for looking up in other structures when we allow cross pointers
+            continue
+
+        existing = inherited_settings_map.get(block_key)
+        if existing is None or existing is incoming:
+            current = incoming
+        else:
+            # Reached through another parent: merge, without touching the (shared) existing dict.
+            current = dict(existing)
+            current.update(incoming)
+        inherited_settings_map[block_key] = current
+
+        passed = _pass_down(current, _local_settings(block_data, field_names))
+        on_path.add(block_key)
+        stack.append((block_key, None))
+        for child in reversed(block_data.fields.get('children', ())):
+            child = BlockKey(*child)
+            if child in on_path:
+                raise InheritanceCycleError(
+                    f'Infinite loop detected when inheriting to {child}, having already inherited from {block_key}'
+                )
+            stack.append((child, passed))
+
+
+def _root(structure):
+    """
+    Return the root BlockKey of ``structure``, or None.
+    """
+    return BlockKey(*structure['root']) if structure.get('root') is not None else None
+
+
+def build_inheritance_map(structure, field_names):
+    """
+    Compute the InheritanceMap of ``structure`` from scratch.
+    """
+    field_names = tuple(field_names)
+    blocks = structure['blocks']
+    root = _root(structure)
+    settings = {}
+    if root is not None:
+        propagate(blocks, root, settings, field_names)
+    signatures = {block_key: _signature(block_data, field_names) for block_key, block_data in blocks.items()}
+    return InheritanceMap(structure['_id'], root, settings, signatures)
+
+
+def derive_inheritance_map(previous, structure, field_names):
+    """
+    Compute the InheritanceMap of ``structure`` from the map of an earlier version.
+
+    Only the subtrees under blocks that were added, or whose inheritable settings
+    or children changed, are recomputed; every other block keeps its previous
+    (shared) settings dict. Falls back to :func:`build_inheritance_map` when the
+    root moved or when blocks with several parents are involved, since the
+    result then depends on the order the whole tree is walked in.
+    """
+    field_names = tuple(field_names)
+    blocks = structure['blocks']
+    root = _root(structure)
+    if root != previous.root:
+        return build_inheritance_map(structure, field_names)
+
+    signatures = {}
+    changed = set()
+    parents = {}
+    shared_children = False
+    for block_key, block_data in blocks.items():
+        signature = _signature(block_data, field_names)
+        signatures[block_key] = signature
+        if previous.signatures.get(block_key) != signature:
+            changed.add(block_key)
+        for child in signature[1]:
+            shared_children = shared_children or child in parents
+            parents[child] = block_key
+
+    if not changed:
+        settings = {block_key: value for block_key, value in previous.settings.items() if block_key in blocks}
+        return InheritanceMap(structure['_id'], root, settings, signatures)
+    if shared_children:
+        return build_inheritance_map(structure, field_names)
+
+    settings = {block_key: value for block_key, value in previous.settings.items() if block_key in blocks}
+
+    # Only the topmost changed blocks need to be walked; their descendants are covered.
+    for block_key in changed:
+        ancestor = parents.get(block_key)
+        while ancestor is not None and ancestor not in changed:
+            ancestor = parents.get(ancestor)
+        if ancestor is not None:
+            continue
+
+        parent = parents.get(block_key)
+        if parent is None:
+            if block_key != root:
+                # Orphans don't inherit anything and don't get an entry.
+                continue
+            inheriting = _EMPTY
+        elif parent in settings:
+            inheriting = _pass_down(settings[parent], signatures[parent][0])
+        else:
+            # The parent isn't reachable from the root, so neither is this block.
+            continue
+        _clear_subtree(blocks, block_key, settings)
+        propagate(blocks, block_key, settings, field_names, inheriting)
+
+    # Blocks that became unreachable (e.g. were removed from their parent's children) must go too.
+    reachable = set()
+    stack = [root] if root is not None else []
+    while stack:
+        block_key = stack.pop()
+        if block_key in reachable or block_key not in blocks:
+            continue
+        reachable.add(block_key)
+        stack.extend(signatures[block_key][1])
+    settings = {block_key: value for block_key, value in settings.items() if block_key in reachable}
+
+    return InheritanceMap(structure['_id'], root, settings, signatures)
+
+
+def _clear_subtree(blocks, start_key, settings):
+    """
+    Remove ``start_key`` and its descendants from ``settings`` so they can be recomputed.
+    """
+    stack = [start_key]
+    seen = set()
+    while stack:
+        block_key = stack.pop()
+        if block_key in seen:
+            continue
+        seen.add(block_key)
+        settings.pop(block_key, None)
+        block_data = blocks.get(block_key)
+        if block_data is not None:
+            stack.extend(BlockKey(*child) for child in block_data.fields.get('children', ()))
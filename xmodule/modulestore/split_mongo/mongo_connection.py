@@ -8,6 +8,8 @@ import logging
 import math
 import pickle
 import re
+import struct
+import uuid
 import zlib
 from contextlib import contextmanager
 from time import time
@@ -22,6 +24,7 @@ from django.db.models.lookups import Exact
 from django.db.transaction import TransactionManagementError
 from edx_django_utils import monitoring
 from edx_django_utils.cache import RequestCache
+from edx_toggles.toggles import SettingToggle
 
 # Import this just to export it
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import  # noqa: F401
@@ -31,10 +34,42 @@ from openedx.core.lib.cache_utils import request_cached
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.columnar_structure import (
+    ColumnarStructure,
+    encode_structure,
+    is_columnar_structure,
+)
+from xmodule.modulestore.split_mongo.structure_lru import get_process_structure_cache
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 
 log = logging.getLogger(__name__)
 
+# .. toggle_name: SPLIT_MONGO_COLUMNAR_STRUCTURE_CACHE
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: When enabled, the CourseStructureCache stores course structures using the columnar
+#   encoding from split_mongo/columnar_structure.py instead of a single pickle. Cache hits then only parse a small
+#   header and decode each block's fields the first time the block is used. Readers understand both encodings, so
+#   this can be switched on without flushing the course_structure_cache.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-16
+COLUMNAR_STRUCTURE_CACHE = SettingToggle(
+    "SPLIT_MONGO_COLUMNAR_STRUCTURE_CACHE", default=False, module_name=__name__
+)
+
+# .. toggle_name: SPLIT_MONGO_CHUNKED_STRUCTURE_CACHE
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: When enabled, course structures whose compressed size is too large for a single
+#   course_structure_cache entry are split across several chunk keys, listed in a small manifest stored under the
+#   structure's own key, instead of not being cached at all. Chunks are read back with a single get_many, and a
+#   structure is only used if every chunk is present and intact.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-16
+CHUNKED_STRUCTURE_CACHE = SettingToggle(
+    "SPLIT_MONGO_CHUNKED_STRUCTURE_CACHE", default=False, module_name=__name__
+)
+
 
 def get_cache(alias):
     """
@@ -198,11 +233,24 @@ def structure_to_mongo(structure, course_context=None):
 class CourseStructureCache:
     """
     Wrapper around django cache object to cache course structure objects.
-    The course structures are pickled and compressed when cached.
+    The course structures are pickled (or, with COLUMNAR_STRUCTURE_CACHE enabled,
+    encoded with :func:`encode_structure`) and compressed when cached.
+
+    Compressed structures of MAX_VALUE_SIZE or more are only cached when
+    CHUNKED_STRUCTURE_CACHE is enabled, in which case they are split into
+    CHUNK_SIZE pieces stored under separate keys, and the structure's key holds
+    a manifest describing them.
 
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
+    # Only data with a size smaller than 2MB will be cached in a single entry.
+    MAX_VALUE_SIZE = 2 * 1024 * 1024
+    CHUNK_SIZE = 1024 * 1024
+
+    # magic, number of chunks, total size, crc32 of the whole payload, chunk key nonce
+    CHUNK_MANIFEST_MAGIC = b'SPLCHUNK'
+    CHUNK_MANIFEST = struct.Struct('<8sIQI16s')
 
     def __init__(self):
         self.cache = None
@@ -213,38 +261,63 @@ class CourseStructureCache:
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
+        structure, __ = self.get_with_encoded(key, course_context)
+        return structure
+
+    def get_with_encoded(self, key, course_context=None):
+        """
+        Like get, but return a (structure, encoded) tuple.
+
+        ``encoded`` is the columnar buffer the structure was opened from, or None
+        if the cached structure was pickled (or nothing was cached).
+        """
         if self.cache is None:
-            return None
+            return None, None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
             try:
                 compressed_pickled_data = self.cache.get(key)
+                if compressed_pickled_data is not None and self._is_chunk_manifest(compressed_pickled_data):
+                    tagger.tag(chunked='true')
+                    compressed_pickled_data = self._get_chunks(key, compressed_pickled_data)
                 tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
                 if compressed_pickled_data is None:
                     # Always log cache misses, because they are unexpected
                     tagger.sample_rate = 1
-                    return None
+                    return None, None
 
                 tagger.measure('compressed_size', len(compressed_pickled_data))
 
                 pickled_data = zlib.decompress(compressed_pickled_data)
                 tagger.measure('uncompressed_size', len(pickled_data))
 
-                return pickle.loads(pickled_data, encoding='latin-1')
+                if is_columnar_structure(pickled_data):
+                    tagger.tag(format='columnar')
+                    return ColumnarStructure(pickled_data).to_structure(), pickled_data
+
+                return pickle.loads(pickled_data, encoding='latin-1'), None
             except Exception:  # pylint: disable=broad-except
                 # The cached data is corrupt in some way, get rid of it.
                 log.warning("CourseStructureCache: Bad data in cache for %s", course_context)
                 self.cache.delete(key)
-                return None
+                return None, None
 
     def set(self, key, structure, course_context=None):
-        """Given a structure, will pickle, compress, and write to cache."""
+        """
+        Given a structure, will pickle, compress, and write to cache.
+
+        Returns the columnar encoding of the structure if it was cached in that format, else None.
+        """
         if self.cache is None:
             return None
 
+        encoded = None
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
-            pickled_data = pickle.dumps(structure, 4)  # Protocol can't be incremented until cache is cleared
+            if COLUMNAR_STRUCTURE_CACHE.is_enabled() and isinstance(structure, dict):
+                pickled_data = encoded = encode_structure(structure)
+            else:
+                pickled_data = pickle.dumps(structure, 4)  # Protocol can't be incremented until cache is cleared
             tagger.measure('uncompressed_size', len(pickled_data))
 
             # 1 = Fastest (slightly larger results)
@@ -254,17 +327,77 @@ class CourseStructureCache:
 
             # We rely on the course structure cache default timeout, which should be
             # high by default (~ a few days).
-            total_bytes_in_one_mb = 1024 * 1024
-            if data_size < total_bytes_in_one_mb * 2:  # Only data with a size smaller than 2MB will be cached
+            if data_size < self.MAX_VALUE_SIZE:
                 self.cache.set(key, compressed_pickled_data)
             else:
+                total_bytes_in_one_mb = 1024 * 1024
                 chunk_size_in_mbs = round(data_size / total_bytes_in_one_mb, 2)
 
                 # .. custom_attribute_name: split_mongo_compressed_size_in_mbs
                 # .. custom_attribute_description: contains the data chunk size in MBs. The size on which
-                #   the memcached client failed to store value in course structure cache.
+                #   the memcached client failed to store value in course structure cache (or, with
+                #   SPLIT_MONGO_CHUNKED_STRUCTURE_CACHE enabled, the size that was stored in chunks).
                 monitoring.set_custom_attribute('split_mongo_compressed_size_in_mbs', chunk_size_in_mbs)
 
+                if CHUNKED_STRUCTURE_CACHE.is_enabled():
+                    tagger.tag(chunked='true')
+                    self._set_chunks(key, compressed_pickled_data)
+
+        return encoded
+
+    @staticmethod
+    def _chunk_keys(key, nonce, num_chunks):
+        """
+        Return the cache keys of the chunks of the value stored under ``key``.
+        """
+        return [f'{key}:{nonce.hex()}:{number}' for number in range(num_chunks)]
+
+    @classmethod
+    def _is_chunk_manifest(cls, data):
+        """
+        Return True if ``data`` is a chunk manifest rather than a compressed structure.
+        """
+        return len(data) == cls.CHUNK_MANIFEST.size and data.startswith(cls.CHUNK_MANIFEST_MAGIC)
+
+    def _set_chunks(self, key, data):
+        """
+        Store ``data`` across several chunk keys, then store the manifest under ``key``.
+
+        The manifest is written last, so readers never see a manifest whose chunks
+        haven't been written.
+        """
+        # A new nonce per write keeps the chunks of concurrent writers apart.
+        nonce = uuid.uuid4().bytes
+        chunks = [data[start:start + self.CHUNK_SIZE] for start in range(0, len(data), self.CHUNK_SIZE)]
+        chunk_keys = self._chunk_keys(key, nonce, len(chunks))
+        failed_keys = self.cache.set_many(dict(zip(chunk_keys, chunks, strict=True)))
+        if failed_keys:
+            log.warning("CourseStructureCache: Failed to store %d of %d chunks", len(failed_keys), len(chunks))
+            return
+        manifest = self.CHUNK_MANIFEST.pack(
+            self.CHUNK_MANIFEST_MAGIC, len(chunks), len(data), zlib.crc32(data), nonce
+        )
+        self.cache.set(key, manifest)
+
+    def _get_chunks(self, key, manifest):
+        """
+        Reassemble the value described by ``manifest``.
+
+        Returns None unless every chunk could be read and the result matches the manifest.
+        """
+        __, num_chunks, total_size, checksum, nonce = self.CHUNK_MANIFEST.unpack(manifest)
+        chunk_keys = self._chunk_keys(key, nonce, num_chunks)
+        chunks = self.cache.get_many(chunk_keys)
+        if len(chunks) != num_chunks:
+            # Some chunks were evicted; the manifest is useless without them.
+            self.cache.delete(key)
+            return None
+
+        data = b''.join(chunks[chunk_key] for chunk_key in chunk_keys)
+        if len(data) != total_size or zlib.crc32(data) != checksum:
+            raise ValueError("Chunked course structure does not match its manifest")
+        return data
+
 
 class MongoPersistenceBackend:
     """
@@ -341,12 +474,20 @@ class MongoPersistenceBackend:
         """
         Get the structure from the persistence mechanism whose id is the given key.
 
-        This method will use a cached version of the structure if it is available.
+        This method will use a cached version of the structure if it is available, first
+        from this process' structure LRU cache and then from the course structure cache.
         """
         with TIMER.timer("get_structure", course_context) as tagger_get_structure:
+            process_cache = get_process_structure_cache()
+            if process_cache is not None:
+                structure = process_cache.get(key)
+                tagger_get_structure.tag(from_process_cache=str(structure is not None).lower())
+                if structure is not None:
+                    return structure
+
             cache = CourseStructureCache()
 
-            structure = cache.get(key, course_context)
+            structure, encoded = cache.get_with_encoded(key, course_context)
             tagger_get_structure.tag(from_cache=str(bool(structure)).lower())
             if not structure:
                 # Always log cache misses, because they are unexpected
@@ -364,7 +505,16 @@ class MongoPersistenceBackend:
                     structure = structure_from_mongo(doc, course_context)
                     tagger_find_one.sample_rate = 1
 
-                cache.set(key, structure, course_context)
+                encoded = cache.set(key, structure, course_context)
+
+            if process_cache is not None:
+                # Reuse the columnar buffer the structure was read from (or cached
+                # as), rather than re-encoding it, which would decode all of its
+                # lazy block data.
+                if encoded is not None:
+                    process_cache.set(key, data=encoded)
+                else:
+                    process_cache.set(key, structure)
 
             return structure
 
@@ -90,6 +90,27 @@ class SplitModuleStoreRuntime(ModuleStoreRuntime, EditInfoRuntimeMixin):  # pyli
                 parent_map[child] = block_key
         return parent_map
 
+    @lazy
+    def _inheritance_map(self):
+        """
+        The precomputed inherited settings of this runtime's structure, or None if they can't be used.
+        """
+        return self.modulestore.get_runtime_inheritance_map(self.course_entry.course_key, self.course_entry.structure)
+
+    def _get_inherited_settings(self, block_key):
+        """
+        Return the precomputed inherited settings of a block, or None if it must walk its ancestors instead.
+        """
+        inheritance_map = self._inheritance_map
+        if inheritance_map is None or block_key not in inheritance_map:
+            return None
+        parent_key = self._parent_map.get(block_key)
+        if parent_key is not None and parent_key.type == 'library_content':
+            # The children of library_content blocks use their own defaults rather than
+            # inheriting (see InheritingFieldData.default).
+            return None
+        return inheritance_map[block_key]
+
     def _load_item(self, usage_key, course_entry_override=None, **kwargs):
         """
         Instantiate the xblock fetching it either from the cache or from the structure
@@ -303,7 +324,7 @@ class SplitModuleStoreRuntime(ModuleStoreRuntime, EditInfoRuntimeMixin):  # pyli
         )
 
         if InheritanceMixin in self.modulestore.xblock_mixins:
-            field_data = inheriting_field_data(kvs)
+            field_data = inheriting_field_data(kvs, self._get_inherited_settings(block_key))
         else:
             field_data = KvsFieldData(kvs)
 
@@ -58,7 +58,8 @@ Representation:
 import copy
 import datetime
 import logging
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
 from importlib import import_module
 from zoneinfo import ZoneInfo
 
@@ -93,7 +94,10 @@ from xmodule.modulestore.exceptions import (
     VersionConflictError,
 )
 from xmodule.modulestore.split_mongo import CourseEnvelope
+from xmodule.modulestore.split_mongo.inheritance_map import build_inheritance_map, derive_inheritance_map, propagate
 from xmodule.modulestore.split_mongo.mongo_connection import DjangoFlexPersistenceBackend, DuplicateKeyError
+from xmodule.modulestore.split_mongo.structure_diff import diff_structures
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.util.keys import BlockKey, derive_key
@@ -401,7 +405,12 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
 
             # The definition hasn't been loaded from the db yet, so load it
             if definition is None:
-                definition = self.db_connection.get_definition(definition_guid, course_key)
+                definition = self._get_prefetched_definitions().get(definition_guid)
+                if definition is not None:
+                    # the bulk operation may update its definitions in place
+                    definition = copy.deepcopy(definition)
+                else:
+                    definition = self.db_connection.get_definition(definition_guid, course_key)
                 bulk_write_record.definitions[definition_guid] = definition
                 if definition is not None:
                     bulk_write_record.definitions_in_db.add(definition_guid)
@@ -410,6 +419,10 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         else:
             # cast string to ObjectId if necessary
             definition_guid = course_key.as_object_id(definition_guid)
+            definition = self._get_prefetched_definitions().get(definition_guid)
+            if definition is not None:
+                # the prefetched definitions are shared by the whole request
+                return copy.deepcopy(definition)
             return self.db_connection.get_definition(definition_guid, course_key)
 
     def get_definitions(self, course_key, ids):
@@ -446,6 +459,35 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
             definitions.extend(defs_from_db)
         return definitions
 
+    def prefetch_definitions(self, course_key, ids):
+        """
+        Load the definitions in ``ids`` with (at most) one query, and keep them for the rest of the request.
+
+        Definitions are immutable, so the prefetched ones are used by :meth:`get_definition` both inside
+        and outside of bulk operations, which saves a query for every block whose definition is then
+        lazily loaded (e.g. when rendering all of the components in a unit).
+
+        Arguments:
+            course_key (:class:`.CourseKey`): The course that these definitions are being loaded
+                for (to respect bulk operations).
+            ids (iterable): definition ids; ids that were already prefetched are skipped.
+        """
+        prefetched = self._get_prefetched_definitions()
+        ids = {definition_id for definition_id in ids if definition_id not in prefetched}
+        if not ids:
+            return
+        for definition in self.get_definitions(course_key, ids):
+            # get_definitions hands the same dicts to the bulk operation, which may update them in place
+            prefetched[definition['_id']] = copy.deepcopy(definition)
+
+    def _get_prefetched_definitions(self):
+        """
+        Return the request's {definition id: definition} cache of prefetched definitions.
+        """
+        if self.request_cache is None:
+            return {}
+        return self.request_cache.data.setdefault('definition_cache', {})
+
     def update_definition(self, course_key, definition):
         """
         Update a definition, respecting the current bulk operation status
@@ -634,6 +676,11 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
     DEFAULT_ROOT_LIBRARY_BLOCK_TYPE = 'library'
     DEFAULT_ROOT_COURSE_BLOCK_TYPE = 'course'
 
+    # How many structure versions' inheritance maps to keep in memory.
+    INHERITANCE_MAP_CACHE_SIZE = 16
+    # How many structure versions' get_items indexes to keep in memory.
+    STRUCTURE_INDEX_CACHE_SIZE = 16
+
     def __init__(self, contentstore, doc_store_config, fs_root, render_template,
                  default_class=None,
                  error_tracker=null_error_tracker,
@@ -680,6 +727,13 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         self.signal_handler = signal_handler
 
+        # {structure version: InheritanceMap}, in least to most recently used order.
+        self._inheritance_maps = OrderedDict()
+        self._inheritance_maps_lock = threading.Lock()
+        # {structure version: StructureIndex}, in least to most recently used order.
+        self._structure_indexes = OrderedDict()
+        self._structure_indexes_lock = threading.Lock()
+
     def close_connections(self):
         """
         Closes any open connections to the underlying databases
@@ -758,6 +812,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         otherwise, do not load the definitions - they'll be loaded later when needed.
         """
         lazy = kwargs.pop('lazy', True)
+        prefetch_definitions = kwargs.pop('prefetch_definitions', None)
         should_cache_items = not lazy
 
         runtime = self._get_cache(course_entry.structure['_id'])
@@ -769,9 +824,52 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if should_cache_items:
             self.cache_items(runtime, block_keys, course_entry.course_key, depth, lazy)
 
+        if prefetch_definitions and lazy:
+            self.prefetch_definitions(
+                course_entry.course_key,
+                self._definitions_to_prefetch(
+                    runtime,
+                    block_keys,
+                    depth,
+                    None if prefetch_definitions is True else prefetch_definitions,
+                ),
+            )
+
         with self.bulk_operations(course_entry.course_key, emit_signals=False):
             return [runtime.load_item(block_key, course_entry, **kwargs) for block_key in block_keys]
 
+    def _definitions_to_prefetch(self, runtime, block_keys, depth, fields=None):
+        """
+        Return the ids of the definitions that loading ``block_keys`` (and their descendants
+        out to ``depth``) will need.
+
+        Blocks whose definition is already loaded or not yet persisted are skipped. If
+        ``fields`` is given, so are blocks that don't have a content field in ``fields``,
+        as reading their other fields never loads the definition.
+        """
+        block_map = runtime.course_entry.structure['blocks']
+        to_load = {}
+        for block_key in block_keys:
+            self.descendants(block_map, block_key, depth, to_load)
+
+        needs_definition = {}
+        definition_ids = set()
+        for block_key, block_data in to_load.items():
+            definition_id = block_data.definition
+            if block_data.definition_loaded or definition_id is None or isinstance(definition_id, LocalId):
+                continue
+            if fields is not None:
+                if block_key.type not in needs_definition:
+                    block_class = runtime.load_block_type(block_key.type)
+                    needs_definition[block_key.type] = any(
+                        field_name in block_class.fields and block_class.fields[field_name].scope == Scope.content
+                        for field_name in fields
+                    )
+                if not needs_definition[block_key.type]:
+                    continue
+            definition_ids.add(definition_id)
+        return definition_ids
+
     def _get_cache(self, course_version_guid):
         """
         Find the block cache for this course if it exists
@@ -807,6 +905,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 pass
         else:
             self.request_cache.data['course_cache'] = {}
+            self.request_cache.data['definition_cache'] = {}
 
     def _lookup_course(self, course_key, head_validation=True):
         """
@@ -1162,6 +1261,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             in the request. The depth is counted in the number of
             calls to get_children() to cache. None indicates to cache all
             descendants.
+        prefetch_definitions (bool or iterable): If True, load the definitions of all of
+            those blocks in one query up front. If a list of field names, only load the
+            definitions of blocks that have a content field among them.
         raises InsufficientSpecificationError or ItemNotFoundError
         """
         if not isinstance(usage_key, BlockUsageLocator) or usage_key.deprecated:
@@ -1210,6 +1312,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         course = self._lookup_course(course_locator)
         items = []
         qualifiers = qualifiers.copy() if qualifiers else {}  # copy the qualifiers (destructively manipulated here)
+        definitions = {}
 
         def _block_matches_all(block_data):
             """
@@ -1221,11 +1324,31 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 self._block_matches(block_data.fields, settings)
             ):
                 if content:
-                    definition_block = self.get_definition(course_locator, block_data.definition)
+                    definition_block = definitions.get(block_data.definition)
+                    if definition_block is None:
+                        definition_block = self.get_definition(course_locator, block_data.definition)
                     return self._block_matches(definition_block['fields'], content)
                 else:
                     return True
 
+        def _prefetch_definitions(block_keys):
+            """
+            Load the definitions of all the blocks that will be checked against ``content`` in one query.
+            """
+            if content:
+                blocks = course.structure['blocks']
+                definitions.update(
+                    (definition['_id'], definition)
+                    for definition in self.get_definitions(
+                        course_locator,
+                        [
+                            blocks[block_key].definition for block_key in block_keys
+                            if self._block_matches(blocks[block_key], qualifiers) and
+                            self._block_matches(blocks[block_key].fields, settings)
+                        ]
+                    )
+                )
+
         if settings is None:
             settings = {}
         if 'name' in qualifiers:
@@ -1255,21 +1378,32 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
 
+        structure_index = self._get_structure_index(course_locator, course.structure)
+        candidates = None
+        if structure_index is not None:
+            candidates = structure_index.candidates(course.structure['blocks'], qualifiers, settings)
+        if candidates is None:
+            candidates = course.structure['blocks'].keys()
+        _prefetch_definitions(candidates)
+
         # No need of these caches unless include_orphans is set to False
         path_cache = None
         parents_cache = None
 
-        if not include_orphans:
+        if not include_orphans and structure_index is None:
             path_cache = {}
             parents_cache = self.build_block_key_to_parents_mapping(course.structure)
 
-        for block_id, value in course.structure['blocks'].items():
-            if _block_matches_all(value):
+        blocks = course.structure['blocks']
+        for block_id in candidates:
+            if _block_matches_all(blocks[block_id]):
                 if not include_orphans:
-                    if (
-                        block_id.type in DETACHED_XBLOCK_TYPES or
-                        self.has_path_to_root(block_id, course, path_cache, parents_cache)
-                    ):
+                    if block_id.type in DETACHED_XBLOCK_TYPES:
+                        items.append(block_id)
+                    elif structure_index is not None:
+                        if block_id in structure_index.reachable(blocks):
+                            items.append(block_id)
+                    elif self.has_path_to_root(block_id, course, path_cache, parents_cache):
                         items.append(block_id)
                 else:
                     items.append(block_id)
@@ -1279,6 +1413,97 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         else:
             return []
 
+    def get_block_content_fields(self, course_locator, parent_block_type=None):
+        """
+        Returns the content scoped fields of the blocks in a course, read straight from its structure
+        and the blocks' definitions (in one query) without instantiating any XBlock.
+
+        Args:
+            course_locator (CourseLocator): the course identifier
+            parent_block_type (str): if given, only the children of the blocks of this type are returned
+
+        Returns:
+            dict: {BlockUsageLocator: {field name: value}}, in structure order. Fields which were
+                never set (and so have their default value) aren't included.
+        """
+        course = self._lookup_course(course_locator)
+        blocks = course.structure['blocks']
+        if parent_block_type is None:
+            block_keys = list(blocks)
+        else:
+            structure_index = self._get_structure_index(course_locator, course.structure)
+            if structure_index is not None:
+                parent_keys = structure_index.by_type(blocks).get(parent_block_type, [])
+            else:
+                parent_keys = [block_key for block_key in blocks if block_key.type == parent_block_type]
+            block_keys = list(dict.fromkeys(
+                child_key
+                for parent_key in parent_keys
+                for child_key in blocks[parent_key].fields.get('children', [])
+                if child_key in blocks
+            ))
+
+        definitions = {
+            definition['_id']: definition
+            for definition in self.get_definitions(
+                course_locator, [blocks[block_key].definition for block_key in block_keys]
+            )
+        }
+        return {
+            course_locator.make_usage_key(block_key.type, block_key.id):
+                definitions.get(blocks[block_key].definition, {}).get('fields', {})
+            for block_key in block_keys
+        }
+
+    def get_block_changes(self, course_locator, previous_version):
+        """
+        Returns the blocks of a course which changed since a previous version of its structure,
+        as found by diff_structures (which see).
+
+        Args:
+            course_locator (CourseLocator): the course identifier
+            previous_version (ObjectId or str): the version of the course's structure to compare to
+
+        Returns:
+            tuple: (current structure version, [changed BlockUsageLocator], [removed BlockUsageLocator]),
+                or None if the previous version of the structure can't be found.
+        """
+        course = self._lookup_course(course_locator)
+        current_version = course.structure['_id']
+        previous_version = course_locator.as_object_id(previous_version)
+        if current_version == previous_version:
+            return current_version, [], []
+        previous_structure = self.get_structure(course_locator, previous_version)
+        if previous_structure is None:
+            return None
+        changed, removed = diff_structures(previous_structure, course.structure)
+        return (
+            current_version,
+            [course_locator.make_usage_key(block_key.type, block_key.id) for block_key in changed],
+            [course_locator.make_usage_key(block_key.type, block_key.id) for block_key in removed],
+        )
+
+    def _get_structure_index(self, course_key, structure):
+        """
+        Return the (cached) StructureIndex of ``structure``, or None if it can't be indexed
+        because it is being modified in an active bulk operation.
+        """
+        version = structure['_id']
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if bulk_write_record.active and version not in bulk_write_record.structures_in_db:
+            return None
+
+        with self._structure_indexes_lock:
+            structure_index = self._structure_indexes.get(version)
+            if structure_index is None:
+                structure_index = StructureIndex(version)
+                self._structure_indexes[version] = structure_index
+                while len(self._structure_indexes) > self.STRUCTURE_INDEX_CACHE_SIZE:
+                    self._structure_indexes.popitem(last=False)
+            else:
+                self._structure_indexes.move_to_end(version)
+        return structure_index
+
     def build_block_key_to_parents_mapping(self, structure):
         """
         Given a structure, builds block_key to parents mapping for all block keys in structure
@@ -1347,15 +1572,25 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        block_key = BlockKey.from_usage_key(locator)
 
         # Check and verify the found parent_ids are not orphans; Remove parent which has no valid path
         # to the course root
-        parent_ids = [
-            valid_parent
-            for valid_parent in all_parent_ids
-            if self.has_path_to_root(valid_parent, course)
-        ]
+        structure_index = self._get_structure_index(locator.course_key, course.structure)
+        if structure_index is not None:
+            blocks = course.structure['blocks']
+            reachable = structure_index.reachable(blocks)
+            parent_ids = [
+                valid_parent
+                for valid_parent in structure_index.parents(blocks).get(block_key, [])
+                if valid_parent in reachable
+            ]
+        else:
+            parent_ids = [
+                valid_parent
+                for valid_parent in self._get_parents_from_structure(block_key, course.structure)
+                if self.has_path_to_root(valid_parent, course)
+            ]
 
         if len(parent_ids) == 0:
             return None
@@ -2640,49 +2875,74 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         self._emit_course_deleted_signal(course_key)
 
     def inherit_settings(
-        self, block_map, block_key, inherited_settings_map, inheriting_settings=None, inherited_from=None
+        self, block_map, block_key, inherited_settings_map, inheriting_settings=None, inherited_from=None  # pylint: disable=unused-argument
     ):
         """
-        Updates block_data with any inheritable setting set by an ancestor and recurses to children.
+        Updates inherited_settings_map with any inheritable setting set by an ancestor of block_key
+        or by block_key itself, for block_key and all of its descendants.
+
+        The values in inherited_settings_map are shared between blocks and must not be modified.
         """
-        if block_key not in block_map:
-            return
-        block_data = block_map[block_key]
+        propagate(
+            block_map,
+            block_key,
+            inherited_settings_map,
+            inheritance.InheritanceMixin.fields,
+            inheriting_settings,
+        )
 
-        if inheriting_settings is None:
-            inheriting_settings = {}
+    def get_inheritance_map(self, course_key):
+        """
+        Return the InheritanceMap ({BlockKey: {field_name: inherited value}}) of the given course or library.
 
-        if inherited_from is None:
-            inherited_from = []
+        Maps are computed once per structure version. When the map of the structure's previous
+        version is still around (e.g. right after a publish), only the changed subtrees are recomputed.
+        """
+        structure = self._lookup_course(course_key).structure
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if bulk_write_record.active and structure['_id'] not in bulk_write_record.structures_in_db:
+            # This structure is still being edited, so its contents can change without its version changing.
+            return build_inheritance_map(structure, inheritance.InheritanceMixin.fields)
+        return self._get_inheritance_map(structure)
+
+    def _get_inheritance_map(self, structure):
+        """
+        Return the (cached) InheritanceMap of a persisted structure.
+        """
+        version = structure['_id']
+        with self._inheritance_maps_lock:
+            inheritance_map = self._inheritance_maps.get(version)
+            if inheritance_map is not None:
+                self._inheritance_maps.move_to_end(version)
+                return inheritance_map
+            previous = self._inheritance_maps.get(structure.get('previous_version'))
+
+        # The map is built without holding the lock, so that other threads can use the cache meanwhile.
+        if previous is not None:
+            inheritance_map = derive_inheritance_map(previous, structure, inheritance.InheritanceMixin.fields)
+        else:
+            inheritance_map = build_inheritance_map(structure, inheritance.InheritanceMixin.fields)
 
-        # the currently passed down values take precedence over any previously cached ones
-        # NOTE: this should show the values which all fields would have if inherited: i.e.,
-        # not set to the locally defined value but to value set by nearest ancestor who sets it
-        inherited_settings_map.setdefault(block_key, {}).update(inheriting_settings)
+        with self._inheritance_maps_lock:
+            self._inheritance_maps[version] = inheritance_map
+            while len(self._inheritance_maps) > self.INHERITANCE_MAP_CACHE_SIZE:
+                self._inheritance_maps.popitem(last=False)
+        return inheritance_map
 
-        # update the inheriting w/ what should pass to children
-        inheriting_settings = inherited_settings_map[block_key].copy()
-        block_fields = block_data.fields
-        for field_name in inheritance.InheritanceMixin.fields:  # pylint: disable=not-an-iterable
-            if field_name in block_fields:
-                inheriting_settings[field_name] = block_fields[field_name]
+    def get_runtime_inheritance_map(self, course_key, structure):
+        """
+        Return the InheritanceMap that a runtime loading blocks of ``structure`` can read inherited settings from.
 
-        for child in block_fields.get('children', []):
-            try:
-                if child in inherited_from:
-                    raise Exception(f'Infinite loop detected when inheriting to {child}, having already inherited from {inherited_from}')  # pylint: disable=line-too-long
-                self.inherit_settings(
-                    block_map,
-                    BlockKey(*child),
-                    inherited_settings_map,
-                    inheriting_settings,
-                    inherited_from + [child]
-                )
-            except KeyError:
-                # here's where we need logic for looking up in other structures when we allow cross pointers
-                # but it's also getting this during course creation if creating top down w/ children set or
-                # migration where the old mongo published had pointers to privates
-                pass
+        Only persisted structures of published branches have one: their blocks are
+        never edited in place, so the map can't go stale while they are loaded.
+        Returns None otherwise, in which case blocks inherit by walking up their ancestors.
+        """
+        if getattr(course_key, 'branch', None) != ModuleStoreEnum.BranchName.published:
+            return None
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if bulk_write_record.active and structure['_id'] not in bulk_write_record.structures_in_db:
+            return None
+        return self._get_inheritance_map(structure)
 
     def descendants(self, block_map, block_id, depth, descendent_map):
         """
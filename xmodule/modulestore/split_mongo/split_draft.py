@@ -290,6 +290,21 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         course_locator = self._map_revision_to_branch(course_locator, revision=revision)
         return super().get_items(course_locator, **kwargs)
 
+    def get_block_content_fields(self, course_locator, revision=None, **kwargs):  # pylint: disable=arguments-differ
+        """
+        Returns the content scoped fields of the blocks in the given revision of a course, without
+        instantiating any XBlock.
+        """
+        course_locator = self._map_revision_to_branch(course_locator, revision=revision)
+        return super().get_block_content_fields(course_locator, **kwargs)
+
+    def get_block_changes(self, course_locator, previous_version, revision=None):  # pylint: disable=arguments-differ
+        """
+        Returns the blocks of the given revision of a course which changed since a previous version of its structure.
+        """
+        course_locator = self._map_revision_to_branch(course_locator, revision=revision)
+        return super().get_block_changes(course_locator, previous_version)
+
     def get_parent_location(self, location, revision=None, **kwargs):  # pylint: disable=arguments-differ
         '''
         Returns the given location's parent location in this course.
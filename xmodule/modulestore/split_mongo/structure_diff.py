@@ -0,0 +1,79 @@
+"""
+Compare two versions of a split modulestore structure, to find the blocks that changed between them.
+
+Only the blocks reachable from the root of each structure are compared (orphans aren't part of the
+course), and the root block itself is never reported. A block is reported as changed if:
+
+* it was added, or moved to a different parent,
+* its definition or its last update version (``edit_info.update_version``) changed, or
+* the display name of one of its ancestors changed, or one of its ancestors was moved, since
+  that changes the breadcrumbs leading to it.
+"""
+from xmodule.modulestore.split_mongo import BlockKey
+
+
+def _parents_of_reachable_blocks(structure):
+    """
+    {BlockKey: parent BlockKey} for every block reachable from the root of ``structure``.
+    The root maps to None, and a block with several parents maps to the first one found.
+    """
+    blocks = structure['blocks']
+    parents = {}
+    stack = [(structure['root'], None)]
+    while stack:
+        block_key, parent_key = stack.pop()
+        if block_key in parents or block_key not in blocks:
+            continue
+        parents[block_key] = parent_key
+        stack.extend(
+            (BlockKey(*child), block_key) for child in reversed(blocks[block_key].fields.get('children', []))
+        )
+    return parents
+
+
+def diff_structures(old_structure, new_structure):
+    """
+    Compare the blocks of two versions of a structure.
+
+    Returns:
+        tuple: ([changed BlockKey], [removed BlockKey]), in the order of the structure they're
+            found in. The changed blocks are in ``new_structure``, the removed ones only in ``old_structure``.
+    """
+    old_blocks = old_structure['blocks']
+    new_blocks = new_structure['blocks']
+    old_parents = _parents_of_reachable_blocks(old_structure)
+    root_key = new_structure['root']
+
+    changed = set()
+    visited = set()
+    stack = [(root_key, None, False)]
+    while stack:
+        block_key, parent_key, breadcrumbs_changed = stack.pop()
+        if block_key in visited or block_key not in new_blocks:
+            continue
+        visited.add(block_key)
+        new_block = new_blocks[block_key]
+        old_block = old_blocks.get(block_key) if block_key in old_parents else None
+
+        if old_block is None or old_parents[block_key] != parent_key:
+            breadcrumbs_changed = True
+        if (
+            breadcrumbs_changed
+            or old_block.definition != new_block.definition
+            or old_block.edit_info.update_version != new_block.edit_info.update_version
+        ):
+            changed.add(block_key)
+
+        children_breadcrumbs_changed = (
+            breadcrumbs_changed or old_block.fields.get('display_name') != new_block.fields.get('display_name')
+        )
+        stack.extend(
+            (BlockKey(*child), block_key, children_breadcrumbs_changed)
+            for child in reversed(new_block.fields.get('children', []))
+        )
+
+    changed.discard(root_key)
+    return (
+        [block_key for block_key in new_blocks if block_key in changed],
+        [block_key for block_key in old_blocks if block_key in old_parents and block_key not in visited],
+    )
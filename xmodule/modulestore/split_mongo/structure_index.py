@@ -0,0 +1,149 @@
+"""
+Secondary indexes over a split modulestore structure, used to answer get_items queries.
+
+A :class:`StructureIndex` is built for one (immutable) structure version and builds
+each index lazily, the first time a query needs it:
+
+* block type -> block keys,
+* settings field value -> block keys, for each settings field that gets queried,
+* block key -> parents,
+* the set of blocks reachable from a root (course/library) block.
+
+Indexes only ever narrow down the candidates of a query; the candidates are still
+checked against the full query by the caller, so a query that can't use an index
+simply scans the structure as before.
+"""
+import re
+from collections import defaultdict
+
+from xmodule.modulestore.split_mongo import BlockKey
+
+# Block types that can be the root of a structure (see has_path_to_root).
+ROOT_BLOCK_TYPES = ('course', 'library')
+
+
+def _is_indexable_criteria(criteria):
+    """
+    Can blocks matching ``criteria`` be looked up in a value index?
+
+    Only plain (hashable) values are; regexes, functions and $in/$nin/$exists
+    dicts are evaluated against every block.
+    """
+    if isinstance(criteria, (re.Pattern, dict, list)) or callable(criteria):
+        return False
+    try:
+        hash(criteria)
+    except TypeError:
+        return False
+    return True
+
+
+class StructureIndex:
+    """
+    Lazily built secondary indexes over one structure version.
+
+    The index doesn't hold on to the structure: every method takes the 'blocks'
+    of the structure being queried, which can be any copy of the version the index
+    was created for. Those blocks are only read when an index is first built.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self._by_type = None
+        self._by_field = {}
+        self._parents = None
+        self._reachable = None
+
+    def by_type(self, blocks):
+        """
+        {block_type: [BlockKey]}, in structure order.
+        """
+        if self._by_type is None:
+            by_type = defaultdict(list)
+            for block_key, block_data in blocks.items():
+                by_type[block_data.block_type].append(block_key)
+            self._by_type = dict(by_type)
+        return self._by_type
+
+    def by_field(self, blocks, field_name):
+        """
+        {value: [BlockKey]} for the settings field ``field_name``, in structure order.
+
+        Blocks whose value is a list are indexed under each (hashable) element, since
+        get_items matches a list if any of its elements matches.
+        """
+        index = self._by_field.get(field_name)
+        if index is None:
+            index = defaultdict(list)
+            for block_key, block_data in blocks.items():
+                fields = block_data.fields
+                if field_name not in fields:
+                    continue
+                value = fields[field_name]
+                values = value if isinstance(value, list) else (value,)
+                seen = set()
+                for element in values:
+                    try:
+                        if element in seen:
+                            continue
+                        seen.add(element)
+                    except TypeError:
+                        continue
+                    index[element].append(block_key)
+            index = self._by_field[field_name] = dict(index)
+        return index
+
+    def parents(self, blocks):
+        """
+        {BlockKey: [parent BlockKey]}, the same mapping as ``build_block_key_to_parents_mapping``.
+        """
+        if self._parents is None:
+            parents = defaultdict(list)
+            for parent_key, block_data in blocks.items():
+                for child_key in block_data.fields.get('children', []):
+                    parents[child_key].append(parent_key)
+            self._parents = parents
+        return self._parents
+
+    def reachable(self, blocks):
+        """
+        The set of blocks that have a path to a root (i.e. parentless course or library) block.
+        """
+        if self._reachable is None:
+            parents = self.parents(blocks)
+            stack = [
+                block_key for block_key in blocks
+                if block_key.type in ROOT_BLOCK_TYPES and not parents.get(block_key)
+            ]
+            reachable = set()
+            while stack:
+                block_key = stack.pop()
+                if block_key in reachable:
+                    continue
+                reachable.add(block_key)
+                block_data = blocks.get(block_key)
+                if block_data is not None:
+                    stack.extend(BlockKey(*child) for child in block_data.fields.get('children', []))
+            self._reachable = reachable
+        return self._reachable
+
+    def candidates(self, blocks, qualifiers, settings):
+        """
+        Return the block keys that may match ``qualifiers`` and ``settings``, in structure order.
+
+        Returns None if no index applies, in which case every block is a candidate.
+        """
+        lookups = []
+        block_type = qualifiers.get('block_type')
+        if block_type is not None and _is_indexable_criteria(block_type):
+            lookups.append(self.by_type(blocks).get(block_type, []))
+        for field_name, criteria in settings.items():
+            if _is_indexable_criteria(criteria):
+                lookups.append(self.by_field(blocks, field_name).get(criteria, []))
+
+        if not lookups:
+            return None
+        # Every lookup is in structure order, so filtering the smallest one keeps that order.
+        lookups.sort(key=len)
+        smallest, others = lookups[0], [set(lookup) for lookup in lookups[1:]]
+        return [block_key for block_key in smallest if all(block_key in other for other in others)]
@@ -0,0 +1,162 @@
+"""
+A bounded, process-local LRU tier for split modulestore course structures.
+
+Structures are immutable once written, so a structure fetched for a version GUID
+can be reused by every later request in the same worker process. Rather than
+handing the same structure dict to every caller (split mutates ``BlockData``
+objects in place, e.g. when definitions get loaded), the cache keeps each
+structure as an immutable columnar buffer (see ``columnar_structure``). That
+buffer is the instance shared between requests; each ``get`` opens a new,
+lazily decoded structure over it, which costs about the same as a dict lookup.
+"""
+import logging
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from xmodule.modulestore.split_mongo.columnar_structure import ColumnarStructure, encode_structure
+
+log = logging.getLogger(__name__)
+
+
+class StructureLRUCache:
+    """
+    Least-recently-used cache of encoded structures, bounded by total size and entry count.
+
+    Keys are structure ids (version GUIDs). The cache is safe to use from multiple threads.
+    """
+
+    def __init__(self, max_bytes, max_entries):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def size(self):
+        """
+        Total size, in bytes, of the buffers currently held.
+        """
+        return self._size
+
+    def get_buffer(self, key):
+        """
+        Return the shared, read-only encoded buffer for ``key``, or None.
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def get(self, key):
+        """
+        Return a new structure dict for ``key`` decoded from the shared buffer, or None.
+        """
+        data = self.get_buffer(key)
+        if data is None:
+            return None
+        return ColumnarStructure(data).to_structure()
+
+    def set(self, key, structure=None, data=None):
+        """
+        Add a structure to the cache.
+
+        Arguments:
+            key: the structure id.
+            structure (dict): the structure; encoded unless ``data`` is given.
+            data (bytes): the already encoded structure.
+
+        Returns:
+            True if the structure is now cached, False if it is too large to be.
+        """
+        if data is None:
+            data = encode_structure(structure)
+        data = bytes(data)
+        size = len(data)
+
+        with self._lock:
+            if size > self.max_bytes:
+                self.rejections += 1
+                return False
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+
+            self._entries[key] = data
+            self._size += size
+            while self._size > self.max_bytes or len(self._entries) > self.max_entries:
+                __, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+            return True
+
+    def clear(self):
+        """
+        Drop all cached structures (the counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        Return a dict of the cache's counters and current usage.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'rejections': self.rejections,
+            'entries': len(self._entries),
+            'bytes': self._size,
+        }
+
+
+_PROCESS_CACHE = None
+_PROCESS_CACHE_LOCK = threading.Lock()
+
+
+def get_process_structure_cache():
+    """
+    Return this process' StructureLRUCache, or None if it is disabled.
+
+    The limits come from the COURSE_STRUCTURE_PROCESS_CACHE setting.
+    """
+    global _PROCESS_CACHE  # pylint: disable=global-statement
+    if _PROCESS_CACHE is None:
+        config = getattr(settings, 'COURSE_STRUCTURE_PROCESS_CACHE', {})
+        max_bytes = config.get('MAX_BYTES', 0)
+        max_entries = config.get('MAX_ENTRIES', 0)
+        if not max_bytes or not max_entries:
+            return None
+        with _PROCESS_CACHE_LOCK:
+            if _PROCESS_CACHE is None:
+                _PROCESS_CACHE = StructureLRUCache(max_bytes, max_entries)
+    return _PROCESS_CACHE
+
+
+def reset_process_structure_cache():
+    """
+    Forget this process' StructureLRUCache, so that it is rebuilt from settings on next use.
+    """
+    global _PROCESS_CACHE  # pylint: disable=global-statement
+    with _PROCESS_CACHE_LOCK:
+        _PROCESS_CACHE = None
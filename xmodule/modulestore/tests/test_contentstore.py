@@ -5,9 +5,11 @@
 
 import logging
 import mimetypes
+import os
 import shutil
 import unittest
 from tempfile import mkdtemp
+from unittest.mock import patch
 from uuid import uuid4
 
 import ddt
@@ -54,13 +56,15 @@ class TestContentstore(unittest.TestCase):
             del CourseLocator.deprecated
         return super().tearDownClass()
 
-    def set_up_assets(self, deprecated):
+    def set_up_assets(self, deprecated, deduplicate_assets=False):
         """
         Setup contentstore w/ proper overriding of deprecated.
         """
         # since MongoModuleStore and MongoContentStore are basically assumed to be together, create this class
         # as well
-        self.contentstore = MongoContentStore(HOST, DB, port=PORT)  # pylint: disable=attribute-defined-outside-init
+        self.contentstore = MongoContentStore(  # pylint: disable=attribute-defined-outside-init
+            HOST, DB, port=PORT, deduplicate_assets=deduplicate_assets
+        )
         self.addCleanup(self.contentstore._drop_database)  # pylint: disable=protected-access
 
         AssetLocator.deprecated = deprecated
@@ -222,3 +226,96 @@ class TestContentstore(unittest.TestCase):
         # ensure it didn't remove any from other course
         __, count = self.contentstore.get_all_content_for_course(self.course2_key)
         assert count == len(self.course2_files)
+
+    @ddt.data(True, False)
+    def test_deduplicated_assets(self, deprecated):
+        """
+        Identical assets share the same blob, which is deleted with the last asset referencing it
+        """
+        self.set_up_assets(deprecated, deduplicate_assets=True)
+        # picture1.jpg is in both courses
+        picture_length = os.path.getsize(f"{DATA_DIR}/static/picture1.jpg")
+        assert self.contentstore.get_deduplication_stats()['blobs'] == 5
+        assert self.contentstore.get_deduplication_stats()['saved_bytes'] == picture_length
+
+        for course_key in (self.course1_key, self.course2_key):
+            asset = self.contentstore.find(course_key.make_asset_key('asset', 'picture1.jpg'))
+            with open(f"{DATA_DIR}/static/picture1.jpg", "rb") as f:
+                assert asset.data == f.read()
+            assert asset.length == picture_length
+            stream = self.contentstore.find(course_key.make_asset_key('asset', 'picture1.jpg'), as_stream=True)
+            assert b''.join(stream.stream_data()) == asset.data
+
+        # Copying the assets only references their blobs
+        dest_course = CourseLocator('test', 'destination', 'copy')
+        self.contentstore.copy_all_course_assets(self.course1_key, dest_course)
+        stats = self.contentstore.get_deduplication_stats()
+        assert stats['blobs'] == 5
+        assert stats['saved_bytes'] == picture_length + sum(
+            os.path.getsize(f"{DATA_DIR}/static/{filename}") for filename in self.course1_files
+        )
+        copied = self.contentstore.find(dest_course.make_asset_key('asset', 'contains.sh'))
+        assert copied.data == self.contentstore.find(self.course1_key.make_asset_key('asset', 'contains.sh')).data
+
+        # The blobs of the course's assets are kept while the copies reference them
+        self.contentstore.delete_all_course_assets(self.course1_key)
+        assert self.contentstore.get_deduplication_stats()['blobs'] == 5
+        assert self.contentstore.find(dest_course.make_asset_key('asset', 'contains.sh')).data == copied.data
+
+        self.contentstore.delete_all_course_assets(dest_course)
+        # Only the blobs of course2's assets are left
+        assert self.contentstore.get_deduplication_stats() == {
+            'blobs': 3,
+            'stored_bytes': sum(
+                os.path.getsize(f"{DATA_DIR}/static/{filename}") for filename in self.course2_files
+            ),
+            'saved_bytes': 0,
+        }
+
+    @ddt.data(True, False)
+    def test_save_same_data_again(self, deprecated):
+        """
+        Saving an asset again with the same data keeps its blob rather than uploading the data again
+        """
+        self.set_up_assets(deprecated, deduplicate_assets=True)
+        asset_key = self.course1_key.make_asset_key('asset', 'contains.sh')
+        stats = self.contentstore.get_deduplication_stats()
+
+        with patch.object(self.contentstore.blob_fs, 'put') as mock_put:
+            self.save_asset('contains.sh', asset_key, 'contains.sh', False)
+        mock_put.assert_not_called()
+        assert self.contentstore.get_deduplication_stats() == stats
+        with open(f"{DATA_DIR}/static/contains.sh", "rb") as f:
+            assert self.contentstore.find(asset_key).data == f.read()
+
+        # Saving other data in its place releases the blob
+        self.save_asset('picture3.jpg', asset_key, 'contains.sh', False)
+        with open(f"{DATA_DIR}/static/picture3.jpg", "rb") as f:
+            assert self.contentstore.find(asset_key).data == f.read()
+        assert self.contentstore.get_deduplication_stats()['blobs'] == stats['blobs'] - 1
+
+    @ddt.data(True, False)
+    def test_blob_stored_concurrently(self, deprecated):
+        """
+        When a blob of the same data is stored concurrently, only the chunks written by the losing save are deleted
+        """
+        self.set_up_assets(deprecated, deduplicate_assets=True)
+        self.contentstore.ensure_indexes()
+        blob_chunks = self.contentstore.blob_chunks.count_documents({})
+        reference_blob_for_hash = self.contentstore._reference_blob_for_hash  # pylint: disable=protected-access
+        lookups = []
+
+        def missing_on_first_lookup(sha256):
+            """The blob isn't found when first looked up, as if it were being stored concurrently."""
+            lookups.append(sha256)
+            return None if len(lookups) == 1 else reference_blob_for_hash(sha256)
+
+        with patch.object(self.contentstore, '_reference_blob_for_hash', side_effect=missing_on_first_lookup):
+            self.save_asset('picture1.jpg', self.course1_key.make_asset_key('asset', 'copy.jpg'), 'copy.jpg', False)
+
+        assert len(lookups) == 2
+        assert self.contentstore.blob_chunks.count_documents({}) == blob_chunks
+        with open(f"{DATA_DIR}/static/picture1.jpg", "rb") as f:
+            data = f.read()
+        assert self.contentstore.find(self.course1_key.make_asset_key('asset', 'copy.jpg')).data == data
+        assert self.contentstore.find(self.course1_key.make_asset_key('asset', 'picture1.jpg')).data == data
@@ -177,3 +177,35 @@ class CountMongoCallsCourseTraversal(TestCase):
                     # and then subsequently retrieved with the lazy and depth=None values
                     course = modulestore.get_item(course.location, depth=None, lazy=False)
                     self._traverse_blocks_in_course(course, access_all_block_fields=True)
+
+    @ddt.data(
+        (MIXED_SPLIT_MODULESTORE_BUILDER, 2),
+    )
+    @ddt.unpack
+    def test_prefetch_definitions(self, store_builder, num_mongo_calls):
+        request_cache = MemoryCache()
+        with store_builder.build(request_cache=request_cache) as (content_store, modulestore):
+            course_key = self._import_course(content_store, modulestore)
+
+            # A lazy traversal that reads every field, which costs a query per definition
+            # without the prefetch (see test_number_mongo_calls).
+            with check_mongo_calls(num_mongo_calls):
+                with modulestore.bulk_operations(course_key):
+                    start_block = modulestore.get_course(
+                        course_key, depth=None, prefetch_definitions=True
+                    )
+                    self._traverse_blocks_in_course(start_block, access_all_block_fields=True)
+
+    def test_prefetched_definitions_are_copied(self):
+        """
+        Changing a definition returned by get_definition doesn't change the request's prefetched one.
+        """
+        with MIXED_SPLIT_MODULESTORE_BUILDER.build(request_cache=MemoryCache()) as (content_store, modulestore):
+            course_key = self._import_course(content_store, modulestore)
+            split_store = modulestore._get_modulestore_for_courselike(course_key)  # pylint: disable=protected-access
+            course = modulestore.get_course(course_key, depth=None, prefetch_definitions=True)
+            definition_id = course.definition_locator.definition_id
+
+            definition = split_store.get_definition(course_key, definition_id)
+            definition['fields']['changed'] = True
+            assert 'changed' not in split_store.get_definition(course_key, definition_id)['fields']
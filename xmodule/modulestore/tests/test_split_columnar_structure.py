@@ -0,0 +1,183 @@
+"""
+Tests for the columnar course structure encoding in split_mongo/columnar_structure.py
+"""
+
+
+import copy
+import datetime
+import pickle
+import unittest
+import zlib
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from bson.objectid import ObjectId
+from django.test import override_settings
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.columnar_structure import (
+    ColumnarStructure,
+    LazyBlockData,
+    StructureFormatError,
+    encode_structure,
+    is_columnar_structure,
+)
+from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
+
+
+def make_structure(num_chapters=3, num_sequentials=2, num_verticals=2):
+    """
+    Build a synthetic structure, in the same shape ``structure_from_mongo`` returns.
+    """
+    version = ObjectId()
+    edited_on = datetime.datetime(2024, 1, 1, tzinfo=ZoneInfo("UTC"))
+
+    def block(block_type, fields, children=None):
+        if children is not None:
+            fields = dict(fields, children=children)
+        return BlockData(
+            block_type=block_type,
+            fields=fields,
+            definition=ObjectId(),
+            defaults={},
+            asides={},
+            edit_info={
+                'edited_on': edited_on,
+                'edited_by': 'test',
+                'previous_version': None,
+                'update_version': version,
+                'source_version': None,
+            },
+        )
+
+    blocks = {}
+    chapters = []
+    for chapter_num in range(num_chapters):
+        chapter_key = BlockKey('chapter', f'chapter_{chapter_num}')
+        sequentials = []
+        for seq_num in range(num_sequentials):
+            seq_key = BlockKey('sequential', f'seq_{chapter_num}_{seq_num}')
+            verticals = []
+            for vert_num in range(num_verticals):
+                vert_key = BlockKey('vertical', f'vert_{chapter_num}_{seq_num}_{vert_num}')
+                html_key = BlockKey('html', f'html_{chapter_num}_{seq_num}_{vert_num}')
+                blocks[html_key] = block('html', {'display_name': f'HTML ü {vert_num}'})
+                blocks[vert_key] = block('vertical', {'display_name': f'Unit {vert_num}'}, [html_key])
+                verticals.append(vert_key)
+            blocks[seq_key] = block('sequential', {'display_name': f'Seq {seq_num}', 'graded': True}, verticals)
+            sequentials.append(seq_key)
+        blocks[chapter_key] = block('chapter', {'display_name': f'Chapter {chapter_num}'}, sequentials)
+        chapters.append(chapter_key)
+    root = BlockKey('course', 'course')
+    blocks[root] = block('course', {'display_name': 'Course'}, chapters)
+
+    return {
+        '_id': version,
+        'root': root,
+        'previous_version': None,
+        'original_version': version,
+        'edited_by': 'test',
+        'edited_on': edited_on,
+        'schema_version': 1,
+        'blocks': blocks,
+    }
+
+
+class TestColumnarStructure(unittest.TestCase):
+    """
+    Tests for encoding and decoding structures with the columnar format.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.structure = make_structure()
+        self.encoded = encode_structure(self.structure)
+
+    def test_round_trip(self):
+        assert is_columnar_structure(self.encoded)
+        decoded = ColumnarStructure(self.encoded).to_structure()
+        assert decoded == self.structure
+        assert list(decoded['blocks']) == list(self.structure['blocks'])
+        assert isinstance(decoded['root'], BlockKey)
+
+    def test_fields_are_decoded_lazily(self):
+        decoded = ColumnarStructure(self.encoded).to_structure()
+        block = decoded['blocks'][BlockKey('chapter', 'chapter_0')]
+        assert isinstance(block, LazyBlockData)
+        assert 'fields' not in block.__dict__
+
+        assert block.fields['children'] == [BlockKey('sequential', 'seq_0_0'), BlockKey('sequential', 'seq_0_1')]
+        assert block.fields['display_name'] == 'Chapter 0'
+        assert '_lazy_source' not in block.__dict__
+
+    def test_get_attributes_decodes(self):
+        decoded = ColumnarStructure(self.encoded).to_structure()
+        block = decoded['blocks'][BlockKey('chapter', 'chapter_0')]
+        attributes = block.get_attributes()
+        assert attributes['block_type'] == 'chapter'
+        assert attributes['fields']['display_name'] == 'Chapter 0'
+        assert attributes == self.structure['blocks'][BlockKey('chapter', 'chapter_0')].get_attributes()
+
+    def test_assignment_before_decoding_is_kept(self):
+        decoded = ColumnarStructure(self.encoded).to_structure()
+        block = decoded['blocks'][BlockKey('html', 'html_0_0_0')]
+        block.fields = {'display_name': 'changed'}
+        assert block.block_type == 'html'
+        assert block.fields == {'display_name': 'changed'}
+
+    def test_copy_and_pickle(self):
+        decoded = ColumnarStructure(self.encoded).to_structure()
+        assert copy.deepcopy(decoded) == self.structure
+        assert pickle.loads(pickle.dumps(decoded, 4)) == self.structure
+
+    def test_navigation_without_decoding_fields(self):
+        columnar = ColumnarStructure(self.encoded)
+        assert columnar.num_blocks == len(self.structure['blocks'])
+        assert columnar.root == BlockKey('course', 'course')
+        root_index = columnar.index_of(columnar.root)
+        assert columnar.has_children(root_index)
+        assert columnar.children(root_index) == self.structure['blocks'][columnar.root].fields['children']
+        assert columnar.index_of(BlockKey('html', 'nope')) is None
+        assert not columnar.has_children(columnar.index_of(BlockKey('html', 'html_0_0_0')))
+
+    def test_dangling_children(self):
+        root = self.structure['root']
+        missing = BlockKey('problem', 'missing')
+        self.structure['blocks'][root].fields['children'].append(missing)
+        columnar = ColumnarStructure(encode_structure(self.structure))
+        assert columnar.num_keys == columnar.num_blocks + 1
+        assert columnar.index_of(missing) is None
+        assert columnar.to_structure() == self.structure
+
+    def test_empty_structure(self):
+        structure = {'_id': ObjectId(), 'root': None, 'blocks': {}}
+        assert ColumnarStructure(encode_structure(structure)).to_structure() == structure
+
+    def test_bad_data(self):
+        with pytest.raises(StructureFormatError):
+            ColumnarStructure(b'garbage')
+        with pytest.raises(StructureFormatError):
+            ColumnarStructure(self.encoded[:200])
+        future = bytearray(self.encoded)
+        future[8] = 99
+        with pytest.raises(StructureFormatError):
+            ColumnarStructure(bytes(future))
+
+    def test_structure_cache_reads_both_formats(self):
+        cache = CourseStructureCache()
+        with patch.object(cache, 'cache') as mock_cache:
+            mock_cache.get.return_value = zlib.compress(self.encoded)
+            assert cache.get('key') == self.structure
+
+            mock_cache.get.return_value = zlib.compress(pickle.dumps(self.structure, 4))
+            assert cache.get('key') == self.structure
+
+    @override_settings(SPLIT_MONGO_COLUMNAR_STRUCTURE_CACHE=True)
+    def test_structure_cache_writes_columnar(self):
+        cache = CourseStructureCache()
+        with patch.object(cache, 'cache') as mock_cache:
+            cache.set('key', self.structure)
+            cached = mock_cache.set.call_args[0][1]
+        assert is_columnar_structure(zlib.decompress(cached))
@@ -0,0 +1,136 @@
+"""
+Tests for the split modulestore inheritance engine in split_mongo/inheritance_map.py
+"""
+
+
+import copy
+import unittest
+
+import pytest
+from bson.objectid import ObjectId
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.inheritance_map import (
+    InheritanceCycleError,
+    build_inheritance_map,
+    derive_inheritance_map,
+    propagate,
+)
+from xmodule.modulestore.tests.test_split_columnar_structure import make_structure
+
+FIELDS = ('due', 'graded', 'visible_to_staff_only')
+
+ROOT = BlockKey('course', 'course')
+CHAPTER = BlockKey('chapter', 'chapter_0')
+OTHER_CHAPTER = BlockKey('chapter', 'chapter_1')
+SEQUENTIAL = BlockKey('sequential', 'seq_0_0')
+VERTICAL = BlockKey('vertical', 'vert_0_0_0')
+HTML = BlockKey('html', 'html_0_0_0')
+
+
+def next_version(structure):
+    """
+    Return a copy of ``structure`` as the next version of it.
+    """
+    new_structure = copy.deepcopy(structure)
+    new_structure['previous_version'] = structure['_id']
+    new_structure['_id'] = ObjectId()
+    return new_structure
+
+
+class TestInheritanceMap(unittest.TestCase):
+    """
+    Tests for building and deriving inheritance maps.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.structure = make_structure(2, 2, 2)
+        self.structure['blocks'][ROOT].fields['visible_to_staff_only'] = False
+        self.structure['blocks'][CHAPTER].fields['due'] = '2030-01-01T00:00:00Z'
+        self.inheritance_map = build_inheritance_map(self.structure, FIELDS)
+
+    def test_build(self):
+        inheritance_map = self.inheritance_map
+        assert inheritance_map.version == self.structure['_id']
+        assert len(inheritance_map) == len(self.structure['blocks'])
+        assert inheritance_map[ROOT] == {}
+        assert inheritance_map[CHAPTER] == {'visible_to_staff_only': False}
+        # sequentials set 'graded'
+        assert inheritance_map[VERTICAL] == {
+            'visible_to_staff_only': False, 'due': '2030-01-01T00:00:00Z', 'graded': True,
+        }
+        assert inheritance_map[HTML] == inheritance_map[VERTICAL]
+        assert inheritance_map[BlockKey('html', 'html_1_0_0')] == {'visible_to_staff_only': False, 'graded': True}
+
+    def test_unchanged_settings_are_shared(self):
+        inheritance_map = self.inheritance_map
+        assert inheritance_map[CHAPTER] is inheritance_map[OTHER_CHAPTER]
+        assert inheritance_map[HTML] is inheritance_map[VERTICAL]
+        assert inheritance_map[HTML] is inheritance_map[BlockKey('vertical', 'vert_0_0_1')]
+
+    def test_orphans_are_skipped(self):
+        orphan = BlockKey('html', 'orphan')
+        self.structure['blocks'][orphan] = copy.deepcopy(self.structure['blocks'][HTML])
+        assert orphan not in build_inheritance_map(self.structure, FIELDS)
+
+    def test_cycle(self):
+        self.structure['blocks'][HTML].fields['children'] = [CHAPTER]
+        with pytest.raises(InheritanceCycleError):
+            build_inheritance_map(self.structure, FIELDS)
+
+    def test_propagate_merges_multiple_parents(self):
+        self.structure['blocks'][OTHER_CHAPTER].fields['due'] = 'later'
+        self.structure['blocks'][OTHER_CHAPTER].fields['children'].append(SEQUENTIAL)
+        settings = {}
+        propagate(self.structure['blocks'], ROOT, settings, FIELDS)
+        # the last parent to be walked wins
+        assert settings[SEQUENTIAL]['due'] == 'later'
+
+    def test_derive_without_changes(self):
+        new_structure = next_version(self.structure)
+        derived = derive_inheritance_map(self.inheritance_map, new_structure, FIELDS)
+        assert derived.version == new_structure['_id']
+        assert derived.settings == self.inheritance_map.settings
+        assert derived[HTML] is self.inheritance_map[HTML]
+
+    def test_derive_changed_setting(self):
+        new_structure = next_version(self.structure)
+        new_structure['blocks'][SEQUENTIAL].fields['visible_to_staff_only'] = True
+        derived = derive_inheritance_map(self.inheritance_map, new_structure, FIELDS)
+
+        assert derived.settings == build_inheritance_map(new_structure, FIELDS).settings
+        assert derived[VERTICAL]['visible_to_staff_only'] is True
+        # blocks outside of the changed subtree were not recomputed
+        assert derived[OTHER_CHAPTER] is self.inheritance_map[OTHER_CHAPTER]
+        assert derived[BlockKey('vertical', 'vert_0_1_0')] is self.inheritance_map[BlockKey('vertical', 'vert_0_1_0')]
+
+    def test_derive_moved_and_removed_blocks(self):
+        new_structure = next_version(self.structure)
+        blocks = new_structure['blocks']
+        # move a vertical to the other chapter's sequential, and delete another one
+        blocks[SEQUENTIAL].fields['children'].remove(VERTICAL)
+        blocks[BlockKey('sequential', 'seq_1_0')].fields['children'].append(VERTICAL)
+        removed = BlockKey('vertical', 'vert_0_1_1')
+        blocks[BlockKey('sequential', 'seq_0_1')].fields['children'].remove(removed)
+        del blocks[removed]
+        del blocks[BlockKey('html', 'html_0_1_1')]
+        # and add a new one
+        added = BlockKey('vertical', 'new')
+        blocks[added] = copy.deepcopy(blocks[BlockKey('vertical', 'vert_0_0_1')])
+        blocks[added].fields['children'] = []
+        blocks[SEQUENTIAL].fields['children'].append(added)
+
+        derived = derive_inheritance_map(self.inheritance_map, new_structure, FIELDS)
+        assert derived.settings == build_inheritance_map(new_structure, FIELDS).settings
+        assert 'due' not in derived[HTML]
+        assert derived[added]['due'] == '2030-01-01T00:00:00Z'
+        assert removed not in derived
+
+    def test_derive_detached_block(self):
+        new_structure = next_version(self.structure)
+        new_structure['blocks'][SEQUENTIAL].fields['children'].remove(VERTICAL)
+        derived = derive_inheritance_map(self.inheritance_map, new_structure, FIELDS)
+        assert VERTICAL not in derived
+        assert HTML not in derived
+        assert derived.settings == build_inheritance_map(new_structure, FIELDS).settings
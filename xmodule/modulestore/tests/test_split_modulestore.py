@@ -15,6 +15,7 @@ import ddt
 import pytest
 from ccx_keys.locator import CCXBlockUsageLocator
 from django.core.cache import InvalidCacheBackendError, caches
+from django.test import override_settings
 from opaque_keys.edx.locator import BlockUsageLocator, CourseKey, CourseLocator, LocalId
 from xblock.fields import Date, Reference, ReferenceList, ReferenceValueDict, Timedelta
 
@@ -33,6 +34,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.inheritance_map import build_inheritance_map
 from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.factories import check_mongo_calls
@@ -873,6 +875,42 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         mock_set_cache.assert_called()
         mock_set_custom_attribute.assert_not_called()
 
+    @patch.object(CourseStructureCache, 'CHUNK_SIZE', 1024)
+    @patch.object(CourseStructureCache, 'MAX_VALUE_SIZE', 2048)
+    @override_settings(SPLIT_MONGO_CHUNKED_STRUCTURE_CACHE=True)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_chunked(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        course_cache = CourseStructureCache()
+
+        # random data doesn't compress, so this needs several chunks
+        data = os.urandom(5000)
+        course_cache.set('my_data_chunk', data)
+        assert course_cache.get('my_data_chunk') == data
+
+        # when a chunk is evicted, the whole structure is a cache miss
+        manifest = CourseStructureCache.CHUNK_MANIFEST.unpack(enabled_cache.get('my_data_chunk'))
+        enabled_cache.delete(CourseStructureCache._chunk_keys('my_data_chunk', manifest[4], manifest[1])[-1])  # pylint: disable=protected-access
+        assert course_cache.get('my_data_chunk') is None
+        assert enabled_cache.get('my_data_chunk') is None
+
+    @patch.object(CourseStructureCache, 'CHUNK_SIZE', 1024)
+    @patch.object(CourseStructureCache, 'MAX_VALUE_SIZE', 2048)
+    @override_settings(SPLIT_MONGO_CHUNKED_STRUCTURE_CACHE=True)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_chunked_corrupt(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        course_cache = CourseStructureCache()
+
+        course_cache.set('my_data_chunk', os.urandom(5000))
+        manifest = CourseStructureCache.CHUNK_MANIFEST.unpack(enabled_cache.get('my_data_chunk'))
+        first_chunk_key = CourseStructureCache._chunk_keys('my_data_chunk', manifest[4], manifest[1])[0]  # pylint: disable=protected-access
+        enabled_cache.set(first_chunk_key, b'bad_data')
+        assert course_cache.get('my_data_chunk') is None
+        assert enabled_cache.get('my_data_chunk') is None
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -1879,6 +1917,51 @@ class TestInheritance(SplitModuleTest):
         # FIXME LMS-11376
 #         self.assertTrue(parented_problem.visible_to_staff_only)
 
+    def test_inheritance_map(self):
+        """
+        Test that the inheritance map is computed once per version and derived for new versions
+        """
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        problem_key = BlockKey('problem', 'problem3_2')
+        inheritance_map = modulestore().get_inheritance_map(course_key)
+        # inherited from the course
+        assert 'graceperiod' in inheritance_map[problem_key]
+        assert not inheritance_map[problem_key].get('visible_to_staff_only')
+        assert modulestore().get_inheritance_map(course_key) is inheritance_map
+
+        chapter = modulestore().get_item(BlockUsageLocator(course_key, 'chapter', 'chapter3'))
+        chapter.visible_to_staff_only = True
+        modulestore().update_item(chapter, self.user_id)
+
+        new_map = modulestore().get_inheritance_map(course_key)
+        assert new_map.version != inheritance_map.version
+        assert new_map[problem_key]['visible_to_staff_only'] is True
+        assert new_map.settings == build_inheritance_map(
+            modulestore()._lookup_course(course_key).structure,  # pylint: disable=protected-access
+            InheritanceMixin.fields,
+        ).settings
+
+    def test_published_inheritance_uses_map(self):
+        """
+        Test that published blocks read inherited settings from the inheritance map, without loading their ancestors
+        """
+        draft_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        published_key = draft_key.for_branch(BRANCH_NAME_PUBLISHED)
+        course = modulestore().get_course(draft_key)
+        modulestore().copy(self.user_id, draft_key, published_key, [course.location], None)
+
+        # Loading a draft block walks up its ancestors, so it doesn't have a map.
+        draft_problem = modulestore().get_item(BlockUsageLocator(draft_key, 'problem', 'problem3_2'))
+        assert draft_problem.runtime._inheritance_map is None  # pylint: disable=protected-access
+        assert draft_problem.graceperiod == datetime.timedelta(hours=2)
+
+        problem = modulestore().get_item(BlockUsageLocator(published_key, 'problem', 'problem3_2'))
+        assert problem.runtime._inheritance_map is not None  # pylint: disable=protected-access
+        with patch('xmodule.x_module.XModuleMixin.get_parent') as mock_get_parent:
+            assert problem.graceperiod == draft_problem.graceperiod
+            assert problem.visible_to_staff_only == draft_problem.visible_to_staff_only
+        assert not mock_get_parent.called
+
 
 class TestPublish(SplitModuleTest):
     """
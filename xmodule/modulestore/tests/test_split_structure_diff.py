@@ -0,0 +1,91 @@
+"""
+Tests for split_mongo/structure_diff.py
+"""
+
+
+import copy
+import unittest
+
+from bson import ObjectId
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_diff import diff_structures
+from xmodule.modulestore.tests.test_split_columnar_structure import make_structure
+
+ROOT = BlockKey('course', 'course')
+CHAPTER = BlockKey('chapter', 'chapter_0')
+SEQUENTIAL = BlockKey('sequential', 'seq_0_0')
+VERTICAL = BlockKey('vertical', 'vert_0_0_0')
+HTML = BlockKey('html', 'html_0_0_0')
+
+
+class TestDiffStructures(unittest.TestCase):
+    """
+    Tests for diff_structures.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.old_structure = make_structure(2, 2, 1)
+        self.new_structure = copy.deepcopy(self.old_structure)
+        self.new_structure['_id'] = ObjectId()
+        self.blocks = self.new_structure['blocks']
+
+    def edit(self, block_key, **fields):
+        """
+        Update the fields of a block in the new structure, as the modulestore does.
+        """
+        self.blocks[block_key].fields.update(fields)
+        self.blocks[block_key].edit_info.update_version = self.new_structure['_id']
+
+    def test_no_changes(self):
+        assert diff_structures(self.old_structure, self.new_structure) == ([], [])
+
+    def test_changed_content(self):
+        self.blocks[HTML].definition = ObjectId()
+        assert diff_structures(self.old_structure, self.new_structure) == ([HTML], [])
+
+    def test_changed_settings(self):
+        self.edit(VERTICAL, visible_to_staff_only=True)
+        assert diff_structures(self.old_structure, self.new_structure) == ([VERTICAL], [])
+
+    def test_renamed(self):
+        """
+        Renaming a block changes the breadcrumbs of its descendants.
+        """
+        self.edit(SEQUENTIAL, display_name='Renamed')
+        assert diff_structures(self.old_structure, self.new_structure) == ([HTML, VERTICAL, SEQUENTIAL], [])
+
+    def test_renamed_root(self):
+        self.edit(ROOT, display_name='Renamed')
+        changed, removed = diff_structures(self.old_structure, self.new_structure)
+        assert set(changed) == set(self.blocks) - {ROOT}
+        assert not removed
+
+    def test_added(self):
+        new_html = BlockKey('html', 'new')
+        self.blocks[new_html] = copy.deepcopy(self.blocks[HTML])
+        self.edit(VERTICAL, children=[HTML, new_html])
+        assert diff_structures(self.old_structure, self.new_structure) == ([VERTICAL, new_html], [])
+
+    def test_moved(self):
+        """
+        Moving a block changes its breadcrumbs and those of its descendants.
+        """
+        other_sequential = BlockKey('sequential', 'seq_1_0')
+        self.edit(SEQUENTIAL, children=[])
+        self.edit(other_sequential, children=self.blocks[other_sequential].fields['children'] + [VERTICAL])
+        changed, removed = diff_structures(self.old_structure, self.new_structure)
+        assert set(changed) == {SEQUENTIAL, other_sequential, VERTICAL, HTML}
+        assert not removed
+
+    def test_removed(self):
+        """
+        The descendants of a removed block are removed too, while orphans are ignored.
+        """
+        orphan = BlockKey('html', 'orphan')
+        self.old_structure['blocks'][orphan] = copy.deepcopy(self.blocks[HTML])
+        self.edit(CHAPTER, children=[BlockKey('sequential', 'seq_0_1')])
+        assert diff_structures(self.old_structure, self.new_structure) == (
+            [CHAPTER], [HTML, VERTICAL, SEQUENTIAL],
+        )
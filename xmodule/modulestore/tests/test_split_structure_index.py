@@ -0,0 +1,67 @@
+"""
+Tests for the get_items indexes in split_mongo/structure_index.py
+"""
+
+
+import copy
+import re
+import unittest
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex
+from xmodule.modulestore.tests.test_split_columnar_structure import make_structure
+
+ROOT = BlockKey('course', 'course')
+SEQUENTIAL = BlockKey('sequential', 'seq_0_0')
+VERTICAL = BlockKey('vertical', 'vert_0_0_0')
+HTML = BlockKey('html', 'html_0_0_0')
+
+
+class TestStructureIndex(unittest.TestCase):
+    """
+    Tests for StructureIndex.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.structure = make_structure(2, 2, 2)
+        self.blocks = self.structure['blocks']
+        self.index = StructureIndex(self.structure['_id'])
+
+    def test_by_type(self):
+        verticals = [block_key for block_key in self.blocks if block_key.type == 'vertical']
+        assert self.index.by_type(self.blocks)['vertical'] == verticals
+        assert self.index.candidates(self.blocks, {'block_type': 'vertical'}, {}) == verticals
+        assert self.index.candidates(self.blocks, {'block_type': 'nope'}, {}) == []
+
+    def test_by_field(self):
+        self.blocks[HTML].fields['tags'] = ['a', 'b', 'a']
+        assert self.index.candidates(self.blocks, {}, {'display_name': 'Seq 0'}) == [
+            SEQUENTIAL, BlockKey('sequential', 'seq_1_0'),
+        ]
+        assert self.index.candidates(self.blocks, {}, {'tags': 'a'}) == [HTML]
+        # children are indexed by element, which answers parent lookups
+        assert self.index.candidates(self.blocks, {}, {'children': VERTICAL}) == [SEQUENTIAL]
+
+    def test_intersection(self):
+        assert self.index.candidates(
+            self.blocks, {'block_type': 'sequential'}, {'display_name': 'Seq 1', 'graded': True}
+        ) == [BlockKey('sequential', 'seq_0_1'), BlockKey('sequential', 'seq_1_1')]
+
+    def test_not_indexable(self):
+        assert self.index.candidates(self.blocks, {'block_type': re.compile('vert')}, {}) is None
+        assert self.index.candidates(self.blocks, {}, {'graded': {'$exists': True}}) is None
+        assert self.index.candidates(self.blocks, {}, {'display_name': lambda name: True}) is None
+        assert self.index.candidates(self.blocks, {'definition': 'x'}, {}) is None
+
+    def test_parents_and_reachable(self):
+        orphan = BlockKey('vertical', 'orphan')
+        self.blocks[orphan] = copy.deepcopy(self.blocks[VERTICAL])
+        assert self.index.parents(self.blocks)[VERTICAL] == [SEQUENTIAL]
+        assert self.index.parents(self.blocks)[HTML] == [VERTICAL, orphan]
+
+        reachable = self.index.reachable(self.blocks)
+        assert ROOT in reachable
+        assert HTML in reachable
+        assert orphan not in reachable
+        assert len(reachable) == len(self.blocks) - 1
@@ -0,0 +1,145 @@
+"""
+Tests for the process-local structure cache in split_mongo/structure_lru.py
+"""
+
+
+import unittest
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.columnar_structure import encode_structure
+from xmodule.modulestore.split_mongo.mongo_connection import MongoPersistenceBackend
+from xmodule.modulestore.split_mongo.structure_lru import (
+    StructureLRUCache,
+    get_process_structure_cache,
+    reset_process_structure_cache,
+)
+from xmodule.modulestore.tests.test_split_columnar_structure import make_structure
+
+
+class TestStructureLRUCache(unittest.TestCase):
+    """
+    Tests for StructureLRUCache.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.structures = [make_structure(1, 1, 1) for __ in range(3)]
+        self.size = max(len(encode_structure(structure)) for structure in self.structures)
+
+    def test_get_returns_independent_copies(self):
+        cache = StructureLRUCache(max_bytes=10 * self.size, max_entries=10)
+        structure = self.structures[0]
+        assert cache.get(structure['_id']) is None
+        assert cache.set(structure['_id'], structure)
+
+        first = cache.get(structure['_id'])
+        second = cache.get(structure['_id'])
+        assert first == structure
+        assert first is not second
+
+        first['blocks'][BlockKey('course', 'course')].fields['display_name'] = 'changed'
+        assert cache.get(structure['_id']) == structure
+        assert cache.stats() == {
+            'hits': 3,
+            'misses': 1,
+            'evictions': 0,
+            'rejections': 0,
+            'entries': 1,
+            'bytes': cache.size,
+        }
+
+    def test_entry_limit(self):
+        cache = StructureLRUCache(max_bytes=10 * self.size, max_entries=2)
+        first, second, third = self.structures
+        cache.set(first['_id'], first)
+        cache.set(second['_id'], second)
+        # Touch the first structure so that the second one is the least recently used.
+        assert cache.get(first['_id']) is not None
+        cache.set(third['_id'], third)
+
+        assert first['_id'] in cache
+        assert second['_id'] not in cache
+        assert third['_id'] in cache
+        assert cache.evictions == 1
+
+    def test_byte_limit(self):
+        cache = StructureLRUCache(max_bytes=int(self.size * 1.5), max_entries=10)
+        first, second, __ = self.structures
+        cache.set(first['_id'], first)
+        cache.set(second['_id'], second)
+        assert len(cache) == 1
+        assert second['_id'] in cache
+        assert cache.size <= cache.max_bytes
+
+    def test_too_large(self):
+        cache = StructureLRUCache(max_bytes=self.size // 2, max_entries=10)
+        structure = self.structures[0]
+        assert not cache.set(structure['_id'], structure)
+        assert cache.rejections == 1
+        assert len(cache) == 0
+
+    def test_replace_and_clear(self):
+        cache = StructureLRUCache(max_bytes=10 * self.size, max_entries=10)
+        structure = self.structures[0]
+        cache.set(structure['_id'], structure)
+        cache.set(structure['_id'], data=encode_structure(structure))
+        assert len(cache) == 1
+        assert cache.size == len(encode_structure(structure))
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size == 0
+
+
+class TestProcessStructureCache(unittest.TestCase):
+    """
+    Tests for the process-wide structure cache and its use by MongoPersistenceBackend.
+    """
+
+    def setUp(self):
+        super().setUp()
+        reset_process_structure_cache()
+        self.addCleanup(reset_process_structure_cache)
+
+    @override_settings(COURSE_STRUCTURE_PROCESS_CACHE={'MAX_BYTES': 0, 'MAX_ENTRIES': 10})
+    def test_disabled(self):
+        assert get_process_structure_cache() is None
+
+    @override_settings(COURSE_STRUCTURE_PROCESS_CACHE={'MAX_BYTES': 2 ** 20, 'MAX_ENTRIES': 10})
+    def test_get_structure_uses_process_cache(self):
+        structure = make_structure(1, 1, 1)
+        process_cache = get_process_structure_cache()
+        assert process_cache is get_process_structure_cache()
+
+        with patch('pymongo.mongo_client.MongoClient'):
+            backend = MongoPersistenceBackend('db', 'collection', 'host')
+
+        with patch('xmodule.modulestore.split_mongo.mongo_connection.CourseStructureCache') as mock_cache:
+            mock_cache.return_value.get_with_encoded.return_value = (structure, None)
+            assert backend.get_structure(structure['_id']) == structure
+            assert backend.get_structure(structure['_id']) == structure
+
+        assert mock_cache.return_value.get_with_encoded.call_count == 1
+        assert process_cache.hits == 1
+        assert process_cache.misses == 1
+
+    @override_settings(COURSE_STRUCTURE_PROCESS_CACHE={'MAX_BYTES': 2 ** 20, 'MAX_ENTRIES': 10})
+    def test_get_structure_reuses_encoded_structure(self):
+        """
+        A columnar structure from the course structure cache goes into the process cache as is.
+        """
+        structure = make_structure(1, 1, 1)
+        encoded = encode_structure(structure)
+
+        with patch('pymongo.mongo_client.MongoClient'):
+            backend = MongoPersistenceBackend('db', 'collection', 'host')
+
+        with patch('xmodule.modulestore.split_mongo.mongo_connection.CourseStructureCache') as mock_cache:
+            mock_cache.return_value.get_with_encoded.return_value = (structure, encoded)
+            with patch('xmodule.modulestore.split_mongo.structure_lru.encode_structure') as mock_encode:
+                assert backend.get_structure(structure['_id']) == structure
+
+        assert not mock_encode.called
+        assert get_process_structure_cache().get_buffer(structure['_id']) == encoded
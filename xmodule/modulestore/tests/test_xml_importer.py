@@ -5,7 +5,9 @@ Tests for XML importer.
 
 import importlib
 import os
+import shutil
 import unittest
+from tempfile import mkdtemp
 from unittest import mock
 from uuid import uuid4
 
@@ -15,6 +17,7 @@ from path import Path as path
 from xblock.fields import List, Scope, ScopeIds, String
 from xblock.runtime import DictKeyValueStore, KvsFieldData, Runtime
 
+from xmodule.contentstore.content import StaticContent
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -237,13 +240,13 @@ class StaticContentImporterTest(unittest.TestCase):  # pylint: disable=missing-c
         ) as patched_import_static_file:
             self.static_content_importer.import_static_content_directory('static')
             patched_import_static_file.assert_any_call(
-                'static/file1.txt', base_dir=expected_base_dir
+                'static/file1.txt', base_dir=expected_base_dir, defer_thumbnail=True
             )
             patched_import_static_file.assert_any_call(
-                'static/file2.txt', base_dir=expected_base_dir
+                'static/file2.txt', base_dir=expected_base_dir, defer_thumbnail=True
             )
             patched_import_static_file.assert_any_call(
-                'static/inner/file1.txt', base_dir=expected_base_dir
+                'static/inner/file1.txt', base_dir=expected_base_dir, defer_thumbnail=True
             )
 
     def test_import_static_file(self):
@@ -257,3 +260,39 @@ class StaticContentImporterTest(unittest.TestCase):  # pylint: disable=missing-c
             )
             mock_file.assert_called_with(full_file_path, 'rb')
             self.mocked_content_store.generate_thumbnail.assert_called_once()
+
+    def test_import_static_content_directory_streams_files(self):
+        course_data_path = path(mkdtemp())
+        self.addCleanup(shutil.rmtree, course_data_path)
+        static_dir = course_data_path / 'static'
+        (static_dir / 'inner').makedirs()
+        (static_dir / 'notes.txt').write_bytes(b'notes')
+        (static_dir / 'inner' / 'image.png').write_bytes(b'image')
+
+        saved_data = {}
+        self.mocked_content_store.save.side_effect = lambda content: saved_data.update(
+            {content.import_path: b''.join(content.data)}
+        )
+        static_content_importer = StaticContentImporter(
+            static_content_store=self.mocked_content_store,
+            course_data_path=course_data_path,
+            target_id=CourseKey.from_string('course-v1:edX+DemoX+Demo_Course')
+        )
+        thumbnail_location = StaticContent.compute_location(
+            static_content_importer.target_id, 'image-png.jpg', is_thumbnail=True
+        )
+        self.mocked_content_store.generate_thumbnail.return_value = (mock.Mock(), thumbnail_location)
+
+        remap_dict = static_content_importer.import_static_content_directory('static')
+
+        assert saved_data == {'notes.txt': b'notes', 'inner/image.png': b'image'}
+        assert set(remap_dict) == {'notes.txt', 'inner/image.png'}
+        # Only the image gets a thumbnail, generated from the file once all the files are saved.
+        image_key = remap_dict['inner/image.png']
+        self.mocked_content_store.generate_thumbnail.assert_called_once_with(
+            mock.ANY, tempfile_path=static_dir / 'inner' / 'image.png'
+        )
+        self.mocked_content_store.set_attr.assert_called_once_with(
+            image_key, 'thumbnail_location', thumbnail_location.to_deprecated_list_repr()
+        )
+        assert set(static_content_importer.timings) == {'static_content', 'thumbnails'}
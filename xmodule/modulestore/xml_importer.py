@@ -26,10 +26,16 @@ import logging
 import mimetypes
 import os
 import re
+import time
 from abc import abstractmethod
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import partial
 
 import xblock
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import gettext as _
 from lxml import etree
@@ -64,6 +70,9 @@ log = logging.getLogger(__name__)
 
 DEFAULT_STATIC_CONTENT_SUBDIR = 'static'
 
+# Size of the chunks in which static files are read while they are imported.
+STATIC_CONTENT_IMPORT_CHUNK_SIZE = 1024 * 1024
+
 
 class CourseImportException(Exception):
     """
@@ -137,10 +146,46 @@ class StaticContentImporter:  # pylint: disable=missing-class-docstring
         mimetypes.add_type('application/octet-stream', '.srt')
         self.mimetypes_list = list(mimetypes.types_map.values())
 
-    def import_static_content_directory(self, content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR, verbose=False):  # pylint: disable=missing-function-docstring
+        self.max_workers = getattr(settings, 'COURSE_IMPORT_STATIC_CONTENT_WORKERS', 4)
+        # Seconds spent in each phase of the static content import, keyed by phase name.
+        self.timings = defaultdict(float)
+        # (content, file path) of the imported files whose thumbnails haven't been generated yet.
+        self._pending_thumbnails = []
+
+    def import_static_content_directory(self, content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR, verbose=False):
+        """
+        Import all the files in the given subdirectory of the course into the content store.
+
+        Files are uploaded in parallel by a pool of workers, streaming each of them in chunks.
+        Thumbnails of the imported images are generated once all the files are uploaded.
+
+        Returns a dict mapping the path of each imported file, relative to the subdirectory,
+        to its asset key.
+        """
         remap_dict = {}
 
         static_dir = self.course_data_path / content_subdir
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self.import_static_file, file_path, base_dir=static_dir, defer_thumbnail=True)
+                for file_path in self._static_file_paths(static_dir, verbose)
+            ]
+            for future in futures:
+                imported_file_attrs = future.result()
+                if imported_file_attrs:
+                    # store the remapping information which will be needed
+                    # to subsitute in the module data
+                    remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
+        self.timings['static_content'] += time.monotonic() - start
+
+        self.generate_pending_thumbnails()
+        return remap_dict
+
+    def _static_file_paths(self, static_dir, verbose):
+        """
+        Yield the paths of all the files to import from the given directory.
+        """
         for dirname, _, filenames in os.walk(static_dir):  # noqa: F402
             for filename in filenames:
 
@@ -154,20 +199,20 @@ class StaticContentImporter:  # pylint: disable=missing-class-docstring
                 if verbose:
                     log.debug('importing static content %s...', file_path)
 
-                imported_file_attrs = self.import_static_file(file_path, base_dir=static_dir)
+                yield file_path
 
-                if imported_file_attrs:
-                    # store the remapping information which will be needed
-                    # to subsitute in the module data
-                    remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
+    def import_static_file(self, full_file_path, base_dir, defer_thumbnail=False):
+        """
+        Import a single file into the content store, streaming it in chunks.
 
-        return remap_dict
+        If `defer_thumbnail` is True, the file's thumbnail isn't generated until
+        `generate_pending_thumbnails` is called.
 
-    def import_static_file(self, full_file_path, base_dir):  # pylint: disable=missing-function-docstring
+        Returns a tuple of the path of the file relative to `base_dir` and its asset key.
+        """
         filename = os.path.basename(full_file_path)
         try:
-            with open(full_file_path, 'rb') as f:
-                data = f.read()
+            f = open(full_file_path, 'rb')  # pylint: disable=consider-using-with
         except OSError:
             # OS X "companion files". See
             # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
@@ -195,26 +240,76 @@ class StaticContentImporter:  # pylint: disable=missing-class-docstring
         # Check extracted contentType in list of all valid mimetypes
         if not mime_type or mime_type not in self.mimetypes_list:
             mime_type = mimetypes.guess_type(filename)[0]  # Assign guessed mimetype
-        content = StaticContent(
-            asset_key, displayname, mime_type, data,
-            import_path=file_subpath, locked=locked
-        )
 
-        # first let's save a thumbnail so we can get back a thumbnail location
-        thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(content)
+        with f:
+            # The content store consumes (and hashes) the data chunk by chunk, so the
+            # file is never read into memory as a whole.
+            content = StaticContent(
+                asset_key, displayname, mime_type, iter(partial(f.read, STATIC_CONTENT_IMPORT_CHUNK_SIZE), b''),
+                import_path=file_subpath, locked=locked
+            )
+
+            if defer_thumbnail:
+                self._pending_thumbnails.append((content, full_file_path))
+            else:
+                # first let's save a thumbnail so we can get back a thumbnail location
+                thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(
+                    content, tempfile_path=full_file_path
+                )
 
-        if thumbnail_content is not None:
-            content.thumbnail_location = thumbnail_location
+                if thumbnail_content is not None:
+                    content.thumbnail_location = thumbnail_location
 
-        # then commit the content
+            # then commit the content
+            try:
+                self.static_content_store.save(content)
+            except Exception as err:  # pylint: disable=broad-except
+                msg = f'Error importing {file_subpath}, error={err}'
+                log.exception(f'Course import {self.target_id}: {msg}')
+                monitor_import_failure(self.target_id, 'Updating', exception=err)
+
+        return file_subpath, asset_key
+
+    def generate_pending_thumbnails(self):
+        """
+        Generate the thumbnails of the images imported with a deferred thumbnail,
+        and point the images at them.
+        """
+        pending_thumbnails = [
+            (content, file_path) for content, file_path in self._pending_thumbnails
+            if content.content_type and content.content_type.split('/')[0] == 'image'
+        ]
+        self._pending_thumbnails = []
+        if not pending_thumbnails:
+            return
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for future in [
+                executor.submit(self._generate_thumbnail, content, file_path)
+                for content, file_path in pending_thumbnails
+            ]:
+                future.result()
+        self.timings['thumbnails'] += time.monotonic() - start
+
+    def _generate_thumbnail(self, content, file_path):
+        """
+        Generate the thumbnail of an already imported image, and record its location on the image.
+        """
+        thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(
+            content, tempfile_path=file_path
+        )
+        if thumbnail_content is None:
+            return
+
+        content.thumbnail_location = thumbnail_location
         try:
-            self.static_content_store.save(content)
+            self.static_content_store.set_attr(
+                content.location, 'thumbnail_location', thumbnail_location.to_deprecated_list_repr()
+            )
         except Exception as err:  # pylint: disable=broad-except
-            msg = f'Error importing {file_subpath}, error={err}'
+            msg = f'Error recording the thumbnail of {content.location}, error={err}'
             log.exception(f'Course import {self.target_id}: {msg}')
-            monitor_import_failure(self.target_id, 'Updating', exception=err)
-
-        return file_subpath, asset_key
 
 
 class ImportManager:
@@ -259,6 +354,9 @@ class ImportManager:
             create this file to implement custom logic in their course.
 
         default_class, load_error_blocks: are arguments for constructing the XMLModuleStore (see its doc)
+
+        phase_timings: If specified, a dict in which the number of seconds spent in each phase of the
+            import is recorded, keyed by phase name.
     """
     store_class = XMLModuleStore
 
@@ -271,6 +369,7 @@ class ImportManager:
             create_if_not_present=False, raise_on_failure=False,
             static_content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR,
             python_lib_filename='python_lib.zip',
+            phase_timings=None,
     ):
         self.store = store
         self.user_id = user_id
@@ -286,6 +385,7 @@ class ImportManager:
         self.do_import_python_lib = do_import_python_lib
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.phase_timings = phase_timings
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -306,6 +406,21 @@ class ImportManager:
         if self.target_id:
             assert len(self.xml_module_store.modules) == 1, 'Store unable to load course correctly.'
 
+    @contextmanager
+    def timed_phase(self, phase):
+        """
+        Add the time spent in the wrapped code to the given phase of `phase_timings`.
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record_timing(phase, time.monotonic() - start)
+
+    def _record_timing(self, phase, seconds):
+        if self.phase_timings is not None:
+            self.phase_timings[phase] = self.phase_timings.get(phase, 0.0) + seconds
+
     def import_static(self, data_path, dest_id):
         """
         Import all static items into the content store.
@@ -360,6 +475,9 @@ class ImportManager:
                 content_subdir=simport, verbose=self.verbose
             )
 
+        for phase, seconds in static_content_importer.timings.items():
+            self._record_timing(phase, seconds)
+
     def import_asset_metadata(self, data_dir, course_id):
         """
         Read in assets XML file, parse it, and add all asset metadata to the modulestore.
@@ -570,27 +688,30 @@ class ImportManager:
             # This bulk operation wraps all the operations to populate the published branch.
             with self.store.bulk_operations(dest_id):
                 # Retrieve the course itself.
-                source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
+                with self.timed_phase('courselike'):
+                    source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
-                # Import all static pieces.
+                # Import all static pieces. The static content importer records its own phases.
                 self.import_static(data_path, dest_id)
 
                 # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
+                with self.timed_phase('asset_metadata'):
+                    self.import_asset_metadata(data_path, dest_id)
 
                 # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                with self.timed_phase('children'):
+                    self.import_children(source_courselike, courselike, courselike_key, dest_id)
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
             # Drafts must be imported in a separate bulk operation from published items to import properly,
             # due to the recursive_build() above creating a draft item for each course block
             # and then publishing it.
-            with self.store.bulk_operations(dest_id):
+            with self.store.bulk_operations(dest_id), self.timed_phase('drafts'):
                 # Import all draft items into the courselike.
                 courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
 
-            with self.store.bulk_operations(dest_id):
+            with self.store.bulk_operations(dest_id), self.timed_phase('tags'):
                 try:
                     self.import_tags(data_path, dest_id)
                 except FileNotFoundError:
@@ -85,6 +85,19 @@ class FakeGridFsItem:
         return chunk
 
 
+class FakeGridOut(FakeGridFsItem):
+    """
+    A GridFS item which can be read one stored chunk at a time
+    """
+    chunk_size = 500
+
+    def readchunk(self):
+        """
+        Read the rest of the chunk holding the cursor
+        """
+        return self.read(self.chunk_size - self.cursor % self.chunk_size)
+
+
 class MockImage(Mock):
     """
     This class pretends to be PIL.Image for purposes of thumbnails testing.
@@ -202,3 +215,16 @@ class ContentTest(unittest.TestCase):  # pylint: disable=missing-class-docstring
             total_length += len(chunck)
 
         assert total_length == ((last_byte - first_byte) + 1)
+
+    def test_static_content_stream_stream_data_in_range_by_chunk(self):
+        """
+        Test StaticContentStream stream_data_in_range function with a GridFS file, asserts
+        that we get the requested bytes, read one stored chunk at a time
+        """
+        item = FakeGridOut(SAMPLE_STRING)
+        static_content_stream = StaticContentStream('loc', 'name', 'type', item, length=item.length)
+
+        chunks = list(static_content_stream.stream_data_in_range(100, 1500))
+
+        assert ''.join(chunks) == SAMPLE_STRING[100:1501]
+        assert [len(chunk) for chunk in chunks] == [400, 500, 500, 1]